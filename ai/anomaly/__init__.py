@@ -1,3 +1,4 @@
 from .detector import AnomalyDetector
+from .service import AnomalyService
 
-__all__ = ["AnomalyDetector"]
+__all__ = ["AnomalyDetector", "AnomalyService"]
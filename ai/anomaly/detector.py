@@ -24,43 +24,41 @@ class AnomalyDetector:
         self.is_trained = False
         self.contamination = 0.01 # Expect top 1% outliers
         
-    def load_data(self) -> pd.DataFrame:
+    def load_data(self, since: Optional[datetime] = None) -> pd.DataFrame:
         """
         Load features for anomaly detection.
         We aggregate data at project level or unit level?
         Let's look at Price Per Sqft derived from pricing snapshots or unit types.
+
+        If ``since`` is given, only unit types created/updated at or after it
+        are loaded (boundary rows are re-scored; flag upserts make that safe).
         """
         logger.info("Loading data for anomaly detection...")
         
         # Strategy: Get all unit types (most granular source of Area + Price)
-        stmt = select(UnitType).where(
+        stmt = select(
+            UnitType.id.label('unit_id'),
+            UnitType.project_id,
+            UnitType.saleable_area_sqmt.label('area'),
+            UnitType.sale_price.label('price'),
+            UnitType.updated_at,
+        ).where(
             UnitType.saleable_area_sqmt.is_not(None),
             UnitType.sale_price.is_not(None)
         )
-        units = self.session.scalars(stmt).all()
-        
-        data = []
-        for u in units:
-            try:
-                area = float(u.saleable_area_sqmt) if u.saleable_area_sqmt else np.nan
-                price = float(u.sale_price) if u.sale_price else np.nan
-                
-                # Derive price_per_sqft (assuming sqmt input, converting to sqft not strictly needed for anomaly if consistent)
-                # But let's work with raw numbers
-                if area > 0 and price > 0:
-                    pp_rate = price / area
-                    
-                    data.append({
-                        'unit_id': u.id,
-                        'project_id': u.project_id,
-                        'area': area,
-                        'price': price,
-                        'price_per_unit_area': pp_rate
-                    })
-            except Exception:
-                continue
-                
-        df = pd.DataFrame(data)
+        if since is not None:
+            stmt = stmt.where(UnitType.updated_at >= since)
+
+        rows = self.session.execute(stmt).all()
+        df = pd.DataFrame(rows, columns=['unit_id', 'project_id', 'area', 'price', 'updated_at'])
+
+        # Derive price_per_sqft (assuming sqmt input, converting to sqft not strictly needed for anomaly if consistent)
+        # But let's work with raw numbers
+        df['area'] = pd.to_numeric(df['area'], errors='coerce').astype(float)
+        df['price'] = pd.to_numeric(df['price'], errors='coerce').astype(float)
+        df = df[(df['area'] > 0) & (df['price'] > 0)].reset_index(drop=True)
+        df['price_per_unit_area'] = df['price'] / df['area']
+
         logger.info(f"Loaded {len(df)} records for training.")
         return df
 
@@ -109,45 +107,71 @@ class AnomalyDetector:
         preds = self.model.predict(X)
         scores = self.model.decision_function(X) # lower is more anomalous
         
-        anomalies = []
         df['anomaly'] = preds
         df['score'] = scores
         
         outliers = df[df['anomaly'] == -1]
         logger.info(f"Detected {len(outliers)} anomalies.")
         
-        for _, row in outliers.iterrows():
-            # Determine which column is likely the cause?
-            # Global outlier, hard to say specific col without interpretation.
-            # We flag the record generally.
-            anomalies.append({
-                'project_id': int(row['project_id']),
-                'column_name': 'price_area_mix', # Generic label for multivariate
-                'outlier_value': float(row['price_per_unit_area']),
-                'anomaly_score': float(row['score'])
-            })
-            
-        return anomalies
+        # Global outlier, hard to say specific col without interpretation.
+        # We flag the record generally.
+        flagged = pd.DataFrame({
+            'project_id': outliers['project_id'].astype(int),
+            'column_name': 'price_area_mix', # Generic label for multivariate
+            'outlier_value': outliers['price_per_unit_area'].astype(float),
+            'anomaly_score': outliers['score'].astype(float),
+        })
+        return flagged.to_dict('records')
 
-    def save_flags(self, anomalies: List[Dict[str, Any]]):
+    def save_flags(self, anomalies: List[Dict[str, Any]]) -> int:
         """
-        Save findings to DB.
+        Upsert findings to DB in bulk.
+
+        One open (unreviewed) flag is kept per (project_id, column_name): if a
+        flag is already open its value/score are refreshed, otherwise a new
+        flag is inserted. The most anomalous record wins within a batch.
         """
         if not anomalies:
-            return
-            
-        count = 0
-        for item in anomalies:
-            # simple check to avoid dupes? (optional, for now just insert)
-            flag = DataQualityFlag(
-                project_id=item['project_id'],
-                column_name=item['column_name'],
-                outlier_value=item['outlier_value'],
-                anomaly_score=item['anomaly_score'],
-                is_reviewed=False
+            return 0
+
+        # Collapse the batch to the worst score per key
+        batch = (
+            pd.DataFrame(anomalies)
+            .sort_values('anomaly_score')
+            .drop_duplicates(['project_id', 'column_name'], keep='first')
+        )
+        keys = {(int(p), c) for p, c in zip(batch['project_id'], batch['column_name'])}
+
+        existing = {
+            (f.project_id, f.column_name): f
+            for f in self.session.scalars(
+                select(DataQualityFlag).where(
+                    DataQualityFlag.project_id.in_({p for p, _ in keys}),
+                    DataQualityFlag.column_name.in_({c for _, c in keys}),
+                    DataQualityFlag.is_reviewed.is_(False),
+                )
             )
-            self.session.add(flag)
-            count += 1
-        
+        }
+
+        new_flags = []
+        updated = 0
+        for item in batch.to_dict('records'):
+            key = (int(item['project_id']), item['column_name'])
+            flag = existing.get(key)
+            if flag is not None:
+                flag.outlier_value = item['outlier_value']
+                flag.anomaly_score = item['anomaly_score']
+                updated += 1
+            else:
+                new_flags.append(DataQualityFlag(
+                    project_id=key[0],
+                    column_name=key[1],
+                    outlier_value=item['outlier_value'],
+                    anomaly_score=item['anomaly_score'],
+                    is_reviewed=False
+                ))
+
+        self.session.add_all(new_flags)
         self.session.commit()
-        logger.info(f"Saved {count} data quality flags.")
+        logger.info(f"Saved {len(new_flags)} new data quality flags, refreshed {updated} open flags.")
+        return len(new_flags) + updated
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import joblib
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Union
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from .detector import AnomalyDetector
+
+logger = logging.getLogger("ai.anomaly.service")
+
+# Bump when the feature layout fed to IsolationForest changes
+FEATURE_VERSION = "isoforest_v1"
+# Where trained models and the scoring watermark live between scheduled runs
+ANOMALY_MODEL_DIR = os.getenv("ANOMALY_MODEL_DIR", "data/models/anomaly")
+
+FEATURE_COLS = ['area', 'price', 'price_per_unit_area']
+
+
+class AnomalyService:
+    """
+    Scheduled anomaly detection on top of AnomalyDetector.
+
+    Two jobs, meant to be scheduled independently:
+    - retrain(): full refit on all unit types, persisted with a version and
+      a hash of the training window (skipped if the window is unchanged).
+    - score_incremental(): loads the persisted model and scores only unit
+      types created/updated since the last watermark, upserting flags.
+
+    State (current model + watermark) is kept in ``<model_dir>/state.json``.
+    """
+
+    def __init__(self, session: Session, model_dir: Union[str, Path] = ANOMALY_MODEL_DIR):
+        self.session = session
+        self.model_dir = Path(model_dir)
+        self.state_path = self.model_dir / "state.json"
+        self.detector = AnomalyDetector(session)
+
+    # ------------------------------------------------------------------ state
+
+    def load_state(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read anomaly state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self, state: Dict[str, Any]):
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2, default=str), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    @staticmethod
+    def window_hash(df: pd.DataFrame) -> str:
+        """
+        Content hash of the training window (unit ids + features).
+        """
+        frame = df[['unit_id'] + FEATURE_COLS].sort_values('unit_id')
+        row_hashes = pd.util.hash_pandas_object(frame, index=False).values
+        digest = hashlib.sha256(row_hashes.tobytes())
+        digest.update(FEATURE_VERSION.encode())
+        return digest.hexdigest()[:16]
+
+    # ------------------------------------------------------------------ model
+
+    def load_model(self) -> bool:
+        """
+        Load the current persisted model into the detector.
+        """
+        state = self.load_state()
+        model_file = state.get("model_file")
+        if not model_file or state.get("feature_version") != FEATURE_VERSION:
+            return False
+        path = self.model_dir / model_file
+        if not path.exists():
+            logger.warning(f"Anomaly model {path} referenced by state is missing.")
+            return False
+        self.detector.model = joblib.load(path)
+        self.detector.is_trained = True
+        logger.info(f"Loaded anomaly model {state.get('model_version')} ({path.name})")
+        return True
+
+    def retrain(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Full retrain on every unit type. Returns the (possibly unchanged) state.
+        """
+        df = self.detector.load_data()
+        if df.empty:
+            logger.warning("No data to train.")
+            return self.load_state()
+
+        state = self.load_state()
+        data_hash = self.window_hash(df)
+        if (
+            not force
+            and state.get("window_hash") == data_hash
+            and state.get("feature_version") == FEATURE_VERSION
+            and (self.model_dir / state.get("model_file", "")).is_file()
+        ):
+            logger.info(f"Training window unchanged ({data_hash}); keeping model {state.get('model_version')}.")
+            return state
+
+        self.detector.train(df)
+        if not self.detector.is_trained:
+            return state
+
+        trained_at = datetime.now(timezone.utc)
+        version = f"{FEATURE_VERSION}-{trained_at:%Y%m%d%H%M%S}"
+        model_file = f"anomaly_{version}_{data_hash}.joblib"
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.detector.model, self.model_dir / model_file)
+
+        state.update({
+            "feature_version": FEATURE_VERSION,
+            "model_version": version,
+            "model_file": model_file,
+            "window_hash": data_hash,
+            "trained_at": trained_at.isoformat(),
+            "n_samples": int(len(df)),
+        })
+        self.save_state(state)
+        logger.info(f"Trained anomaly model {version} on {len(df)} unit types.")
+        return state
+
+    # ---------------------------------------------------------------- scoring
+
+    def score_incremental(self, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Score unit types changed since the last watermark and upsert flags.
+
+        Bootstraps with a full retrain if no model has been persisted yet.
+        """
+        if not self.load_model():
+            logger.info("No persisted anomaly model; running initial retrain.")
+            self.retrain()
+            if not self.load_model():
+                logger.error("Model not trained.")
+                return []
+
+        state = self.load_state()
+        since = datetime.fromisoformat(state["watermark"]) if state.get("watermark") else None
+        df = self.detector.load_data(since=since)
+        logger.info(f"Scoring {len(df)} unit types changed since {since or 'the beginning'}.")
+        if df.empty:
+            return []
+
+        anomalies = self.detector.detect(df)
+        if dry_run:
+            return anomalies
+
+        self.detector.save_flags(anomalies)
+
+        watermark = df['updated_at'].max()
+        if pd.notna(watermark):
+            state["watermark"] = pd.Timestamp(watermark).isoformat()
+            state["last_scored_at"] = datetime.now(timezone.utc).isoformat()
+            self.save_state(state)
+        return anomalies
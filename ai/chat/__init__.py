@@ -1,5 +1,5 @@
-from .embedder import ProjectEmbedder
+from .embedder import ProjectEmbedder, get_embedder
 from .search import SemanticSearch
 from .assistant import ChatAssistant
 
-__all__ = ["ProjectEmbedder", "SemanticSearch", "ChatAssistant"]
+__all__ = ["ProjectEmbedder", "SemanticSearch", "ChatAssistant", "get_embedder"]
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from cg_rera_extractor.db.models import Project
 from .search import SemanticSearch
-from .embedder import ProjectEmbedder
+from .embedder import ProjectEmbedder, get_embedder
 
 logger = logging.getLogger("ai.chat.assistant")
 
@@ -29,7 +29,7 @@ class ChatAssistant:
     
     def __init__(self, session: Session, embedder: ProjectEmbedder = None):
         self.session = session
-        self.embedder = embedder or ProjectEmbedder()
+        self.embedder = embedder or get_embedder()
         self.searcher = SemanticSearch(session, self.embedder)
         self.llm = None
         
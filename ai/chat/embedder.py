@@ -25,12 +25,12 @@ class ProjectEmbedder:
     MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
     VECTOR_DIM = 384
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, load: bool = True):
         self.model_name = model_name or self.MODEL_NAME
         self.model = None
         self.is_loaded = False
         
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
+        if SENTENCE_TRANSFORMERS_AVAILABLE and load:
             self._load_model()
     
     def _load_model(self):
@@ -130,3 +130,21 @@ class ProjectEmbedder:
                 parts.append(f"Price: {latest.min_price_total} - {latest.max_price_total}")
         
         return ". ".join(parts)
+
+
+def load_embedder() -> Optional[ProjectEmbedder]:
+    """Model registry loader: a loaded embedder, or None if unavailable."""
+    embedder = ProjectEmbedder()
+    return embedder if embedder.is_loaded else None
+
+
+def get_embedder() -> ProjectEmbedder:
+    """
+    The process-wide embedder from the model registry.
+
+    Returns an unloaded embedder (``is_loaded`` False) when
+    sentence-transformers or the model is unavailable.
+    """
+    from ai.registry import get_model
+
+    return get_model("embedder") or ProjectEmbedder(load=False)
@@ -8,7 +8,7 @@ from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
 from cg_rera_extractor.db.models import Project, ProjectEmbedding
-from .embedder import ProjectEmbedder
+from .embedder import ProjectEmbedder, get_embedder
 
 logger = logging.getLogger("ai.chat.search")
 
@@ -20,7 +20,7 @@ class SemanticSearch:
     
     def __init__(self, session: Session, embedder: ProjectEmbedder = None):
         self.session = session
-        self.embedder = embedder or ProjectEmbedder()
+        self.embedder = embedder or get_embedder()
     
     def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -13,11 +13,13 @@ Solution:
 Create a proper FastAPI dependency function that yields database sessions.
 """
 
+from cg_rera_extractor.api.concurrency import ReadSession, open_read_session
 from cg_rera_extractor.db import get_engine, get_session_local
+from fastapi import Depends
 from sqlalchemy.orm import Session
-from typing import Generator
+from typing import AsyncIterator, Generator
 
-# Create engine and sessionmaker at module level
+# Shared process-wide engine (same pool as any other caller in this process)
 _engine = get_engine()
 _SessionLocal = get_session_local(_engine)
 
@@ -44,6 +46,17 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_read_db(db: Session = Depends(get_db)) -> AsyncIterator[ReadSession]:
+    """
+    FastAPI dependency for read-only handlers.
+
+    Yields a ReadSession; ``await read.run(fn, ...)`` runs ``fn(session, ...)``
+    on the async engine when enabled, else in the bounded DB thread pool.
+    """
+    async with open_read_session(db) as read:
+        yield read
+
+
 # Example usage in ai/main.py:
 # 
 # from fastapi import Depends
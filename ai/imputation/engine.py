@@ -1,11 +1,15 @@
+import hashlib
 import logging
+import os
+import joblib
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, date
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sklearn.experimental import enable_iterative_imputer  # noqa
 from sklearn.impute import IterativeImputer
 from sklearn.linear_model import BayesianRidge
@@ -14,6 +18,10 @@ from cg_rera_extractor.db.models import Project, ProjectImputation
 
 logger = logging.getLogger("ai.imputation.engine")
 
+MODEL_NAME = "IterativeImputer_v1"
+# Where fitted imputers are cached between scheduled runs
+IMPUTATION_MODEL_DIR = os.getenv("IMPUTATION_MODEL_DIR", "data/models/imputation")
+
 class ImputationEngine:
     """
     AI-powered engine to impute missing data for Real Estate Projects.
@@ -29,6 +37,7 @@ class ImputationEngine:
         self.model = None
         self.is_trained = False
         self.trained_features = None  # Track which features were actually used in training
+        self.training_data: Optional[pd.DataFrame] = None
         
         # Features used for prediction
         self.feature_cols = [
@@ -52,57 +61,127 @@ class ImputationEngine:
         - possession_year_impute = project.proposed_end_date.year (NaN if missing)
         """
         logger.info("Loading training data from DB...")
-        stmt = select(Project)
+        stmt = select(Project).options(
+            selectinload(Project.buildings),
+            selectinload(Project.unit_types),
+            selectinload(Project.promoters),
+        )
         projects = self.session.scalars(stmt).all()
         
         data = []
         for p in projects:
-            # Safe access to buildings and promoters
-            try:
-                total_units = None
-                if p.buildings and len(p.buildings) > 0 and p.buildings[0].total_units:
-                    total_units = float(p.buildings[0].total_units)
-                elif p.unit_types and len(p.unit_types) > 0 and p.unit_types[0].total_units:
-                    total_units = float(p.unit_types[0].total_units)
-                    
-                developer_id = float(p.promoters[0].id) if p.promoters and len(p.promoters) > 0 else 0.0
-                
-                row = {
-                    'id': p.id,
-                    'latitude': float(p.latitude) if p.latitude else np.nan,
-                    'longitude': float(p.longitude) if p.longitude else np.nan,
-                    'developer_id': developer_id,
-                    # Simple encoding: Residential=1, Commercial=2, etc. (Placeholder)
-                    'project_type_encoded': 1.0, 
-                    
-                    # Targets
-                    'total_units_impute': total_units if total_units is not None else np.nan,
-                    'possession_year_impute': float(p.proposed_end_date.year) if p.proposed_end_date else np.nan
-                }
-            except (IndexError, AttributeError) as e:
-                logger.warning(f"Error accessing data for project {p.id}: {e}")
-                continue
-            # Fallback for total_units if possible
-            if pd.isna(row['total_units_impute']):
-                 # Try to sum buildings? For now just keep NaN
-                 pass
-                 
-            data.append(row)
+            row = self._build_row(p)
+            if row is not None:
+                data.append(row)
             
         df = pd.DataFrame(data)
         logger.info(f"Loaded {len(df)} rows. Feature columns: {self.all_cols}")
         return df
 
-    def train(self):
+    def _build_row(self, p: Project) -> Optional[Dict[str, Any]]:
+        """
+        Build the feature/target row for a single project (None if unreadable).
+        """
+        # Safe access to buildings and promoters
+        try:
+            total_units = None
+            if p.buildings and len(p.buildings) > 0 and p.buildings[0].total_units:
+                total_units = float(p.buildings[0].total_units)
+            elif p.unit_types and len(p.unit_types) > 0 and p.unit_types[0].total_units:
+                total_units = float(p.unit_types[0].total_units)
+                
+            developer_id = float(p.promoters[0].id) if p.promoters and len(p.promoters) > 0 else 0.0
+            
+            return {
+                'id': p.id,
+                'latitude': float(p.latitude) if p.latitude else np.nan,
+                'longitude': float(p.longitude) if p.longitude else np.nan,
+                'developer_id': developer_id,
+                # Simple encoding: Residential=1, Commercial=2, etc. (Placeholder)
+                'project_type_encoded': 1.0, 
+                
+                # Targets
+                'total_units_impute': total_units if total_units is not None else np.nan,
+                'possession_year_impute': float(p.proposed_end_date.year) if p.proposed_end_date else np.nan
+            }
+        except (IndexError, AttributeError) as e:
+            logger.warning(f"Error accessing data for project {p.id}: {e}")
+            return None
+
+    def training_data_hash(self, df: pd.DataFrame) -> str:
+        """
+        Stable content hash of the training matrix, used as the model cache key.
+        """
+        frame = df[['id'] + self.all_cols].sort_values('id')
+        row_hashes = pd.util.hash_pandas_object(frame, index=False).values
+        digest = hashlib.sha256(row_hashes.tobytes())
+        digest.update(MODEL_NAME.encode())
+        return digest.hexdigest()[:16]
+
+    def _model_path(self, model_dir: Union[str, Path], data_hash: str) -> Path:
+        return Path(model_dir) / f"imputer_{data_hash}.joblib"
+
+    def save_model(self, model_dir: Union[str, Path], data_hash: str) -> Path:
+        """
+        Persist the fitted imputer keyed by the training-data hash.
+        """
+        path = self._model_path(model_dir, data_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(
+            {"model": self.model, "trained_features": self.trained_features, "all_cols": self.all_cols},
+            path,
+        )
+        logger.info(f"Saved imputation model to {path}")
+        return path
+
+    def load_model(self, model_dir: Union[str, Path], data_hash: str) -> bool:
+        """
+        Load a previously fitted imputer for this training-data hash, if present.
+        """
+        path = self._model_path(model_dir, data_hash)
+        if not path.exists():
+            return False
+        try:
+            payload = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Could not load cached model {path}: {e}")
+            return False
+        if payload.get("all_cols") != self.all_cols:
+            logger.info(f"Cached model {path} uses a different feature layout; retraining.")
+            return False
+        self.model = payload["model"]
+        self.trained_features = payload["trained_features"]
+        self.is_trained = True
+        logger.info(f"Loaded cached imputation model from {path}")
+        return True
+
+    def train(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        model_dir: Optional[Union[str, Path]] = None,
+        refit: bool = False,
+    ):
         """
         Train the IterativeImputer on the dataset.
+
+        If ``model_dir`` is given, a model fitted on identical training data is
+        reused from disk instead of retraining, and fresh fits are saved there.
+        ``refit`` skips the cached model and overwrites it with a fresh fit.
         """
-        df = self.load_training_data()
+        if df is None:
+            df = self.load_training_data()
+        self.training_data = df
         
         if df.empty:
             logger.warning("No data to train on.")
             return
 
+        data_hash = None
+        if model_dir is not None:
+            data_hash = self.training_data_hash(df)
+            if not refit and self.load_model(model_dir, data_hash):
+                return
+
         # Prepare X matrix
         # We drop ID for training
         X = df[self.all_cols].values
@@ -126,6 +205,9 @@ class ImputationEngine:
         logger.info(f"Model trained successfully. Active features: {self.trained_features}")
         logger.info("Model trained successfully.")
 
+        if data_hash is not None:
+            self.save_model(model_dir, data_hash)
+
     def predict_project(self, project_id: int) -> Dict[str, Any]:
         """
         Predict missing values for a specific project.
@@ -216,7 +298,99 @@ class ImputationEngine:
             project_id=project_id,
             imputed_data=data,
             confidence_score=0.85, # Placeholder for sklearn imputer confidence
-            model_name="IterativeImputer_v1"
+            model_name=MODEL_NAME
         )
         self.session.add(imputation)
         self.session.commit()
+
+    def predict_many(self, df: Optional[pd.DataFrame] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Predict missing values for every project in ``df`` with a single transform.
+
+        Defaults to the frame the model was trained on. Returns a mapping of
+        project_id -> imputed fields, containing only projects with gaps.
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model is not trained. Call train() first.")
+
+        if df is None:
+            df = self.training_data if self.training_data is not None else self.load_training_data()
+        if df.empty:
+            return {}
+
+        X_out = self.model.transform(df[self.all_cols].values)
+
+        # Same column mapping rules as predict_project
+        if X_out.shape[1] == len(self.trained_features):
+            out_cols = self.trained_features
+        else:
+            logger.warning(f"Output shape {X_out.shape[1]} doesn't match trained features count {len(self.trained_features)}")
+            out_cols = self.all_cols[:X_out.shape[1]]
+        predicted = pd.DataFrame(X_out, columns=out_cols, index=df.index)
+
+        nan_col = pd.Series(np.nan, index=df.index)
+        pred_units = predicted.get('total_units_impute', nan_col)
+        pred_year = predicted.get('possession_year_impute', nan_col)
+
+        fill_units = df['total_units_impute'].isna() & pred_units.notna()
+        fill_year = df['possession_year_impute'].isna() & pred_year.notna()
+
+        units = pred_units.clip(lower=0).round()
+        years = pred_year.round()
+
+        results: Dict[int, Dict[str, Any]] = {}
+        for pid, do_units, unit_val, do_year, year_val in zip(
+            df['id'].to_numpy(), fill_units.to_numpy(), units.to_numpy(),
+            fill_year.to_numpy(), years.to_numpy(),
+        ):
+            if not (do_units or do_year):
+                continue
+            result: Dict[str, Any] = {}
+            if do_units:
+                result['total_units'] = int(unit_val)
+            if do_year:
+                result['proposed_end_date'] = f"{int(year_val)}-12-31" # Approx end of year
+            results[int(pid)] = result
+
+        logger.info(f"Predicted gaps for {len(results)} of {len(df)} projects.")
+        return results
+
+    def save_imputations(self, predictions: Dict[int, Dict[str, Any]]) -> int:
+        """
+        Bulk-save predictions from predict_many in a single transaction.
+        """
+        rows = [
+            ProjectImputation(
+                project_id=project_id,
+                imputed_data=data,
+                confidence_score=0.85, # Placeholder for sklearn imputer confidence
+                model_name=MODEL_NAME
+            )
+            for project_id, data in predictions.items()
+            if data
+        ]
+        if not rows:
+            return 0
+        self.session.add_all(rows)
+        self.session.commit()
+        logger.info(f"Saved {len(rows)} imputations.")
+        return len(rows)
+
+    def impute_all(
+        self,
+        model_dir: Optional[Union[str, Path]] = IMPUTATION_MODEL_DIR,
+        dry_run: bool = False,
+        refit: bool = False,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Train (or reuse a cached model), predict every project in one pass and
+        bulk-write the results. ``refit`` retrains and replaces the cached model.
+        """
+        self.train(model_dir=model_dir, refit=refit)
+        if not self.is_trained:
+            return {}
+
+        predictions = self.predict_many()
+        if not dry_run:
+            self.save_imputations(predictions)
+        return predictions
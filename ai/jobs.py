@@ -0,0 +1,357 @@
+"""
+Queued AI jobs: idempotent submission and execution.
+
+Document extraction and project scoring run on Celery workers
+(``cg_rera_extractor/worker.py``) instead of inside API requests. Each job is
+an ``ai_jobs`` row keyed by (kind, project, input hash):
+
+* ``rera_extract`` - input hash is the SHA-256 of the PDF, so the same
+  document is extracted once however often it is submitted;
+* ``score`` - input hash covers the project's data version (parse and
+  scrape timestamps), so a project is re-scored only after it changes.
+
+Submitting an existing key returns the existing job; failed jobs (or any job
+with ``force``) are re-queued. Clients poll ``GET /ai/jobs/{id}`` or pass a
+``callback_url`` that receives the job as JSON when it finishes.
+"""
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.db.models import AIJob, Project
+
+logger = logging.getLogger("ai.jobs")
+
+# Job kind -> Celery queue (CPU-bound OCR vs GPU/LLM work)
+JOB_QUEUES = {"rera_extract": "ocr", "score": "llm"}
+
+AI_JOB_BATCH_MAX = int(os.getenv("AI_JOB_BATCH_MAX", "5000"))
+AI_JOB_CALLBACK_TIMEOUT_SEC = float(os.getenv("AI_JOB_CALLBACK_TIMEOUT_SEC", "10"))
+
+SCORE_MODEL_NAME = "llama-local-v1"
+
+# Input problems that retrying cannot fix: the job fails at once
+PERMANENT_ERRORS = (LookupError, ValueError, FileNotFoundError)
+
+_KEY_CHUNK = 500
+
+
+@dataclass
+class JobRequest:
+    kind: str
+    project_id: int
+    file_path: Optional[str] = None
+    document_hash: Optional[str] = None  # skips hashing the file when the caller knows it
+    callback_url: Optional[str] = None
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _score_input_hash(project_id: int, last_parsed_at: Any, scraped_at: Any) -> str:
+    version = f"{project_id}:{last_parsed_at}:{scraped_at}"
+    return hashlib.sha256(version.encode()).hexdigest()
+
+
+def _prepare(session: Session, requests: List[JobRequest]) -> List[Dict[str, Any]]:
+    """Validate requests and compute their job keys."""
+    project_ids = {r.project_id for r in requests}
+    versions = {}
+    ids = list(project_ids)
+    for start in range(0, len(ids), _KEY_CHUNK):
+        rows = session.execute(
+            select(Project.id, Project.last_parsed_at, Project.scraped_at).where(
+                Project.id.in_(ids[start:start + _KEY_CHUNK])
+            )
+        )
+        versions.update({row.id: (row.last_parsed_at, row.scraped_at) for row in rows})
+
+    prepared = []
+    for request in requests:
+        if request.kind not in JOB_QUEUES:
+            raise ValueError(f"Unknown job kind {request.kind!r}; expected one of {', '.join(JOB_QUEUES)}")
+        if request.project_id not in versions:
+            raise LookupError(f"Project {request.project_id} not found")
+
+        payload: Dict[str, Any] = {}
+        if request.kind == "rera_extract":
+            if not request.file_path:
+                raise ValueError("file_path is required for rera_extract jobs")
+            if request.document_hash:
+                input_hash = request.document_hash.lower()
+            elif os.path.exists(request.file_path):
+                input_hash = file_sha256(request.file_path)
+            else:
+                raise LookupError(f"File not found: {request.file_path}")
+            payload["file_path"] = request.file_path
+        else:
+            input_hash = _score_input_hash(request.project_id, *versions[request.project_id])
+
+        prepared.append({
+            "job_key": f"{request.kind}:{request.project_id}:{input_hash}",
+            "kind": request.kind,
+            "project_id": request.project_id,
+            "input_hash": input_hash,
+            "payload": payload,
+            "queue": JOB_QUEUES[request.kind],
+            "callback_url": request.callback_url,
+        })
+    return prepared
+
+
+def submit_jobs(
+    session: Session, requests: Iterable[JobRequest], *, force: bool = False
+) -> List[Tuple[AIJob, bool]]:
+    """
+    Record and enqueue jobs; returns ``(job, created)`` per request.
+
+    Existing jobs with the same key are returned as-is unless they failed
+    or ``force`` is set, in which case they are re-queued. All rows are
+    written in one transaction before any task is sent.
+    """
+    requests = list(requests)
+    if len(requests) > AI_JOB_BATCH_MAX:
+        raise ValueError(f"Batch of {len(requests)} jobs exceeds AI_JOB_BATCH_MAX={AI_JOB_BATCH_MAX}")
+    prepared = _prepare(session, requests)
+
+    keys = list({item["job_key"] for item in prepared})
+    existing: Dict[str, AIJob] = {}
+    for start in range(0, len(keys), _KEY_CHUNK):
+        stmt = select(AIJob).where(AIJob.job_key.in_(keys[start:start + _KEY_CHUNK]))
+        existing.update({job.job_key: job for job in session.scalars(stmt)})
+
+    results: List[Tuple[AIJob, bool]] = []
+    to_dispatch: Dict[str, AIJob] = {}
+    for item in prepared:
+        job = existing.get(item["job_key"])
+        created = job is None
+        if created:
+            job = AIJob(**item, status="queued", attempts=0)
+            session.add(job)
+            existing[job.job_key] = job
+            to_dispatch[job.job_key] = job
+        elif job.job_key not in to_dispatch and (force or job.status == "failed"):
+            job.status = "queued"
+            job.attempts = 0
+            job.error = None
+            job.started_at = job.finished_at = None
+            job.callback_url = item["callback_url"] or job.callback_url
+            to_dispatch[job.job_key] = job
+        results.append((job, created))
+
+    for job in to_dispatch.values():
+        job.task_id = uuid.uuid4().hex
+    session.commit()
+
+    dispatch_jobs(session, list(to_dispatch.values()))
+    return results
+
+
+def submit_job(
+    session: Session, kind: str, project_id: int, *, force: bool = False, **kwargs: Any
+) -> Tuple[AIJob, bool]:
+    """Submit a single job (see :func:`submit_jobs`)."""
+    return submit_jobs(session, [JobRequest(kind=kind, project_id=project_id, **kwargs)], force=force)[0]
+
+
+def dispatch_jobs(session: Session, jobs: List[AIJob]) -> None:
+    """Send committed jobs to their Celery queues."""
+    if not jobs:
+        return
+    from cg_rera_extractor.worker import JOB_TASKS, celery_app
+
+    def _send(job: AIJob, **options: Any) -> None:
+        JOB_TASKS[job.kind].apply_async(args=[job.id], task_id=job.task_id, queue=job.queue, **options)
+
+    sent = set()
+    try:
+        if celery_app.conf.task_always_eager:
+            for job in jobs:
+                _send(job)
+                sent.add(job.id)
+        else:
+            # One broker connection for the whole batch
+            with celery_app.producer_or_acquire() as producer:
+                for job in jobs:
+                    _send(job, producer=producer)
+                    sent.add(job.id)
+    except Exception as e:
+        logger.error(f"Failed to enqueue AI jobs: {e}")
+        session.rollback()
+        for job in jobs:
+            if job.id not in sent:
+                job.status = "failed"
+                job.error = f"Could not enqueue: {e}"
+        session.commit()
+        raise
+    # Eager tasks (and fast workers) update rows through their own sessions
+    for job in jobs:
+        session.expire(job)
+
+
+def execute_job(session: Session, job_id: int, *, final_attempt: bool = True) -> Dict[str, Any]:
+    """
+    Run one job (called by the Celery tasks) and record the outcome.
+
+    A job that already succeeded is not run again (redelivered messages).
+    Errors are re-raised so the task can retry; the job is marked failed on
+    permanent errors or the final attempt, ``retrying`` otherwise.
+    """
+    job = session.get(AIJob, job_id)
+    if job is None:
+        raise LookupError(f"AI job {job_id} not found")
+    if job.status == "succeeded":
+        return job.result or {}
+
+    job.status = "running"
+    job.attempts = (job.attempts or 0) + 1
+    job.started_at = datetime.now(timezone.utc)
+    session.commit()
+
+    try:
+        result = _RUNNERS[job.kind](session, job)
+    except Exception as e:
+        session.rollback()
+        job = session.get(AIJob, job_id)
+        if final_attempt or isinstance(e, PERMANENT_ERRORS):
+            _finish(session, job, "failed", error=str(e))
+        else:
+            job.status = "retrying"
+            job.error = str(e)
+            session.commit()
+            logger.warning(f"AI job {job_id} attempt {job.attempts} failed, retrying: {e}")
+        raise
+
+    _finish(session, job, "succeeded", result=result)
+    return result
+
+
+def _finish(session: Session, job: AIJob, status: str, *, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+    job.status = status
+    job.result = result
+    job.error = error
+    job.finished_at = datetime.now(timezone.utc)
+    session.commit()
+    if job.callback_url:
+        _notify(job)
+
+
+def _notify(job: AIJob) -> None:
+    import httpx
+
+    try:
+        httpx.post(job.callback_url, json=job_to_dict(job, iso=True), timeout=AI_JOB_CALLBACK_TIMEOUT_SEC)
+    except httpx.HTTPError as e:
+        logger.warning(f"Callback for AI job {job.id} to {job.callback_url} failed: {e}")
+
+
+def _run_rera_extract(session: Session, job: AIJob) -> Dict[str, Any]:
+    from ai.rera.parser import ReraPdfParser
+
+    file_path = (job.payload or {}).get("file_path")
+    if not file_path or not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    outcome = ReraPdfParser(use_ocr=True).process_file(file_path, project_id=job.project_id, db=session)
+    if outcome is None:
+        raise ValueError(f"Could not extract {file_path} (invalid or corrupt PDF)")
+    return outcome
+
+
+def _run_score(session: Session, job: AIJob) -> Dict[str, Any]:
+    from ai.features.builder import build_feature_pack
+    from ai.scoring.logic import score_project_quality
+
+    snapshot = build_feature_pack(job.project_id, db=session)
+    if not snapshot:
+        raise LookupError(f"Project {job.project_id} not found")
+    result = score_project_quality(snapshot.features)
+    score_id = store_score(session, job.project_id, SCORE_MODEL_NAME, result, snapshot.features)
+    return {
+        "score_id": score_id,
+        "score_value": float(result["score"]),
+        "confidence": float(result["confidence"]),
+        "explanation": result["explanation"],
+        "model_name": SCORE_MODEL_NAME,
+    }
+
+
+_RUNNERS = {"rera_extract": _run_rera_extract, "score": _run_score}
+
+
+def store_score(db: Session, project_id: int, model_name: str, result: dict, features: dict) -> int:
+    """Insert an ai_scores row and point the project at it; returns the score id."""
+    # Using raw SQL to match the "create table in migration" approach
+    from sqlalchemy import text
+    import json
+
+    try:
+        # Insert into ai_scores
+        stmt = text("""
+            INSERT INTO ai_scores
+            (project_id, model_name, model_version, score_value, confidence, explanation, input_features, provenance)
+            VALUES (:pid, :mname, :mver, :val, :conf, :expl, :feat, :prov)
+            RETURNING id
+        """)
+
+        row = db.execute(stmt, {
+            "pid": project_id,
+            "mname": model_name,
+            "mver": "1.0",
+            "val": result["score"],
+            "conf": result["confidence"],
+            "expl": result["explanation"],
+            "feat": json.dumps(features),
+            "prov": json.dumps(result.get("metadata", {}))
+        }).fetchone()
+
+        new_score_id = row[0]
+
+        # Update project pointer
+        db.execute(text("UPDATE projects SET latest_ai_score_id = :sid WHERE id = :pid"), {
+            "sid": new_score_id,
+            "pid": project_id
+        })
+
+        db.commit()
+        return new_score_id
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_job(session: Session, job_id: int) -> Optional[AIJob]:
+    return session.get(AIJob, job_id)
+
+
+def job_to_dict(job: AIJob, *, iso: bool = False) -> Dict[str, Any]:
+    def _ts(value: Optional[datetime]) -> Any:
+        return value.isoformat() if iso and value is not None else value
+
+    return {
+        "job_id": job.id,
+        "job_key": job.job_key,
+        "kind": job.kind,
+        "project_id": job.project_id,
+        "input_hash": job.input_hash,
+        "queue": job.queue,
+        "status": job.status,
+        "task_id": job.task_id,
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error,
+        "created_at": _ts(job.created_at),
+        "started_at": _ts(job.started_at),
+        "finished_at": _ts(job.finished_at),
+    }
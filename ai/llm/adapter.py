@@ -15,7 +15,6 @@ CONTEXT_SIZE = int(os.getenv("CONTEXT_SIZE", "4096"))  # Increased default for b
 LLM_TIMEOUT_SEC = int(os.getenv("LLM_TIMEOUT_SEC", "180"))
 REQUIRE_GPU = os.getenv("LLM_REQUIRE_GPU", "true").lower() == "true"  # Default: require GPU
 
-_LLM_INSTANCE = None
 _GPU_AVAILABLE = None
 
 
@@ -64,15 +63,22 @@ def get_gpu_info() -> Optional[Dict[str, Any]]:
 
 def get_llm_instance():
     """
-    Singleton loader for the LLM.
+    The process-wide LLM, loaded once through the model registry.
+    
+    Returns None if the model is unavailable (see :func:`load_llm`).
+    """
+    from ai.registry import get_model
+
+    return get_model("llm")
+
+
+def load_llm():
+    """
+    Model registry loader for the llama.cpp model.
     
     If REQUIRE_GPU is True (default), will only load if GPU is available.
     Returns None if GPU is required but not available.
     """
-    global _LLM_INSTANCE
-    if _LLM_INSTANCE is not None:
-        return _LLM_INSTANCE
-    
     if not MODEL_PATH or not os.path.exists(MODEL_PATH):
         logger.warning(f"Model file not found at: {MODEL_PATH}. LLM disabled.")
         return None
@@ -92,7 +98,7 @@ def get_llm_instance():
         logger.info(f"Loading Local LLM from {MODEL_PATH}...")
         logger.info(f"Config: GPU_LAYERS={GPU_LAYERS}, CONTEXT_SIZE={CONTEXT_SIZE}")
         
-        _LLM_INSTANCE = Llama(
+        llm = Llama(
             model_path=MODEL_PATH,
             n_gpu_layers=GPU_LAYERS,
             n_ctx=CONTEXT_SIZE,
@@ -104,10 +110,11 @@ def get_llm_instance():
         logger.error("llama-cpp-python not installed. LLM disabled.")
         return None
     except Exception as e:
+        # Surfaced by the registry as a failed (retryable) load
         logger.error(f"Failed to load model: {e}")
-        return None
+        raise
         
-    return _LLM_INSTANCE
+    return llm
 
 def _generate_raw(llm, prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
     """Internal generation function to be run in a thread."""
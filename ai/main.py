@@ -1,17 +1,40 @@
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from fastapi import FastAPI, HTTPException, Depends
 from sqlalchemy.orm import Session
 import os
+import anyio.to_thread
 from fastapi.middleware.cors import CORSMiddleware
 
-from ai.schemas import HealthCheck, AIScoreResponse
-from ai.dependencies import get_db
+from ai.schemas import (
+    AIJobBatchRequest,
+    AIJobBatchResponse,
+    AIJobResponse,
+    AIScoreResponse,
+    HealthCheck,
+)
+from ai.jobs import JobRequest, job_to_dict, submit_jobs
+from ai.dependencies import ReadSession, get_db, get_read_db
+from ai.registry import AI_PRELOAD_MODELS, model_registry, process_rss_mb
+from cg_rera_extractor.api.concurrency import run_blocking
+from cg_rera_extractor.db.models import AIJob
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the configured models before serving so no request pays a load
+    if AI_PRELOAD_MODELS.strip():
+        await anyio.to_thread.run_sync(model_registry.preload, AI_PRELOAD_MODELS)
+    yield
+
 
 app = FastAPI(
     title="RealMap AI Microservice",
     description="Dedicated microservice for AI scoring and enrichment",
     version="0.1.0",
     docs_url="/ai/docs",
-    openapi_url="/ai/openapi.json"
+    openapi_url="/ai/openapi.json",
+    lifespan=lifespan,
 )
 
 # Enable CORS
@@ -29,92 +52,63 @@ AI_SCORE_ENABLED = os.getenv("AI_SCORE_ENABLED", "true").lower() == "true"
 
 @app.get("/ai/health", response_model=HealthCheck)
 async def health_check():
-    """Service health check."""
+    """Service health check, with warm/cold status of the shared models."""
     return {
         "status": "ok" if AI_ENABLED else "disabled",
-        "model_loaded": False, # TODO: Connect to LLM adapter status
-        "version": "0.1.0"
+        "model_loaded": model_registry.is_warm("llm"),
+        "version": "0.1.0",
+        "models": {name: status.as_dict() for name, status in model_registry.status().items()},
+        "process_rss_mb": process_rss_mb(),
     }
 
-@app.post("/ai/score/project/{project_id}", response_model=AIScoreResponse)
-async def score_project(project_id: int, db: Session = Depends(get_db)):
+
+def _job_response(job, created: Optional[bool] = None) -> dict:
+    return {**job_to_dict(job), "created": created}
+
+
+def _submit(db: Session, requests: list, force: bool) -> List[dict]:
+    # Responses are built here, in the worker thread: dispatch expires the rows
+    try:
+        results = submit_jobs(db, requests, force=force)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not queue jobs: {e}")
+    return [_job_response(job, created) for job, created in results]
+
+
+@app.post("/ai/score/project/{project_id}", response_model=AIJobResponse, status_code=202)
+async def score_project(
+    project_id: int,
+    force: bool = False,
+    callback_url: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
-    Trigger AI scoring for a specific project.
+    Queue AI scoring for a project (``llm`` queue).
+
+    Idempotent: unchanged project data returns the existing job. Poll
+    ``GET /ai/jobs/{job_id}``; the result holds the ``score_id``.
     """
     if not AI_ENABLED or not AI_SCORE_ENABLED:
         raise HTTPException(status_code=503, detail="AI services are currently disabled")
-    
-    # 1. Load project features
-    from ai.features.builder import build_feature_pack
-    snapshot = build_feature_pack(project_id, db=db)
-    
-    if not snapshot:
-        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
-        
-    # 2. Call LLM Scoring
-    from ai.scoring.logic import score_project_quality
-    result = score_project_quality(snapshot.features)
-    
-    # 3. Save result (using raw SQL for decoupled safety or ORM if model existed)
-    # Using raw SQL to match the "create table in migration" approach
-    from sqlalchemy import text
-    import json
-    from datetime import datetime
-    
-    model_name = "llama-local-v1" # TODO: Get from adapter
-    
-    try:
-        # Insert into ai_scores
-        stmt = text("""
-            INSERT INTO ai_scores 
-            (project_id, model_name, model_version, score_value, confidence, explanation, input_features, provenance) 
-            VALUES (:pid, :mname, :mver, :val, :conf, :expl, :feat, :prov) 
-            RETURNING id
-        """)
-        
-        row = db.execute(stmt, {
-            "pid": project_id,
-            "mname": model_name,
-            "mver": "1.0",
-            "val": result["score"],
-            "conf": result["confidence"],
-            "expl": result["explanation"],
-            "feat": json.dumps(snapshot.features),
-            "prov": json.dumps(result.get("metadata", {}))
-        }).fetchone()
-        
-        new_score_id = row[0]
-        
-        # Update project pointer
-        db.execute(text("UPDATE projects SET latest_ai_score_id = :sid WHERE id = :pid"), {
-            "sid": new_score_id,
-            "pid": project_id
-        })
-        
-        db.commit()
-        
-        return {
-            "score_id": new_score_id,
-            "project_id": project_id,
-            "score_value": float(result["score"]),
-            "confidence": float(result["confidence"]),
-            "explanation": result["explanation"],
-            "model_name": model_name,
-            "created_at": datetime.utcnow()
-        }
-        
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    request = JobRequest(kind="score", project_id=project_id, callback_url=callback_url)
+    [job] = await run_blocking(_submit, db, [request], force)
+    return job
+
 
 @app.get("/ai/score/{score_id}", response_model=AIScoreResponse)
-async def get_score(score_id: int, db: Session = Depends(get_db)):
+async def get_score(score_id: int, read: ReadSession = Depends(get_read_db)):
     """Retrieve a specific score details."""
     if not AI_ENABLED:
         raise HTTPException(status_code=503, detail="AI services are currently disabled")
     
     from sqlalchemy import text
-    row = db.execute(text("SELECT id, project_id, score_value, confidence, explanation, model_name, created_at FROM ai_scores WHERE id = :sid"), {"sid": score_id}).fetchone()
+    stmt = text("SELECT id, project_id, score_value, confidence, explanation, model_name, created_at FROM ai_scores WHERE id = :sid")
+    row = await read.run(lambda session: session.execute(stmt, {"sid": score_id}).fetchone())
     
     if not row:
         raise HTTPException(status_code=404, detail="Score not found")
@@ -129,25 +123,80 @@ async def get_score(score_id: int, db: Session = Depends(get_db)):
         "created_at": row.created_at
     }
 
-@app.post("/ai/extract/rera", response_model=bool)
-async def extract_rera_doc(file_path: str, project_id: int, db: Session = Depends(get_db)):
+@app.post("/ai/extract/rera", response_model=AIJobResponse, status_code=202)
+async def extract_rera_doc(
+    file_path: str,
+    project_id: int,
+    force: bool = False,
+    callback_url: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
-    Trigger RERA document extraction for a specific file.
+    Queue RERA document extraction for a specific file (``ocr`` queue).
+
+    Idempotent per (project, document SHA-256).
     """
     if not AI_ENABLED:
         raise HTTPException(status_code=503, detail="AI services are currently disabled")
-        
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-        
-    from ai.rera.parser import ReraPdfParser
-    
-    try:
-        parser = ReraPdfParser(use_ocr=True) # or config driven
-        result = parser.process_file(file_path, project_id=project_id, db=db)
-        return True
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    request = JobRequest(kind="rera_extract", project_id=project_id, file_path=file_path, callback_url=callback_url)
+    [job] = await run_blocking(_submit, db, [request], force)
+    return job
+
+
+@app.post("/ai/jobs/batch", response_model=AIJobBatchResponse, status_code=202)
+async def submit_job_batch(batch: AIJobBatchRequest, db: Session = Depends(get_db)):
+    """
+    Queue many extraction/scoring jobs in one transaction (ETL bulk submission).
+
+    Jobs whose key already exists are returned rather than re-queued.
+    """
+    if not AI_ENABLED:
+        raise HTTPException(status_code=503, detail="AI services are currently disabled")
+
+    requests = [JobRequest(**item.model_dump()) for item in batch.jobs]
+    jobs = await run_blocking(_submit, db, requests, batch.force)
+    created = sum(1 for job in jobs if job["created"])
+    return {
+        "submitted": len(jobs),
+        "created": created,
+        "existing": len(jobs) - created,
+        "jobs": jobs,
+    }
+
+
+@app.get("/ai/jobs/{job_id}", response_model=AIJobResponse)
+async def get_job_status(job_id: int, read: ReadSession = Depends(get_read_db)):
+    """Poll a queued job."""
+    def _load(session: Session) -> Optional[dict]:
+        job = session.get(AIJob, job_id)
+        return _job_response(job) if job is not None else None
+
+    job = await read.run(_load)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/ai/jobs", response_model=List[AIJobResponse])
+async def list_jobs(
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = 100,
+    read: ReadSession = Depends(get_read_db),
+):
+    """Recent jobs, optionally filtered by project, status and kind."""
+    from sqlalchemy import select
+
+    stmt = select(AIJob).order_by(AIJob.id.desc()).limit(min(max(limit, 1), 1000))
+    if project_id is not None:
+        stmt = stmt.where(AIJob.project_id == project_id)
+    if status:
+        stmt = stmt.where(AIJob.status == status)
+    if kind:
+        stmt = stmt.where(AIJob.kind == kind)
+    return await read.run(lambda session: [_job_response(job) for job in session.scalars(stmt)])
 
 
 # ============ Feature 6: Chat Search ============
@@ -181,9 +230,16 @@ async def chat_search(request: ChatSearchRequest, db: Session = Depends(get_db))
     
     from ai.chat.assistant import ChatAssistant
     
-    try:
+    def _answer() -> dict:
+        # The embedder and LLM come from the model registry: loaded once per
+        # process, so a request only pays for inference
         assistant = ChatAssistant(db)
-        result = assistant.answer(request.query, limit=request.limit)
+        return assistant.answer(request.query, limit=request.limit)
+
+    try:
+        # Query embedding and answer synthesis are model work; run them in the
+        # bounded worker pool rather than on the event loop
+        result = await run_blocking(_answer)
         
         return ChatSearchResponse(
             query=result["query"],
@@ -1,7 +1,7 @@
 import os
 import logging
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional
 from PIL import Image
 import numpy as np
 
@@ -19,6 +19,28 @@ try:
 except ImportError:
     logger.warning("surya-ocr not installed. strict OCR features will be disabled.")
 
+class SuryaModels(NamedTuple):
+    det_model: Any
+    det_processor: Any
+    ocr_model: Any
+    ocr_processor: Any
+
+
+def load_surya_models() -> Optional[SuryaModels]:
+    """Model registry loader for the Surya detection and recognition models."""
+    if not SURYA_AVAILABLE:
+        return None
+    logger.info("Loading Surya OCR models...")
+    models = SuryaModels(
+        det_model=segformer.load_model(),
+        det_processor=segformer.load_processor(),
+        ocr_model=load_model(),
+        ocr_processor=load_processor(),
+    )
+    logger.info("Surya models loaded successfully.")
+    return models
+
+
 class FloorPlanParser:
     """
     Parser for floor plan images to extract room dimensions and layout.
@@ -42,13 +64,14 @@ class FloorPlanParser:
             self.models_loaded = False
 
     def _load_models(self):
-        """Lazy load models."""
-        logger.info("Loading Surya OCR models...")
-        self.det_processor, self.det_model = segformer.load_processor(), segformer.load_model()
-        self.ocr_model = load_model()
-        self.ocr_processor = load_processor()
+        """Attach the shared Surya models (loaded once per process)."""
+        from ai.registry import model_registry
+
+        models = model_registry.get("ocr")
+        if models is None:
+            raise RuntimeError(model_registry.status("ocr").error or "Surya OCR models unavailable")
+        self.det_model, self.det_processor, self.ocr_model, self.ocr_processor = models
         self.models_loaded = True
-        logger.info("Surya models loaded successfully.")
 
     def parse_image(self, image_path: str) -> Dict[str, Any]:
         """
@@ -63,58 +86,84 @@ class FloorPlanParser:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image not found: {image_path}")
 
-        result = {
-            "image_path": image_path,
-            "parsed": False,
-            "rooms": [],
-            "raw_text": [],
-            "meta": {}
-        }
+        return self.parse_images([image_path])[0]
+
+    def parse_images(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse several floor plan images with one batched OCR call.
+        
+        Surya's detection and recognition models are batched, so a call
+        per batch instead of per image removes most of the per-call
+        overhead on CPU. Results are returned in input order; an image
+        that cannot be opened (or a batch that fails) only marks the
+        affected results with an ``error``.
+        """
+        results = [
+            {"image_path": path, "parsed": False, "rooms": [], "raw_text": [], "meta": {}}
+            for path in image_paths
+        ]
         
         if not self.models_loaded:
-            result["error"] = "OCR dependencies not available"
-            return result
+            for result in results:
+                result["error"] = "OCR dependencies not available"
+            return results
+
+        images, positions = [], []
+        for i, path in enumerate(image_paths):
+            try:
+                images.append(Image.open(path))
+                positions.append(i)
+            except Exception as e:
+                logger.error(f"Error opening image {path}: {e}")
+                results[i]["error"] = str(e)
+        if not images:
+            return results
 
         try:
-            image = Image.open(image_path)
-            
-            # 1. Run OCR
+            # 1. Run OCR on the whole batch
             predictions = run_ocr(
-                [image], 
-                [self.languages], 
+                images, 
+                [self.languages] * len(images), 
                 self.det_model, 
                 self.det_processor, 
                 self.ocr_model, 
                 self.ocr_processor
             )
-            
-            # 2. Process predictions
-            # Surya returns a list of results (one per image)
-            if predictions and len(predictions) > 0:
-                ocr_result = predictions[0]
-                
-                # Extract text lines
-                text_lines = []
-                for line in ocr_result.text_lines:
-                    text_lines.append({
-                        "text": line.text,
-                        "bbox": line.bbox, # [x1, y1, x2, y2]
-                        "confidence": line.confidence
-                    })
-                
-                result["raw_text"] = text_lines
-                result["parsed"] = True
-                
-                # 3. Simple Heuristic Room Extraction (Placeholder)
-                # In a real impl, we'd use geometric analysis here.
-                # For now, we just identify text that looks like dimensions (e.g., "10'x12'")
-                result["rooms"] = self._extract_rooms_from_text(text_lines)
-                
         except Exception as e:
-            logger.error(f"Error parsing image {image_path}: {e}")
-            result["error"] = str(e)
+            if len(images) == 1:
+                logger.error(f"Error parsing image {image_paths[positions[0]]}: {e}")
+                results[positions[0]]["error"] = str(e)
+                return results
+            # Retry one by one so a single bad image does not fail the batch
+            logger.warning(f"Batched OCR of {len(images)} images failed ({e}); retrying individually")
+            for i in positions:
+                results[i] = self.parse_images([image_paths[i]])[0]
+            return results
+        finally:
+            for image in images:
+                close = getattr(image, "close", None)
+                if close:
+                    close()
+
+        # 2. Process predictions (Surya returns one result per image)
+        for i, ocr_result in zip(positions, predictions or []):
+            text_lines = [
+                {
+                    "text": line.text,
+                    "bbox": line.bbox, # [x1, y1, x2, y2]
+                    "confidence": line.confidence
+                }
+                for line in ocr_result.text_lines
+            ]
+            results[i]["raw_text"] = text_lines
+            results[i]["parsed"] = True
+            
+            # 3. Simple Heuristic Room Extraction (Placeholder)
+            # In a real impl, we'd use geometric analysis here.
+            # For now, we just identify text that looks like dimensions (e.g., "10'x12'")
+            results[i]["rooms"] = self._extract_rooms_from_text(text_lines)
             
-        return result
+        return results
 
     def _extract_rooms_from_text(self, text_lines: List[Dict]) -> List[Dict]:
         """
@@ -0,0 +1,290 @@
+"""
+Batched floor-plan OCR over project artifacts.
+
+Artifacts are read from the database one page at a time (keyset on id) and
+fetched - local file or download - by a thread pool while OCR runs. Ready
+images are grouped into batches sized to the available memory and parsed
+with one :meth:`FloorPlanParser.parse_images` call per batch.
+
+Every file is hashed as it is fetched. A file whose SHA-256 matches an
+already-parsed artifact (the same plan attached to several projects, or an
+unchanged file on ``reparse``) reuses the stored result without OCR.
+Results are written with one bulk UPDATE and one commit per batch.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.db.models import ProjectArtifact
+
+logger = logging.getLogger("ai.ocr.pipeline")
+
+# Working memory per image in a Surya batch (decoded page + activations)
+FLOOR_PLAN_OCR_MB_PER_IMAGE = float(os.getenv("FLOOR_PLAN_OCR_MB_PER_IMAGE", "160"))
+FLOOR_PLAN_OCR_MAX_BATCH = int(os.getenv("FLOOR_PLAN_OCR_MAX_BATCH", "32"))
+DOWNLOAD_TIMEOUT_SEC = 30
+
+_PAGE_SIZE = 200
+
+
+def available_memory_mb() -> Optional[float]:
+    """MemAvailable from /proc/meminfo (Linux), else None."""
+    try:
+        with open("/proc/meminfo") as fh:
+            for line in fh:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def auto_batch_size(
+    mb_per_image: float = FLOOR_PLAN_OCR_MB_PER_IMAGE,
+    max_batch: int = FLOOR_PLAN_OCR_MAX_BATCH,
+    memory_fraction: float = 0.5,
+) -> int:
+    """Images per OCR batch that fit in ``memory_fraction`` of available RAM."""
+    available = available_memory_mb()
+    if available is None:
+        return min(8, max_batch)
+    return max(1, min(max_batch, int(available * memory_fraction / mb_per_image)))
+
+
+@dataclass
+class FetchedArtifact:
+    artifact_id: int
+    source: str  # file path or URL, recorded as the result's image_path
+    path: Optional[str] = None
+    content_sha256: Optional[str] = None
+    previous_sha256: Optional[str] = None
+    temp: bool = False
+    error: Optional[str] = None
+
+    def cleanup(self) -> None:
+        if self.temp and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+@dataclass
+class FloorPlanBatchStats:
+    artifacts: int = 0
+    parsed: int = 0
+    reused: int = 0  # identical file already parsed
+    unchanged: int = 0  # reparse: file hash unchanged
+    failed: int = 0
+    batches: int = 0
+    ocr_seconds: float = 0.0
+
+    @property
+    def images_per_sec(self) -> float:
+        return self.parsed / self.ocr_seconds if self.ocr_seconds else 0.0
+
+
+def iter_floor_plan_artifacts(
+    session: Session,
+    *,
+    project_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    reparse: bool = False,
+) -> Iterator[Any]:
+    """Stream floor-plan artifact rows (unparsed ones unless ``reparse``)."""
+    stmt = select(
+        ProjectArtifact.id,
+        ProjectArtifact.file_path,
+        ProjectArtifact.source_url,
+        ProjectArtifact.file_format,
+        ProjectArtifact.content_sha256,
+    ).where(ProjectArtifact.artifact_type.ilike("%floor%plan%"))
+    if not reparse:
+        stmt = stmt.where(ProjectArtifact.floor_plan_data.is_(None))
+    if project_id:
+        stmt = stmt.where(ProjectArtifact.project_id == project_id)
+
+    last_id, emitted = 0, 0
+    while limit is None or emitted < limit:
+        page_size = _PAGE_SIZE if limit is None else min(_PAGE_SIZE, limit - emitted)
+        rows = session.execute(
+            stmt.where(ProjectArtifact.id > last_id).order_by(ProjectArtifact.id).limit(page_size)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        emitted += len(rows)
+        last_id = rows[-1].id
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fetch_artifact(row: Any) -> FetchedArtifact:
+    """Resolve an artifact row to a local file and hash it (downloads if needed)."""
+    fetched = FetchedArtifact(
+        artifact_id=row.id,
+        source=row.file_path or row.source_url or "",
+        previous_sha256=row.content_sha256,
+    )
+    if row.file_path and os.path.exists(row.file_path):
+        fetched.path = row.file_path
+        fetched.content_sha256 = _sha256_file(row.file_path)
+        return fetched
+    if not row.source_url:
+        fetched.error = "No valid file path or URL"
+        return fetched
+
+    fd, temp_path = tempfile.mkstemp(suffix=f".{row.file_format or 'jpg'}")
+    fetched.path, fetched.temp, fetched.source = temp_path, True, row.source_url
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as fh, requests.get(row.source_url, stream=True, timeout=DOWNLOAD_TIMEOUT_SEC) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                fh.write(chunk)
+                digest.update(chunk)
+        fetched.content_sha256 = digest.hexdigest()
+    except Exception as e:
+        fetched.cleanup()
+        fetched.error = f"Download failed: {e}"
+    return fetched
+
+
+def _fetch_stream(rows: Iterable[Any], workers: int) -> Iterator[FetchedArtifact]:
+    # Bounded look-ahead: at most 2 x workers files fetched but not yet used
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        inflight: deque = deque()
+        for row in rows:
+            inflight.append(pool.submit(fetch_artifact, row))
+            if len(inflight) >= 2 * max(1, workers):
+                yield inflight.popleft().result()
+        while inflight:
+            yield inflight.popleft().result()
+
+
+def _parsed_result_for_hash(session: Session, content_sha256: str) -> Optional[Dict[str, Any]]:
+    return session.scalar(
+        select(ProjectArtifact.floor_plan_data)
+        .where(
+            ProjectArtifact.content_sha256 == content_sha256,
+            ProjectArtifact.floor_plan_data.is_not(None),
+        )
+        .limit(1)
+    )
+
+
+def process_floor_plans(
+    session: Session,
+    parser: Any,
+    *,
+    limit: Optional[int] = None,
+    project_id: Optional[int] = None,
+    batch_size: int = 0,
+    download_workers: int = 4,
+    dry_run: bool = False,
+    reparse: bool = False,
+) -> FloorPlanBatchStats:
+    """
+    OCR floor-plan artifacts in batches and store the results.
+
+    ``parser`` provides ``parse_images(paths)`` (a :class:`FloorPlanParser`).
+    ``batch_size`` 0 sizes batches from available memory. With ``dry_run``
+    nothing is written.
+    """
+    batch_size = batch_size or auto_batch_size()
+    stats = FloorPlanBatchStats()
+    known: Dict[str, Dict[str, Any]] = {}  # content hash -> result, this run
+    pending: List[FetchedArtifact] = []
+    waiting: Dict[str, List[FetchedArtifact]] = {}  # duplicates of a pending file
+    updates: List[Dict[str, Any]] = []
+
+    def _result_for(fetched: FetchedArtifact, result: Dict[str, Any]) -> None:
+        updates.append({
+            "id": fetched.artifact_id,
+            "floor_plan_data": {**result, "image_path": fetched.source},
+            "content_sha256": fetched.content_sha256,
+        })
+
+    def _write() -> None:
+        if updates and not dry_run:
+            session.execute(update(ProjectArtifact), updates)
+            session.commit()
+        updates.clear()
+
+    def _flush() -> None:
+        if not pending:
+            _write()
+            return
+        started = time.perf_counter()
+        results = parser.parse_images([fetched.path for fetched in pending])
+        stats.ocr_seconds += time.perf_counter() - started
+        stats.batches += 1
+        for fetched, result in zip(pending, results):
+            duplicates = waiting.pop(fetched.content_sha256, [])
+            for item in [fetched, *duplicates]:
+                item.cleanup()
+            if not result.get("parsed"):
+                logger.warning(f"Failed to parse Artifact {fetched.artifact_id}: {result.get('error')}")
+                stats.failed += 1 + len(duplicates)
+                continue
+            result.setdefault("meta", {})["content_sha256"] = fetched.content_sha256
+            known[fetched.content_sha256] = result
+            _result_for(fetched, result)
+            stats.parsed += 1
+            for duplicate in duplicates:
+                _result_for(duplicate, result)
+                stats.reused += 1
+        pending.clear()
+        _write()
+
+    rows = iter_floor_plan_artifacts(session, project_id=project_id, limit=limit, reparse=reparse)
+    for fetched in _fetch_stream(rows, download_workers):
+        stats.artifacts += 1
+        if fetched.error:
+            logger.warning(f"Skipping Artifact {fetched.artifact_id}: {fetched.error}")
+            stats.failed += 1
+            continue
+
+        digest = fetched.content_sha256
+        if reparse and digest == fetched.previous_sha256:
+            fetched.cleanup()
+            stats.unchanged += 1
+            continue
+        if digest in waiting:
+            waiting[digest].append(fetched)
+            continue
+        reuse = known.get(digest) or _parsed_result_for_hash(session, digest)
+        if reuse is not None:
+            fetched.cleanup()
+            _result_for(fetched, reuse)
+            stats.reused += 1
+            if len(updates) >= batch_size and not pending:
+                _write()
+            continue
+
+        pending.append(fetched)
+        waiting[digest] = []
+        if len(pending) >= batch_size:
+            _flush()
+    _flush()
+
+    logger.info(
+        f"Floor plans: {stats.parsed} parsed in {stats.batches} batches "
+        f"({stats.images_per_sec:.2f} images/sec), {stats.reused} reused, "
+        f"{stats.unchanged} unchanged, {stats.failed} failed"
+    )
+    return stats
@@ -0,0 +1,189 @@
+"""
+Process-wide registry of the AI service's heavy models.
+
+The sentence-transformers embedder, the Surya OCR models and the llama.cpp
+model are each loaded at most once per process and shared by every request
+handler, CLI script and batch job. Loads are lazy and guarded by a per-model
+lock, so concurrent first requests wait for one load instead of starting
+several.
+
+``AI_PRELOAD_MODELS`` (comma-separated names, or ``all``) lists models the
+API warms at startup, so the first request pays inference time only. Model
+status (cold, loading, warm, unavailable, failed), load time and the
+resident-memory growth seen during the load are reported by ``/ai/health``.
+
+Loaders are referenced by import path so registering them does not import
+torch, surya or llama.cpp. A loader returns the model, or ``None`` when its
+optional dependency or model file is missing.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("ai.registry")
+
+AI_PRELOAD_MODELS = os.getenv("AI_PRELOAD_MODELS", "")
+# Failed loads are retried on the next request after this many seconds
+AI_MODEL_RETRY_SEC = float(os.getenv("AI_MODEL_RETRY_SEC", "300"))
+
+DEFAULT_LOADERS = {
+    "embedder": "ai.chat.embedder:load_embedder",
+    "ocr": "ai.ocr.parser:load_surya_models",
+    "llm": "ai.llm.adapter:load_llm",
+}
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux only)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class ModelStatus:
+    name: str
+    state: str = "cold"
+    loaded_at: Optional[float] = None
+    load_seconds: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ModelRegistry:
+    """
+    Named, lazily loaded, process-wide model instances.
+    """
+
+    def __init__(self, loaders: Optional[Dict[str, Any]] = None):
+        self._loaders: Dict[str, Any] = dict(DEFAULT_LOADERS if loaders is None else loaders)
+        self._models: Dict[str, Any] = {}
+        self._status: Dict[str, ModelStatus] = {name: ModelStatus(name) for name in self._loaders}
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self._loaders}
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._loaders)
+
+    def register(self, name: str, loader: Any) -> None:
+        """Register (or replace) the loader for ``name``; drops any loaded instance."""
+        self._loaders[name] = loader
+        self._locks.setdefault(name, threading.Lock())
+        with self._locks[name]:
+            self._models.pop(name, None)
+            self._status[name] = ModelStatus(name)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance of ``name``, loading it on first use.
+
+        Returns None when the model is unavailable or its load failed; the
+        reason is in :meth:`status`.
+        """
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model {name!r}; registered: {', '.join(self._loaders)}")
+
+        status = self._status[name]
+        if status.state == "warm" or not self._should_load(status):
+            return self._models.get(name)
+
+        with self._locks[name]:
+            status = self._status[name]
+            if status.state == "warm" or not self._should_load(status):
+                return self._models.get(name)
+            return self._load(name)
+
+    def is_warm(self, name: str) -> bool:
+        return name in self._status and self._status[name].state == "warm"
+
+    def preload(self, names: Iterable[str] | str) -> Dict[str, str]:
+        """Load ``names`` (a list, or a comma-separated string / ``all``) now."""
+        if isinstance(names, str):
+            names = self.names if names.strip().lower() == "all" else [n.strip() for n in names.split(",")]
+        states = {}
+        for name in names:
+            if not name:
+                continue
+            if name not in self._loaders:
+                logger.warning(f"Ignoring unknown model in preload list: {name}")
+                continue
+            self.get(name)
+            states[name] = self._status[name].state
+        return states
+
+    def status(self, name: Optional[str] = None) -> Any:
+        """Status of one model, or of all models keyed by name."""
+        if name is not None:
+            return self._status[name]
+        return {key: self._status[key] for key in self._loaders}
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """Drop loaded instances (all, or ``name``) so the next ``get`` reloads."""
+        for key in [name] if name else list(self._loaders):
+            with self._locks[key]:
+                self._models.pop(key, None)
+                self._status[key] = ModelStatus(key)
+
+    def _should_load(self, status: ModelStatus) -> bool:
+        if status.state in ("cold", "loading"):
+            return True
+        if status.state == "failed":
+            return time.time() - (status.loaded_at or 0) >= AI_MODEL_RETRY_SEC
+        return False  # unavailable: dependency or model file missing
+
+    def _resolve_loader(self, name: str) -> Callable[[], Any]:
+        loader = self._loaders[name]
+        if isinstance(loader, str):
+            module_name, _, attr = loader.partition(":")
+            loader = getattr(importlib.import_module(module_name), attr)
+        return loader
+
+    def _load(self, name: str) -> Any:
+        self._status[name] = ModelStatus(name, state="loading")
+        rss_before = _rss_mb()
+        started = time.perf_counter()
+        try:
+            model = self._resolve_loader(name)()
+        except Exception as e:
+            logger.error(f"Failed to load model {name}: {e}")
+            self._status[name] = ModelStatus(name, state="failed", loaded_at=time.time(), error=str(e))
+            return None
+
+        rss_after = _rss_mb()
+        status = ModelStatus(
+            name,
+            state="warm" if model is not None else "unavailable",
+            loaded_at=time.time(),
+            load_seconds=round(time.perf_counter() - started, 3),
+        )
+        if model is not None:
+            if rss_before is not None and rss_after is not None:
+                status.rss_delta_mb = round(rss_after - rss_before, 1)
+            self._models[name] = model
+            logger.info(f"Model {name} warm in {status.load_seconds}s")
+        self._status[name] = status
+        return model
+
+
+model_registry = ModelRegistry()
+
+
+def get_model(name: str) -> Any:
+    """Shared instance of a registered model (see :class:`ModelRegistry.get`)."""
+    return model_registry.get(name)
+
+
+def process_rss_mb() -> Optional[float]:
+    return _rss_mb()
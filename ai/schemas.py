@@ -1,11 +1,21 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Literal
 from datetime import datetime
 
+class ModelHealth(BaseModel):
+    name: str
+    state: str  # cold, loading, warm, unavailable, failed
+    loaded_at: Optional[float] = None
+    load_seconds: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    error: Optional[str] = None
+
 class HealthCheck(BaseModel):
     status: str
     model_loaded: bool
     version: str
+    models: Dict[str, ModelHealth] = {}
+    process_rss_mb: Optional[float] = None
 
 class AIScoreRequest(BaseModel):
     # Optional parameters for the scoring run
@@ -23,6 +33,40 @@ class AIScoreResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class AIJobResponse(BaseModel):
+    job_id: int
+    job_key: str
+    kind: str
+    project_id: int
+    input_hash: str
+    queue: str
+    status: str  # queued, running, retrying, succeeded, failed
+    task_id: Optional[str] = None
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created: Optional[bool] = None  # set on submission: False when an existing job was returned
+
+class AIJobSubmission(BaseModel):
+    kind: Literal["rera_extract", "score"]
+    project_id: int
+    file_path: Optional[str] = None
+    document_hash: Optional[str] = None
+    callback_url: Optional[str] = None
+
+class AIJobBatchRequest(BaseModel):
+    jobs: List[AIJobSubmission]
+    force: bool = False
+
+class AIJobBatchResponse(BaseModel):
+    submitted: int
+    created: int
+    existing: int
+    jobs: List[AIJobResponse]
+
 class FeatureSnapshot(BaseModel):
     project_id: int
     features: Dict[str, Any]
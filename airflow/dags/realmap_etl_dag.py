@@ -1,24 +1,42 @@
 """
-RealMap ETL DAG - Production Ready
+RealMap ETL DAG - Incremental, Sharded Pipeline
 
 This DAG orchestrates the RealMap data pipeline with real backend integration.
-Uses BashOperator with subprocess isolation to avoid Airflow/SQLAlchemy conflicts.
+Backend code runs through BashOperator subprocesses (PYTHONPATH=/opt/realmap)
+to keep realmap's SQLAlchemy 2.0 out of the Airflow interpreter; the DAG file
+itself only uses the standard library.
 
 Pipeline Flow:
 1. Pre-processing: Config loading, browser session (needs CAPTCHA - placeholder)
-2. Main processing: Raw extraction, mapping, validation, normalization, DB loading
-3. Post-processing: Geocoding, amenity stats, score computation
-
-IMPORTANT: Backend code runs in subprocess with PYTHONPATH=/opt/realmap
+2. Planning: list the non-empty (run, shard) pairs under REALMAP_RUNS_DIR
+3. Main processing, mapped per shard (one mapped task group instance each):
+   raw_extractor -> mapper_v1 -> qa_normalization. Each stage reads only the
+   artifacts the previous stage persisted in the run directory and is skipped
+   when the content hash of its inputs is unchanged
+   (see ``cg_rera_extractor.runs.pipeline``).
+4. DB loading, mapped per run; returns the ids of the projects it upserted
+5. Post-processing (geocoding, amenity stats, scores, detail documents) for
+   those projects only
+
+Per-stage duration/throughput is appended to
+``<run>/pipeline_state/metrics.jsonl`` by each task and summarised (and sent
+to StatsD when Airflow metrics are enabled) by ``report_stage_metrics``.
 """
 from __future__ import annotations
 
+import json
 import logging
+import os
+import re
+from collections import defaultdict
 from datetime import timedelta
+from pathlib import Path
 
 from airflow import DAG
+from airflow.decorators import task, task_group
 from airflow.operators.empty import EmptyOperator
 from airflow.operators.bash import BashOperator
+from airflow.stats import Stats
 from airflow.utils.dates import days_ago
 from airflow.utils.task_group import TaskGroup
 
@@ -68,387 +86,78 @@ echo "Run manually: python -m cg_rera_extractor.cli --config config.yaml"
 echo "This task is a placeholder for orchestration purposes."
 """
 
-# Raw extraction from HTML files
-RAW_EXTRACTOR_CMD = """
-echo "=== Raw Data Extraction ==="
+# Shard planning: last stdout line is the JSON list of shards
+PLAN_SHARDS_CMD = """
+echo "=== Shard Planning ==="
 cd /opt/realmap
 export PYTHONPATH=/opt/realmap
-python -c "
-import os
-import json
-from pathlib import Path
-
-runs_dir = os.environ.get('REALMAP_RUNS_DIR', '/opt/realmap/outputs/realcrawl/runs')
-print(f'Runs directory: {runs_dir}')
-
-if not Path(runs_dir).exists():
-    print('No runs directory found - run scraper first')
-    exit(0)
-
-# Find HTML files to process
-run_dirs = sorted(Path(runs_dir).glob('run_*'))
-total_html = 0
-total_extracted = 0
-
-for run_dir in run_dirs[-5:]:  # Process last 5 runs
-    html_dir = run_dir / 'raw_html'
-    if not html_dir.exists():
-        continue
-    
-    html_files = list(html_dir.glob('*.html')) + list(html_dir.glob('*.htm'))
-    total_html += len(html_files)
-    
-    for html_file in html_files[:10]:  # Sample up to 10 per run
-        try:
-            from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
-            html = html_file.read_text(encoding='utf-8', errors='ignore')
-            raw = extract_raw_from_html(html, source_file=str(html_file))
-            total_extracted += 1
-            print(f'  ✓ Extracted: {html_file.name} -> {len(raw.sections)} sections')
-        except Exception as e:
-            print(f'  ✗ Failed: {html_file.name}: {e}')
-
-print(f'=== Summary ===')
-print(f'  HTML files found: {total_html}')
-print(f'  Successfully extracted: {total_extracted}')
-"
+python -m cg_rera_extractor.runs.pipeline plan \\
+    --runs-dir "${REALMAP_RUNS_DIR:-/opt/realmap/outputs/realcrawl/runs}" \\
+    --shards "${REALMAP_ETL_SHARDS:-4}"
 """
 
-# Mapper: Raw -> V1 Schema
-MAPPER_V1_CMD = """
-echo "=== V1 Schema Mapping ==="
-cd /opt/realmap
-export PYTHONPATH=/opt/realmap
-python -c "
-import os
-import json
-from pathlib import Path
-
-runs_dir = os.environ.get('REALMAP_RUNS_DIR', '/opt/realmap/outputs/realcrawl/runs')
-
-if not Path(runs_dir).exists():
-    print('No runs directory found')
-    exit(0)
 
-run_dirs = sorted(Path(runs_dir).glob('run_*'))
-total_mapped = 0
-total_errors = 0
+def _stage_cmd(stage: str) -> str:
+    """One file stage over the shard given by RUN_DIR/SHARD_INDEX/SHARD_COUNT."""
 
-for run_dir in run_dirs[-5:]:
-    html_dir = run_dir / 'raw_html'
-    v1_dir = run_dir / 'v1_json'
-    
-    if not html_dir.exists():
-        continue
-    
-    # Check existing V1 JSON files
-    if v1_dir.exists():
-        v1_files = list(v1_dir.glob('*.json'))
-        print(f'{run_dir.name}: {len(v1_files)} V1 JSON files exist')
-        total_mapped += len(v1_files)
-    else:
-        print(f'{run_dir.name}: No V1 JSON directory')
-    
-    # Sample mapping
-    html_files = list(html_dir.glob('*.html'))[:3]
-    for html_file in html_files:
-        try:
-            from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
-            from cg_rera_extractor.parsing.mapper import map_raw_to_v1
-            
-            html = html_file.read_text(encoding='utf-8', errors='ignore')
-            raw = extract_raw_from_html(html, source_file=str(html_file))
-            v1 = map_raw_to_v1(raw, state_code='CG')
-            
-            print(f'  ✓ Mapped: {v1.project_details.registration_number or \"unknown\"} - {v1.project_details.project_name or \"unknown\"}')
-        except Exception as e:
-            total_errors += 1
-            print(f'  ✗ Error: {html_file.name}: {e}')
-
-print(f'=== Summary ===')
-print(f'  V1 files mapped: {total_mapped}')
-print(f'  Sample errors: {total_errors}')
-"
-"""
-
-# QA Validation
-QA_VALIDATOR_CMD = """
-echo "=== QA Validation ==="
+    return f"""
+echo "=== Stage {stage}: $RUN_DIR shard $SHARD_INDEX/$SHARD_COUNT ==="
 cd /opt/realmap
 export PYTHONPATH=/opt/realmap
-python -c "
-import os
-import json
-from pathlib import Path
-
-runs_dir = os.environ.get('REALMAP_RUNS_DIR', '/opt/realmap/outputs/realcrawl/runs')
-
-if not Path(runs_dir).exists():
-    print('No runs directory found')
-    exit(0)
-
-run_dirs = sorted(Path(runs_dir).glob('run_*'))
-total_validated = 0
-total_warnings = 0
-
-for run_dir in run_dirs[-3:]:
-    v1_dir = run_dir / 'v1_json'
-    
-    if not v1_dir.exists():
-        continue
-    
-    v1_files = list(v1_dir.glob('*.json'))[:5]  # Sample
-    
-    for v1_file in v1_files:
-        try:
-            from cg_rera_extractor.parsing.schema import V1Project
-            from cg_rera_extractor.quality.validation import validate_v1_project
-            
-            data = json.loads(v1_file.read_text())
-            v1 = V1Project(**data)
-            messages = validate_v1_project(v1)
-            
-            total_validated += 1
-            if messages:
-                total_warnings += len(messages)
-                print(f'  ⚠ {v1_file.name}: {len(messages)} warnings')
-            else:
-                print(f'  ✓ {v1_file.name}: Valid')
-        except Exception as e:
-            print(f'  ✗ {v1_file.name}: {e}')
-
-print(f'=== Summary ===')
-print(f'  Files validated: {total_validated}')
-print(f'  Total warnings: {total_warnings}')
-"
+python -m cg_rera_extractor.runs.pipeline stage {stage} \\
+    --run-dir "$RUN_DIR" --shard "$SHARD_INDEX" --shards "$SHARD_COUNT"
 """
 
-# Normalization
-NORMALIZATION_CMD = """
-echo "=== Data Normalization ==="
-cd /opt/realmap
-export PYTHONPATH=/opt/realmap
-python -c "
-import os
-import json
-from pathlib import Path
-
-runs_dir = os.environ.get('REALMAP_RUNS_DIR', '/opt/realmap/outputs/realcrawl/runs')
-
-if not Path(runs_dir).exists():
-    print('No runs directory found')
-    exit(0)
 
-run_dirs = sorted(Path(runs_dir).glob('run_*'))
-total_normalized = 0
-
-for run_dir in run_dirs[-3:]:
-    v1_dir = run_dir / 'v1_json'
-    
-    if not v1_dir.exists():
-        continue
-    
-    v1_files = list(v1_dir.glob('*.json'))[:5]
-    
-    for v1_file in v1_files:
-        try:
-            from cg_rera_extractor.parsing.schema import V1Project
-            from cg_rera_extractor.quality.normalization import normalize_v1_project
-            
-            data = json.loads(v1_file.read_text())
-            v1 = V1Project(**data)
-            normalized = normalize_v1_project(v1)
-            
-            total_normalized += 1
-            d = normalized.project_details
-            print(f'  ✓ Normalized: {d.registration_number} - Status: {d.project_status}, District: {d.district}')
-        except Exception as e:
-            print(f'  ✗ {v1_file.name}: {e}')
-
-print(f'=== Summary ===')
-print(f'  Files normalized: {total_normalized}')
-"
-"""
-
-# Database Loading
+# Database Loading (one run); last stdout line carries the touched project ids
 DB_LOADER_CMD = """
-echo "=== Database Loader ==="
+echo "=== Database Loader: $RUN_DIR ==="
 cd /opt/realmap
 export PYTHONPATH=/opt/realmap
-python -c "
-import os
-import sys
-from pathlib import Path
-
-runs_dir = os.environ.get('REALMAP_RUNS_DIR', '/opt/realmap/outputs/realcrawl/runs')
-print(f'Runs directory: {runs_dir}')
-
-if not Path(runs_dir).exists():
-    print(f'WARNING: Runs directory does not exist: {runs_dir}')
-    sys.exit(0)
-
-run_dirs = list(Path(runs_dir).glob('run_*'))
-if not run_dirs:
-    print(f'No run_* directories found in {runs_dir}')
-    sys.exit(0)
-
-print(f'Found {len(run_dirs)} run directories')
-
-# List first few runs for reference
-for rd in run_dirs[:5]:
-    v1_count = len(list((rd / 'v1_json').glob('*.json'))) if (rd / 'v1_json').exists() else 0
-    print(f'  - {rd.name}: {v1_count} V1 JSON files')
-
-# Attempt to load if database is configured
-try:
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        print('NOTE: DATABASE_URL not set - showing dry run statistics')
-        print('Set DATABASE_URL to enable actual database loading')
-        sys.exit(0)
-    
-    from cg_rera_extractor.db.loader import load_all_runs
-    stats = load_all_runs(runs_dir)
-    
-    print('=== Load Statistics ===')
-    result = stats.to_dict()
-    for k, v in result.items():
-        if isinstance(v, (int, float)):
-            print(f'  {k}: {v}')
-    print('✓ Database loading complete')
-except ImportError as e:
-    print(f'Import error (SQLAlchemy version mismatch): {e}')
-    print('NOTE: Full DB loading requires SQLAlchemy 2.0 - run from host')
-    sys.exit(0)
-except Exception as e:
-    print(f'Error: {e}')
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
-"
+if [ -z "$DATABASE_URL" ]; then
+    echo "NOTE: DATABASE_URL not set - skipping database load"
+    echo '{"stage": "load", "skipped": true, "project_ids": []}'
+    exit 0
+fi
+python -m cg_rera_extractor.runs.pipeline load --run-dir "$RUN_DIR"
 """
 
-# Geocoding
-GEOCODING_CMD = '''
-echo "=== Geocoding ==="
+# Post-processing commands receive PROJECT_ARGS ("@<file>" holding one
+# "--project-id N" per line, expanded by argparse's fromfile_prefix_chars) and
+# PROJECT_COUNT for the projects touched by this DAG run's loads
+_POST_PREAMBLE = """
 cd /opt/realmap
 export PYTHONPATH=/opt/realmap
-python << 'PYEOF'
-import os
-from pathlib import Path
-
-print("Geocoding projects without coordinates...")
-
-# Check for geocode cache
-cache_path = Path("/opt/realmap/data/geocode_cache.sqlite")
-if cache_path.exists():
-    import sqlite3
-    conn = sqlite3.connect(str(cache_path))
-    count = conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
-    conn.close()
-    print(f"Geocode cache: {count} entries")
-else:
-    print("No geocode cache found")
-
-# Show what would be geocoded
-try:
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        print("NOTE: DATABASE_URL not set - geocoding requires DB access")
-        print("Geocoding runs via: geocode_missing_projects(session, geocoder)")
-        exit(0)
-    
-    from cg_rera_extractor.db import get_engine, get_session_local
-    from cg_rera_extractor.geo import geocode_missing_projects, NoopGeocoder
-    
-    engine = get_engine()
-    SessionLocal = get_session_local(engine)
-    session = SessionLocal()
-    
-    geocoder = NoopGeocoder()
-    result = geocode_missing_projects(session, geocoder, limit=10)
-    
-    print(f"Geocoding result: {result}")
-    print("Geocoding check complete")
-except ImportError as e:
-    print(f"Import error: {e}")
-    print("Run geocoding from host machine with full dependencies")
-except Exception as e:
-    print(f"Error: {e}")
-PYEOF
-'''
+CONFIG_ARGS=""
+if [ -f "$REALMAP_CONFIG" ]; then
+    CONFIG_ARGS="--config $REALMAP_CONFIG"
+fi
+echo "Projects touched by the load: $PROJECT_COUNT"
+"""
 
+GEOCODING_CMD = """
+echo "=== Geocoding ==="
+""" + _POST_PREAMBLE + """
+python tools/geocode_projects.py $CONFIG_ARGS --limit "$PROJECT_COUNT" "$PROJECT_ARGS"
+"""
 
-# Amenity Stats Computation
-AMENITY_STATS_CMD = '''
+AMENITY_STATS_CMD = """
 echo "=== Amenity Statistics ==="
-cd /opt/realmap
-export PYTHONPATH=/opt/realmap
-python << 'PYEOF'
-import os
-
-print("Computing amenity statistics for projects...")
-
-try:
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        print("NOTE: DATABASE_URL not set - amenity stats requires DB access")
-        print("Amenity stats are computed via OSM Overpass API + project locations")
-        exit(0)
-    
-    print("Amenity computation would query OSM for nearby POIs")
-    print("Categories: schools, hospitals, transit, supermarkets, banks, parks")
-    print("Radius tiers: 1km, 3km, 5km, 10km")
-    print("Amenity stats overview complete")
-except Exception as e:
-    print(f"Error: {e}")
-PYEOF
-'''
+""" + _POST_PREAMBLE + """
+python tools/compute_project_amenity_stats.py $CONFIG_ARGS --recompute "$PROJECT_ARGS"
+"""
 
-# Score Computation
-SCORE_COMPUTATION_CMD = '''
+SCORE_COMPUTATION_CMD = """
 echo "=== Score Computation ==="
-cd /opt/realmap
-export PYTHONPATH=/opt/realmap
-python << 'PYEOF'
-import os
-from pathlib import Path
-
-print("Computing project quality scores...")
-
-runs_dir = os.environ.get("REALMAP_RUNS_DIR", "/opt/realmap/outputs/realcrawl/runs")
-
-run_dirs = list(Path(runs_dir).glob("run_*")) if Path(runs_dir).exists() else []
-total_projects = 0
-for rd in run_dirs:
-    v1_dir = rd / "v1_json"
-    if v1_dir.exists():
-        total_projects += len(list(v1_dir.glob("*.json")))
-
-print(f"Projects available for scoring: {total_projects}")
-
-print("Score Components:")
-print("  - amenity_score: Based on nearby POIs (3km/10km)")
-print("  - location_score: Transit, daily needs accessibility")
-print("  - connectivity_score: Road network, public transport")
-print("  - overall_score: Weighted combination")
-print()
+""" + _POST_PREAMBLE + """
+python tools/compute_project_scores.py --recompute "$PROJECT_ARGS"
+"""
 
-try:
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        print("NOTE: DATABASE_URL not set - scores computed on DB-loaded projects")
-        exit(0)
-    
-    from cg_rera_extractor.amenities.scoring import compute_amenity_scores
-    print("Score computation module available")
-    print("Score computation check complete")
-except ImportError as e:
-    print(f"Import error: {e}")
-except Exception as e:
-    print(f"Error: {e}")
-PYEOF
-'''
+DETAIL_DOCUMENTS_CMD = """
+echo "=== Detail Documents ==="
+""" + _POST_PREAMBLE + """
+python tools/refresh_detail_documents.py "$PROJECT_ARGS"
+"""
 
 # AI Scoring (Optional Enhancement)
 AI_SCORING_CMD = '''
@@ -482,6 +191,166 @@ print("AI scoring check complete")
 PYEOF
 '''
 
+# =============================================================================
+# TASKFLOW HELPERS (standard library only - they run in Airflow's interpreter)
+# =============================================================================
+
+# Mapped stage tasks, in pipeline order, as (task_id, pipeline stage)
+SHARD_STAGES = (
+    ("raw_extractor", "extract"),
+    ("mapper_v1", "map"),
+    ("qa_normalization", "qa"),
+)
+SHARD_GROUP_ID = "main_processing.shard_pipeline"
+LOAD_TASK_ID = "main_processing.db_loader"
+TOUCHED_TASK_ID = "post_processing.touched_projects"
+DEFAULT_RUNS_DIR = "/opt/realmap/outputs/realcrawl/runs"
+
+
+def _parse_result(output: str | None) -> dict | None:
+    """JSON payload from a BashOperator XCom (its last stdout line)."""
+
+    if not output:
+        return None
+    try:
+        payload = json.loads(output)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _as_list(values) -> list:
+    if values is None:
+        return []
+    if isinstance(values, str):
+        return [values]
+    return list(values)
+
+
+@task
+def shard_envs(plan_output: str | None) -> list[dict[str, str]]:
+    """One env dict per (run, shard) for the mapped shard pipeline."""
+
+    shards = json.loads(plan_output) if plan_output else []
+    logger.info("Planned %s shard(s)", len(shards))
+    return [
+        {
+            "RUN_DIR": shard["run_dir"],
+            "SHARD_INDEX": str(shard["shard_index"]),
+            "SHARD_COUNT": str(shard["shard_count"]),
+        }
+        for shard in shards
+    ]
+
+
+@task
+def run_envs(plan_output: str | None) -> list[dict[str, str]]:
+    """One env dict per run directory for the mapped loader."""
+
+    shards = json.loads(plan_output) if plan_output else []
+    return [{"RUN_DIR": run_dir} for run_dir in sorted({s["run_dir"] for s in shards})]
+
+
+@task_group(group_id="shard_pipeline")
+def shard_pipeline(env):
+    """extract -> map -> qa for one shard; instances run in parallel."""
+
+    previous = None
+    for task_id, stage in SHARD_STAGES:
+        current = BashOperator(
+            task_id=task_id,
+            bash_command=_stage_cmd(stage),
+            env=env,
+            append_env=True,
+            doc=f"Pipeline stage '{stage}' for one run shard",
+        )
+        if previous is not None:
+            previous >> current
+        previous = current
+    return previous
+
+
+@task(trigger_rule="all_done")
+def report_stage_metrics(ti=None) -> dict[str, dict[str, float]]:
+    """Aggregate per-shard/per-run stage metrics and send them to StatsD."""
+
+    sources = [(f"{SHARD_GROUP_ID}.{task_id}", stage) for task_id, stage in SHARD_STAGES]
+    sources.append((LOAD_TASK_ID, "load"))
+
+    totals: dict[str, dict[str, float]] = defaultdict(
+        lambda: {"tasks": 0, "skipped": 0, "items": 0, "processed": 0, "failed": 0,
+                 "duration_seconds": 0.0, "max_duration_seconds": 0.0}
+    )
+    for task_id, stage in sources:
+        for output in _as_list(ti.xcom_pull(task_ids=task_id)):
+            result = _parse_result(output)
+            if result is None:
+                continue
+            summary = totals[stage]
+            duration = float(result.get("duration_seconds", 0.0))
+            summary["tasks"] += 1
+            summary["skipped"] += int(bool(result.get("skipped")))
+            summary["items"] += int(result.get("items", 0))
+            summary["processed"] += int(result.get("processed", 0))
+            summary["failed"] += int(result.get("failed", 0))
+            summary["duration_seconds"] += duration
+            summary["max_duration_seconds"] = max(summary["max_duration_seconds"], duration)
+
+    for stage, summary in totals.items():
+        busy = summary["duration_seconds"]
+        summary["items_per_second"] = round(summary["processed"] / busy, 3) if busy else 0.0
+        logger.info(
+            "stage=%s tasks=%d skipped=%d items=%d processed=%d failed=%d "
+            "busy=%.1fs slowest=%.1fs throughput=%.2f/s",
+            stage, summary["tasks"], summary["skipped"], summary["items"],
+            summary["processed"], summary["failed"], busy,
+            summary["max_duration_seconds"], summary["items_per_second"],
+        )
+        Stats.timing(f"realmap_etl.{stage}.duration", timedelta(seconds=busy))
+        Stats.gauge(f"realmap_etl.{stage}.items_per_second", summary["items_per_second"])
+        Stats.incr(f"realmap_etl.{stage}.processed", int(summary["processed"]))
+        Stats.incr(f"realmap_etl.{stage}.failed", int(summary["failed"]))
+        Stats.incr(f"realmap_etl.{stage}.skipped_tasks", int(summary["skipped"]))
+    return dict(totals)
+
+
+def write_project_args(path: Path, project_ids) -> Path:
+    """Write ``--project-id`` arguments one per line for ``@file`` expansion.
+
+    Thousands of ids would overflow the kernel's per-string limit (E2BIG) if
+    passed inline through the environment or the command line.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"--project-id\n{pid}\n" for pid in sorted(project_ids)), encoding="utf-8")
+    return path
+
+
+@task(task_id="touched_projects")
+def touched_projects(load_outputs, run_id=None) -> dict[str, object]:
+    """Union of project ids upserted by the per-run loads."""
+
+    project_ids: set[int] = set()
+    for output in _as_list(load_outputs):
+        result = _parse_result(output)
+        if result:
+            project_ids.update(int(pid) for pid in result.get("project_ids", []))
+    logger.info("Load touched %s project(s)", len(project_ids))
+    # Keyed by DAG run so concurrent runs do not share an argument file
+    state_dir = Path(os.environ.get("REALMAP_RUNS_DIR") or DEFAULT_RUNS_DIR) / "pipeline_state"
+    run_name = re.sub(r"[^\w.-]", "_", run_id or "manual")
+    args_file = state_dir / "touched_projects" / f"{run_name}.args"
+    return {
+        "count": len(project_ids),
+        "args_file": str(write_project_args(args_file, project_ids)),
+    }
+
+
+@task.short_circuit(task_id="has_touched_projects", ignore_downstream_trigger_rules=False)
+def has_touched_projects(touched: dict) -> bool:
+    return bool(touched["count"])
+
+
 # =============================================================================
 # DAG DEFINITION
 # =============================================================================
@@ -495,9 +364,15 @@ default_args = {
     "retry_delay": timedelta(minutes=5),
 }
 
+# Env for post-processing tasks, rendered from the touched_projects XCom
+POST_PROCESSING_ENV = {
+    "PROJECT_ARGS": "@{{ ti.xcom_pull(task_ids='%s')['args_file'] }}" % TOUCHED_TASK_ID,
+    "PROJECT_COUNT": "{{ ti.xcom_pull(task_ids='%s')['count'] }}" % TOUCHED_TASK_ID,
+}
+
 with DAG(
     dag_id="realmap_etl",
-    description="RealMap ETL Pipeline - Production Ready",
+    description="RealMap ETL Pipeline - incremental, sharded",
     default_args=default_args,
     start_date=days_ago(1),
     schedule=None,  # Manual trigger
@@ -506,7 +381,7 @@ with DAG(
 ) as dag:
     
     start = EmptyOperator(task_id="start")
-    end = EmptyOperator(task_id="end")
+    end = EmptyOperator(task_id="end", trigger_rule="none_failed")
     
     # Environment Check
     check_env = BashOperator(
@@ -532,55 +407,63 @@ with DAG(
         config >> browser_session
     
     # -------------------------------------------------------------------------
-    # Main Processing: Extract -> Map -> Validate -> Normalize -> Load
+    # Main Processing: plan -> [extract -> map -> qa] per shard -> load per run
     # -------------------------------------------------------------------------
     with TaskGroup(group_id="main_processing") as main_processing:
-        raw_extractor = BashOperator(
-            task_id="raw_extractor",
-            bash_command=RAW_EXTRACTOR_CMD,
-            doc="Extract raw data from HTML files",
-        )
-        mapper_v1 = BashOperator(
-            task_id="mapper_v1",
-            bash_command=MAPPER_V1_CMD,
-            doc="Map raw data to V1 schema",
-        )
-        qa_validator = BashOperator(
-            task_id="qa_validator",
-            bash_command=QA_VALIDATOR_CMD,
-            doc="Validate data quality",
-        )
-        normalization = BashOperator(
-            task_id="normalization",
-            bash_command=NORMALIZATION_CMD,
-            doc="Normalize field values",
+        plan = BashOperator(
+            task_id="plan_shards",
+            bash_command=PLAN_SHARDS_CMD,
+            doc="List non-empty (run, shard) pairs",
         )
-        db_loader = BashOperator(
+        shards = shard_envs(plan.output)
+        runs = run_envs(plan.output)
+        shard_done = shard_pipeline.expand(env=shards)
+        db_loader = BashOperator.partial(
             task_id="db_loader",
             bash_command=DB_LOADER_CMD,
-            doc="Load data into PostgreSQL",
-        )
-        
-        raw_extractor >> mapper_v1 >> qa_validator >> normalization >> db_loader
+            append_env=True,
+            # Runs share parent projects/promoters; load them one at a time
+            max_active_tis_per_dag=1,
+            doc="Load one run's scraped_json into PostgreSQL",
+        ).expand(env=runs)
+        shard_done >> db_loader
+    
+    metrics = report_stage_metrics()
+    db_loader >> metrics
     
     # -------------------------------------------------------------------------
-    # Post-Processing: Geocoding -> Amenities -> Scores
+    # Post-Processing: only the projects touched by the load
     # -------------------------------------------------------------------------
     with TaskGroup(group_id="post_processing") as post_processing:
+        touched = touched_projects(db_loader.output)
+        gate = has_touched_projects(touched)
         geocoding = BashOperator(
             task_id="geocoding",
             bash_command=GEOCODING_CMD,
-            doc="Geocode project addresses",
+            env=POST_PROCESSING_ENV,
+            append_env=True,
+            doc="Geocode touched projects",
         )
         amenity_stats = BashOperator(
             task_id="amenity_stats",
             bash_command=AMENITY_STATS_CMD,
-            doc="Compute amenity statistics from OSM",
+            env=POST_PROCESSING_ENV,
+            append_env=True,
+            doc="Recompute amenity statistics for touched projects",
         )
         score_computation = BashOperator(
             task_id="score_computation",
             bash_command=SCORE_COMPUTATION_CMD,
-            doc="Compute project quality scores",
+            env=POST_PROCESSING_ENV,
+            append_env=True,
+            doc="Recompute scores for touched projects",
+        )
+        detail_documents = BashOperator(
+            task_id="detail_documents",
+            bash_command=DETAIL_DOCUMENTS_CMD,
+            env=POST_PROCESSING_ENV,
+            append_env=True,
+            doc="Rebuild precomputed detail documents for touched projects",
         )
         ai_scoring = BashOperator(
             task_id="ai_scoring",
@@ -588,12 +471,10 @@ with DAG(
             doc="AI-based project scoring (optional)",
         )
         
-        geocoding >> amenity_stats >> score_computation
-        score_computation >> ai_scoring
+        gate >> geocoding >> amenity_stats >> score_computation >> detail_documents >> ai_scoring
     
     # -------------------------------------------------------------------------
     # Task Dependencies
     # -------------------------------------------------------------------------
     start >> check_env >> pre_processing >> main_processing
-    db_loader >> [geocoding]
-    ai_scoring >> end
+    [ai_scoring, metrics] >> end
@@ -0,0 +1,31 @@
+"""Add created_at/updated_at to unit_types
+
+Revision ID: h5c6d7e8f9a0
+Revises: e8a661eec56f
+Create Date: 2026-10-18 10:00:00.000000
+
+Used as the watermark for incremental anomaly scoring
+(ai.anomaly.service.AnomalyService.score_incremental).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'h5c6d7e8f9a0'
+down_revision: Union[str, Sequence[str], None] = 'e8a661eec56f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('unit_types', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('unit_types', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index('ix_unit_types_updated_at', 'unit_types', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_unit_types_updated_at', table_name='unit_types')
+    op.drop_column('unit_types', 'updated_at')
+    op.drop_column('unit_types', 'created_at')
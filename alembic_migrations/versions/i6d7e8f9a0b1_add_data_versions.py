@@ -0,0 +1,33 @@
+"""Add data_versions table
+
+Revision ID: i6d7e8f9a0b1
+Revises: h5c6d7e8f9a0
+Create Date: 2026-10-18 11:00:00.000000
+
+Version counters bumped by the loader and scoring jobs; the API response
+cache keys on them for invalidation.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'i6d7e8f9a0b1'
+down_revision: Union[str, Sequence[str], None] = 'h5c6d7e8f9a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('scope', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
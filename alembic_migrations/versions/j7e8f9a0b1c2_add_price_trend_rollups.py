@@ -0,0 +1,51 @@
+"""Add price_trend_rollups table
+
+Revision ID: j7e8f9a0b1c2
+Revises: i6d7e8f9a0b1
+Create Date: 2026-10-18 13:00:00.000000
+
+Per-period price aggregates for projects, localities and districts,
+refreshed from project_pricing_snapshots by the loader and pricing jobs.
+Run ``python tools/refresh_price_rollups.py`` once after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'j7e8f9a0b1c2'
+down_revision: Union[str, Sequence[str], None] = 'i6d7e8f9a0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'price_trend_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_key', sa.String(length=160), nullable=False),
+        sa.Column('granularity', sa.String(length=20), nullable=False),
+        sa.Column('unit_type_label', sa.String(length=100), nullable=False, server_default=''),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('avg_price_per_sqft', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('min_price_per_sqft', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('max_price_per_sqft', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('median_price_per_sqft', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('avg_total_price', sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column('min_total_price', sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column('max_total_price', sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'entity_type', 'entity_key', 'granularity', 'unit_type_label', 'period_start',
+            name='uq_price_trend_rollups_period',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('price_trend_rollups')
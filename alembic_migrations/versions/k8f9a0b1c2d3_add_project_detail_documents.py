@@ -0,0 +1,38 @@
+"""Add project_detail_documents table
+
+Revision ID: k8f9a0b1c2d3
+Revises: j7e8f9a0b1c2
+Create Date: 2026-10-18 15:00:00.000000
+
+Precomputed project detail payloads keyed by project and data version,
+rebuilt by the ETL after scoring. Run
+``python tools/refresh_detail_documents.py`` once after upgrading; until
+then the detail endpoint assembles payloads live.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'k8f9a0b1c2d3'
+down_revision: Union[str, Sequence[str], None] = 'j7e8f9a0b1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_detail_documents',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('document', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_detail_documents')
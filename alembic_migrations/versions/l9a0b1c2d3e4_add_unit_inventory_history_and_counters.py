@@ -0,0 +1,66 @@
+"""Add unit_status_history and unit_inventory_counters tables
+
+Revision ID: l9a0b1c2d3e4
+Revises: k8f9a0b1c2d3
+Create Date: 2026-10-18 16:00:00.000000
+
+Unit status transitions and per-project/block/unit-type availability
+counters maintained by the incremental inventory sync in the loader. Run
+``python tools/rebuild_inventory_counters.py`` once after upgrading; until
+then inventory summaries are aggregated from ``units`` directly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'l9a0b1c2d3e4'
+down_revision: Union[str, Sequence[str], None] = 'k8f9a0b1c2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'unit_status_history',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('unit_id', sa.Integer(), nullable=True),
+        sa.Column('unit_key', sa.String(length=200), nullable=False),
+        sa.Column('old_status', sa.String(length=32), nullable=True),
+        sa.Column('new_status', sa.String(length=32), nullable=True),
+        sa.Column('observed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('run_id', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_unit_status_history_project_observed',
+        'unit_status_history',
+        ['project_id', 'observed_at'],
+        unique=False,
+    )
+    op.create_index('ix_unit_status_history_unit_id', 'unit_status_history', ['unit_id'], unique=False)
+
+    op.create_table(
+        'unit_inventory_counters',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('dimension', sa.String(length=16), nullable=False),
+        sa.Column('dimension_value', sa.String(length=64), nullable=False),
+        sa.Column('total_units', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('available_units', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('booked_units', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unknown_units', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'dimension', 'dimension_value'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('unit_inventory_counters')
+    op.drop_index('ix_unit_status_history_unit_id', table_name='unit_status_history')
+    op.drop_index('ix_unit_status_history_project_observed', table_name='unit_status_history')
+    op.drop_table('unit_status_history')
@@ -0,0 +1,53 @@
+"""Add ai_jobs table
+
+Revision ID: m0b1c2d3e4f5
+Revises: l9a0b1c2d3e4
+Create Date: 2026-10-18 18:00:00.000000
+
+Queued document extraction and scoring jobs run by the Celery workers
+(``cg_rera_extractor/worker.py``), keyed by (kind, project, input hash) so
+resubmissions are idempotent.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'm0b1c2d3e4f5'
+down_revision: Union[str, Sequence[str], None] = 'l9a0b1c2d3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job_key', sa.String(length=200), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('input_hash', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('queue', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='queued'),
+        sa.Column('task_id', sa.String(length=64), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('callback_url', sa.String(length=1024), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_key', name='uq_ai_jobs_job_key'),
+    )
+    op.create_index('ix_ai_jobs_project_kind', 'ai_jobs', ['project_id', 'kind'], unique=False)
+    op.create_index('ix_ai_jobs_status', 'ai_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_jobs_status', table_name='ai_jobs')
+    op.drop_index('ix_ai_jobs_project_kind', table_name='ai_jobs')
+    op.drop_table('ai_jobs')
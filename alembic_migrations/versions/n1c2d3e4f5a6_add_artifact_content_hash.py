@@ -0,0 +1,32 @@
+"""Add content_sha256 to project_artifacts
+
+Revision ID: n1c2d3e4f5a6
+Revises: m0b1c2d3e4f5
+Create Date: 2026-10-18 19:00:00.000000
+
+Hash of each artifact file as last processed by the batched floor-plan OCR
+pipeline (``scripts/process_floor_plans.py``): unchanged or duplicate files
+reuse the stored result instead of being OCR'd again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'n1c2d3e4f5a6'
+down_revision: Union[str, Sequence[str], None] = 'm0b1c2d3e4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project_artifacts', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_project_artifacts_content_sha256', 'project_artifacts', ['content_sha256'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_artifacts_content_sha256', table_name='project_artifacts')
+    op.drop_column('project_artifacts', 'content_sha256')
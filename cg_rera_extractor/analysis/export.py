@@ -0,0 +1,326 @@
+"""Streaming bulk export of the project catalogue.
+
+Rows are read with keyset pagination on ``(overall_score, id)`` and each
+page is fetched through a server-side cursor (``stream_results`` +
+``yield_per``), so memory stays flat regardless of catalogue size.
+Encoders turn the row stream into CSV, JSON Lines or Parquet byte chunks
+that can be written to a file or sent as a chunked HTTP response.
+
+Columns mirror the search read model (``project_search_view``) and are
+selected by name; see :data:`EXPORT_COLUMNS`.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.db import Project, ProjectScores
+
+try:  # Optional dependency, only needed for Parquet exports
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised when pyarrow is absent
+    pa = None
+    pq = None
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Sort key for keyset pagination; unscored projects sort last.
+_SCORE_KEY = func.coalesce(ProjectScores.overall_score, -1)
+
+# Exportable columns, named after the search read model
+EXPORT_COLUMNS: dict[str, Any] = {
+    "project_id": Project.id,
+    "state_code": Project.state_code,
+    "rera_registration_number": Project.rera_registration_number,
+    "project_name": Project.project_name,
+    "status": Project.status,
+    "district": Project.district,
+    "tehsil": Project.tehsil,
+    "village_or_locality": Project.village_or_locality,
+    "full_address": Project.full_address,
+    "lat": Project.latitude,
+    "lon": Project.longitude,
+    "geo_source": Project.geo_source,
+    "geo_precision": Project.geo_precision,
+    "registration_date": Project.approved_date,
+    "proposed_end_date": Project.proposed_end_date,
+    "extended_end_date": Project.extended_end_date,
+    "overall_score": ProjectScores.overall_score,
+    "location_score": ProjectScores.location_score,
+    "amenity_score": ProjectScores.amenity_score,
+    "connectivity_score": ProjectScores.connectivity_score,
+    "daily_needs_score": ProjectScores.daily_needs_score,
+    "social_infra_score": ProjectScores.social_infra_score,
+    "value_score": ProjectScores.value_score,
+    "score_version": ProjectScores.score_version,
+    "score_status": ProjectScores.score_status,
+}
+
+DEFAULT_COLUMNS: tuple[str, ...] = (
+    "project_id",
+    "state_code",
+    "rera_registration_number",
+    "project_name",
+    "district",
+    "status",
+    "overall_score",
+    "location_score",
+    "amenity_score",
+    "score_version",
+)
+
+EXPORT_FORMATS: dict[str, str] = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@dataclass
+class ExportFilters:
+    """Row filters for an export."""
+
+    district: str | None = None
+    status: str | None = None
+    min_score: float | None = None
+    scored_only: bool = False
+    limit: int | None = None
+
+
+def resolve_columns(columns: Sequence[str] | None) -> list[str]:
+    """Validate requested column names (default set when empty)."""
+
+    if not columns:
+        return list(DEFAULT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown export columns: {', '.join(unknown)}. "
+            f"Available: {', '.join(EXPORT_COLUMNS)}"
+        )
+    return list(dict.fromkeys(columns))
+
+
+# ---- Row stream -----------------------------------------------------------
+
+
+def iter_export_rows(
+    session: Session,
+    columns: Sequence[str],
+    filters: ExportFilters | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[tuple]:
+    """Yield rows (in ``columns`` order) best score first, one page at a time.
+
+    Each page is a fresh ``WHERE (score, id) < last`` query, so no cursor is
+    held open between pages and deep pages cost the same as the first.
+    """
+
+    filters = filters or ExportFilters()
+    selected = [EXPORT_COLUMNS[name].label(name) for name in columns]
+    base = select(*selected, _SCORE_KEY.label("_score_key"), Project.id.label("_id"))
+    if filters.scored_only or filters.min_score is not None:
+        base = base.join(ProjectScores, ProjectScores.project_id == Project.id)
+    else:
+        base = base.outerjoin(ProjectScores, ProjectScores.project_id == Project.id)
+
+    if filters.district:
+        base = base.where(Project.district.ilike(filters.district))
+    if filters.status:
+        base = base.where(Project.status.ilike(filters.status))
+    if filters.min_score is not None:
+        base = base.where(ProjectScores.overall_score >= filters.min_score)
+    base = base.order_by(_SCORE_KEY.desc(), Project.id.desc())
+
+    remaining = filters.limit
+    last: tuple[Any, int] | None = None
+    while remaining is None or remaining > 0:
+        page_size = batch_size if remaining is None else min(batch_size, remaining)
+        stmt = base
+        if last is not None:
+            last_score, last_id = last
+            stmt = stmt.where(
+                or_(
+                    _SCORE_KEY < last_score,
+                    and_(_SCORE_KEY == last_score, Project.id < last_id),
+                )
+            )
+        result = session.execute(
+            stmt.limit(page_size),
+            execution_options={"stream_results": True, "yield_per": page_size},
+        )
+        fetched = 0
+        for row in result:
+            fetched += 1
+            last = (row._score_key, row._id)
+            yield tuple(row[:len(columns)])
+        result.close()
+
+        if remaining is not None:
+            remaining -= fetched
+        if fetched < page_size:
+            break
+
+
+# ---- Encoders -------------------------------------------------------------
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _chunked(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    chunk: list[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_csv(
+    rows: Iterable[tuple], columns: Sequence[str], chunk_rows: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunked(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_jsonl(
+    rows: Iterable[tuple], columns: Sequence[str], chunk_rows: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    for chunk in _chunked(rows, chunk_rows):
+        lines = [
+            json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False)
+            for row in chunk
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only sink whose contents are handed out and discarded per chunk."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_parquet(
+    rows: Iterable[tuple], columns: Sequence[str], chunk_rows: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """One Parquet row group per chunk; bytes are yielded as they are written."""
+
+    if pa is None:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package")
+
+    sink = _DrainableSink()
+    writer = None
+    for chunk in _chunked(rows, chunk_rows):
+        data = {
+            name: [
+                float(v) if isinstance(v, Decimal) else v
+                for v in (row[i] for row in chunk)
+            ]
+            for i, name in enumerate(columns)
+        }
+        table = pa.table(data)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table.cast(writer.schema))
+        yield sink.drain()
+    if writer is None:
+        writer = pq.ParquetWriter(sink, pa.schema([(name, pa.string()) for name in columns]))
+    writer.close()
+    yield sink.drain()
+
+
+_ENCODERS = {"csv": encode_csv, "jsonl": encode_jsonl, "parquet": encode_parquet}
+
+
+def stream_export(
+    session: Session,
+    fmt: str = "csv",
+    columns: Sequence[str] | None = None,
+    filters: ExportFilters | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Byte chunks of the export in ``fmt`` (csv, jsonl or parquet)."""
+
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package")
+    names = resolve_columns(columns)
+    rows = iter_export_rows(session, names, filters, batch_size)
+    return _ENCODERS[fmt](rows, names, batch_size)
+
+
+def write_export(
+    session: Session,
+    path: str | Path | BinaryIO,
+    fmt: str = "csv",
+    columns: Sequence[str] | None = None,
+    filters: ExportFilters | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write an export to ``path`` (or an open binary file); returns bytes written."""
+
+    chunks = stream_export(session, fmt, columns, filters, batch_size)
+    if hasattr(path, "write"):
+        return sum(path.write(chunk) for chunk in chunks)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fh:
+        return sum(fh.write(chunk) for chunk in chunks)
+
+
+__all__ = [
+    "DEFAULT_COLUMNS",
+    "EXPORT_COLUMNS",
+    "EXPORT_FORMATS",
+    "ExportFilters",
+    "iter_export_rows",
+    "resolve_columns",
+    "stream_export",
+    "write_export",
+]
@@ -6,7 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import or_, select
 from sqlalchemy.orm import Session, selectinload
 
-from cg_rera_extractor.api.deps import get_db
+from cg_rera_extractor.api.cache import ResponseCacheMiddleware
+from cg_rera_extractor.api.deps import ReadSession, get_read_db
 from cg_rera_extractor.api.middleware import RateLimitMiddleware  # Point 30: API Governance
 from cg_rera_extractor.api.routes_projects import router as projects_router
 from cg_rera_extractor.api.routes_admin import router as admin_router
@@ -33,6 +34,9 @@ app = FastAPI(
 # To re-enable in production, uncomment the line below
 # app.add_middleware(RateLimitMiddleware)
 
+# Response cache for read-heavy endpoints (no-op unless API_CACHE_ENABLED=true)
+app.add_middleware(ResponseCacheMiddleware)
+
 # Enable CORS for frontend development
 app.add_middleware(
     CORSMiddleware,
@@ -61,14 +65,14 @@ def healthcheck() -> dict[str, str]:
 
 
 @app.get("/projects", response_model=list[ProjectSummary])
-def list_projects(
+async def list_projects(
     *,
     district: str | None = None,
     status: str | None = None,
     q: str | None = None,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ) -> list[ProjectSummary]:
     """List projects with optional filters and pagination."""
 
@@ -91,15 +95,18 @@ def list_projects(
 
     stmt = stmt.order_by(Project.project_name).offset(offset).limit(limit)
 
-    projects = db.execute(stmt).scalars().all()
-    return [ProjectSummary.model_validate(project) for project in projects]
+    def _load(session: Session) -> list[ProjectSummary]:
+        projects = session.execute(stmt).scalars().all()
+        return [ProjectSummary.model_validate(project) for project in projects]
+
+    return await read.run(_load)
 
 
 @app.get("/projects/{state_code}/{rera_registration_number}", response_model=ProjectDetail)
-def get_project_detail(
+async def get_project_detail(
     state_code: str,
     rera_registration_number: str,
-    db: Session = Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ) -> ProjectDetail:
     """Return a single project's details by registration number."""
 
@@ -118,11 +125,15 @@ def get_project_detail(
         )
     )
 
-    project = db.execute(stmt).scalar_one_or_none()
+    def _load(session: Session) -> ProjectDetail | None:
+        project = session.execute(stmt).scalar_one_or_none()
+        return ProjectDetail.model_validate(project) if project else None
+
+    project = await read.run(_load)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectDetail.model_validate(project)
+    return project
 
 
 __all__ = ["app"]
@@ -0,0 +1,329 @@
+"""
+Response caching for read-heavy API endpoints.
+
+The catalog served by the API only changes when the ETL (loader, scoring
+jobs) runs, so GET responses for the search/map/detail/tag/landmark/price-trend
+endpoints are cached and revalidated against a data-version counter:
+
+- Keys are ``path + normalized query params + data version``; a bump of
+  the ``data_versions`` counter (see ``cg_rera_extractor.db.versioning``)
+  makes every older entry unreachable.
+- Backends are pluggable: an in-process LRU with TTL (default) or Redis
+  (``API_CACHE_BACKEND=redis``, using ``REDIS_URL``) so several workers
+  share one cache.
+- Every cacheable response carries an ``ETag``; ``If-None-Match`` returns
+  ``304 Not Modified`` without a body.
+
+Caching is off unless ``API_CACHE_ENABLED=true``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Protocol
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+try:  # Optional dependency, only needed for the shared backend
+    import redis
+except ImportError:  # pragma: no cover - exercised when redis is absent
+    redis = None
+
+LOGGER = logging.getLogger(__name__)
+
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "false").lower() == "true"
+API_CACHE_BACKEND = os.getenv("API_CACHE_BACKEND", "memory").lower()
+API_CACHE_TTL_SECONDS = int(os.getenv("API_CACHE_TTL_SECONDS", "300"))
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "2048"))
+API_CACHE_VERSION_POLL_SECONDS = float(os.getenv("API_CACHE_VERSION_POLL_SECONDS", "5"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# GET endpoints whose responses depend only on the URL and the catalog data.
+CACHEABLE_PATHS: list[re.Pattern[str]] = [
+    re.compile(r"^/projects/search$"),
+    re.compile(r"^/projects/map(/clusters)?$"),
+    re.compile(r"^/projects/\d+$"),
+    re.compile(r"^/discovery/tags/faceted$"),
+    re.compile(r"^/discovery/landmarks(/.*)?$"),
+    re.compile(r"^/analytics/price-trends(/compare)?$"),
+]
+
+
+# =============================================================================
+# Cache entries and backends
+# =============================================================================
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body with the metadata needed to replay it."""
+
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps({"etag": self.etag, "media_type": self.media_type}).encode()
+        return header + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        header, _, body = raw.partition(b"\n")
+        meta = json.loads(header)
+        return cls(body=body, etag=meta["etag"], media_type=meta["media_type"])
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached responses."""
+
+    def get(self, key: str) -> CachedResponse | None: ...
+
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryLRUCache:
+    """Thread-safe, process-local LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = API_CACHE_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """Redis-backed cache shared by all API workers."""
+
+    PREFIX = "realmap:api-cache:"
+
+    def __init__(self, url: str = REDIS_URL) -> None:
+        if redis is None:
+            raise RuntimeError("API_CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> CachedResponse | None:
+        try:
+            raw = self._client.get(self.PREFIX + key)
+        except redis.RedisError as exc:
+            LOGGER.warning("Redis cache read failed: %s", exc)
+            return None
+        return CachedResponse.from_bytes(raw) if raw else None
+
+    def set(self, key: str, value: CachedResponse, ttl: int) -> None:
+        try:
+            self._client.setex(self.PREFIX + key, ttl, value.to_bytes())
+        except redis.RedisError as exc:
+            LOGGER.warning("Redis cache write failed: %s", exc)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self.PREFIX + "*", count=500):
+            self._client.delete(key)
+
+
+def create_cache_backend(name: str = API_CACHE_BACKEND) -> CacheBackend:
+    """Build the configured backend, falling back to in-memory."""
+
+    if name == "redis":
+        try:
+            return RedisCache()
+        except RuntimeError as exc:
+            LOGGER.warning("%s; using in-memory response cache", exc)
+    return InMemoryLRUCache()
+
+
+# =============================================================================
+# Data version source
+# =============================================================================
+
+
+class DataVersionSource:
+    """
+    Reads the catalog data version, re-polling the DB at most every
+    ``poll_seconds`` so the hot path does not query on each request.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable | None = None,
+        poll_seconds: float = API_CACHE_VERSION_POLL_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._poll_seconds = poll_seconds
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _read(self) -> int:
+        from cg_rera_extractor.db.versioning import get_data_version
+
+        factory = self._session_factory
+        if factory is None:
+            from cg_rera_extractor.api.deps import SessionLocal
+
+            factory = SessionLocal
+        with factory() as session:
+            return get_data_version(session)
+
+    def current(self) -> int | None:
+        """Return the current version, or None if it cannot be determined."""
+
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self._poll_seconds:
+                return self._version
+            try:
+                self._version = self._read()
+            except Exception as exc:  # DB unavailable/table missing: don't cache
+                LOGGER.warning("Could not read data version: %s", exc)
+                self._version = None
+            self._checked_at = now
+            return self._version
+
+
+# =============================================================================
+# Keys and ETags
+# =============================================================================
+
+
+def normalize_cache_key(request: Request, version: int) -> str:
+    """Build a cache key from the path and sorted, non-empty query params."""
+
+    params = sorted((k, v) for k, v in request.query_params.multi_items() if v != "")
+    raw = f"v{version}:{request.url.path}?{urlencode(params)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def compute_etag(body: bytes, version: int) -> str:
+    return f'"{version}-{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def is_cacheable_path(path: str) -> bool:
+    return any(pattern.match(path) for pattern in CACHEABLE_PATHS)
+
+
+# =============================================================================
+# Middleware
+# =============================================================================
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Serve cacheable GET endpoints from the response cache.
+
+    Adds ``ETag`` and ``X-Cache: HIT|MISS`` headers and answers matching
+    ``If-None-Match`` requests with 304.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        backend: CacheBackend | None = None,
+        version_source: DataVersionSource | None = None,
+        ttl_seconds: int = API_CACHE_TTL_SECONDS,
+        enabled: bool | None = None,
+    ) -> None:
+        super().__init__(app)
+        self.enabled = API_CACHE_ENABLED if enabled is None else enabled
+        self.backend = backend
+        self.version_source = version_source or DataVersionSource()
+        self.ttl_seconds = ttl_seconds
+
+    def _get_backend(self) -> CacheBackend:
+        if self.backend is None:
+            self.backend = create_cache_backend()
+        return self.backend
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if (
+            not self.enabled
+            or request.method != "GET"
+            or not is_cacheable_path(request.url.path)
+        ):
+            return await call_next(request)
+
+        version = self.version_source.current()
+        if version is None:
+            return await call_next(request)
+
+        backend = self._get_backend()
+        key = normalize_cache_key(request, version)
+        cached = backend.get(key)
+
+        if cached is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            cached = CachedResponse(
+                body=body,
+                etag=compute_etag(body, version),
+                media_type=response.media_type or response.headers.get("content-type", "application/json"),
+            )
+            backend.set(key, cached, self.ttl_seconds)
+            cache_status = "MISS"
+        else:
+            cache_status = "HIT"
+
+        headers = {"ETag": cached.etag, "X-Cache": cache_status}
+        if _etag_matches(request, cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+__all__ = [
+    "CACHEABLE_PATHS",
+    "CacheBackend",
+    "CachedResponse",
+    "DataVersionSource",
+    "InMemoryLRUCache",
+    "RedisCache",
+    "ResponseCacheMiddleware",
+    "compute_etag",
+    "create_cache_backend",
+    "normalize_cache_key",
+]
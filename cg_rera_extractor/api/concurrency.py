@@ -0,0 +1,133 @@
+"""Async read sessions and bounded executors for the FastAPI services.
+
+Read endpoints depend on a :class:`ReadSession` and ``await read.run(fn, ...)``
+where ``fn`` is an ordinary function taking a sync ``Session`` (the existing
+service layer). With async reads enabled, ``fn`` runs through
+``AsyncSession.run_sync`` on the shared asyncpg engine: the ORM code is
+unchanged, but every query is awaited on the event loop and no thread is
+held while the database works. Otherwise ``fn`` runs on the request's sync
+session in a thread pool capped at ``API_DB_WORKERS``.
+
+``DB_ASYNC_READS`` selects the mode: ``auto`` (default) uses async reads for
+PostgreSQL when ``asyncpg`` is installed, ``true`` requires them and
+``false`` disables them.
+
+CPU- or model-bound work (scoring, embeddings, document extraction) goes
+through :func:`run_blocking`, which allows at most ``API_BLOCKING_WORKERS``
+concurrent calls so slow work queues up instead of starving the event loop
+and the connection pool.
+"""
+from __future__ import annotations
+
+import functools
+import importlib.util
+import logging
+import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+import anyio
+import anyio.to_thread
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
+from cg_rera_extractor.db.base import get_async_engine, get_async_session_local
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DB_ASYNC_READS = os.getenv("DB_ASYNC_READS", "auto").strip().lower()
+API_DB_WORKERS = int(os.getenv("API_DB_WORKERS", "16"))
+API_BLOCKING_WORKERS = int(os.getenv("API_BLOCKING_WORKERS", "4"))
+
+_db_limiter = anyio.CapacityLimiter(API_DB_WORKERS)
+_blocking_limiter = anyio.CapacityLimiter(API_BLOCKING_WORKERS)
+
+# None until resolved; False when async reads are disabled
+_async_factory: async_sessionmaker[AsyncSession] | bool | None = None
+
+
+def _resolve_async_factory() -> async_sessionmaker[AsyncSession] | None:
+    global _async_factory
+
+    if _async_factory is None:
+        _async_factory = False
+        if DB_ASYNC_READS not in {"0", "false", "no", "off"}:
+            url = ensure_database_url()
+            forced = DB_ASYNC_READS in {"1", "true", "yes", "on"}
+            available = (
+                make_url(url).get_backend_name() == "postgresql"
+                and importlib.util.find_spec("asyncpg") is not None
+            )
+            if forced or available:
+                _async_factory = get_async_session_local(get_async_engine(url=url))
+                LOGGER.info("Async read sessions enabled for %s", describe_database_target(url))
+    return _async_factory or None
+
+
+def async_reads_enabled() -> bool:
+    """Whether read endpoints run on the async engine."""
+
+    return _resolve_async_factory() is not None
+
+
+class ReadSession:
+    """Runs sync session functions for a request, on the async engine if enabled."""
+
+    def __init__(self, session: Session | None = None, async_session: AsyncSession | None = None):
+        if (session is None) == (async_session is None):
+            raise ValueError("Provide exactly one of session or async_session")
+        self._session = session
+        self._async_session = async_session
+
+    @property
+    def is_async(self) -> bool:
+        return self._async_session is not None
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``fn(session, *args, **kwargs)`` without blocking the event loop."""
+
+        if self._async_session is not None:
+            return await self._async_session.run_sync(fn, *args, **kwargs)
+        return await anyio.to_thread.run_sync(
+            functools.partial(fn, self._session, *args, **kwargs), limiter=_db_limiter
+        )
+
+
+@asynccontextmanager
+async def open_read_session(db: Session) -> AsyncIterator[ReadSession]:
+    """Wrap the request's sync session, or open an async one instead.
+
+    ``db`` is still taken in async mode so ``get_db`` overrides (tests) keep
+    working; an unused ``Session`` never checks out a connection.
+    """
+
+    factory = _resolve_async_factory()
+    if factory is None:
+        yield ReadSession(session=db)
+        return
+    async with factory() as async_session:
+        yield ReadSession(async_session=async_session)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU/model-bound ``fn`` in the bounded worker pool."""
+
+    return await anyio.to_thread.run_sync(
+        functools.partial(fn, *args, **kwargs), limiter=_blocking_limiter
+    )
+
+
+__all__ = [
+    "API_BLOCKING_WORKERS",
+    "API_DB_WORKERS",
+    "DB_ASYNC_READS",
+    "ReadSession",
+    "async_reads_enabled",
+    "open_read_session",
+    "run_blocking",
+]
@@ -2,16 +2,18 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 
+from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from cg_rera_extractor.api.concurrency import ReadSession, open_read_session
 from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
 from cg_rera_extractor.db.base import get_engine, get_session_local
 
 LOGGER = logging.getLogger(__name__)
 
-# Global session factory backed by the configured database URL.
+# Global session factory backed by the shared engine for the configured URL.
 ensure_database_url()
 _engine = get_engine()
 LOGGER.info("API session factory configured for %s", describe_database_target())
@@ -28,4 +30,15 @@ def get_db() -> Iterator[Session]:
         db.close()
 
 
-__all__ = ["get_db", "SessionLocal"]
+async def get_read_db(db: Session = Depends(get_db)) -> AsyncIterator[ReadSession]:
+    """Yield a :class:`ReadSession` for read-only endpoints.
+
+    Backed by the async engine when async reads are enabled, otherwise by
+    the request's sync session in a bounded thread pool.
+    """
+
+    async with open_read_session(db) as read:
+        yield read
+
+
+__all__ = ["get_db", "get_read_db", "ReadSession", "SessionLocal"]
@@ -9,22 +9,36 @@ Point 30 Implementation: API Governance (Throttling)
 """
 from __future__ import annotations
 
+import bisect
 import hashlib
+import logging
+import threading
 import time
-from collections import defaultdict
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Callable
+from typing import Callable, Protocol
 
+import anyio.to_thread
 from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 import os
 
+try:  # Optional dependency, only needed for the shared backend
+    import redis
+except ImportError:  # pragma: no cover - exercised when redis is absent
+    redis = None
+
+logger = logging.getLogger(__name__)
+
 # Environment variable to disable rate limiting (defaults to OFF for local development)
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+# "memory" (per process) or "redis" (shared across workers via REDIS_URL)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 
 # =============================================================================
@@ -142,142 +156,247 @@ def validate_api_key(api_key: str) -> APIKeyInfo | None:
 # =============================================================================
 
 
-@dataclass
+class RateLimitBackend(Protocol):
+    """Storage/decision backend for rate limiting."""
+
+    def check_rate_limit(
+        self,
+        client_id: str,
+        config: RateLimitConfig,
+    ) -> tuple[bool, dict[str, str]]:
+        """Check (and count) a request. Returns (is_allowed, headers_dict)."""
+        ...
+
+
+def _limit_headers(limit: int, remaining: int, reset: int, window: str) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(max(0, remaining)),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Window": window,
+    }
+
+
+@dataclass(slots=True)
 class RateLimitBucket:
-    """Token bucket for rate limiting."""
+    """Token bucket plus fixed-window counters for one client.
+
+    Each window keeps only the current slot index and its count, so checks
+    and updates are O(1) regardless of how long the client has been active.
+    """
     tokens: float
     last_update: float
-    window_requests: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    minute_slot: int = -1
+    minute_count: int = 0
+    hour_slot: int = -1
+    hour_count: int = 0
+    day_slot: int = -1
+    day_count: int = 0
+
+    def roll_windows(self, now: float) -> None:
+        """Reset counters whose window has elapsed."""
+        minute, hour, day = int(now // 60), int(now // 3600), int(now // 86400)
+        if self.minute_slot != minute:
+            self.minute_slot, self.minute_count = minute, 0
+        if self.hour_slot != hour:
+            self.hour_slot, self.hour_count = hour, 0
+        if self.day_slot != day:
+            self.day_slot, self.day_count = day, 0
 
 
 class RateLimiter:
     """
-    Token bucket rate limiter with sliding window.
+    In-process token bucket rate limiter with fixed minute/hour windows.
     
     Point 30: Implements tiered rate limiting with multiple time windows.
+    All operations are O(1) and guarded by a lock. Idle clients are evicted
+    in LRU order once ``max_clients`` is exceeded. Limits are per process;
+    use RedisRateLimiter to share them across uvicorn workers.
     """
     
-    def __init__(self) -> None:
-        self._buckets: dict[str, RateLimitBucket] = {}
-        self._lock_time = 0.0  # Simple lock mechanism
+    def __init__(self, max_clients: int = 100_000) -> None:
+        self._buckets: OrderedDict[str, RateLimitBucket] = OrderedDict()
+        self._max_clients = max_clients
+        self._lock = threading.Lock()
     
-    def _get_bucket(self, client_id: str, config: RateLimitConfig) -> RateLimitBucket:
+    def _get_bucket(self, client_id: str, config: RateLimitConfig, now: float) -> RateLimitBucket:
         """Get or create a rate limit bucket for a client."""
-        if client_id not in self._buckets:
-            self._buckets[client_id] = RateLimitBucket(
-                tokens=float(config.burst_limit),
-                last_update=time.time(),
-            )
-        return self._buckets[client_id]
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = RateLimitBucket(tokens=float(config.burst_limit), last_update=now)
+            self._buckets[client_id] = bucket
+            if len(self._buckets) > self._max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+        return bucket
     
     def _refill_tokens(
         self,
         bucket: RateLimitBucket,
         config: RateLimitConfig,
+        now: float,
     ) -> None:
         """Refill tokens based on time elapsed."""
-        now = time.time()
         elapsed = now - bucket.last_update
         
         # Calculate token refill rate (tokens per second)
         refill_rate = config.requests_per_minute / 60.0
-        tokens_to_add = elapsed * refill_rate
         
         bucket.tokens = min(
             float(config.burst_limit),
-            bucket.tokens + tokens_to_add,
+            bucket.tokens + elapsed * refill_rate,
         )
         bucket.last_update = now
     
-    def _clean_old_windows(self, bucket: RateLimitBucket) -> None:
-        """Remove old window data."""
-        now = time.time()
-        hour_ago = now - 3600
-        day_ago = now - 86400
-        
-        # Clean minute windows older than 1 hour
-        keys_to_remove = [
-            k for k in bucket.window_requests
-            if k.startswith("min_") and float(k.split("_")[1]) < hour_ago
-        ]
-        for k in keys_to_remove:
-            del bucket.window_requests[k]
-    
     def check_rate_limit(
         self,
         client_id: str,
         config: RateLimitConfig,
-    ) -> tuple[bool, dict[str, int]]:
+    ) -> tuple[bool, dict[str, str]]:
         """
         Check if request is allowed under rate limit.
         
         Returns:
             Tuple of (is_allowed, headers_dict)
         """
-        bucket = self._get_bucket(client_id, config)
-        self._refill_tokens(bucket, config)
-        self._clean_old_windows(bucket)
-        
         now = time.time()
-        current_minute = f"min_{int(now // 60)}"
-        current_hour = f"hour_{int(now // 3600)}"
-        current_day = f"day_{int(now // 86400)}"
-        
-        # Check minute limit
-        minute_count = bucket.window_requests.get(current_minute, 0)
-        if minute_count >= config.requests_per_minute:
-            reset_time = int((int(now // 60) + 1) * 60)
-            return False, {
-                "X-RateLimit-Limit": str(config.requests_per_minute),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(reset_time),
-                "X-RateLimit-Window": "minute",
-            }
-        
-        # Check hour limit
-        hour_count = sum(
-            v for k, v in bucket.window_requests.items()
-            if k.startswith("hour_") and k == current_hour
-        )
-        if hour_count >= config.requests_per_hour:
-            reset_time = int((int(now // 3600) + 1) * 3600)
-            return False, {
-                "X-RateLimit-Limit": str(config.requests_per_hour),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(reset_time),
-                "X-RateLimit-Window": "hour",
-            }
-        
-        # Check burst limit (token bucket)
-        if bucket.tokens < 1:
-            return False, {
-                "X-RateLimit-Limit": str(config.burst_limit),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(int(now + 1)),
-                "X-RateLimit-Window": "burst",
-            }
-        
-        # Allow request, consume token and update counters
-        bucket.tokens -= 1
-        bucket.window_requests[current_minute] = minute_count + 1
-        bucket.window_requests[current_hour] = hour_count + 1
-        bucket.window_requests[current_day] = bucket.window_requests.get(current_day, 0) + 1
-        
-        remaining = min(
-            config.requests_per_minute - minute_count - 1,
-            int(bucket.tokens),
-        )
-        
-        return True, {
-            "X-RateLimit-Limit": str(config.requests_per_minute),
-            "X-RateLimit-Remaining": str(max(0, remaining)),
-            "X-RateLimit-Reset": str(int((int(now // 60) + 1) * 60)),
-            "X-RateLimit-Window": "minute",
-        }
+        with self._lock:
+            bucket = self._get_bucket(client_id, config, now)
+            self._refill_tokens(bucket, config, now)
+            bucket.roll_windows(now)
+            
+            # Check minute limit
+            if bucket.minute_count >= config.requests_per_minute:
+                return False, _limit_headers(
+                    config.requests_per_minute, 0, (bucket.minute_slot + 1) * 60, "minute"
+                )
+            
+            # Check hour limit
+            if bucket.hour_count >= config.requests_per_hour:
+                return False, _limit_headers(
+                    config.requests_per_hour, 0, (bucket.hour_slot + 1) * 3600, "hour"
+                )
+            
+            # Check burst limit (token bucket)
+            if bucket.tokens < 1:
+                return False, _limit_headers(config.burst_limit, 0, int(now + 1), "burst")
+            
+            # Allow request, consume token and update counters
+            bucket.tokens -= 1
+            bucket.minute_count += 1
+            bucket.hour_count += 1
+            bucket.day_count += 1
+            
+            remaining = min(
+                config.requests_per_minute - bucket.minute_count,
+                int(bucket.tokens),
+            )
+            return True, _limit_headers(
+                config.requests_per_minute, remaining, (bucket.minute_slot + 1) * 60, "minute"
+            )
+
+
+# Atomic check-and-count, mirroring RateLimiter.check_rate_limit.
+# KEYS[1] = per-client hash; ARGV = now, requests_per_minute, requests_per_hour, burst_limit
+# Returns {allowed, limit, remaining, reset, window}
+_REDIS_RATE_LIMIT_LUA = """
+local now = tonumber(ARGV[1])
+local rpm = tonumber(ARGV[2])
+local rph = tonumber(ARGV[3])
+local burst = tonumber(ARGV[4])
+local minute = math.floor(now / 60)
+local hour = math.floor(now / 3600)
+
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'min_slot', 'min_count', 'hour_slot', 'hour_count')
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+local min_count = 0
+if tonumber(b[3]) == minute then min_count = tonumber(b[4]) end
+local hour_count = 0
+if tonumber(b[5]) == hour then hour_count = tonumber(b[6]) end
+
+tokens = math.min(burst, tokens + (now - ts) * rpm / 60)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 7200)
+
+if min_count >= rpm then
+  return {0, rpm, 0, (minute + 1) * 60, 'minute'}
+end
+if hour_count >= rph then
+  return {0, rph, 0, (hour + 1) * 3600, 'hour'}
+end
+if tokens < 1 then
+  return {0, burst, 0, math.floor(now) + 1, 'burst'}
+end
+
+tokens = tokens - 1
+min_count = min_count + 1
+hour_count = hour_count + 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens),
+  'min_slot', minute, 'min_count', min_count,
+  'hour_slot', hour, 'hour_count', hour_count)
+
+local remaining = math.min(rpm - min_count, math.floor(tokens))
+return {1, rpm, remaining, (minute + 1) * 60, 'minute'}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Rate limiter shared by all workers, evaluated atomically in Redis.
+
+    Same semantics as RateLimiter; the whole check runs in one Lua script,
+    so concurrent workers cannot race between reading and counting. While
+    Redis is unreachable, requests are counted per process instead.
+    """
+
+    PREFIX = "realmap:ratelimit:"
+
+    def __init__(self, url: str | None = None, client=None) -> None:
+        if client is None:
+            if redis is None:
+                raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+            client = redis.Redis.from_url(url or REDIS_URL)
+        self._client = client
+        self._script = client.register_script(_REDIS_RATE_LIMIT_LUA)
+        self._fallback = RateLimiter()
+
+    def check_rate_limit(
+        self,
+        client_id: str,
+        config: RateLimitConfig,
+    ) -> tuple[bool, dict[str, str]]:
+        try:
+            allowed, limit, remaining, reset, window = self._script(
+                keys=[self.PREFIX + client_id],
+                args=[
+                    time.time(),
+                    config.requests_per_minute,
+                    config.requests_per_hour,
+                    config.burst_limit,
+                ],
+            )
+        except redis.RedisError as exc:
+            logger.warning("Redis rate limit check failed, using in-memory limits: %s", exc)
+            return self._fallback.check_rate_limit(client_id, config)
+        if isinstance(window, bytes):
+            window = window.decode()
+        return bool(allowed), _limit_headers(int(limit), int(remaining), int(reset), window)
+
+
+def create_rate_limiter(backend: str = RATE_LIMIT_BACKEND) -> RateLimitBackend:
+    """Build the configured rate limit backend, falling back to in-memory."""
+    if backend == "redis":
+        try:
+            return RedisRateLimiter()
+        except RuntimeError as exc:
+            logger.warning("%s; using in-memory rate limiter", exc)
+    return RateLimiter()
 
 
 # Global rate limiter instance
-_rate_limiter = RateLimiter()
+_rate_limiter: RateLimitBackend = create_rate_limiter()
 
 
 # =============================================================================
@@ -340,9 +459,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         config = RATE_LIMITS[client_tier]
         
         # Check rate limit
-        allowed, headers = _rate_limiter.check_rate_limit(client_id, config)
+        started = time.perf_counter()
+        if isinstance(_rate_limiter, RedisRateLimiter):
+            # Network round-trip: keep it off the event loop
+            allowed, headers = await anyio.to_thread.run_sync(
+                _rate_limiter.check_rate_limit, client_id, config
+            )
+        else:
+            allowed, headers = _rate_limiter.check_rate_limit(client_id, config)
         
         if not allowed:
+            _usage_tracker.record(
+                client_id, client_tier, request.url.path, request.method, 429,
+                (time.perf_counter() - started) * 1000,
+            )
             return JSONResponse(
                 status_code=429,
                 content={
@@ -356,6 +486,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Process request
         response = await call_next(request)
         
+        # Key usage by route template so /projects/1 and /projects/2 aggregate together
+        route = request.scope.get("route")
+        _usage_tracker.record(
+            client_id,
+            client_tier,
+            getattr(route, "path", request.url.path),
+            request.method,
+            response.status_code,
+            (time.perf_counter() - started) * 1000,
+        )
+        
         # Add rate limit headers to response
         for key, value in headers.items():
             response.headers[key] = value
@@ -459,16 +600,60 @@ class UsageRecord:
     timestamp: datetime
 
 
+# Upper bounds (ms) of the latency histogram buckets; a final bucket is open-ended.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _histogram_labels() -> list[str]:
+    labels = [f"<={int(b)}" for b in LATENCY_BUCKETS_MS]
+    labels.append(f">{int(LATENCY_BUCKETS_MS[-1])}")
+    return labels
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """Pre-aggregated counters and latency histogram for one endpoint."""
+    count: int = 0
+    error_count: int = 0
+    total_time_ms: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def add(self, status_code: int, response_time_ms: float) -> None:
+        self.count += 1
+        if status_code >= 400:
+            self.error_count += 1
+        self.total_time_ms += response_time_ms
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, response_time_ms)] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "error_count": self.error_count,
+            "avg_response_time_ms": round(self.total_time_ms / self.count, 2) if self.count else 0,
+            "latency_histogram_ms": dict(zip(_histogram_labels(), self.histogram)),
+        }
+
+
 class UsageTracker:
     """
     Track API usage for analytics and billing.
     
     Point 30: Usage tracking for API governance.
+    The last ``max_records`` requests are kept in a fixed-size ring buffer
+    for filtered queries; totals, per-tier/per-endpoint counts and latency
+    histograms are aggregated on write (since process start), so the
+    unfiltered summary never scans records.
     """
     
     def __init__(self, max_records: int = 10000) -> None:
-        self._records: list[UsageRecord] = []
+        self._records: list[UsageRecord | None] = [None] * max_records
         self._max_records = max_records
+        self._next = 0
+        self._size = 0
+        self._totals = EndpointStats()
+        self._by_endpoint: dict[str, EndpointStats] = {}
+        self._by_tier: Counter[str] = Counter()
+        self._lock = threading.Lock()
     
     def record(
         self,
@@ -490,46 +675,72 @@ class UsageTracker:
             timestamp=datetime.now(timezone.utc),
         )
         
-        self._records.append(record)
-        
-        # Trim old records if needed
-        if len(self._records) > self._max_records:
-            self._records = self._records[-self._max_records:]
+        with self._lock:
+            self._records[self._next] = record
+            self._next = (self._next + 1) % self._max_records
+            self._size = min(self._size + 1, self._max_records)
+
+            self._totals.add(status_code, response_time_ms)
+            stats = self._by_endpoint.get(endpoint)
+            if stats is None:
+                stats = self._by_endpoint[endpoint] = EndpointStats()
+            stats.add(status_code, response_time_ms)
+            self._by_tier[tier.value] += 1
+    
+    def recent_records(self) -> list[UsageRecord]:
+        """Return retained records, oldest first."""
+        with self._lock:
+            start = (self._next - self._size) % self._max_records
+            indices = [(start + i) % self._max_records for i in range(self._size)]
+            return [self._records[i] for i in indices]
+    
+    def get_endpoint_stats(self) -> dict[str, dict]:
+        """Per-endpoint counters and latency histograms."""
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self._by_endpoint.items()}
     
     def get_summary(
         self,
         client_id: str | None = None,
         since: datetime | None = None,
     ) -> dict:
-        """Get usage summary."""
-        records = self._records
-        
-        if client_id:
-            records = [r for r in records if r.client_id == client_id]
-        
-        if since:
-            records = [r for r in records if r.timestamp >= since]
-        
-        if not records:
+        """Get usage summary.
+
+        Without filters this reads the pre-aggregated counters; filtering by
+        client or time scans the retained ring buffer instead.
+        """
+        if client_id is None and since is None:
+            with self._lock:
+                totals = self._totals
+                by_tier = dict(self._by_tier)
+                by_endpoint = {e: st.count for e, st in self._by_endpoint.items()}
+        else:
+            records = [
+                r for r in self.recent_records()
+                if (client_id is None or r.client_id == client_id)
+                and (since is None or r.timestamp >= since)
+            ]
+            totals = EndpointStats()
+            by_tier = Counter()
+            by_endpoint = Counter()
+            for r in records:
+                totals.add(r.status_code, r.response_time_ms)
+                by_tier[r.tier.value] += 1
+                by_endpoint[r.endpoint] += 1
+            by_tier, by_endpoint = dict(by_tier), dict(by_endpoint)
+        
+        total = totals.count
+        if not total:
             return {"total_requests": 0}
         
-        total = len(records)
-        by_tier = defaultdict(int)
-        by_endpoint = defaultdict(int)
-        avg_response_time = sum(r.response_time_ms for r in records) / total
-        error_count = sum(1 for r in records if r.status_code >= 400)
-        
-        for r in records:
-            by_tier[r.tier.value] += 1
-            by_endpoint[r.endpoint] += 1
-        
         return {
             "total_requests": total,
-            "by_tier": dict(by_tier),
-            "by_endpoint": dict(by_endpoint),
-            "avg_response_time_ms": round(avg_response_time, 2),
-            "error_count": error_count,
-            "error_rate": round(error_count / total * 100, 2) if total else 0,
+            "by_tier": by_tier,
+            "by_endpoint": by_endpoint,
+            "avg_response_time_ms": round(totals.total_time_ms / total, 2),
+            "error_count": totals.error_count,
+            "error_rate": round(totals.error_count / total * 100, 2),
+            "latency_histogram_ms": dict(zip(_histogram_labels(), totals.histogram)),
         }
 
 
@@ -540,7 +751,10 @@ _usage_tracker = UsageTracker()
 __all__ = [
     # Rate limiting
     "RateLimitMiddleware",
+    "RateLimitBackend",
     "RateLimiter",
+    "RedisRateLimiter",
+    "create_rate_limiter",
     "RateLimitConfig",
     "RATE_LIMITS",
     # API keys
@@ -554,4 +768,6 @@ __all__ = [
     # Usage tracking
     "UsageTracker",
     "UsageRecord",
+    "EndpointStats",
+    "LATENCY_BUCKETS_MS",
 ]
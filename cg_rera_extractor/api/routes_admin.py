@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from cg_rera_extractor.api.deps import get_db
 from cg_rera_extractor.api.services import fetch_project_detail
-from cg_rera_extractor.db import Project, ProjectArtifact
+from cg_rera_extractor.db import Project, ProjectArtifact, get_pool_metrics
 from sqlalchemy.orm import Session, selectinload
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -368,4 +368,16 @@ def search_project_by_rera(
     }
 
 
+@router.get("/db/pool")
+def get_db_pool_metrics() -> dict[str, Any]:
+    """
+    Connection pool metrics for every engine in this process.
+
+    Includes checkout/checkin counts, connections currently in use and
+    checkout wait times (total, average, max).
+    """
+
+    return {"engines": get_pool_metrics()}
+
+
 __all__ = ["router"]
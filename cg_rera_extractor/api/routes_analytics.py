@@ -7,7 +7,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from cg_rera_extractor.api.deps import get_db
+from cg_rera_extractor.api.deps import ReadSession, get_read_db
 from cg_rera_extractor.api.schemas_api import (
     PriceTrendResponse,
     TimeframeEnum,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
 @router.get("/price-trends", response_model=PriceTrendResponse)
-def get_price_trends(
+async def get_price_trends(
     *,
     entity_id: int = Query(..., description="Project, Locality, or District ID"),
     entity_type: EntityTypeEnum = Query(
@@ -43,7 +43,7 @@ def get_price_trends(
         None,
         description="Area type for price calculation: carpet, builtup, super_builtup"
     ),
-    db=Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ):
     """
     Get price trend analytics for a project, locality, or district.
@@ -51,7 +51,8 @@ def get_price_trends(
     Returns time-series data showing price movements over the specified timeframe.
     
     ## Parameters
-    - **entity_id**: The ID of the entity to analyze
+    - **entity_id**: The ID of the entity to analyze (for districts, the ID of
+      the district's locality record or any locality within it)
     - **entity_type**: Type of entity (project, locality, district, developer)
     - **timeframe**: How far back to look (1M to 5Y or ALL)
     - **granularity**: Time bucket size (daily to yearly)
@@ -70,16 +71,16 @@ def get_price_trends(
     GET /analytics/price-trends?entity_id=123&timeframe=1Y&granularity=quarterly
     ```
     """
-    # Currently only PROJECT entity type is supported
-    if entity_type != EntityTypeEnum.PROJECT:
+    # Developer trends have no rollup yet
+    if entity_type == EntityTypeEnum.DEVELOPER:
         raise HTTPException(
             status_code=400,
             detail=f"Entity type '{entity_type.value}' not yet supported. "
-                   f"Currently only 'project' is implemented."
+                   f"Use 'project', 'locality' or 'district'."
         )
     
-    result = fetch_price_trends(
-        db=db,
+    result = await read.run(
+        fetch_price_trends,
         entity_id=entity_id,
         entity_type=entity_type,
         timeframe=timeframe,
@@ -97,7 +98,7 @@ def get_price_trends(
 
 
 @router.get("/price-trends/compare")
-def compare_price_trends(
+async def compare_price_trends(
     *,
     entity_ids: str = Query(
         ...,
@@ -106,7 +107,7 @@ def compare_price_trends(
     entity_type: EntityTypeEnum = Query(EntityTypeEnum.PROJECT),
     timeframe: TimeframeEnum = Query(TimeframeEnum.ONE_YEAR),
     granularity: GranularityEnum = Query(GranularityEnum.QUARTERLY),
-    db=Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ):
     """
     Compare price trends across multiple entities.
@@ -133,11 +134,17 @@ def compare_price_trends(
             status_code=400,
             detail="Maximum 10 entities can be compared at once."
         )
+
+    if entity_type == EntityTypeEnum.DEVELOPER:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Entity type '{entity_type.value}' not yet supported."
+        )
     
     results = []
     for entity_id in ids:
-        result = fetch_price_trends(
-            db=db,
+        result = await read.run(
+            fetch_price_trends,
             entity_id=entity_id,
             entity_type=entity_type,
             timeframe=timeframe,
@@ -1,27 +1,50 @@
 """Project-related API routes implementing Phase 6 endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
-from cg_rera_extractor.api.deps import get_db
+from cg_rera_extractor.api.deps import ReadSession, get_db, get_read_db
 from cg_rera_extractor.api.schemas import (
     ProjectDetailV2,
     ProjectDetailV2,
+    ProjectMapClusterResponse,
     ProjectMapResponse,
     ProjectSearchResponse,
     ProjectInventoryResponse,
     InventoryStats,
     UnitResponse,
+    UnitStatusChange,
+)
+from cg_rera_extractor.analysis.export import (
+    EXPORT_FORMATS,
+    ExportFilters,
+    resolve_columns,
+    stream_export,
 )
 from cg_rera_extractor.db import Unit
-from cg_rera_extractor.api.services import fetch_map_projects, fetch_project_detail, search_projects
+from cg_rera_extractor.db.inventory import get_inventory_summary, get_unit_status_history
+from cg_rera_extractor.api.services import (
+    fetch_map_clusters,
+    fetch_map_projects,
+    fetch_project_detail,
+    render_map_tile,
+    search_projects,
+)
+from cg_rera_extractor.api.services.detail import resolve_detail_sections
+from cg_rera_extractor.api.services.map import MAX_TILE_ZOOM
 from cg_rera_extractor.api.services.search import SearchParams
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
+def _split_csv(value: str | None) -> list[str] | None:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+
 @router.get("/search", response_model=ProjectSearchResponse)
-def search_projects_endpoint(
+async def search_projects_endpoint(
     *,
     district: str | None = None,
     tehsil: str | None = None,
@@ -48,7 +71,7 @@ def search_projects_endpoint(
     page_size: int = Query(20, ge=1, le=200),
     sort_by: str = Query("overall_score", pattern="^(overall_score|location_score|amenity_score|value_score|registration_date|distance|price|name)$"),
     sort_dir: str = Query("desc", pattern="^(asc|desc)$"),
-    db=Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ):
     """
     Search projects with advanced filtering.
@@ -119,12 +142,12 @@ def search_projects_endpoint(
         group_by_parent=group_by_parent,
     )
 
-    total, items = search_projects(db, params)
+    total, items = await read.run(search_projects, params)
     return ProjectSearchResponse(page=page, page_size=page_size, total=total, items=items)
 
 
 @router.get("/map", response_model=ProjectMapResponse)
-def map_endpoint(
+async def map_endpoint(
     *,
     bbox: str | None = Query(None),
     lat: float | None = Query(None, ge=-90, le=90),
@@ -133,7 +156,7 @@ def map_endpoint(
     min_overall_score: float | None = Query(None, ge=0, le=1),
     project_type: str | None = None,
     status: str | None = None,
-    db=Depends(get_db),
+    read: ReadSession = Depends(get_read_db),
 ):
     if not bbox and (lat is None or lon is None):
         raise HTTPException(status_code=400, detail="Either bbox or lat/lon must be provided")
@@ -150,8 +173,8 @@ def map_endpoint(
 
     center = (lat, lon) if lat is not None and lon is not None else None
 
-    pins = fetch_map_projects(
-        db,
+    pins = await read.run(
+        fetch_map_projects,
         bbox=bbox_tuple,
         center=center,
         radius_km=radius_km,
@@ -162,37 +185,168 @@ def map_endpoint(
     return ProjectMapResponse(items=pins)
 
 
-@router.get("/{project_id}", response_model=ProjectDetailV2)
-def project_detail_endpoint(project_id: int, db=Depends(get_db)):
+@router.get("/map/clusters", response_model=ProjectMapClusterResponse)
+async def map_clusters_endpoint(
+    *,
+    bbox: str = Query(..., description="min_lat,min_lon,max_lat,max_lon"),
+    zoom: int = Query(..., ge=0, le=MAX_TILE_ZOOM),
+    min_overall_score: float | None = Query(None, ge=0, le=1),
+    status: str | None = None,
+    read: ReadSession = Depends(get_read_db),
+):
+    """
+    Zoom-aware map feed.
+
+    Below the clustering zoom threshold, nearby projects are merged into
+    clusters with a count, centroid and score/price summary; above it the
+    individual pins in the viewport are returned.
+    """
+    try:
+        parts = [float(p) for p in bbox.split(",")]
+        if len(parts) != 4:
+            raise ValueError
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid bbox format") from exc
+
+    return await read.run(
+        fetch_map_clusters,
+        bbox=(parts[0], parts[1], parts[2], parts[3]),
+        zoom=zoom,
+        min_overall_score=min_overall_score,
+        status=status,
+    )
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def map_tile_endpoint(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    min_overall_score: float | None = Query(None, ge=0, le=1),
+    status: str | None = None,
+    read: ReadSession = Depends(get_read_db),
+):
+    """
+    Mapbox Vector Tile with clusters (low zoom) or pins (high zoom).
+
+    Layer ``projects``; features carry ``cluster``, ``point_count`` and
+    summary properties for clusters, or ``project_id``, ``name``,
+    ``overall_score``, ``status`` and ``min_price_total`` for pins.
+    """
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    tile = await read.run(
+        render_map_tile, z, x, y, min_overall_score=min_overall_score, status=status
+    )
+    headers = {"ETag": tile.etag, "Cache-Control": "public, max-age=300"}
+    if request.headers.get("if-none-match") == tile.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=tile.body, media_type=tile.media_type, headers=headers)
+
+
+@router.get("/export")
+def export_projects_endpoint(
+    *,
+    format: str = Query("csv", pattern="^(csv|jsonl|parquet)$"),
+    columns: str | None = Query(None, description="Comma-separated column names"),
+    district: str | None = None,
+    status: str | None = None,
+    min_overall_score: float | None = Query(None, ge=0),
+    scored_only: bool = False,
+    limit: int | None = Query(None, gt=0),
+    db=Depends(get_db),
+):
+    """
+    Stream the project catalogue as CSV, JSON Lines or Parquet.
+
+    Rows are ordered best score first and read page by page with keyset
+    pagination, so the response is chunked and server memory stays flat
+    for full-catalogue exports. Columns are named after the search read
+    model; omit ``columns`` for the default set.
+    """
+    try:
+        names = resolve_columns([c.strip() for c in columns.split(",") if c.strip()] if columns else None)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    filters = ExportFilters(
+        district=district,
+        status=status,
+        min_score=min_overall_score,
+        scored_only=scored_only,
+        limit=limit,
+    )
+    bind = db.get_bind()
+
+    def _body():
+        # The request-scoped session may be closed before streaming finishes
+        with Session(bind=bind) as export_session:
+            yield from stream_export(export_session, format, names, filters)
+
+    try:
+        body = _body()
+        first_chunk = next(body, b"")
+    except RuntimeError as exc:  # e.g. pyarrow missing for parquet
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    def _chunks():
+        yield first_chunk
+        yield from body
+
+    return StreamingResponse(
+        _chunks(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'},
+    )
+
+
+@router.get("/{project_id}", response_model=ProjectDetailV2, response_model_exclude_unset=True)
+async def project_detail_endpoint(
+    project_id: int,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated core sections to return (default: all), "
+        "e.g. project,location,scores",
+    ),
+    include: str | None = Query(
+        None,
+        description="Comma-separated on-demand sections: documents, quarterly_updates, units, schema_org",
+    ),
+    read: ReadSession = Depends(get_read_db),
+):
     """
     Get project details by internal database ID.
     
+    Core sections are served from the precomputed detail document. Heavy
+    sections are only loaded when listed in ``include``, e.g.
+    ``GET /projects/123?fields=project,scores&include=documents,schema_org``.
+    
     For unified identifier lookup (accepts ID or RERA number),
     use GET /projects/lookup/{identifier} instead.
     """
-    project = fetch_project_detail(db, project_id)
+    try:
+        field_names, include_names = resolve_detail_sections(
+            _split_csv(fields), _split_csv(include)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    project = await read.run(
+        fetch_project_detail, project_id, fields=field_names, include=include_names
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
-@router.get("/{project_id}/inventory", response_model=ProjectInventoryResponse)
-def get_project_inventory(project_id: int, db=Depends(get_db)):
-    """
-    Get detailed unit inventory for a project.
-    """
-    from cg_rera_extractor.db import Unit
-
-    units = db.query(Unit).filter(Unit.project_id == project_id).all()
-
-    # Calculate stats
-    total = len(units)
-    available = sum(1 for u in units if (u.status or "").lower() == "available")
-    booked = sum(1 for u in units if (u.status or "").lower() in ["booked", "sold"])
-    unknown = total - available - booked
+def _load_inventory(db: Session, project_id: int, include_units: bool) -> ProjectInventoryResponse:
+    summary = get_inventory_summary(db, project_id)
 
     # Map to response objects with sqft derived if only sqm exists
     unit_responses: list[UnitResponse] = []
+    units = db.query(Unit).filter(Unit.project_id == project_id).all() if include_units else []
     for u in units:
         carpet_area_sqft = None
         if u.carpet_area_sqm:
@@ -211,16 +365,45 @@ def get_project_inventory(project_id: int, db=Depends(get_db)):
         ))
 
     return ProjectInventoryResponse(
-        stats=InventoryStats(
-            total_units=total,
-            available_units=available,
-            booked_units=booked,
-            unknown_units=unknown,
-        ),
+        stats=InventoryStats(**summary["stats"]),
+        blocks=summary["blocks"],
+        unit_types=summary["unit_types"],
         units=unit_responses,
     )
 
 
+@router.get("/{project_id}/inventory", response_model=ProjectInventoryResponse)
+async def get_project_inventory(
+    project_id: int,
+    include_units: bool = Query(True, description="Include the unit list (stats only when false)"),
+    read: ReadSession = Depends(get_read_db),
+):
+    """
+    Get detailed unit inventory for a project.
+
+    Stats and per-block/per-type breakdowns come from the inventory counters
+    maintained by the loader; pass ``include_units=false`` to skip the unit list.
+    """
+    return await read.run(_load_inventory, project_id, include_units)
+
+
+@router.get("/{project_id}/inventory/history", response_model=list[UnitStatusChange])
+async def get_project_inventory_history(
+    project_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    read: ReadSession = Depends(get_read_db),
+):
+    """Recent unit status transitions for a project, newest first."""
+
+    def _load(db: Session) -> list[UnitStatusChange]:
+        return [
+            UnitStatusChange.model_validate(row)
+            for row in get_unit_status_history(db, project_id, limit=limit)
+        ]
+
+    return await read.run(_load)
+
+
 @router.get("/lookup/{identifier}")
 def unified_project_lookup(
     identifier: str,
@@ -1,19 +1,33 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.api.concurrency import run_blocking
+from cg_rera_extractor.api.deps import get_db
 
 router = APIRouter()
 
 class ScoreRequest(BaseModel):
     project_id: str
+    force: bool = False
 
 class ScoreResponse(BaseModel):
     task_id: str
     status: str
+    job_id: int | None = None
+
+@router.post("/score/project", response_model=ScoreResponse, status_code=202)
+async def score_project(request: ScoreRequest, db: Session = Depends(get_db)):
+    # Queue an idempotent scoring job (see ai.jobs); poll /ai/jobs/{job_id}
+    from ai.jobs import submit_job
+
+    def _submit() -> ScoreResponse:
+        job, _ = submit_job(db, "score", int(request.project_id), force=request.force)
+        return ScoreResponse(task_id=job.task_id or "", status=job.status, job_id=job.id)
 
-@router.post("/score/project", response_model=ScoreResponse)
-async def score_project(request: ScoreRequest, background_tasks: BackgroundTasks):
-    # Dispatch the task to Celery
-    from cg_rera_extractor.worker import score_project_task
-    task = score_project_task.delay(request.project_id)
-    
-    return ScoreResponse(task_id=task.id, status="queued")
+    try:
+        return await run_blocking(_submit)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
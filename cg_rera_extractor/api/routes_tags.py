@@ -11,9 +11,10 @@ from __future__ import annotations
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from cg_rera_extractor.api.deps import get_db
+from cg_rera_extractor.api.deps import ReadSession, get_read_db
 from cg_rera_extractor.api.schemas_discovery import (
     FacetedTagsResponse,
     LandmarkResponse,
@@ -39,7 +40,7 @@ from cg_rera_extractor.api.services.discovery import (
     get_projects_near_landmark,
     get_verification_history,
 )
-from cg_rera_extractor.db import Project
+from cg_rera_extractor.db import Project, ProjectScores
 from cg_rera_extractor.db.models_discovery import Landmark
 
 router = APIRouter(prefix="/discovery", tags=["discovery-trust"])
@@ -50,8 +51,8 @@ router = APIRouter(prefix="/discovery", tags=["discovery-trust"])
 # =============================================================================
 
 @router.get("/tags", response_model=list[TagResponse])
-def list_tags(
-    session: Annotated[Session, Depends(get_db)],
+async def list_tags(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     active_only: bool = Query(True, description="Only return active tags"),
     category: str | None = Query(None, description="Filter by category slug"),
 ):
@@ -73,13 +74,16 @@ def list_tags(
                 detail=f"Invalid category: {category}. Valid values: {[c.value for c in TagCategory]}"
             )
     
-    tags = get_all_tags(session, active_only=active_only, category=cat_enum)
-    return [TagResponse.model_validate(t) for t in tags]
+    def _load(session: Session) -> list[TagResponse]:
+        tags = get_all_tags(session, active_only=active_only, category=cat_enum)
+        return [TagResponse.model_validate(t) for t in tags]
+
+    return await read.run(_load)
 
 
 @router.get("/tags/faceted", response_model=FacetedTagsResponse)
-def get_faceted_search_tags(
-    session: Annotated[Session, Depends(get_db)],
+async def get_faceted_search_tags(
+    read: Annotated[ReadSession, Depends(get_read_db)],
 ):
     """
     Get tags organized for faceted search UI.
@@ -105,12 +109,12 @@ def get_faceted_search_tags(
     }
     ```
     """
-    return get_faceted_tags(session)
+    return await read.run(get_faceted_tags)
 
 
 @router.get("/projects/{project_id}/tags", response_model=ProjectTagsResponse)
-def get_project_tag_list(
-    session: Annotated[Session, Depends(get_db)],
+async def get_project_tag_list(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
 ):
     """
@@ -119,7 +123,7 @@ def get_project_tag_list(
     Each tag includes metadata like whether it was auto-applied
     and any computed values (e.g., distance for proximity tags).
     """
-    tags = get_project_tags(session, project_id)
+    tags = await read.run(get_project_tags, project_id)
     return ProjectTagsResponse(
         project_id=project_id,
         tags=tags,
@@ -132,8 +136,8 @@ def get_project_tag_list(
 # =============================================================================
 
 @router.get("/projects/{project_id}/verification", response_model=ReraVerificationResponse | None)
-def get_verification_status(
-    session: Annotated[Session, Depends(get_db)],
+async def get_verification_status(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
 ):
     """
@@ -141,15 +145,18 @@ def get_verification_status(
     
     Returns the most recent verification record with full details.
     """
-    verification = get_project_verification(session, project_id)
-    if verification:
-        return ReraVerificationResponse.model_validate(verification)
-    return None
+    def _load(session: Session) -> ReraVerificationResponse | None:
+        verification = get_project_verification(session, project_id)
+        if verification:
+            return ReraVerificationResponse.model_validate(verification)
+        return None
+
+    return await read.run(_load)
 
 
 @router.get("/projects/{project_id}/trust-badge", response_model=TrustBadge)
-def get_trust_badge(
-    session: Annotated[Session, Depends(get_db)],
+async def get_trust_badge(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
 ):
     """
@@ -168,16 +175,18 @@ def get_trust_badge(
     - REVOKED/EXPIRED/NOT_FOUND: Red (#EF4444)
     - UNKNOWN: Gray (#9CA3AF)
     """
-    # Get project's RERA number for context
-    project = session.get(Project, project_id)
-    rera_number = project.rera_registration_number if project else None
-    
-    return get_project_trust_badge(session, project_id, rera_number)
+    def _load(session: Session) -> TrustBadge:
+        # Get project's RERA number for context
+        project = session.get(Project, project_id)
+        rera_number = project.rera_registration_number if project else None
+        return get_project_trust_badge(session, project_id, rera_number)
+
+    return await read.run(_load)
 
 
 @router.get("/projects/{project_id}/verification/history", response_model=list[ReraVerificationResponse])
-def get_verification_history_endpoint(
-    session: Annotated[Session, Depends(get_db)],
+async def get_verification_history_endpoint(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
     limit: int = Query(10, ge=1, le=100, description="Max records to return"),
 ):
@@ -187,8 +196,11 @@ def get_verification_history_endpoint(
     Returns all verification records ordered by date (newest first).
     Useful for audit trails and tracking status changes over time.
     """
-    history = get_verification_history(session, project_id, limit=limit)
-    return [ReraVerificationResponse.model_validate(v) for v in history]
+    def _load(session: Session) -> list[ReraVerificationResponse]:
+        history = get_verification_history(session, project_id, limit=limit)
+        return [ReraVerificationResponse.model_validate(v) for v in history]
+
+    return await read.run(_load)
 
 
 # =============================================================================
@@ -196,8 +208,8 @@ def get_verification_history_endpoint(
 # =============================================================================
 
 @router.get("/landmarks", response_model=list[LandmarkSummary])
-def list_landmarks(
-    session: Annotated[Session, Depends(get_db)],
+async def list_landmarks(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     category: str | None = Query(None, description="Filter by category (mall, tech_park, metro_station, etc.)"),
     city: str | None = Query(None, description="Filter by city"),
     limit: int = Query(100, ge=1, le=500),
@@ -215,8 +227,6 @@ def list_landmarks(
     - `school`: Schools and universities
     - `bus_stand`: Bus stations
     """
-    from sqlalchemy import select
-    
     query = select(Landmark).where(Landmark.is_active == True)
     
     if category:
@@ -226,30 +236,35 @@ def list_landmarks(
     
     query = query.order_by(Landmark.importance_score.desc()).limit(limit)
     
-    result = session.execute(query)
-    landmarks = result.scalars().all()
-    
-    return [LandmarkSummary.model_validate(lm) for lm in landmarks]
+    def _load(session: Session) -> list[LandmarkSummary]:
+        landmarks = session.execute(query).scalars().all()
+        return [LandmarkSummary.model_validate(lm) for lm in landmarks]
+
+    return await read.run(_load)
 
 
 @router.get("/landmarks/{slug}", response_model=LandmarkResponse)
-def get_landmark_detail(
-    session: Annotated[Session, Depends(get_db)],
+async def get_landmark_detail(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     slug: str = Path(..., description="Landmark slug"),
 ):
     """
     Get detailed information about a specific landmark.
     """
-    landmark = get_landmark_by_slug(session, slug)
+    def _load(session: Session) -> LandmarkResponse | None:
+        landmark = get_landmark_by_slug(session, slug)
+        return LandmarkResponse.model_validate(landmark) if landmark else None
+
+    landmark = await read.run(_load)
     if not landmark:
         raise HTTPException(status_code=404, detail="Landmark not found")
     
-    return LandmarkResponse.model_validate(landmark)
+    return landmark
 
 
 @router.get("/landmarks/{slug}/projects", response_model=NearbyProjectsResponse)
-def get_projects_near_landmark_endpoint(
-    session: Annotated[Session, Depends(get_db)],
+async def get_projects_near_landmark_endpoint(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     slug: str = Path(..., description="Landmark slug"),
     max_distance_km: float = Query(10.0, ge=0.1, le=50.0, description="Maximum distance in km"),
     limit: int = Query(50, ge=1, le=200),
@@ -261,55 +276,58 @@ def get_projects_near_landmark_endpoint(
     - "Projects near Hinjewadi IT Park"
     - "Apartments near Metro Station"
     """
-    landmark = get_landmark_by_slug(session, slug)
-    if not landmark:
-        raise HTTPException(status_code=404, detail="Landmark not found")
-    
-    # Get project IDs and distances
-    project_distances = get_projects_near_landmark(
-        session, 
-        landmark.id, 
-        max_distance_km=max_distance_km,
-        limit=limit,
-    )
-    
-    # Fetch project details
-    from cg_rera_extractor.db import ProjectScores
-    from sqlalchemy import select
-    
-    projects = []
-    for project_id, distance_km in project_distances:
-        project = session.get(Project, project_id)
-        if project:
-            # Get score
-            score_query = select(ProjectScores.overall_score).where(ProjectScores.project_id == project_id)
-            score_result = session.execute(score_query).scalar_one_or_none()
-            
-            projects.append(
-                ProjectNearLandmark(
-                    project_id=project.id,
-                    project_name=project.project_name,
-                    rera_number=project.rera_registration_number,
-                    distance_km=distance_km,
-                    lat=project.latitude or 0,
-                    lon=project.longitude or 0,
-                    overall_score=score_result,
-                    min_price_total=None,  # Could add price lookup
+    def _load(session: Session) -> NearbyProjectsResponse | None:
+        landmark = get_landmark_by_slug(session, slug)
+        if not landmark:
+            return None
+
+        # Get project IDs and distances
+        project_distances = get_projects_near_landmark(
+            session, 
+            landmark.id, 
+            max_distance_km=max_distance_km,
+            limit=limit,
+        )
+
+        # Fetch project details
+        projects = []
+        for project_id, distance_km in project_distances:
+            project = session.get(Project, project_id)
+            if project:
+                # Get score
+                score_query = select(ProjectScores.overall_score).where(ProjectScores.project_id == project_id)
+                score_result = session.execute(score_query).scalar_one_or_none()
+
+                projects.append(
+                    ProjectNearLandmark(
+                        project_id=project.id,
+                        project_name=project.project_name,
+                        rera_number=project.rera_registration_number,
+                        distance_km=distance_km,
+                        lat=project.latitude or 0,
+                        lon=project.longitude or 0,
+                        overall_score=score_result,
+                        min_price_total=None,  # Could add price lookup
+                    )
                 )
-            )
-    
-    return NearbyProjectsResponse(
-        landmark_id=landmark.id,
-        landmark_name=landmark.name,
-        landmark_slug=landmark.slug,
-        projects=projects,
-        total_count=len(projects),
-    )
+
+        return NearbyProjectsResponse(
+            landmark_id=landmark.id,
+            landmark_name=landmark.name,
+            landmark_slug=landmark.slug,
+            projects=projects,
+            total_count=len(projects),
+        )
+
+    response = await read.run(_load)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Landmark not found")
+    return response
 
 
 @router.get("/projects/{project_id}/landmarks", response_model=ProjectLandmarksResponse)
-def get_project_nearby_landmarks(
-    session: Annotated[Session, Depends(get_db)],
+async def get_project_nearby_landmarks(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
     max_distance_km: float = Query(10.0, ge=0.1, le=50.0, description="Maximum distance in km"),
 ):
@@ -321,7 +339,7 @@ def get_project_nearby_landmarks(
     - Driving/walking time estimates (if available)
     - Highlighted landmarks for prominent display
     """
-    return get_project_landmarks(session, project_id, max_distance_km=max_distance_km)
+    return await read.run(get_project_landmarks, project_id, max_distance_km=max_distance_km)
 
 
 # =============================================================================
@@ -329,8 +347,8 @@ def get_project_nearby_landmarks(
 # =============================================================================
 
 @router.get("/projects/{project_id}/full", response_model=ProjectDiscoveryData)
-def get_full_discovery_data(
-    session: Annotated[Session, Depends(get_db)],
+async def get_full_discovery_data(
+    read: Annotated[ReadSession, Depends(get_read_db)],
     project_id: int = Path(..., description="Project ID"),
 ):
     """
@@ -344,15 +362,20 @@ def get_full_discovery_data(
     This is the recommended endpoint for project detail pages
     to get all discovery/trust data in a single request.
     """
-    project = session.get(Project, project_id)
-    if not project:
+    def _load(session: Session) -> ProjectDiscoveryData | None:
+        project = session.get(Project, project_id)
+        if not project:
+            return None
+        return get_project_discovery_data(
+            session, 
+            project_id, 
+            project.rera_registration_number,
+        )
+
+    data = await read.run(_load)
+    if data is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    return get_project_discovery_data(
-        session, 
-        project_id, 
-        project.rera_registration_number,
-    )
+    return data
 
 
 # Export router
@@ -1,7 +1,7 @@
 """Pydantic models for API responses."""
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 
@@ -173,6 +173,28 @@ class ProjectMapResponse(BaseModel):
     items: list[ProjectMapPin]
 
 
+class ProjectMapCluster(BaseModel):
+    """Group of nearby projects shown as one marker at low zoom."""
+
+    cluster_id: str
+    count: int
+    lat: float
+    lon: float
+    min_overall_score: float | None = None
+    avg_overall_score: float | None = None
+    max_overall_score: float | None = None
+    min_price_total: float | None = None
+    expansion_zoom: int
+
+
+class ProjectMapClusterResponse(BaseModel):
+    """Zoom-aware map feed: clusters at low zoom, individual pins at high zoom."""
+
+    zoom: int
+    clusters: list[ProjectMapCluster]
+    pins: list[ProjectMapPin]
+
+
 class ScoreFactorsDetail(BaseModel):
     """Strong and weak factors for a score category."""
     
@@ -196,18 +218,6 @@ class ScoreExplanation(BaseModel):
     factors: ScoreExplanationFactors | None = None
 
 
-class ProjectDetailV2(BaseModel):
-    """Phase 6 project detail payload."""
-
-    project: dict[str, Any]
-    location: dict[str, Any]
-    scores: dict[str, Any]
-    amenities: dict[str, Any]
-    pricing: dict[str, Any] | None = None
-    qa: dict[str, Any]
-    score_explanation: ScoreExplanation | None = None
-
-
 class UnitResponse(BaseModel):
     """Individual unit inventory record."""
     model_config = ConfigDict(from_attributes=True)
@@ -225,15 +235,57 @@ class UnitResponse(BaseModel):
     raw_data: dict[str, Any] | None = None
 
 
+class ProjectDetailV2(BaseModel):
+    """Phase 6 project detail payload.
+
+    Sections are omitted when excluded with ``fields=``; ``documents``,
+    ``quarterly_updates``, ``units`` and ``schema_org`` appear only when
+    requested with ``include=``.
+    """
+
+    project: dict[str, Any] | None = None
+    location: dict[str, Any] | None = None
+    scores: dict[str, Any] | None = None
+    amenities: dict[str, Any] | None = None
+    pricing: dict[str, Any] | None = None
+    qa: dict[str, Any] | None = None
+    score_explanation: ScoreExplanation | None = None
+    provenance: dict[str, Any] | None = None
+    documents: list[ProjectDocument] | None = None
+    quarterly_updates: list[QuarterlyUpdate] | None = None
+    units: list[UnitResponse] | None = None
+    schema_org: dict[str, Any] | None = None
+
+
 class InventoryStats(BaseModel):
     """Aggregated inventory statistics."""
     total_units: int = 0
     available_units: int = 0
     booked_units: int = 0
     unknown_units: int = 0
+    sold_percent: float | None = None
+
+
+class InventoryBreakdown(InventoryStats):
+    """Inventory statistics for one block or unit type."""
+    name: str
 
 
 class ProjectInventoryResponse(BaseModel):
-    """Full inventory response with stats and list."""
+    """Full inventory response with stats, breakdowns and list."""
     stats: InventoryStats
+    blocks: list[InventoryBreakdown] = Field(default_factory=list)
+    unit_types: list[InventoryBreakdown] = Field(default_factory=list)
     units: list[UnitResponse] = Field(default_factory=list)
+
+
+class UnitStatusChange(BaseModel):
+    """One unit status transition; ``None`` marks appearance/removal."""
+    model_config = ConfigDict(from_attributes=True)
+
+    unit_id: int | None = None
+    unit_key: str
+    old_status: str | None = None
+    new_status: str | None = None
+    observed_at: datetime
+    run_id: str | None = None
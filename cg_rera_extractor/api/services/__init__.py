@@ -1,7 +1,7 @@
 """Service layer for project API endpoints."""
 
-from .detail import fetch_project_detail
-from .map import fetch_map_projects
+from .detail import fetch_project_detail, refresh_detail_documents
+from .map import fetch_map_clusters, fetch_map_projects, render_map_tile
 from .search import search_projects
 from .analytics import fetch_price_trends
 from .access import process_brochure_access, SignedUrlGenerator
@@ -10,7 +10,10 @@ from .jsonld import generate_project_jsonld, generate_project_jsonld_from_db
 __all__ = [
     "search_projects",
     "fetch_project_detail",
+    "refresh_detail_documents",
     "fetch_map_projects",
+    "fetch_map_clusters",
+    "render_map_tile",
     "fetch_price_trends",
     "process_brochure_access",
     "SignedUrlGenerator",
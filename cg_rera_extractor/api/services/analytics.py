@@ -1,16 +1,25 @@
 """
 Price Trends Analytics Service (Point 13).
 
-Aggregates historical pricing data into time-series for analytics.
+Serves price time-series from the ``price_trend_rollups`` table, which the
+loader and pricing jobs refresh whenever snapshots land.
 """
 from __future__ import annotations
 
 from datetime import date, timedelta
 from typing import Any
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from cg_rera_extractor.db import Project, ProjectPricingSnapshot
+from cg_rera_extractor.db import PriceTrendRollup, Project
+from cg_rera_extractor.db.models_discovery import Locality
+from cg_rera_extractor.db.price_rollups import (
+    ALL_UNIT_TYPES,
+    district_key,
+    period_start,
+    project_group_key,
+)
 from cg_rera_extractor.api.schemas_api import (
     PriceTrendDataPoint,
     PriceTrendResponse,
@@ -55,95 +64,44 @@ def _get_period_label(period_start: date, granularity: GranularityEnum) -> str:
     return period_start.isoformat()
 
 
-def _get_period_bounds(period_start: date, granularity: GranularityEnum) -> tuple[date, date]:
-    """Get the start and end dates for a period."""
-    if granularity == GranularityEnum.DAILY:
-        return period_start, period_start
-    elif granularity == GranularityEnum.WEEKLY:
-        # Week starts on Monday
-        week_start = period_start - timedelta(days=period_start.weekday())
-        week_end = week_start + timedelta(days=6)
-        return week_start, week_end
-    elif granularity == GranularityEnum.MONTHLY:
-        month_start = period_start.replace(day=1)
-        if month_start.month == 12:
-            month_end = date(month_start.year + 1, 1, 1) - timedelta(days=1)
-        else:
-            month_end = date(month_start.year, month_start.month + 1, 1) - timedelta(days=1)
-        return month_start, month_end
-    elif granularity == GranularityEnum.QUARTERLY:
-        quarter = (period_start.month - 1) // 3
-        quarter_start = date(period_start.year, quarter * 3 + 1, 1)
-        if quarter == 3:
-            quarter_end = date(period_start.year + 1, 1, 1) - timedelta(days=1)
-        else:
-            quarter_end = date(period_start.year, (quarter + 1) * 3 + 1, 1) - timedelta(days=1)
-        return quarter_start, quarter_end
-    elif granularity == GranularityEnum.YEARLY:
-        year_start = date(period_start.year, 1, 1)
-        year_end = date(period_start.year, 12, 31)
-        return year_start, year_end
-    
-    return period_start, period_start
-
+def _resolve_entity(
+    db: Session, entity_id: int, entity_type: EntityTypeEnum
+) -> tuple[str, str, DataProvenance] | None:
+    """Map an API entity to its rollup key, display name and provenance."""
+    if entity_type == EntityTypeEnum.PROJECT:
+        project = db.get(Project, entity_id)
+        if not project:
+            return None
+        return (
+            project_group_key(project.id, project.parent_project_id),
+            project.project_name,
+            DataProvenance(
+                last_updated_at=project.scraped_at,
+                source_domain="rera.cg.gov.in",
+                extraction_method=ExtractionMethodEnum.SCRAPER,
+                data_quality_score=project.data_quality_score,
+            ),
+        )
 
-def _aggregate_snapshots_for_period(
-    snapshots: list[ProjectPricingSnapshot],
-    period_start: date,
-    period_end: date,
-) -> dict[str, Any] | None:
-    """Aggregate pricing snapshots within a period."""
-    period_snapshots = [
-        s for s in snapshots
-        if s.snapshot_date and period_start <= s.snapshot_date <= period_end
-    ]
-    
-    if not period_snapshots:
-        return None
-    
-    # Collect price values
-    prices_per_sqft = [
-        float(s.min_price_per_sqft) for s in period_snapshots
-        if s.min_price_per_sqft is not None
-    ]
-    prices_per_sqft.extend([
-        float(s.max_price_per_sqft) for s in period_snapshots
-        if s.max_price_per_sqft is not None
-    ])
-    
-    total_prices = [
-        float(s.min_price_total) for s in period_snapshots
-        if s.min_price_total is not None
-    ]
-    total_prices.extend([
-        float(s.max_price_total) for s in period_snapshots
-        if s.max_price_total is not None
-    ])
-    
-    if not prices_per_sqft and not total_prices:
-        return None
-    
-    result: dict[str, Any] = {
-        "sample_size": len(period_snapshots),
-    }
-    
-    if prices_per_sqft:
-        prices_per_sqft.sort()
-        result["avg_price_per_sqft"] = sum(prices_per_sqft) / len(prices_per_sqft)
-        result["min_price_per_sqft"] = min(prices_per_sqft)
-        result["max_price_per_sqft"] = max(prices_per_sqft)
-        mid = len(prices_per_sqft) // 2
-        result["median_price_per_sqft"] = (
-            prices_per_sqft[mid] if len(prices_per_sqft) % 2 == 1
-            else (prices_per_sqft[mid - 1] + prices_per_sqft[mid]) / 2
+    if entity_type in (EntityTypeEnum.LOCALITY, EntityTypeEnum.DISTRICT):
+        locality = db.get(Locality, entity_id)
+        if not locality:
+            return None
+        provenance = DataProvenance(
+            last_updated_at=locality.updated_at or locality.created_at,
+            source_domain="rera.cg.gov.in",
+            extraction_method=ExtractionMethodEnum.SCRAPER,
         )
-    
-    if total_prices:
-        result["avg_total_price"] = sum(total_prices) / len(total_prices)
-        result["min_total_price"] = min(total_prices)
-        result["max_total_price"] = max(total_prices)
-    
-    return result
+        if entity_type == EntityTypeEnum.LOCALITY:
+            return str(locality.id), locality.name, provenance
+        # Districts are addressed through their locality row (or any locality in them)
+        district_name = locality.district or locality.name
+        key = district_key(district_name)
+        if key is None:
+            return None
+        return key, district_name, provenance
+
+    return None
 
 
 def fetch_price_trends(
@@ -157,130 +115,65 @@ def fetch_price_trends(
     """
     Fetch price trend data for a project, locality, or district.
     
-    Aggregates historical pricing snapshots into time-series data points.
+    Reads pre-aggregated periods from ``price_trend_rollups``; registrations
+    sharing a parent project share one series.
     """
-    # For now, only PROJECT entity type is implemented
-    if entity_type != EntityTypeEnum.PROJECT:
-        # TODO: Implement locality/district aggregation
-        return None
-    
-    # Fetch the project
-    project = db.query(Project).filter(Project.id == entity_id).first()
-    if not project:
+    resolved = _resolve_entity(db, entity_id, entity_type)
+    if resolved is None:
         return None
-    
-    # Determine project IDs to include (all registrations for the same parent)
-    project_ids = [entity_id]
-    if project.parent_project_id:
-        related_ids = (
-            db.query(Project.id)
-            .filter(Project.parent_project_id == project.parent_project_id)
-            .all()
-        )
-        project_ids = [r[0] for r in related_ids]
+    entity_key, entity_name, provenance = resolved
 
     # Determine date range
-    start_date = _get_timeframe_start(timeframe)
     end_date = date.today()
-    
-    # Fetch all pricing snapshots in range
-    query = (
-        db.query(ProjectPricingSnapshot)
-        .filter(
-            ProjectPricingSnapshot.project_id.in_(project_ids),
-            ProjectPricingSnapshot.is_active == True,
-            ProjectPricingSnapshot.snapshot_date >= start_date,
-            ProjectPricingSnapshot.snapshot_date <= end_date,
+    first_period = period_start(_get_timeframe_start(timeframe), granularity.value)
+
+    rollups = db.execute(
+        select(PriceTrendRollup)
+        .where(
+            PriceTrendRollup.entity_type == entity_type.value,
+            PriceTrendRollup.entity_key == entity_key,
+            PriceTrendRollup.granularity == granularity.value,
+            PriceTrendRollup.unit_type_label == (unit_type or ALL_UNIT_TYPES),
+            PriceTrendRollup.period_start >= first_period,
+            PriceTrendRollup.period_start <= end_date,
         )
-    )
-    
-    if unit_type:
-        query = query.filter(ProjectPricingSnapshot.unit_type_label == unit_type)
-    
-    snapshots = query.order_by(ProjectPricingSnapshot.snapshot_date).all()
-    
-    if not snapshots:
-        # Return empty response with metadata
-        return PriceTrendResponse(
-            entity_id=entity_id,
-            entity_type=entity_type,
-            entity_name=project.project_name,
-            timeframe=timeframe,
-            granularity=granularity,
-            trend_data=[],
-            data_points_count=0,
-            provenance=DataProvenance(
-                last_updated_at=project.scraped_at,
-                source_domain="rera.cg.gov.in",
-                extraction_method=ExtractionMethodEnum.SCRAPER,
-                data_quality_score=project.data_quality_score,
-            ),
-        )
-    
-    # Group snapshots into periods
+        .order_by(PriceTrendRollup.period_start)
+    ).scalars().all()
+
     trend_data: list[PriceTrendDataPoint] = []
     previous_avg: float | None = None
-    
-    # Generate periods
-    current_date = start_date
-    while current_date <= end_date:
-        period_start, period_end = _get_period_bounds(current_date, granularity)
-        
-        # Ensure we don't go past end_date
-        if period_start > end_date:
-            break
-        
-        aggregated = _aggregate_snapshots_for_period(snapshots, period_start, period_end)
-        
-        if aggregated:
-            current_avg = aggregated.get("avg_price_per_sqft")
-            
-            # Calculate change from previous period
-            change_pct = None
-            change_abs = None
-            if previous_avg and current_avg:
-                change_abs = current_avg - previous_avg
-                change_pct = (change_abs / previous_avg) * 100
-            
-            data_point = PriceTrendDataPoint(
-                period=_get_period_label(period_start, granularity),
-                period_start=period_start,
-                period_end=period_end,
-                avg_price_per_sqft=aggregated.get("avg_price_per_sqft"),
-                min_price_per_sqft=aggregated.get("min_price_per_sqft"),
-                max_price_per_sqft=aggregated.get("max_price_per_sqft"),
-                median_price_per_sqft=aggregated.get("median_price_per_sqft"),
-                avg_total_price=aggregated.get("avg_total_price"),
-                min_total_price=aggregated.get("min_total_price"),
-                max_total_price=aggregated.get("max_total_price"),
-                sample_size=aggregated.get("sample_size"),
+
+    for rollup in rollups:
+        current_avg = _to_float(rollup.avg_price_per_sqft)
+
+        # Calculate change from previous period
+        change_pct = None
+        change_abs = None
+        if previous_avg and current_avg:
+            change_abs = current_avg - previous_avg
+            change_pct = (change_abs / previous_avg) * 100
+
+        trend_data.append(
+            PriceTrendDataPoint(
+                period=_get_period_label(rollup.period_start, granularity),
+                period_start=rollup.period_start,
+                period_end=rollup.period_end,
+                avg_price_per_sqft=current_avg,
+                min_price_per_sqft=_to_float(rollup.min_price_per_sqft),
+                max_price_per_sqft=_to_float(rollup.max_price_per_sqft),
+                median_price_per_sqft=_to_float(rollup.median_price_per_sqft),
+                avg_total_price=_to_float(rollup.avg_total_price),
+                min_total_price=_to_float(rollup.min_total_price),
+                max_total_price=_to_float(rollup.max_total_price),
+                sample_size=rollup.sample_size,
                 change_pct=round(change_pct, 2) if change_pct else None,
                 change_abs=round(change_abs, 2) if change_abs else None,
-                confidence_level="high" if aggregated.get("sample_size", 0) >= 3 else "low",
+                confidence_level="high" if rollup.sample_size >= 3 else "low",
             )
-            trend_data.append(data_point)
+        )
+        if current_avg is not None:
             previous_avg = current_avg
-        
-        # Move to next period
-        if granularity == GranularityEnum.DAILY:
-            current_date += timedelta(days=1)
-        elif granularity == GranularityEnum.WEEKLY:
-            current_date += timedelta(weeks=1)
-        elif granularity == GranularityEnum.MONTHLY:
-            if current_date.month == 12:
-                current_date = date(current_date.year + 1, 1, 1)
-            else:
-                current_date = date(current_date.year, current_date.month + 1, 1)
-        elif granularity == GranularityEnum.QUARTERLY:
-            month = current_date.month + 3
-            year = current_date.year
-            if month > 12:
-                month -= 12
-                year += 1
-            current_date = date(year, month, 1)
-        elif granularity == GranularityEnum.YEARLY:
-            current_date = date(current_date.year + 1, 1, 1)
-    
+
     # Calculate summary statistics
     all_avgs = [dp.avg_price_per_sqft for dp in trend_data if dp.avg_price_per_sqft]
     current_avg_price = all_avgs[-1] if all_avgs else None
@@ -297,7 +190,7 @@ def fetch_price_trends(
     return PriceTrendResponse(
         entity_id=entity_id,
         entity_type=entity_type,
-        entity_name=project.project_name,
+        entity_name=entity_name,
         timeframe=timeframe,
         granularity=granularity,
         trend_data=trend_data,
@@ -308,13 +201,12 @@ def fetch_price_trends(
         data_points_count=len(trend_data),
         earliest_date=earliest,
         latest_date=latest,
-        provenance=DataProvenance(
-            last_updated_at=project.scraped_at,
-            source_domain="rera.cg.gov.in",
-            extraction_method=ExtractionMethodEnum.SCRAPER,
-            data_quality_score=project.data_quality_score,
-        ),
+        provenance=provenance,
     )
 
 
+def _to_float(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
 __all__ = ["fetch_price_trends"]
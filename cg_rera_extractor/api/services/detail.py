@@ -1,17 +1,76 @@
-"""Project detail service assembling enriched payloads."""
+"""Project detail service assembling enriched payloads.
+
+The core detail payload (project, location, scores, amenities, pricing, QA,
+score explanation, provenance and the JSON-LD block) is precomputed per
+project into ``project_detail_documents`` by :func:`refresh_detail_documents`,
+which the ETL runs after scoring. Writers drop the documents of the projects
+they change, so :func:`fetch_project_detail` serves a stored document
+whenever one exists and assembles it live otherwise.
+
+Heavy sections are loaded only on request: ``documents``,
+``quarterly_updates`` and ``units`` are queried when included, and
+``schema_org`` is stripped from the document unless included.
+"""
 from __future__ import annotations
 
-from typing import Any
+import logging
+from typing import Any, Iterable, Sequence
 
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
 from cg_rera_extractor.amenities.value_scoring import compute_value_score, get_value_bucket
 from cg_rera_extractor.analysis.explain import explain_project_score
-from cg_rera_extractor.db import Project, ProjectAmenityStats, ProjectScores
+from cg_rera_extractor.api.schemas import (
+    ProjectDocument as ProjectDocumentSchema,
+    QuarterlyUpdate as QuarterlyUpdateSchema,
+    UnitResponse,
+)
+from cg_rera_extractor.db import (
+    Project,
+    ProjectAmenityStats,
+    ProjectDetailDocument,
+    ProjectDocument,
+    ProjectScores,
+    QuarterlyUpdate,
+    Unit,
+    get_data_version,
+)
 
 from .search import _nearby_counts, _onsite_amenities, _resolve_location, _score_to_float, _get_latest_price
 from .jsonld import generate_project_jsonld
 
+logger = logging.getLogger(__name__)
+
+# Sections stored in the precomputed document
+DETAIL_SECTIONS: tuple[str, ...] = (
+    "project",
+    "location",
+    "scores",
+    "amenities",
+    "pricing",
+    "qa",
+    "score_explanation",
+    "provenance",
+)
+
+# Sections returned only when requested with ``include=``
+ON_DEMAND_SECTIONS: tuple[str, ...] = ("documents", "quarterly_updates", "units", "schema_org")
+
+# Relationships the document builder reads
+_DOCUMENT_LOADS = (
+    selectinload(Project.score),
+    selectinload(Project.amenity_stats),
+    selectinload(Project.locations),
+    selectinload(Project.promoters),
+    selectinload(Project.unit_types),
+    selectinload(Project.pricing_snapshots),
+    selectinload(Project.project_unit_types),
+)
+
+DEFAULT_REFRESH_BATCH = 200
+
 
 def _build_amenities_section(stats: list[ProjectAmenityStats]) -> dict[str, Any]:
     onsite_list = [s.amenity_type for s in stats if s.radius_km is None and s.onsite_available]
@@ -30,29 +89,8 @@ def _build_amenities_section(stats: list[ProjectAmenityStats]) -> dict[str, Any]
     }
 
 
-def fetch_project_detail(db: Session, project_id: int) -> dict[str, Any] | None:
-    """Return a project detail payload or ``None`` if missing."""
-
-    project = (
-        db.query(Project)
-        .options(
-            selectinload(Project.score),
-            selectinload(Project.amenity_stats),
-            selectinload(Project.locations),
-            selectinload(Project.promoters),
-            selectinload(Project.buildings),
-            selectinload(Project.unit_types),
-            selectinload(Project.documents),
-            selectinload(Project.quarterly_updates),
-            selectinload(Project.pricing_snapshots),
-            selectinload(Project.project_unit_types),
-        )
-        .filter(Project.id == project_id)
-        .one_or_none()
-    )
-
-    if not project:
-        return None
+def build_detail_document(db: Session, project: Project) -> dict[str, Any]:
+    """Assemble the JSON-safe detail document for a loaded ``project``."""
 
     lat, lon, quality = _resolve_location(project)
     scores: ProjectScores | None = project.score
@@ -95,7 +133,7 @@ def fetch_project_detail(db: Session, project_id: int) -> dict[str, Any] | None:
             unit_types.append({
                 "label": ut.type_name,
                 "bedrooms": None, # Old schema doesn't have bedrooms explicitly
-                "area_range": [float(ut.carpet_area_sqmt * 10.764) if ut.carpet_area_sqmt else None, None], # Convert sqmt to sqft
+                "area_range": [float(ut.carpet_area_sqmt) * 10.764 if ut.carpet_area_sqmt else None, None], # Convert sqmt to sqft
             })
 
     other_registrations = []
@@ -114,7 +152,7 @@ def fetch_project_detail(db: Session, project_id: int) -> dict[str, Any] | None:
                 "registration_date": other.approved_date.isoformat() if other.approved_date else None,
             })
 
-    payload: dict[str, Any] = {
+    document: dict[str, Any] = {
         "project": {
             "project_id": project.id,
             "parent_project_id": project.parent_project_id,
@@ -180,7 +218,138 @@ def fetch_project_detail(db: Session, project_id: int) -> dict[str, Any] | None:
         ).model_dump(by_alias=True, exclude_none=True),
     }
 
+    return jsonable_encoder(document)
+
+
+def _load_projects(db: Session, project_ids: Sequence[int]) -> list[Project]:
+    return list(
+        db.scalars(select(Project).options(*_DOCUMENT_LOADS).where(Project.id.in_(project_ids)))
+    )
+
+
+def refresh_detail_documents(
+    db: Session,
+    project_ids: Iterable[int] | None = None,
+    batch_size: int = DEFAULT_REFRESH_BATCH,
+) -> int:
+    """Rebuild detail documents at the current data version; returns the count.
+
+    With ``project_ids`` only those projects are rebuilt, which suffices after
+    an incremental load since writers already dropped the documents they made
+    stale. Without it all projects are rebuilt. Runs in the caller's
+    transaction.
+    """
+
+    version = get_data_version(db)
+    if project_ids is None:
+        ids = list(db.scalars(select(Project.id).order_by(Project.id)))
+    else:
+        ids = sorted(set(project_ids))
+
+    written = 0
+    for offset in range(0, len(ids), batch_size):
+        batch = ids[offset:offset + batch_size]
+        existing = {
+            doc.project_id: doc
+            for doc in db.scalars(
+                select(ProjectDetailDocument).where(ProjectDetailDocument.project_id.in_(batch))
+            )
+        }
+        for project in _load_projects(db, batch):
+            document = build_detail_document(db, project)
+            row = existing.get(project.id)
+            if row is None:
+                db.add(ProjectDetailDocument(project_id=project.id, data_version=version, document=document))
+            else:
+                row.document = document
+                row.data_version = version
+            written += 1
+        db.flush()
+
+    logger.info("Rebuilt %s detail documents at data version %s", written, version)
+    return written
+
+
+def resolve_detail_sections(
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] | None = None,
+) -> tuple[list[str], list[str]]:
+    """Validate ``fields``/``include`` names (all core sections when ``fields`` is empty)."""
+
+    unknown = [f for f in fields or () if f not in DETAIL_SECTIONS]
+    unknown += [i for i in include or () if i not in ON_DEMAND_SECTIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown detail sections: {', '.join(unknown)}. "
+            f"fields: {', '.join(DETAIL_SECTIONS)}; include: {', '.join(ON_DEMAND_SECTIONS)}"
+        )
+    return list(dict.fromkeys(fields or DETAIL_SECTIONS)), list(dict.fromkeys(include or ()))
+
+
+def _load_section(db: Session, project_id: int, name: str) -> list[dict[str, Any]]:
+    if name == "documents":
+        rows = db.scalars(
+            select(ProjectDocument).where(ProjectDocument.project_id == project_id).order_by(ProjectDocument.id)
+        )
+        return [ProjectDocumentSchema.model_validate(r).model_dump(mode="json") for r in rows]
+    if name == "quarterly_updates":
+        rows = db.scalars(
+            select(QuarterlyUpdate)
+            .where(QuarterlyUpdate.project_id == project_id)
+            .order_by(QuarterlyUpdate.update_date.desc(), QuarterlyUpdate.id.desc())
+        )
+        return [QuarterlyUpdateSchema.model_validate(r).model_dump(mode="json") for r in rows]
+    if name == "units":
+        rows = db.scalars(select(Unit).where(Unit.project_id == project_id).order_by(Unit.id))
+        units = []
+        for row in rows:
+            unit = UnitResponse.model_validate(row)
+            if row.carpet_area_sqm:
+                unit.carpet_area_sqft = round(row.carpet_area_sqm * 10.7639, 2)
+            units.append(unit.model_dump(mode="json"))
+        return units
+    raise ValueError(f"Unknown on-demand section: {name}")
+
+
+def fetch_project_detail(
+    db: Session,
+    project_id: int,
+    *,
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] | None = None,
+) -> dict[str, Any] | None:
+    """Return a project detail payload or ``None`` if missing.
+
+    ``fields`` limits the core sections returned (default: all of
+    :data:`DETAIL_SECTIONS`); ``include`` adds sections from
+    :data:`ON_DEMAND_SECTIONS`.
+    """
+
+    fields, include = resolve_detail_sections(fields, include)
+
+    row = db.get(ProjectDetailDocument, project_id)
+    if row is not None:
+        document = row.document
+    else:
+        projects = _load_projects(db, [project_id])
+        if not projects:
+            return None
+        document = build_detail_document(db, projects[0])
+
+    payload: dict[str, Any] = {name: document.get(name) for name in fields}
+    for name in include:
+        if name == "schema_org":
+            payload[name] = document.get("schema_org")
+        else:
+            payload[name] = _load_section(db, project_id, name)
     return payload
 
 
-__all__ = ["fetch_project_detail"]
+__all__ = [
+    "DETAIL_SECTIONS",
+    "ON_DEMAND_SECTIONS",
+    "build_detail_document",
+    "fetch_project_detail",
+    "refresh_detail_documents",
+    "resolve_detail_sections",
+]
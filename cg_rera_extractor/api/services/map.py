@@ -1,11 +1,383 @@
-"""Map pin service for lightweight project feeds."""
+"""Map pin service for lightweight project feeds.
+
+Pins are served from an in-process :class:`MapIndex` built with two lean
+column queries (no ORM hydration of scores/locations/snapshots) and rebuilt
+when the catalog data version changes or after ``MAP_INDEX_TTL_SECONDS``.
+
+On top of the index:
+
+- ``fetch_map_clusters`` returns grid clusters (count, centroid, score and
+  price summaries) below ``MAP_CLUSTER_MAX_ZOOM`` and individual pins above.
+  Clusters are computed once per zoom/filter combination and bucketed by
+  tile, so a viewport or tile only reads the cells that overlap it.
+- ``render_map_tile`` encodes the same clusters/pins as a Mapbox Vector
+  Tile for ``/projects/tiles/{z}/{x}/{y}.mvt``; encoded tiles are kept in
+  an LRU so each tile is built once per data version.
+"""
 from __future__ import annotations
 
-from sqlalchemy.orm import Session, selectinload
+import bisect
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from cg_rera_extractor.api.cache import CachedResponse, InMemoryLRUCache, compute_etag
+from cg_rera_extractor.db import Project, ProjectLocation, ProjectPricingSnapshot, ProjectScores
+from cg_rera_extractor.db.versioning import get_data_version
+
+from .search import _haversine_km, _score_to_float
+from .vector_tiles import DEFAULT_EXTENT, PointFeature, encode_tile
+
+MAP_CLUSTER_MAX_ZOOM = int(os.getenv("MAP_CLUSTER_MAX_ZOOM", "14"))
+MAP_CLUSTER_RADIUS_PX = int(os.getenv("MAP_CLUSTER_RADIUS_PX", "60"))
+MAP_TILE_CACHE_SIZE = int(os.getenv("MAP_TILE_CACHE_SIZE", "4096"))
+MAP_INDEX_TTL_SECONDS = float(os.getenv("MAP_INDEX_TTL_SECONDS", "300"))
+MAX_TILE_ZOOM = 20
+
+TILE_SIZE_PX = 256
+TILE_LAYER = "projects"
+TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+# Features this close to a tile edge (in tile units) are drawn in both tiles
+TILE_BUFFER = 64
+
+
+# =============================================================================
+# Geometry helpers
+# =============================================================================
+
+
+def _mercator(lat: float, lon: float) -> tuple[float, float]:
+    """Project lat/lon to normalized Web Mercator (0..1, y grows southward)."""
+
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def _tile_of(x: float, y: float, zoom: int) -> tuple[int, int]:
+    scale = 2 ** zoom
+    return min(int(x * scale), scale - 1), min(int(y * scale), scale - 1)
+
+
+def _tile_range(bbox: tuple[float, float, float, float], zoom: int) -> tuple[int, int, int, int]:
+    """Inclusive tile range (x0, y0, x1, y1) covering ``bbox`` at ``zoom``."""
+
+    min_lat, min_lon, max_lat, max_lon = bbox
+    x0, y0 = _tile_of(*_mercator(max_lat, min_lon), zoom)
+    x1, y1 = _tile_of(*_mercator(min_lat, max_lon), zoom)
+    return x0, y0, x1, y1
+
+
+def _tile_bbox(z: int, x: int, y: int, margin: float = 0.0) -> tuple[float, float, float, float]:
+    """Lat/lon bounds of tile ``z/x/y`` grown by ``margin`` tiles on each side."""
+
+    scale = 2 ** z
+
+    def lat(ty: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / scale))))
+
+    west = (x - margin) / scale * 360.0 - 180.0
+    east = (x + 1 + margin) / scale * 360.0 - 180.0
+    return lat(y + 1 + margin), west, lat(y - margin), east
+
+
+def _in_bbox(lat: float, lon: float, bbox: tuple[float, float, float, float] | None) -> bool:
+    if bbox is None:
+        return True
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+@dataclass(slots=True)
+class MapPoint:
+    project_id: int
+    name: str
+    lat: float
+    lon: float
+    x: float
+    y: float
+    overall_score: float | None
+    status: str | None
+    min_price_total: float | None
+
+    def to_pin(self) -> dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "name": self.name,
+            "lat": self.lat,
+            "lon": self.lon,
+            "overall_score": self.overall_score,
+            "project_type": self.name,
+            "status": self.status,
+            "min_price_total": self.min_price_total,
+            "size_hint": {"units": None, "area_sqft": None},
+        }
+
+
+@dataclass(slots=True)
+class MapCluster:
+    cluster_id: str
+    count: int
+    lat: float
+    lon: float
+    x: float
+    y: float
+    min_overall_score: float | None
+    avg_overall_score: float | None
+    max_overall_score: float | None
+    min_price_total: float | None
+    expansion_zoom: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cluster_id": self.cluster_id,
+            "count": self.count,
+            "lat": self.lat,
+            "lon": self.lon,
+            "min_overall_score": self.min_overall_score,
+            "avg_overall_score": self.avg_overall_score,
+            "max_overall_score": self.max_overall_score,
+            "min_price_total": self.min_price_total,
+            "expansion_zoom": self.expansion_zoom,
+        }
+
+
+@dataclass
+class _ClusterAccumulator:
+    members: list[MapPoint] = field(default_factory=list)
+
+    def build(self, cluster_id: str, zoom: int) -> MapCluster:
+        count = len(self.members)
+        lat = sum(p.lat for p in self.members) / count
+        lon = sum(p.lon for p in self.members) / count
+        scores = [p.overall_score for p in self.members if p.overall_score is not None]
+        prices = [p.min_price_total for p in self.members if p.min_price_total is not None]
+        x, y = _mercator(lat, lon)
+        return MapCluster(
+            cluster_id=cluster_id,
+            count=count,
+            lat=lat,
+            lon=lon,
+            x=x,
+            y=y,
+            min_overall_score=min(scores) if scores else None,
+            avg_overall_score=round(sum(scores) / len(scores), 4) if scores else None,
+            max_overall_score=max(scores) if scores else None,
+            min_price_total=min(prices) if prices else None,
+            expansion_zoom=min(zoom + 1, MAP_CLUSTER_MAX_ZOOM + 1),
+        )
+
+
+class ClusterLayer:
+    """One zoom's clusters and lone pins, bucketed by their tile at that zoom."""
+
+    def __init__(self, zoom: int) -> None:
+        self.zoom = zoom
+        self.cells: dict[tuple[int, int], tuple[list[MapCluster], list[MapPoint]]] = {}
+
+    def add(self, item: MapCluster | MapPoint) -> None:
+        clusters, singles = self.cells.setdefault(_tile_of(item.x, item.y, self.zoom), ([], []))
+        (clusters if isinstance(item, MapCluster) else singles).append(item)
+
+    def in_tiles(self, x0: int, y0: int, x1: int, y1: int) -> tuple[list[MapCluster], list[MapPoint]]:
+        """Clusters and pins in the inclusive tile range, reading only its cells."""
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            keys = [k for k in self.cells if x0 <= k[0] <= x1 and y0 <= k[1] <= y1]
+        else:
+            keys = [(tx, ty) for tx in range(x0, x1 + 1) for ty in range(y0, y1 + 1) if (tx, ty) in self.cells]
+        clusters: list[MapCluster] = []
+        singles: list[MapPoint] = []
+        for key in keys:
+            cell_clusters, cell_singles = self.cells[key]
+            clusters.extend(cell_clusters)
+            singles.extend(cell_singles)
+        return clusters, singles
+
+
+def _filter_key(min_overall_score: float | None, status: str | None) -> tuple:
+    return (min_overall_score, status.lower() if status else None)
+
+
+def _matches(point: MapPoint, min_overall_score: float | None, status: str | None) -> bool:
+    if status and (point.status or "").lower() != status.lower():
+        return False
+    if min_overall_score is not None and (
+        point.overall_score is None or point.overall_score < min_overall_score
+    ):
+        return False
+    return True
 
-from cg_rera_extractor.db import Project
 
-from .search import _haversine_km, _resolve_location, _score_to_float
+class MapIndex:
+    """All mappable projects, sorted by longitude, with memoized clusters."""
+
+    def __init__(self, points: Iterable[MapPoint], version: int, source: int = 0) -> None:
+        self.points = sorted(points, key=lambda p: p.lon)
+        self._lons = [p.lon for p in self.points]
+        self.version = version
+        self.source = source
+        self.built_at = time.monotonic()
+        self._clusters: dict[tuple, ClusterLayer] = {}
+        self._lock = threading.Lock()
+        self.tiles = InMemoryLRUCache(max_entries=MAP_TILE_CACHE_SIZE)
+
+    def points_in(
+        self,
+        bbox: tuple[float, float, float, float] | None,
+        min_overall_score: float | None = None,
+        status: str | None = None,
+    ) -> list[MapPoint]:
+        if bbox is None:
+            candidates = self.points
+        else:
+            lo = bisect.bisect_left(self._lons, bbox[1])
+            hi = bisect.bisect_right(self._lons, bbox[3])
+            candidates = self.points[lo:hi]
+        return [
+            p for p in candidates
+            if _in_bbox(p.lat, p.lon, bbox) and _matches(p, min_overall_score, status)
+        ]
+
+    def clusters(
+        self,
+        zoom: int,
+        min_overall_score: float | None = None,
+        status: str | None = None,
+    ) -> ClusterLayer:
+        """Grid clusters for ``zoom``; cells holding a single project stay pins."""
+
+        key = (zoom, _filter_key(min_overall_score, status))
+        with self._lock:
+            cached = self._clusters.get(key)
+        if cached is not None:
+            return cached
+
+        cell = MAP_CLUSTER_RADIUS_PX / (TILE_SIZE_PX * 2 ** zoom)
+        cells: dict[tuple[int, int], _ClusterAccumulator] = {}
+        for point in self.points:
+            if not _matches(point, min_overall_score, status):
+                continue
+            cell_key = (int(point.x / cell), int(point.y / cell))
+            cells.setdefault(cell_key, _ClusterAccumulator()).members.append(point)
+
+        layer = ClusterLayer(zoom)
+        for (cx, cy), acc in cells.items():
+            if len(acc.members) == 1:
+                layer.add(acc.members[0])
+            else:
+                layer.add(acc.build(f"{zoom}/{cx}/{cy}", zoom))
+
+        with self._lock:
+            self._clusters[key] = layer
+        return layer
+
+
+def load_map_points(db: Session) -> list[MapPoint]:
+    """Resolve one point per project with its score and cheapest active price."""
+
+    min_price = (
+        select(
+            ProjectPricingSnapshot.project_id,
+            func.min(ProjectPricingSnapshot.min_price_total).label("min_price_total"),
+        )
+        .where(ProjectPricingSnapshot.is_active.is_(True))
+        .group_by(ProjectPricingSnapshot.project_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            Project.id,
+            Project.project_name,
+            Project.status,
+            Project.latitude,
+            Project.longitude,
+            ProjectScores.overall_score,
+            min_price.c.min_price_total,
+        )
+        .outerjoin(ProjectScores, ProjectScores.project_id == Project.id)
+        .outerjoin(min_price, min_price.c.project_id == Project.id)
+    ).all()
+
+    # Active geocoded locations take precedence over the raw project columns
+    active_locations: dict[int, tuple[float, float]] = {}
+    for project_id, lat, lon in db.execute(
+        select(ProjectLocation.project_id, ProjectLocation.lat, ProjectLocation.lon)
+        .where(ProjectLocation.is_active.is_(True))
+        .order_by(ProjectLocation.id)
+    ):
+        active_locations.setdefault(project_id, (float(lat), float(lon)))
+
+    points: list[MapPoint] = []
+    for project_id, name, status, lat, lon, score, price in rows:
+        if project_id in active_locations:
+            lat, lon = active_locations[project_id]
+        elif lat is None or lon is None:
+            continue
+        lat, lon = float(lat), float(lon)
+        x, y = _mercator(lat, lon)
+        points.append(
+            MapPoint(
+                project_id=project_id,
+                name=name,
+                lat=lat,
+                lon=lon,
+                x=x,
+                y=y,
+                overall_score=_score_to_float(score),
+                status=status,
+                min_price_total=float(price) if price is not None else None,
+            )
+        )
+    return points
+
+
+_index: MapIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_map_index(db: Session) -> MapIndex:
+    """Return the shared index, rebuilding it on a data-version change or TTL."""
+
+    global _index
+    version = get_data_version(db)
+    # Versions are per database, so an index never serves another engine's data
+    source = id(db.get_bind())
+    with _index_lock:
+        current = _index
+        if (
+            current is not None
+            and current.version == version
+            and current.source == source
+            and time.monotonic() - current.built_at < MAP_INDEX_TTL_SECONDS
+        ):
+            return current
+        _index = MapIndex(load_map_points(db), version, source)
+        return _index
+
+
+def reset_map_index() -> None:
+    global _index
+    with _index_lock:
+        _index = None
+
+
+# =============================================================================
+# Public service functions
+# =============================================================================
 
 
 def fetch_map_projects(
@@ -20,66 +392,116 @@ def fetch_map_projects(
 ) -> list[dict]:
     """Return pins constrained by a bounding box or center/radius."""
 
-    stmt = db.query(Project).options(
-        selectinload(Project.score),
-        selectinload(Project.locations),
-        selectinload(Project.pricing_snapshots)
-    )
+    points = get_map_index(db).points_in(bbox, min_overall_score, status)
+    if center and radius_km is not None:
+        center_lat, center_lon = center
+        points = [
+            p for p in points
+            if _haversine_km(center_lat, center_lon, p.lat, p.lon) <= radius_km
+        ]
+    return [p.to_pin() for p in points]
 
-    if status:
-        stmt = stmt.filter(Project.status.ilike(status))
 
-    if bbox:
-        min_lat, min_lon, max_lat, max_lon = bbox
-        stmt = stmt.filter(
-            Project.latitude.is_not(None),
-            Project.longitude.is_not(None),
-            Project.latitude.between(min_lat, max_lat),
-            Project.longitude.between(min_lon, max_lon),
-        )
+def fetch_map_clusters(
+    db: Session,
+    *,
+    bbox: tuple[float, float, float, float],
+    zoom: int,
+    min_overall_score: float | None = None,
+    status: str | None = None,
+) -> dict[str, Any]:
+    """Zoom-aware feed: clusters below ``MAP_CLUSTER_MAX_ZOOM``, pins above."""
 
-    projects = stmt.all()
-    pins: list[dict] = []
-    for project in projects:
-        lat, lon, quality = _resolve_location(project)
-        if lat is None or lon is None:
-            continue
+    index = get_map_index(db)
+    if zoom > MAP_CLUSTER_MAX_ZOOM:
+        pins = index.points_in(bbox, min_overall_score, status)
+        return {"zoom": zoom, "clusters": [], "pins": [p.to_pin() for p in pins]}
 
-        scores = project.score
-        overall_score = _score_to_float(scores.overall_score) if scores else None
-        if min_overall_score is not None and (overall_score is None or overall_score < min_overall_score):
-            continue
+    clusters, singles = index.clusters(zoom, min_overall_score, status).in_tiles(*_tile_range(bbox, zoom))
+    return {
+        "zoom": zoom,
+        "clusters": [c.to_dict() for c in clusters if _in_bbox(c.lat, c.lon, bbox)],
+        "pins": [p.to_pin() for p in singles if _in_bbox(p.lat, p.lon, bbox)],
+    }
 
-        if center and radius_km is not None:
-            center_lat, center_lon = center
-            distance = _haversine_km(center_lat, center_lon, lat, lon)
-            if distance > radius_km:
-                continue
-        
-        # Calculate min price
-        min_price = None
-        if project.pricing_snapshots:
-            active_snapshots = [s for s in project.pricing_snapshots if s.is_active]
-            if active_snapshots:
-                prices = [float(s.min_price_total) for s in active_snapshots if s.min_price_total is not None]
-                if prices:
-                    min_price = min(prices)
-
-        pins.append(
-            {
-                "project_id": project.id,
-                "name": project.project_name,
-                "lat": lat,
-                "lon": lon,
-                "overall_score": overall_score,
-                "project_type": project.project_name,
-                "status": project.status,
-                "min_price_total": min_price,
-                "size_hint": {"units": None, "area_sqft": None},
-            }
+
+def _tile_feature(x: float, y: float, z: int, tx: int, ty: int, **properties) -> PointFeature | None:
+    scale = 2 ** z
+    px = round((x * scale - tx) * DEFAULT_EXTENT)
+    py = round((y * scale - ty) * DEFAULT_EXTENT)
+    if not (-TILE_BUFFER <= px <= DEFAULT_EXTENT + TILE_BUFFER):
+        return None
+    if not (-TILE_BUFFER <= py <= DEFAULT_EXTENT + TILE_BUFFER):
+        return None
+    return PointFeature(x=px, y=py, properties=properties)
+
+
+def render_map_tile(
+    db: Session,
+    z: int,
+    x: int,
+    y: int,
+    *,
+    min_overall_score: float | None = None,
+    status: str | None = None,
+) -> CachedResponse:
+    """Encode the clusters/pins of one XYZ tile as MVT, cached per data version."""
+
+    index = get_map_index(db)
+    cache_key = f"{z}/{x}/{y}:{_filter_key(min_overall_score, status)}"
+    cached = index.tiles.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if z > MAP_CLUSTER_MAX_ZOOM:
+        clusters = []
+        # The window includes the buffer (plus a pixel for rounding); points
+        # are filtered on tile pixels below
+        margin = (TILE_BUFFER + 1) / DEFAULT_EXTENT
+        singles = index.points_in(_tile_bbox(z, x, y, margin), min_overall_score, status)
+    else:
+        # The buffer is less than a tile, so only the neighbouring cells can reach in
+        clusters, singles = index.clusters(z, min_overall_score, status).in_tiles(x - 1, y - 1, x + 1, y + 1)
+
+    features: list[PointFeature] = []
+    for cluster in clusters:
+        feature = _tile_feature(
+            cluster.x, cluster.y, z, x, y,
+            cluster=True,
+            point_count=cluster.count,
+            avg_overall_score=cluster.avg_overall_score,
+            min_price_total=cluster.min_price_total,
+            expansion_zoom=cluster.expansion_zoom,
+        )
+        if feature:
+            features.append(feature)
+    for point in singles:
+        feature = _tile_feature(
+            point.x, point.y, z, x, y,
+            cluster=False,
+            project_id=point.project_id,
+            name=point.name,
+            overall_score=point.overall_score,
+            status=point.status,
+            min_price_total=point.min_price_total,
         )
+        if feature:
+            feature.id = point.project_id
+            features.append(feature)
 
-    return pins
+    body = encode_tile({TILE_LAYER: features})
+    tile = CachedResponse(body=body, etag=compute_etag(body, index.version), media_type=TILE_MEDIA_TYPE)
+    index.tiles.set(cache_key, tile, ttl=int(MAP_INDEX_TTL_SECONDS) or 1)
+    return tile
 
 
-__all__ = ["fetch_map_projects"]
+__all__ = [
+    "MAP_CLUSTER_MAX_ZOOM",
+    "ClusterLayer",
+    "MapIndex",
+    "fetch_map_clusters",
+    "fetch_map_projects",
+    "get_map_index",
+    "render_map_tile",
+    "reset_map_index",
+]
@@ -0,0 +1,118 @@
+"""Minimal Mapbox Vector Tile (MVT v2) encoder for point layers.
+
+Only what the map tiles need: one or more layers of POINT features with
+string/number/bool properties, written directly as protobuf so the API
+does not depend on a protobuf runtime.
+"""
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_EXTENT = 4096
+
+# MVT geometry type and command ids
+_GEOM_POINT = 1
+_CMD_MOVE_TO = 1
+
+
+@dataclass
+class PointFeature:
+    """A point in tile-local coordinates (0..extent) with properties."""
+
+    x: int
+    y: int
+    properties: dict[str, Any] = field(default_factory=dict)
+    id: int | None = None
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field_number: int, wire_type: int) -> bytes:
+    return _varint((field_number << 3) | wire_type)
+
+
+def _length_delimited(field_number: int, payload: bytes) -> bytes:
+    return _key(field_number, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field_number: int, values: list[int]) -> bytes:
+    return _length_delimited(field_number, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value < 0:
+            return _key(6, 0) + _varint(_zigzag(value))
+        return _key(5, 0) + _varint(value)
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _length_delimited(1, str(value).encode("utf-8"))
+
+
+def encode_layer(
+    name: str, features: list[PointFeature], extent: int = DEFAULT_EXTENT
+) -> bytes:
+    """Encode one MVT layer (without the enclosing Tile message)."""
+
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, Any], int] = {}
+    encoded_features: list[bytes] = []
+
+    for feature in features:
+        tags: list[int] = []
+        for prop, value in feature.properties.items():
+            if value is None:
+                continue
+            key_index = keys.setdefault(prop, len(keys))
+            value_index = values.setdefault((type(value), value), len(values))
+            tags.extend((key_index, value_index))
+
+        body = b""
+        if feature.id is not None:
+            body += _key(1, 0) + _varint(feature.id)
+        if tags:
+            body += _packed(2, tags)
+        body += _key(3, 0) + _varint(_GEOM_POINT)
+        body += _packed(
+            4,
+            [(_CMD_MOVE_TO & 0x7) | (1 << 3), _zigzag(feature.x), _zigzag(feature.y)],
+        )
+        encoded_features.append(_length_delimited(2, body))
+
+    layer = _key(15, 0) + _varint(2)
+    layer += _length_delimited(1, name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_length_delimited(3, k.encode("utf-8")) for k in keys)
+    layer += b"".join(_length_delimited(4, _encode_value(v)) for _, v in values)
+    layer += _key(5, 0) + _varint(extent)
+    return layer
+
+
+def encode_tile(layers: dict[str, list[PointFeature]], extent: int = DEFAULT_EXTENT) -> bytes:
+    """Encode a full tile from ``{layer_name: features}``."""
+
+    return b"".join(
+        _length_delimited(3, encode_layer(name, features, extent))
+        for name, features in layers.items()
+    )
+
+
+__all__ = ["DEFAULT_EXTENT", "PointFeature", "encode_layer", "encode_tile"]
@@ -20,7 +20,7 @@ class RunMode(str, Enum):
 class ScrapingMode(str, Enum):
     """Scraping behavior for conditional/delta scraping."""
 
-    DELTA = "delta"  # Skip already-scraped listings
+    DELTA = "delta"  # Skip unchanged listings fetched within the refetch TTL
     FULL = "full"    # Scrape everything regardless of history
 
 
@@ -57,7 +57,9 @@ class RunConfig(BaseModel):
 
     mode: RunMode = RunMode.FULL
     scraping_mode: ScrapingMode = ScrapingMode.FULL
-    scraping_cache_file: str = "data/scraped_cache.json"
+    scraping_cache_file: str = "data/scraped_cache.json"  # Legacy ID list, imported into the index
+    scrape_index_file: str = "data/scrape_index.sqlite3"
+    scrape_refetch_ttl_days: float | None = 30.0  # Delta mode re-fetches unchanged listings older than this
     search_filters: SearchFilterConfig
     output_base_dir: str
     state_code: str = "CG"
@@ -66,6 +68,7 @@ class RunConfig(BaseModel):
     skip_to_page: int | None = None  # Skip directly to this page number (for testing pagination)
     skip_filters: bool = False  # Skip filter application and CAPTCHA (use when listings are already visible)
     max_pages_per_run: int | None = None  # Maximum pages to process before stopping (for parallel runs)
+    html_parser_backend: str | None = None  # html.parser, lxml, selectolax or auto (default: HTML_PARSER_BACKEND env)
 
 
 class DatabaseConfig(BaseModel):
@@ -1,6 +1,13 @@
 """Database layer for CG RERA projects."""
 
-from .base import Base, get_engine, get_session_local
+from .base import (
+    Base,
+    EngineSettings,
+    dispose_engines,
+    get_engine,
+    get_pool_metrics,
+    get_session_local,
+)
 from .migrations import MIGRATIONS, apply_migrations
 
 # Core models
@@ -16,14 +23,19 @@ from .models import (
     ProjectScores,
     ProjectLocation,
     ProjectPricingSnapshot,
+    PriceTrendRollup,
+    ProjectDetailDocument,
     ProjectMedia,
     ProjectUnitType,
     Promoter,
     QuarterlyUpdate,
     UnitType,
     Unit,
+    UnitInventoryCounter,
+    UnitStatusHistory,
     AmenityPOI,
     ReraFiling,
+    AIJob,
     # Point 28 & 29: Ops Standard
     DataProvenance,
     IngestionAudit,
@@ -61,12 +73,17 @@ from .enums import (
     ReraVerificationStatus,
 )
 
+from .versioning import bump_data_version, get_data_version, invalidate_detail_documents
+from .price_rollups import refresh_price_rollups
 from .loader import load_all_runs, load_run_into_db
 
 __all__ = [
     # Base
     "Base",
+    "EngineSettings",
+    "dispose_engines",
     "get_engine",
+    "get_pool_metrics",
     "get_session_local",
     
     # Core models
@@ -80,6 +97,8 @@ __all__ = [
     "ProjectAmenityStats",
     "ProjectDocument",
     "ProjectPricingSnapshot",
+    "PriceTrendRollup",
+    "ProjectDetailDocument",
     "ProjectMedia",
     "ProjectScores",
     "ProjectLocation",
@@ -95,6 +114,9 @@ __all__ = [
     "Developer",
     "DeveloperProject",
     "Unit",
+    "UnitInventoryCounter",
+    "AIJob",
+    "UnitStatusHistory",
     "ProjectPossessionTimeline",
     "AmenityCategory",
     "Amenity",
@@ -120,6 +142,10 @@ __all__ = [
     # Utilities
     "MIGRATIONS",
     "apply_migrations",
+    "bump_data_version",
+    "get_data_version",
+    "invalidate_detail_documents",
     "load_all_runs",
     "load_run_into_db",
+    "refresh_price_rollups",
 ]
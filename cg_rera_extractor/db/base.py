@@ -1,9 +1,39 @@
-"""Database base classes and connection helpers."""
+"""Database base classes and connection helpers.
+
+Engines are shared process-wide: :func:`get_engine` returns one engine per
+(URL, settings) pair, so the API, the AI service, the loader and the batch
+tools reuse one tuned pool instead of building a fresh default pool on every
+call. Pool behaviour is configured through :class:`EngineSettings`, which
+defaults to these environment variables:
+
+``DB_POOL_SIZE`` (5), ``DB_MAX_OVERFLOW`` (10), ``DB_POOL_TIMEOUT`` (30 s),
+``DB_POOL_RECYCLE`` (1800 s), ``DB_POOL_PRE_PING`` (true),
+``DB_STATEMENT_TIMEOUT_MS`` (0 = no timeout) and ``DB_PGBOUNCER`` (false).
+
+PgBouncer mode (transaction pooling) uses ``NullPool`` so PgBouncer does the
+pooling, disables server-side prepared statements for drivers that use them,
+and applies the statement timeout per transaction with ``SET LOCAL``.
+
+Checkout counts, in-use connections and checkout wait times are collected
+per engine; see :func:`get_pool_metrics`.
+
+:func:`get_async_engine` returns the asyncio counterpart of the same URL
+(``postgresql+asyncpg``, ``sqlite+aiosqlite``) with the same settings, for
+request handlers that await their queries instead of holding a thread.
+"""
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 
 # SQLAlchemy 1.4/2.0 compatibility for Base class
 try:
@@ -26,35 +56,363 @@ except ImportError:
     # Add attribute for compatibility
     Base.__allow_unmapped__ = True
 
-from cg_rera_extractor.config.env import ensure_database_url
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
 from cg_rera_extractor.config.models import DatabaseConfig
 
 
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Pool and session settings for an engine (hashable registry key)."""
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_timeout_ms: int = 0
+    pgbouncer: bool = False
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        return cls(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0")),
+            pgbouncer=_env_bool("DB_PGBOUNCER", False),
+        )
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one engine's pool, updated from pool events."""
+
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    wait_count: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def in_use(self) -> int:
+        return self.checkouts - self.checkins
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "in_use": self.in_use,
+            "wait_count": self.wait_count,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.wait_count, 6)
+            if self.wait_count
+            else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+class _TimedPoolMixin:
+    """Times ``_do_get`` (queue wait, or connect time for NullPool)."""
+
+    _metrics: PoolMetrics
+
+    def _do_get(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            self._metrics.record_wait(time.perf_counter() - started)
+
+
+def _timed_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    # One subclass per engine so Pool.recreate() (dispose) keeps the metrics
+    return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"_metrics": metrics})
+
+
+# Async driver used for each backend by get_async_engine
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """``url`` rewritten to the asyncio driver of its backend."""
+
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def _engine_options(url: str, settings: EngineSettings, metrics: PoolMetrics) -> dict:
+    """``create_engine`` keyword arguments for ``url`` under ``settings``."""
+
+    parsed = make_url(url)
+    is_async = parsed.get_driver_name() in _ASYNC_DRIVERS.values()
+    options: dict = {"pool_pre_ping": settings.pool_pre_ping}
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite keeps its dialect-specific default pool
+        return options
+
+    connect_args: dict = {}
+    if settings.pgbouncer:
+        options["poolclass"] = _timed_pool_class(NullPool, metrics)
+        driver = parsed.get_driver_name()
+        if driver == "psycopg":
+            connect_args["prepare_threshold"] = None
+        elif driver == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+            options["url"] = parsed.update_query_dict({"prepared_statement_cache_size": "0"})
+    else:
+        options.update(
+            poolclass=_timed_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, metrics),
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+        )
+        if settings.statement_timeout_ms and parsed.get_backend_name() == "postgresql":
+            if parsed.get_driver_name() == "asyncpg":
+                connect_args["server_settings"] = {
+                    "statement_timeout": str(settings.statement_timeout_ms)
+                }
+            else:
+                connect_args["options"] = f"-c statement_timeout={settings.statement_timeout_ms}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _attach_pool_events(engine: Engine, metrics: PoolMetrics, settings: EngineSettings) -> None:
+    pool_events = engine.pool
+
+    event.listen(pool_events, "connect", lambda *_: metrics.incr("connects"))
+    event.listen(pool_events, "checkout", lambda *_: metrics.incr("checkouts"))
+    event.listen(pool_events, "checkin", lambda *_: metrics.incr("checkins"))
+    event.listen(pool_events, "invalidate", lambda *_: metrics.incr("invalidations"))
+
+    if settings.pgbouncer and settings.statement_timeout_ms and engine.dialect.name == "postgresql":
+        # Session-level SETs leak across PgBouncer clients; scope to the transaction
+        timeout = int(settings.statement_timeout_ms)
+
+        @event.listens_for(engine, "begin")
+        def _set_local_timeout(conn) -> None:
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+
+
+@dataclass
+class _RegisteredEngine:
+    engine: Engine
+    metrics: PoolMetrics
+    settings: EngineSettings
+    async_engine: AsyncEngine | None = None
+
+
+_ENGINES: dict[tuple[str, bool, EngineSettings], _RegisteredEngine] = {}
+_SESSION_FACTORIES: dict[int, sessionmaker[Session]] = {}
+_ASYNC_SESSION_FACTORIES: dict[int, async_sessionmaker[AsyncSession]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
 def get_engine(
     database_config: DatabaseConfig | None = None,
     *,
     url: str | None = None,
     echo: bool = False,
+    settings: EngineSettings | None = None,
 ) -> Engine:
-    """Return a SQLAlchemy engine using the provided configuration.
+    """Return the shared SQLAlchemy engine for the resolved URL.
 
     The URL is resolved in the following precedence order:
     1. Explicit ``url`` argument
     2. ``database_config.url``
     3. ``DATABASE_URL`` environment variable
+
+    Repeated calls with the same URL and settings return the same engine
+    (and therefore the same connection pool).
     """
 
     database_url = url or (database_config.url if database_config else None)
     if not database_url:
         database_url = ensure_database_url()
+    settings = settings or EngineSettings.from_env()
+    key = (str(database_url), echo, settings)
+
+    with _REGISTRY_LOCK:
+        registered = _ENGINES.get(key)
+        if registered is None:
+            metrics = PoolMetrics()
+            options = _engine_options(str(database_url), settings, metrics)
+            engine_url = options.pop("url", database_url)
+            engine = create_engine(engine_url, echo=echo, future=True, **options)
+            _attach_pool_events(engine, metrics, settings)
+            registered = _RegisteredEngine(engine, metrics, settings)
+            _ENGINES[key] = registered
+            logger.debug(
+                "Created engine for %s (%s)",
+                describe_database_target(str(database_url)),
+                "pgbouncer" if settings.pgbouncer else f"pool_size={settings.pool_size}",
+            )
+    return registered.engine
+
+
+def get_async_engine(
+    database_config: DatabaseConfig | None = None,
+    *,
+    url: str | None = None,
+    echo: bool = False,
+    settings: EngineSettings | None = None,
+) -> AsyncEngine:
+    """Return the shared asyncio engine for the resolved URL.
+
+    The URL is resolved as in :func:`get_engine` and switched to the async
+    driver of its backend (see :func:`async_database_url`). Raises
+    ``RuntimeError`` when that driver is not installed.
+    """
+
+    database_url = url or (database_config.url if database_config else None)
+    if not database_url:
+        database_url = ensure_database_url()
+    database_url = async_database_url(str(database_url))
+    settings = settings or EngineSettings.from_env()
+    key = (database_url, echo, settings)
+
+    with _REGISTRY_LOCK:
+        registered = _ENGINES.get(key)
+        if registered is None:
+            metrics = PoolMetrics()
+            options = _engine_options(database_url, settings, metrics)
+            engine_url = options.pop("url", database_url)
+            try:
+                async_engine = create_async_engine(engine_url, echo=echo, **options)
+            except ImportError as exc:
+                raise RuntimeError(
+                    f"Async database access requires the {make_url(database_url).get_driver_name()!r} driver"
+                ) from exc
+            _attach_pool_events(async_engine.sync_engine, metrics, settings)
+            registered = _RegisteredEngine(async_engine.sync_engine, metrics, settings, async_engine)
+            _ENGINES[key] = registered
+            logger.debug("Created async engine for %s", describe_database_target(database_url))
+    return registered.async_engine
+
+
+def get_session_local(engine: Engine | None = None) -> sessionmaker[Session]:
+    """Return a sessionmaker bound to ``engine`` (the shared engine by default)."""
+
+    engine = engine or get_engine()
+    with _REGISTRY_LOCK:
+        factory = _SESSION_FACTORIES.get(id(engine))
+        if factory is None or factory.kw.get("bind") is not engine:
+            factory = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+            _SESSION_FACTORIES[id(engine)] = factory
+    return factory
+
+
+def get_async_session_local(engine: AsyncEngine | None = None) -> async_sessionmaker[AsyncSession]:
+    """Return an ``async_sessionmaker`` bound to ``engine`` (the shared async engine by default)."""
+
+    engine = engine or get_async_engine()
+    with _REGISTRY_LOCK:
+        factory = _ASYNC_SESSION_FACTORIES.get(id(engine))
+        if factory is None or factory.kw.get("bind") is not engine:
+            # Objects stay readable after commit; handlers serialise them afterwards
+            factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            _ASYNC_SESSION_FACTORIES[id(engine)] = factory
+    return factory
+
+
+def get_pool_metrics() -> list[dict]:
+    """Pool counters and live pool status for every registered engine."""
+
+    with _REGISTRY_LOCK:
+        registered = list(_ENGINES.values())
+
+    snapshot = []
+    for entry in registered:
+        pool = entry.engine.pool
+        item: dict = {
+            "target": describe_database_target(entry.engine.url),
+            "pool_class": type(pool).__name__,
+            "async": entry.async_engine is not None,
+            "pgbouncer": entry.settings.pgbouncer,
+            **entry.metrics.to_dict(),
+        }
+        if isinstance(pool, QueuePool):
+            item.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        snapshot.append(item)
+    return snapshot
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Dispose every registered engine and clear the registry.
+
+    ``close=False`` drops pooled connections without closing them, which is
+    what a forked child must do with connections inherited from its parent.
+    """
+
+    with _REGISTRY_LOCK:
+        registered = list(_ENGINES.values())
+        _ENGINES.clear()
+        _SESSION_FACTORIES.clear()
+        _ASYNC_SESSION_FACTORIES.clear()
+    for entry in registered:
+        # Async connections can only be closed from the event loop
+        # (``await AsyncEngine.dispose()``); here they are just dropped.
+        entry.engine.dispose(close=close and entry.async_engine is None)
 
-    return create_engine(database_url, echo=echo, future=True)
 
+def _reset_pools_after_fork() -> None:
+    # Keep the engines but give the child fresh pools
+    for entry in list(_ENGINES.values()):
+        entry.engine.dispose(close=False)
 
-def get_session_local(engine: Engine) -> sessionmaker[Session]:
-    """Return a sessionmaker factory bound to the provided engine."""
 
-    return sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
 
 
-__all__ = ["Base", "get_engine", "get_session_local"]
+__all__ = [
+    "Base",
+    "EngineSettings",
+    "PoolMetrics",
+    "async_database_url",
+    "dispose_engines",
+    "get_async_engine",
+    "get_async_session_local",
+    "get_engine",
+    "get_pool_metrics",
+    "get_session_local",
+]
@@ -0,0 +1,332 @@
+"""Incremental unit inventory sync with status history and availability counters.
+
+The loader parses a project's unit tables and inventory grid into transient
+``Unit`` objects keyed by identity (``<block>_<unit_no>`` for table rows,
+``grid_<unit_no>`` for grid-only cells). :func:`sync_project_units` diffs
+them against the stored units instead of replacing them:
+
+* new units are inserted, vanished units deleted, and changed attributes
+  updated in place, so unchanged units cost no writes and ``units.id`` stays
+  stable for rows that reference it;
+* every status change (including a unit appearing or disappearing) is
+  appended to ``unit_status_history``;
+* ``unit_inventory_counters`` holds total/available/booked/unknown counts
+  per project, per block and per unit type, rewritten only where they
+  changed. Inventory summaries and sold percentages read these rows instead
+  of scanning units (:func:`get_inventory_summary`).
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.orm import Session
+
+from .models import Unit, UnitInventoryCounter, UnitStatusHistory
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_PROJECT = "project"
+DIMENSION_BLOCK = "block"
+DIMENSION_UNIT_TYPE = "unit_type"
+
+# Unit attributes compared when diffing parsed against stored units
+_TRACKED_FIELDS = ("block_name", "floor_no", "unit_no", "unit_type", "carpet_area_sqm", "status", "raw_data")
+
+_BOOKED_STATUSES = {"booked", "sold"}
+
+
+def status_bucket(status: str | None) -> str:
+    """``available``, ``booked`` (booked or sold) or ``unknown``."""
+
+    value = (status or "").strip().lower()
+    if value == "available":
+        return "available"
+    if value in _BOOKED_STATUSES:
+        return "booked"
+    return "unknown"
+
+
+def sold_percent(total: int, booked: int) -> float | None:
+    return round(100.0 * booked / total, 2) if total else None
+
+
+def unit_key(unit: Unit) -> str:
+    """Identity key of a unit, matching the keys the loader assigns."""
+
+    if (unit.raw_data or {}).get("source") == "grid":
+        return f"grid_{unit.unit_no}"
+    return f"{unit.block_name}_{unit.unit_no}" if unit.block_name else str(unit.unit_no)
+
+
+def _keyed(units: Iterable[Unit]) -> dict[str, Unit]:
+    # Repeated keys (the same grid label twice) are numbered in order
+    keyed: dict[str, Unit] = {}
+    for unit in units:
+        key = base = unit_key(unit)
+        n = 2
+        while key in keyed:
+            key = f"{base}#{n}"
+            n += 1
+        keyed[key] = unit
+    return keyed
+
+
+@dataclass
+class InventorySyncResult:
+    """What one project's inventory sync wrote."""
+
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    status_changes: int = 0
+    counters_written: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "status_changes": self.status_changes,
+            "counters_written": self.counters_written,
+        }
+
+
+def _history(
+    project_id: int,
+    key: str,
+    unit: Unit | None,
+    old_status: str | None,
+    new_status: str | None,
+    observed_at: datetime,
+    run_id: str | None,
+) -> UnitStatusHistory:
+    return UnitStatusHistory(
+        project_id=project_id,
+        unit=unit,
+        unit_key=key,
+        old_status=old_status,
+        new_status=new_status,
+        observed_at=observed_at,
+        run_id=run_id,
+    )
+
+
+def sync_project_units(
+    session: Session,
+    project_id: int,
+    parsed_units: Mapping[str, Unit] | Iterable[Unit],
+    *,
+    run_id: str | None = None,
+    observed_at: datetime | None = None,
+) -> InventorySyncResult:
+    """Bring ``project_id``'s stored units in line with ``parsed_units``.
+
+    ``parsed_units`` are transient (not yet added) ``Unit`` objects, either
+    keyed by identity or as a sequence keyed with :func:`unit_key`. An empty
+    parse means the unit table and grid did not parse, not that the project
+    lost its units, so stored units and counters are left untouched.
+    """
+
+    observed_at = observed_at or datetime.now(timezone.utc)
+    parsed = dict(parsed_units) if isinstance(parsed_units, Mapping) else _keyed(parsed_units)
+    if not parsed:
+        return InventorySyncResult()
+    stored = _keyed(
+        session.scalars(select(Unit).where(Unit.project_id == project_id).order_by(Unit.id))
+    )
+    result = InventorySyncResult(total=len(parsed))
+
+    for key, incoming in parsed.items():
+        current = stored.pop(key, None)
+        if current is None:
+            incoming.project_id = project_id
+            session.add(incoming)
+            session.add(_history(project_id, key, incoming, None, incoming.status, observed_at, run_id))
+            result.inserted += 1
+            result.status_changes += 1
+            continue
+
+        changed = False
+        for name in _TRACKED_FIELDS:
+            value = getattr(incoming, name)
+            if getattr(current, name) != value:
+                if name == "status":
+                    session.add(
+                        _history(project_id, key, current, current.status, value, observed_at, run_id)
+                    )
+                    result.status_changes += 1
+                setattr(current, name, value)
+                changed = True
+        if changed:
+            result.updated += 1
+        else:
+            result.unchanged += 1
+
+    for key, gone in stored.items():
+        session.add(_history(project_id, key, None, gone.status, None, observed_at, run_id))
+        session.delete(gone)
+        result.removed += 1
+        result.status_changes += 1
+
+    if result.inserted or result.updated or result.removed:
+        session.flush()
+    result.counters_written = _write_counters(session, project_id, parsed.values())
+    return result
+
+
+def _count(units: Iterable[Unit]) -> dict[tuple[str, str], Counter]:
+    counts: dict[tuple[str, str], Counter] = defaultdict(Counter)
+    for unit in units:
+        bucket = status_bucket(unit.status)
+        for dimension, value in (
+            (DIMENSION_PROJECT, ""),
+            (DIMENSION_BLOCK, unit.block_name or ""),
+            (DIMENSION_UNIT_TYPE, unit.unit_type or ""),
+        ):
+            counts[(dimension, value)][bucket] += 1
+    return counts
+
+
+def _write_counters(session: Session, project_id: int, units: Iterable[Unit]) -> int:
+    counts = _count(units)
+    existing = {
+        (row.dimension, row.dimension_value): row
+        for row in session.scalars(
+            select(UnitInventoryCounter).where(UnitInventoryCounter.project_id == project_id)
+        )
+    }
+
+    written = 0
+    for key, bucket in counts.items():
+        values = {
+            "total_units": sum(bucket.values()),
+            "available_units": bucket["available"],
+            "booked_units": bucket["booked"],
+            "unknown_units": bucket["unknown"],
+        }
+        row = existing.pop(key, None)
+        if row is None:
+            session.add(
+                UnitInventoryCounter(
+                    project_id=project_id, dimension=key[0], dimension_value=key[1], **values
+                )
+            )
+            written += 1
+        elif any(getattr(row, name) != value for name, value in values.items()):
+            for name, value in values.items():
+                setattr(row, name, value)
+            written += 1
+
+    for row in existing.values():
+        session.delete(row)
+        written += 1
+    return written
+
+
+def rebuild_inventory_counters(session: Session, project_ids: Iterable[int] | None = None) -> int:
+    """Recompute counters from stored units (backfill); returns rows written."""
+
+    stmt = select(Unit.project_id).distinct()
+    if project_ids is not None:
+        stmt = stmt.where(Unit.project_id.in_(list(project_ids)))
+    written = 0
+    for project_id in session.scalars(stmt):
+        units = session.scalars(select(Unit).where(Unit.project_id == project_id))
+        written += _write_counters(session, project_id, units)
+    return written
+
+
+def _row_to_dict(name: str, total: int, available: int, booked: int, unknown: int) -> dict[str, Any]:
+    return {
+        "name": name,
+        "total_units": total,
+        "available_units": available,
+        "booked_units": booked,
+        "unknown_units": unknown,
+        "sold_percent": sold_percent(total, booked),
+    }
+
+
+def _summary_from_units(session: Session, project_id: int) -> list[tuple[str, str, int, int, int, int]]:
+    # Projects loaded before the counters existed: aggregate in the database
+    lowered = func.lower(func.coalesce(Unit.status, ""))
+    available = func.sum(case((lowered == "available", 1), else_=0))
+    booked = func.sum(case((lowered.in_(_BOOKED_STATUSES), 1), else_=0))
+    rows: list[tuple[str, str, int, int, int, int]] = []
+    for dimension, column in (
+        (DIMENSION_PROJECT, None),
+        (DIMENSION_BLOCK, Unit.block_name),
+        (DIMENSION_UNIT_TYPE, Unit.unit_type),
+    ):
+        label = func.coalesce(column, "") if column is not None else literal("")
+        stmt = select(label, func.count(), available, booked).where(Unit.project_id == project_id)
+        if column is not None:
+            stmt = stmt.group_by(label)
+        for value, total, avail, book in session.execute(stmt):
+            if total:
+                avail, book = int(avail or 0), int(book or 0)
+                rows.append((dimension, value or "", total, avail, book, total - avail - book))
+    return rows
+
+
+def get_inventory_summary(session: Session, project_id: int) -> dict[str, Any]:
+    """Project totals plus per-block and per-unit-type breakdowns."""
+
+    rows = [
+        (r.dimension, r.dimension_value, r.total_units, r.available_units, r.booked_units, r.unknown_units)
+        for r in session.scalars(
+            select(UnitInventoryCounter).where(UnitInventoryCounter.project_id == project_id)
+        )
+    ]
+    if not rows:
+        rows = _summary_from_units(session, project_id)
+
+    summary: dict[str, Any] = {
+        "stats": _row_to_dict("", 0, 0, 0, 0),
+        "blocks": [],
+        "unit_types": [],
+    }
+    for dimension, value, total, available, booked, unknown in sorted(rows):
+        entry = _row_to_dict(value, total, available, booked, unknown)
+        if dimension == DIMENSION_PROJECT:
+            summary["stats"] = entry
+        elif dimension == DIMENSION_BLOCK:
+            summary["blocks"].append(entry)
+        else:
+            summary["unit_types"].append(entry)
+    return summary
+
+
+def get_unit_status_history(
+    session: Session, project_id: int, limit: int = 100
+) -> list[UnitStatusHistory]:
+    """Most recent status transitions for a project, newest first."""
+
+    return list(
+        session.scalars(
+            select(UnitStatusHistory)
+            .where(UnitStatusHistory.project_id == project_id)
+            .order_by(UnitStatusHistory.observed_at.desc(), UnitStatusHistory.id.desc())
+            .limit(limit)
+        )
+    )
+
+
+__all__ = [
+    "InventorySyncResult",
+    "get_inventory_summary",
+    "get_unit_status_history",
+    "rebuild_inventory_counters",
+    "status_bucket",
+    "sync_project_units",
+    "unit_key",
+]
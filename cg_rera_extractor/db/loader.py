@@ -13,7 +13,7 @@ from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Callable, Iterable
+from typing import Callable, Iterable
 
 from sqlalchemy import delete, select, func
 from sqlalchemy.orm import Session
@@ -38,9 +38,13 @@ from cg_rera_extractor.db import (
 )
 from cg_rera_extractor.db.enums import MediaCategory
 from cg_rera_extractor.db.models import DataProvenance, IngestionAudit
+from cg_rera_extractor.db.inventory import InventorySyncResult, sync_project_units
+from cg_rera_extractor.db.price_rollups import entity_keys_for_project, refresh_price_rollups
+from cg_rera_extractor.db.versioning import bump_data_version, invalidate_detail_documents
 from cg_rera_extractor.geo import AddressParts, normalize_address
 from cg_rera_extractor.utils.normalize import slugify
 from cg_rera_extractor.parsing.schema import V1Project
+from cg_rera_extractor.quality.run_qa import evaluate_run_qa, qa_project_data, run_qa_available
 from cg_rera_extractor.quality.validation import (
     run_qa_validation,
     QAResult,
@@ -66,14 +70,18 @@ class LoadStats:
     artifacts: int = 0
     locations: int = 0
     units: int = 0               # New: Shredded units
+    unit_status_changes: int = 0  # Inventory status transitions logged
     media: int = 0               # New: Media files
     provenance_records: int = 0  # Point 29: Provenance tracking
     qa_passed: int = 0           # Point 27: QA tracking
     qa_warnings: int = 0
     qa_failed: int = 0
     runs_processed: list[str] = field(default_factory=list)
+    project_ids: set[int] = field(default_factory=set)
+    # (entity_type, entity_key) price rollups reloaded projects belonged to before
+    previous_rollup_keys: set[tuple[str, str]] = field(default_factory=set)
 
-    def to_dict(self) -> dict[str, int | list[str]]:
+    def to_dict(self) -> dict[str, int | list[str] | list[int]]:
         return {
             "projects_upserted": self.projects_upserted,
             "promoters": self.promoters,
@@ -86,12 +94,14 @@ class LoadStats:
             "artifacts": self.artifacts,
             "locations": self.locations,
             "units": self.units,
+            "unit_status_changes": self.unit_status_changes,
             "media": self.media,
             "provenance_records": self.provenance_records,
             "qa_passed": self.qa_passed,
             "qa_warnings": self.qa_warnings,
             "qa_failed": self.qa_failed,
             "runs_processed": list(self.runs_processed),
+            "project_ids": sorted(self.project_ids),
         }
 
 
@@ -117,9 +127,8 @@ def _ensure_session(session: Session | None) -> tuple[Session, Callable[[], None
     if session is not None:
         return session, lambda: None
 
-    engine = get_engine()
-    SessionLocal = get_session_local(engine)
-    db_session = SessionLocal()
+    # Shared process-wide engine; repeated loads reuse its connection pool
+    db_session = get_session_local(get_engine())()
     return db_session, db_session.close
 
 
@@ -183,11 +192,12 @@ def _infer_media_category(field_key: str) -> MediaCategory:
 def _process_shredded_units(
     session: Session, 
     project: Project, 
-    v1_project: V1Project
-) -> int:
+    v1_project: V1Project,
+    run_id: str | None = None,
+) -> InventorySyncResult:
     """
     Parse 'Brief Details Apartment/Flat' table and 'Inventory Status' grid
-    to populate the 'units' table.
+    and sync the 'units' table (plus status history and counters) with them.
     """
     raw_tables = v1_project.raw_data.tables
     raw_grids = v1_project.raw_data.grids
@@ -317,14 +327,8 @@ def _process_shredded_units(
                     # Use a unique key
                     units_map[f"grid_{unit_text}_{len(units_map)}"] = u
 
-    # 3. Insert into DB
-    count = 0
-    if units_map:
-        session.execute(delete(Unit).where(Unit.project_id == project.id))
-        session.add_all(units_map.values())
-        count = len(units_map)
-        
-    return count
+    # 3. Diff against stored units: only changed rows are written
+    return sync_project_units(session, project.id, list(units_map.values()), run_id=run_id)
 
 # =============================================================================
 # POINT 27: QA Validation Gate
@@ -340,29 +344,7 @@ def _run_qa_gate(
     
     Point 27: QA gate that validates data quality.
     """
-    details = v1_project.project_details
-    
-    # Build project data dict for validation
-    project_data: dict[str, Any] = {
-        "rera_registration_number": details.registration_number,
-        "project_name": details.project_name,
-        "district": details.district,
-        "project_status": details.project_status,
-        "promoter_name": (
-            v1_project.promoter_details[0].name 
-            if v1_project.promoter_details else None
-        ),
-        "approved_date": details.launch_date,
-        "proposed_end_date": details.expected_completion_date,
-    }
-    
-    # Extract pricing from unit types if available
-    if v1_project.unit_types:
-        prices = [ut.price_in_inr for ut in v1_project.unit_types if ut.price_in_inr]
-        if prices:
-            project_data["min_price_total"] = min(prices)
-            project_data["max_price_total"] = max(prices)
-    
+    project_data = qa_project_data(v1_project)
     return run_qa_validation(project_data, config=config or PriceSanityConfig())
 
 
@@ -486,6 +468,7 @@ def _load_project(
     run_id: str | None = None,
     html_snapshot_path: str | None = None,
     qa_config: PriceSanityConfig | None = None,
+    qa_result: QAResult | None = None,
 ) -> LoadStats:
     stats = LoadStats()
     details = v1_project.project_details
@@ -497,7 +480,9 @@ def _load_project(
     # =========================================================================
     # POINT 27: Run QA Validation Gate
     # =========================================================================
-    qa_result = _run_qa_gate(v1_project, config=qa_config)
+    # Run loads pass the result of the run-level gate (see quality.run_qa)
+    if qa_result is None:
+        qa_result = _run_qa_gate(v1_project, config=qa_config)
     
     if qa_result.status == QAStatus.PASSED:
         stats.qa_passed += 1
@@ -535,6 +520,9 @@ def _load_project(
         )
         session.add(project)
     else:
+        stats.previous_rollup_keys.update(
+            (entity_type, key) for entity_type, key in entity_keys_for_project(project).items() if key is not None
+        )
         project.project_name = details.project_name or project.project_name
         project.parent_project_id = parent_project.id
 
@@ -613,14 +601,16 @@ def _load_project(
         (ProjectArtifact, []),  # Artifacts handled via previews
         (ProjectLocation, v1_project.rera_locations),  # RERA locations from amenities
         (ProjectPricingSnapshot, []), # Prices handled separately below
-        (Unit, []), # Units handled via _process_shredded_units
         (ProjectMedia, []), # Media handled via previews/docs below
     ]
     for model, _ in child_tables:
         session.execute(delete(model).where(model.project_id == project.id))
     
     # --- Populating Units (Shredded) ---
-    stats.units = _process_shredded_units(session, project, v1_project)
+    # Units are diffed rather than deleted above, keeping ids and history
+    inventory = _process_shredded_units(session, project, v1_project, run_id=run_id)
+    stats.units = inventory.total
+    stats.unit_status_changes = inventory.status_changes
 
     # --- Promoters ---
     for promoter in v1_project.promoter_details:
@@ -879,6 +869,7 @@ def _load_project(
         stats.locations += 1
 
     stats.projects_upserted += 1
+    stats.project_ids.add(project.id)
     return stats
 
 
@@ -921,21 +912,38 @@ def load_run_into_db(
         logger.info(f"Loading {len(v1_files)} projects from {run_path.name}")
         audit.projects_attempted = len(v1_files)
 
+        projects: list[tuple[Path, V1Project]] = []
         for path in v1_files:
+            try:
+                # Read JSON, removing BOM if present
+                json_text = path.read_text(encoding='utf-8-sig')
+                projects.append((path, V1Project.model_validate_json(json_text)))
+            except Exception as exc:
+                logger.error(f"Failed to load {path.name}: {exc}")
+                raise
+
+        # QA for the whole run in one pass (peer price statistics need all projects)
+        qa_results: list[QAResult | None] = [None] * len(projects)
+        if run_qa_available() and projects:
+            qa_report = evaluate_run_qa(
+                [v1_project for _, v1_project in projects], config=qa_config or PriceSanityConfig()
+            )
+            qa_results = list(qa_report.results)
+            audit.qa_flags_summary = {"district_stats": qa_report.district_stats}
+
+        for (path, v1_project), qa_result in zip(projects, qa_results):
             # Determine HTML snapshot path if it exists
             html_path = run_path / "raw_html" / path.name.replace(".v1.json", ".html")
             html_snapshot_path = str(html_path) if html_path.exists() else None
             
             try:
-                # Read JSON, removing BOM if present
-                json_text = path.read_text(encoding='utf-8-sig')
-                v1_project = V1Project.model_validate_json(json_text)
                 project_stats = _load_project(
                     working_session,
                     v1_project,
                     run_id=run_id,
                     html_snapshot_path=html_snapshot_path,
                     qa_config=qa_config,
+                    qa_result=qa_result,
                 )
                 stats.projects_upserted += project_stats.projects_upserted
                 stats.promoters += project_stats.promoters
@@ -948,11 +956,14 @@ def load_run_into_db(
                 stats.artifacts += project_stats.artifacts
                 stats.locations += project_stats.locations
                 stats.units += project_stats.units
+                stats.unit_status_changes += project_stats.unit_status_changes
                 stats.media += project_stats.media
                 stats.provenance_records += project_stats.provenance_records
                 stats.qa_passed += project_stats.qa_passed
                 stats.qa_warnings += project_stats.qa_warnings
                 stats.qa_failed += project_stats.qa_failed
+                stats.project_ids |= project_stats.project_ids
+                stats.previous_rollup_keys |= project_stats.previous_rollup_keys
             except Exception as exc:
                 logger.error(f"Failed to load {path.name}: {exc}")
                 raise
@@ -963,6 +974,7 @@ def load_run_into_db(
         audit.projects_succeeded = stats.projects_upserted
         audit.projects_failed = stats.qa_failed
         audit.qa_flags_summary = {
+            **(audit.qa_flags_summary or {}),
             "qa_passed": stats.qa_passed,
             "qa_warnings": stats.qa_warnings,
             "qa_failed": stats.qa_failed,
@@ -972,6 +984,13 @@ def load_run_into_db(
                 (audit.completed_at - audit.started_at).total_seconds()
             )
 
+        # Reloads replace every loaded project's snapshots (even with no new
+        # prices) and may move it to another district, so refresh both sides
+        refresh_price_rollups(working_session, stats.project_ids, stats.previous_rollup_keys)
+
+        # Invalidate cached API responses built from the previous data
+        invalidate_detail_documents(working_session, stats.project_ids)
+        bump_data_version(working_session)
         working_session.commit()
         logger.info(f"Successfully loaded run {run_path.name}: {stats.to_dict()}")
         return stats.to_dict()
@@ -1024,10 +1043,12 @@ def load_all_runs(
                 stats.artifacts += int(run_stats.get("artifacts", 0))
                 stats.locations += int(run_stats.get("locations", 0))
                 stats.units += int(run_stats.get("units", 0))
+                stats.unit_status_changes += int(run_stats.get("unit_status_changes", 0))
                 stats.provenance_records += int(run_stats.get("provenance_records", 0))
                 stats.qa_passed += int(run_stats.get("qa_passed", 0))
                 stats.qa_warnings += int(run_stats.get("qa_warnings", 0))
                 stats.qa_failed += int(run_stats.get("qa_failed", 0))
+                stats.project_ids.update(run_stats.get("project_ids", []))
                 stats.runs_processed.append(run_path.name)
             except Exception as exc:
                 logger.error(f"Failed to load run {run_path.name}: {exc}")
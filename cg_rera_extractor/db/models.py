@@ -18,6 +18,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Float,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -332,6 +333,7 @@ class UnitType(Base):
     """Unit type mix for a project (1BHK/2BHK/etc.)."""
 
     __tablename__ = "unit_types"
+    __table_args__ = (Index("ix_unit_types_updated_at", "updated_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -344,6 +346,13 @@ class UnitType(Base):
     terrace_area_sqmt: Mapped[Numeric | None] = mapped_column(Numeric(12, 2))
     total_units: Mapped[int | None] = mapped_column(Integer)
     sale_price: Mapped[Numeric | None] = mapped_column(Numeric(14, 2))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(),
+        doc="Watermark column for incremental anomaly scoring"
+    )
 
     project: Mapped[Project] = relationship(back_populates="unit_types")
 
@@ -442,6 +451,9 @@ class ProjectArtifact(Base):
     
     # Feature 3: Floor Plan OCR Data
     floor_plan_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, doc="Structured room dimensions and layout data")
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64), index=True, doc="SHA-256 of the file as last OCR'd; identical files reuse its result"
+    )
 
     project: Mapped[Project] = relationship(back_populates="artifacts")
 
@@ -742,6 +754,60 @@ class Unit(Base):
 
 
 
+class UnitStatusHistory(Base):
+    """
+    Append-only log of unit status transitions written by the inventory sync.
+
+    ``old_status`` is NULL when a unit first appears and ``new_status`` is
+    NULL when it disappears from the grid (``unit_id`` is then NULL too;
+    ``unit_key`` still identifies it).
+    """
+    __tablename__ = "unit_status_history"
+    __table_args__ = (
+        Index("ix_unit_status_history_project_observed", "project_id", "observed_at"),
+        Index("ix_unit_status_history_unit_id", "unit_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    unit_id: Mapped[int | None] = mapped_column(ForeignKey("units.id", ondelete="SET NULL"))
+    unit_key: Mapped[str] = mapped_column(String(200), nullable=False, doc="Block/unit identity key")
+    old_status: Mapped[str | None] = mapped_column(String(32))
+    new_status: Mapped[str | None] = mapped_column(String(32))
+    observed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    run_id: Mapped[str | None] = mapped_column(String(100), doc="Ingestion run that observed it")
+
+    unit: Mapped["Unit | None"] = relationship()
+
+
+class UnitInventoryCounter(Base):
+    """
+    Availability counters maintained by the inventory sync.
+
+    One row per (project, dimension, value): dimension ``project`` (value
+    ``""``), ``block`` (block name) or ``unit_type``. Inventory summaries and
+    sold percentages are read from here instead of scanning ``units``.
+    """
+    __tablename__ = "unit_inventory_counters"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    dimension_value: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    total_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    booked_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unknown_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 # =============================================================================
 # POINT 29: Content Provenance (Audit Trail)
 # =============================================================================
@@ -998,6 +1064,48 @@ class ReraFiling(Base):
     project: Mapped[Project] = relationship(back_populates="rera_filings")
 
 
+class AIJob(Base):
+    """
+    Queued AI work (document extraction, project scoring) run by Celery workers.
+
+    ``job_key`` (kind, project, input hash) makes submissions idempotent:
+    resubmitting the same document, or scoring unchanged project data,
+    returns the existing job. ``input_hash`` is the SHA-256 of the document
+    for extraction and of the project's data version for scoring.
+    """
+
+    __tablename__ = "ai_jobs"
+    __table_args__ = (
+        UniqueConstraint("job_key", name="uq_ai_jobs_job_key"),
+        Index("ix_ai_jobs_project_kind", "project_id", "kind"),
+        Index("ix_ai_jobs_status", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_key: Mapped[str] = mapped_column(String(200), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False, doc="rera_extract or score")
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    input_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict[str, Any] | None] = mapped_column(JSON, doc="Task arguments, e.g. file_path")
+    queue: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default="queued",
+        doc="queued, running, retrying, succeeded or failed",
+    )
+    task_id: Mapped[str | None] = mapped_column(String(64), doc="Celery task id of the latest dispatch")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+    callback_url: Mapped[str | None] = mapped_column(String(1024))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
 class ProjectImputation(Base):
     """
     Stores predicted/imputed values for missing project data.
@@ -1098,6 +1206,97 @@ class ProjectEmbedding(Base):
     project: Mapped[Project] = relationship(back_populates="embedding")
 
 
+class DataVersion(Base):
+    """
+    Monotonic data-version counters bumped by ETL writers (loader, scoring).
+
+    Read-side caches include the current version in their keys, so a bump
+    invalidates every cached response derived from the older data.
+    """
+
+    __tablename__ = "data_versions"
+
+    scope: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class PriceTrendRollup(Base):
+    """
+    Materialized per-period price aggregates for projects, localities and districts.
+
+    Rebuilt for the affected entities whenever pricing snapshots land (see
+    ``cg_rera_extractor.db.price_rollups``) so trend endpoints read a
+    handful of pre-aggregated rows instead of scanning snapshots.
+    """
+
+    __tablename__ = "price_trend_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "entity_type",
+            "entity_key",
+            "granularity",
+            "unit_type_label",
+            "period_start",
+            name="uq_price_trend_rollups_period",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(
+        String(20), nullable=False, doc="project | locality | district"
+    )
+    entity_key: Mapped[str] = mapped_column(
+        String(160), nullable=False,
+        doc="Project group key, locality id or normalized district name",
+    )
+    granularity: Mapped[str] = mapped_column(String(20), nullable=False)
+    unit_type_label: Mapped[str] = mapped_column(
+        String(100), nullable=False, default="", doc="Empty string = all unit types"
+    )
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[date] = mapped_column(Date, nullable=False)
+    sample_size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    avg_price_per_sqft: Mapped[Numeric | None] = mapped_column(Numeric(10, 2))
+    min_price_per_sqft: Mapped[Numeric | None] = mapped_column(Numeric(10, 2))
+    max_price_per_sqft: Mapped[Numeric | None] = mapped_column(Numeric(10, 2))
+    median_price_per_sqft: Mapped[Numeric | None] = mapped_column(Numeric(10, 2))
+    avg_total_price: Mapped[Numeric | None] = mapped_column(Numeric(14, 2))
+    min_total_price: Mapped[Numeric | None] = mapped_column(Numeric(14, 2))
+    max_total_price: Mapped[Numeric | None] = mapped_column(Numeric(14, 2))
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class ProjectDetailDocument(Base):
+    """
+    Precomputed project detail payload served by ``GET /projects/{id}``.
+
+    Rebuilt by the ETL after scoring (see
+    ``cg_rera_extractor.api.services.detail.refresh_detail_documents``).
+    Writers that change a project drop its document (see
+    ``cg_rera_extractor.db.versioning.invalidate_detail_documents``), so a
+    stored document is always current and missing ones are assembled live.
+    ``data_version`` records the catalog version it was built at.
+    """
+
+    __tablename__ = "project_detail_documents"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    document: Mapped[dict[str, Any]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=False
+    )
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 __all__ = [
     "ParentProject",
     "Project",
@@ -1115,14 +1314,20 @@ __all__ = [
     "ProjectLocation",
     "ProjectUnitType",
     "Unit",
+    "UnitStatusHistory",
+    "UnitInventoryCounter",
     "ProjectPricingSnapshot",
+    "PriceTrendRollup",
+    "ProjectDetailDocument",
     # Point 28 & 29: Ops Standard
     "DataProvenance",
     "IngestionAudit",
     "ReraFiling",
+    "AIJob",
     "ProjectImputation",
     "DataQualityFlag",
     "ProjectEmbedding",
+    "DataVersion",
     "ProjectMedia",
     "Locality",
 ]
@@ -0,0 +1,365 @@
+"""Materialized price-trend rollups keyed by project, locality and district.
+
+``price_trend_rollups`` holds one row per (entity, granularity, unit type,
+period) with the aggregates the analytics API serves. Writers of
+``ProjectPricingSnapshot`` rows call :func:`refresh_price_rollups` with the
+touched project ids; only the projects, localities and districts those
+projects belong to are recomputed.
+
+On PostgreSQL the aggregation runs in SQL (``date_trunc`` buckets and
+``percentile_cont`` medians). Other dialects (SQLite in tests) fall back to
+a single-pass aggregation in Python with the same bucket semantics.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from statistics import median
+from typing import Any, Iterable
+
+from sqlalchemy import (
+    Date,
+    String,
+    and_,
+    case,
+    cast,
+    delete,
+    distinct,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from .models import PriceTrendRollup, Project, ProjectPricingSnapshot
+
+logger = logging.getLogger(__name__)
+
+ENTITY_PROJECT = "project"
+ENTITY_LOCALITY = "locality"
+ENTITY_DISTRICT = "district"
+ENTITY_TYPES = (ENTITY_PROJECT, ENTITY_LOCALITY, ENTITY_DISTRICT)
+
+# Granularity -> PostgreSQL date_trunc unit
+GRANULARITIES: dict[str, str] = {
+    "daily": "day",
+    "weekly": "week",
+    "monthly": "month",
+    "quarterly": "quarter",
+    "yearly": "year",
+}
+
+# unit_type_label used for the "all unit types" series
+ALL_UNIT_TYPES = ""
+
+
+# =============================================================================
+# Periods and entity keys
+# =============================================================================
+
+
+def period_start(value: date, granularity: str) -> date:
+    """Truncate ``value`` to the start of its period (weeks start on Monday)."""
+
+    if granularity == "daily":
+        return value
+    if granularity == "weekly":
+        return value - timedelta(days=value.weekday())
+    if granularity == "monthly":
+        return value.replace(day=1)
+    if granularity == "quarterly":
+        return date(value.year, ((value.month - 1) // 3) * 3 + 1, 1)
+    if granularity == "yearly":
+        return date(value.year, 1, 1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def period_end(start: date, granularity: str) -> date:
+    """Last day of the period starting at ``start``."""
+
+    if granularity == "daily":
+        return start
+    if granularity == "weekly":
+        return start + timedelta(days=6)
+    months = {"monthly": 1, "quarterly": 3, "yearly": 12}[granularity]
+    month = start.month - 1 + months
+    return date(start.year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+
+def project_group_key(project_id: int, parent_project_id: int | None) -> str:
+    """Registrations of the same parent project share one price series."""
+
+    return f"parent:{parent_project_id}" if parent_project_id else str(project_id)
+
+
+def district_key(name: str | None) -> str | None:
+    if not name or not name.strip():
+        return None
+    return name.strip().lower()
+
+
+def entity_keys_for_project(project: Project) -> dict[str, str | None]:
+    """Rollup keys a project's snapshots contribute to, per entity type."""
+
+    return {
+        ENTITY_PROJECT: project_group_key(project.id, project.parent_project_id),
+        ENTITY_LOCALITY: str(project.locality_id) if project.locality_id else None,
+        ENTITY_DISTRICT: district_key(project.district),
+    }
+
+
+def _entity_key_expr(entity_type: str):
+    if entity_type == ENTITY_PROJECT:
+        return case(
+            (
+                Project.parent_project_id.isnot(None),
+                literal("parent:") + cast(Project.parent_project_id, String),
+            ),
+            else_=cast(Project.id, String),
+        )
+    if entity_type == ENTITY_LOCALITY:
+        return cast(Project.locality_id, String)
+    if entity_type == ENTITY_DISTRICT:
+        return func.lower(func.trim(Project.district))
+    raise ValueError(f"Unknown entity type: {entity_type}")
+
+
+# =============================================================================
+# Aggregation
+# =============================================================================
+
+
+def _aggregate_sql(
+    session: Session, entity_type: str, keys: set[str] | None
+) -> list[dict[str, Any]]:
+    """Aggregate every granularity in the database (PostgreSQL)."""
+
+    key_expr = _entity_key_expr(entity_type)
+    snap = ProjectPricingSnapshot
+
+    def observations(psf_col, total_col):
+        stmt = (
+            select(
+                snap.id.label("snapshot_id"),
+                key_expr.label("entity_key"),
+                snap.snapshot_date.label("snapshot_date"),
+                snap.unit_type_label.label("unit_type_label"),
+                psf_col.label("psf"),
+                total_col.label("total"),
+            )
+            .join(Project, Project.id == snap.project_id)
+            .where(
+                snap.is_active.is_(True),
+                key_expr.isnot(None),
+                or_(psf_col.isnot(None), total_col.isnot(None)),
+            )
+        )
+        if keys is not None:
+            stmt = stmt.where(key_expr.in_(keys))
+        return stmt
+
+    # Each snapshot contributes both ends of its price range
+    obs = union_all(
+        observations(snap.min_price_per_sqft, snap.min_price_total),
+        observations(snap.max_price_per_sqft, snap.max_price_total),
+    ).subquery()
+
+    rows: list[dict[str, Any]] = []
+    for granularity, unit in GRANULARITIES.items():
+        # Inline the unit so SELECT and GROUP BY render the identical expression
+        unit_sql = literal_column(f"'{unit}'")
+        bucket = cast(func.date_trunc(unit_sql, obs.c.snapshot_date), Date).label("period_start")
+        for by_unit_type in (False, True):
+            group_cols = [obs.c.entity_key, bucket]
+            if by_unit_type:
+                group_cols.append(obs.c.unit_type_label)
+            stmt = select(
+                *group_cols,
+                func.count(distinct(obs.c.snapshot_id)).label("sample_size"),
+                func.avg(obs.c.psf).label("avg_price_per_sqft"),
+                func.min(obs.c.psf).label("min_price_per_sqft"),
+                func.max(obs.c.psf).label("max_price_per_sqft"),
+                func.percentile_cont(0.5).within_group(obs.c.psf).label("median_price_per_sqft"),
+                func.avg(obs.c.total).label("avg_total_price"),
+                func.min(obs.c.total).label("min_total_price"),
+                func.max(obs.c.total).label("max_total_price"),
+            ).group_by(*group_cols)
+            if by_unit_type:
+                stmt = stmt.where(obs.c.unit_type_label.isnot(None))
+
+            for row in session.execute(stmt).mappings():
+                record = dict(row)
+                record["granularity"] = granularity
+                record["unit_type_label"] = (
+                    row["unit_type_label"] if by_unit_type else ALL_UNIT_TYPES
+                )
+                rows.append(record)
+    return rows
+
+
+def _aggregate_python(
+    session: Session, entity_type: str, keys: set[str] | None
+) -> list[dict[str, Any]]:
+    """Portable fallback: one read of the snapshots, one pass per series."""
+
+    key_expr = _entity_key_expr(entity_type)
+    snap = ProjectPricingSnapshot
+    stmt = (
+        select(
+            snap.id,
+            key_expr,
+            snap.snapshot_date,
+            snap.unit_type_label,
+            snap.min_price_per_sqft,
+            snap.max_price_per_sqft,
+            snap.min_price_total,
+            snap.max_price_total,
+        )
+        .join(Project, Project.id == snap.project_id)
+        .where(snap.is_active.is_(True), key_expr.isnot(None))
+    )
+    if keys is not None:
+        stmt = stmt.where(key_expr.in_(keys))
+    snapshots = session.execute(stmt).all()
+
+    rows: list[dict[str, Any]] = []
+    for granularity in GRANULARITIES:
+        groups: dict[tuple, list[tuple]] = defaultdict(list)
+        for snapshot in snapshots:
+            start = period_start(snapshot[2], granularity)
+            groups[(snapshot[1], start, ALL_UNIT_TYPES)].append(snapshot)
+            if snapshot[3] is not None:
+                groups[(snapshot[1], start, snapshot[3])].append(snapshot)
+
+        for (key, start, unit_label), members in groups.items():
+            psf = [float(v) for s in members for v in (s[4], s[5]) if v is not None]
+            totals = [float(v) for s in members for v in (s[6], s[7]) if v is not None]
+            if not psf and not totals:
+                continue
+            rows.append({
+                "entity_key": key,
+                "period_start": start,
+                "granularity": granularity,
+                "unit_type_label": unit_label,
+                "sample_size": sum(
+                    1 for s in members if any(v is not None for v in s[4:8])
+                ),
+                "avg_price_per_sqft": sum(psf) / len(psf) if psf else None,
+                "min_price_per_sqft": min(psf) if psf else None,
+                "max_price_per_sqft": max(psf) if psf else None,
+                "median_price_per_sqft": median(psf) if psf else None,
+                "avg_total_price": sum(totals) / len(totals) if totals else None,
+                "min_total_price": min(totals) if totals else None,
+                "max_total_price": max(totals) if totals else None,
+            })
+    return rows
+
+
+def _round(value: Any, places: str) -> Decimal | None:
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(Decimal(places))
+
+
+def _write_rows(session: Session, entity_type: str, rows: list[dict[str, Any]]) -> None:
+    session.add_all(
+        PriceTrendRollup(
+            entity_type=entity_type,
+            entity_key=row["entity_key"],
+            granularity=row["granularity"],
+            unit_type_label=row["unit_type_label"],
+            period_start=row["period_start"],
+            period_end=period_end(row["period_start"], row["granularity"]),
+            sample_size=int(row["sample_size"]),
+            avg_price_per_sqft=_round(row["avg_price_per_sqft"], "0.01"),
+            min_price_per_sqft=_round(row["min_price_per_sqft"], "0.01"),
+            max_price_per_sqft=_round(row["max_price_per_sqft"], "0.01"),
+            median_price_per_sqft=_round(row["median_price_per_sqft"], "0.01"),
+            avg_total_price=_round(row["avg_total_price"], "0.01"),
+            min_total_price=_round(row["min_total_price"], "0.01"),
+            max_total_price=_round(row["max_total_price"], "0.01"),
+        )
+        for row in rows
+    )
+
+
+# =============================================================================
+# Refresh entry point
+# =============================================================================
+
+
+def refresh_price_rollups(
+    session: Session,
+    project_ids: Iterable[int] | None = None,
+    extra_keys: Iterable[tuple[str, str]] = (),
+) -> int:
+    """Recompute rollups for the entities touched by ``project_ids``.
+
+    ``None`` rebuilds every rollup. ``extra_keys`` are further
+    ``(entity_type, entity_key)`` pairs to recompute, such as the keys a
+    project contributed to before a reload moved it. Runs in the caller's
+    transaction (the caller commits) and returns the number of rollup rows
+    written.
+    """
+
+    # Pending snapshot and project changes must be visible to the reads below
+    session.flush()
+    affected: dict[str, set[str] | None]
+    if project_ids is None:
+        affected = {entity_type: None for entity_type in ENTITY_TYPES}
+    else:
+        ids = set(project_ids)
+        affected = {entity_type: set() for entity_type in ENTITY_TYPES}
+        for entity_type, key in extra_keys:
+            affected[entity_type].add(key)
+        if ids:
+            projects = session.execute(select(Project).where(Project.id.in_(ids))).scalars()
+            for project in projects:
+                for entity_type, key in entity_keys_for_project(project).items():
+                    if key is not None:
+                        affected[entity_type].add(key)
+        if not any(affected.values()):
+            return 0
+
+    aggregate = (
+        _aggregate_sql
+        if session.get_bind().dialect.name == "postgresql"
+        else _aggregate_python
+    )
+
+    written = 0
+    for entity_type, keys in affected.items():
+        if keys is not None and not keys:
+            continue
+        condition = PriceTrendRollup.entity_type == entity_type
+        if keys is not None:
+            condition = and_(condition, PriceTrendRollup.entity_key.in_(keys))
+        session.execute(delete(PriceTrendRollup).where(condition))
+
+        rows = aggregate(session, entity_type, keys)
+        _write_rows(session, entity_type, rows)
+        written += len(rows)
+
+    session.flush()
+    logger.info("Refreshed %s price trend rollup rows", written)
+    return written
+
+
+__all__ = [
+    "ALL_UNIT_TYPES",
+    "ENTITY_DISTRICT",
+    "ENTITY_LOCALITY",
+    "ENTITY_PROJECT",
+    "GRANULARITIES",
+    "district_key",
+    "entity_keys_for_project",
+    "period_end",
+    "period_start",
+    "project_group_key",
+    "refresh_price_rollups",
+]
@@ -0,0 +1,68 @@
+"""Data-version counters used to invalidate read-side caches."""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from .models import DataVersion, Project, ProjectDetailDocument
+
+# Scope covering everything the public read API serves.
+CATALOG_SCOPE = "catalog"
+
+
+def get_data_version(session: Session, scope: str = CATALOG_SCOPE) -> int:
+    """Return the current version for ``scope`` (0 if never bumped)."""
+
+    version = session.execute(
+        select(DataVersion.version).where(DataVersion.scope == scope)
+    ).scalar_one_or_none()
+    return int(version or 0)
+
+
+def bump_data_version(session: Session, scope: str = CATALOG_SCOPE) -> int:
+    """Increment the version for ``scope`` and return the new value.
+
+    The increment runs inside the caller's transaction so the bump becomes
+    visible together with the data it describes.
+    """
+
+    result = session.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == scope)
+        .values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        session.add(DataVersion(scope=scope, version=1))
+        session.flush()
+    return get_data_version(session, scope)
+
+
+def invalidate_detail_documents(session: Session, project_ids: Iterable[int]) -> int:
+    """Drop the precomputed detail documents of ``project_ids``.
+
+    Documents of sibling registrations (same parent project) go too, since
+    they list each other. Dropped projects are assembled live until the next
+    detail document refresh; returns the number of documents removed.
+    """
+
+    ids = set(project_ids)
+    if not ids:
+        return 0
+    parents = select(Project.parent_project_id).where(
+        Project.id.in_(ids), Project.parent_project_id.isnot(None)
+    )
+    siblings = select(Project.id).where(Project.parent_project_id.in_(parents))
+    result = session.execute(
+        delete(ProjectDetailDocument).where(
+            or_(
+                ProjectDetailDocument.project_id.in_(ids),
+                ProjectDetailDocument.project_id.in_(siblings),
+            )
+        )
+    )
+    return result.rowcount or 0
+
+
+__all__ = ["CATALOG_SCOPE", "bump_data_version", "get_data_version", "invalidate_detail_documents"]
@@ -24,6 +24,8 @@ from cg_rera_extractor.detail.storage import (
 from cg_rera_extractor.listing.models import ListingRecord
 from cg_rera_extractor.utils.scraping_cache import (
     ScrapedCache,
+    ScrapeIndex,
+    listing_fingerprint,
     should_skip_listing,
     mark_listing_scraped,
 )
@@ -249,7 +251,7 @@ def fetch_and_save_details(
     listing_page_url: str,
     state_code: str,
     scraping_mode: str = "full",
-    cache: ScrapedCache | None = None,
+    cache: ScrapeIndex | ScrapedCache | None = None,
 ) -> None:
     """Fetch detail pages for each listing and persist the HTML files.
     
@@ -260,8 +262,9 @@ def fetch_and_save_details(
         output_base: Base directory for output files
         listing_page_url: URL of the listing page
         state_code: State code (e.g., 'CG')
-        scraping_mode: 'delta' to skip already-scraped listings, 'full' to scrape all
-        cache: Optional ScrapedCache instance for delta mode (auto-created if None)
+        scraping_mode: 'delta' to skip unchanged, recently scraped listings, 'full' to scrape all
+        cache: Optional ScrapeIndex for delta mode (auto-created if None); in full
+            mode a given index still records fingerprints and page hashes
     """
 
     table_selector = selectors.listing_table or selectors.results_table or "table"
@@ -270,9 +273,9 @@ def fetch_and_save_details(
     
     # Initialize cache if needed
     if cache is None and scraping_mode == "delta":
-        from cg_rera_extractor.utils.scraping_cache import load_cache
-        cache = load_cache()
-        LOGGER.info("Loaded scraping cache for delta mode")
+        from cg_rera_extractor.utils.scraping_cache import load_scrape_index
+        cache = load_scrape_index()
+        LOGGER.info("Loaded scrape index for delta mode")
     
     LOGGER.info("Starting detail fetch for %d listings (mode=%s)", total, scraping_mode)
 
@@ -281,10 +284,11 @@ def fetch_and_save_details(
             LOGGER.debug("Skipping %s - no detail URL", record.reg_no)
             continue
         
-        # CONDITIONAL SCRAPING: Check if listing should be skipped in delta mode
-        if cache is not None and should_skip_listing(record.reg_no, scraping_mode, cache):
-            LOGGER.info("[SKIP] %s already scraped (delta mode)", record.reg_no)
-            print(f"[{idx}/{total}] SKIPPED {record.reg_no} - already scraped")
+        # CONDITIONAL SCRAPING: Skip listings whose row is unchanged and recently fetched
+        fingerprint = listing_fingerprint(record)
+        if cache is not None and should_skip_listing(record.reg_no, scraping_mode, cache, fingerprint):
+            LOGGER.info("[SKIP] %s unchanged since last scrape (delta mode)", record.reg_no)
+            print(f"[{idx}/{total}] SKIPPED {record.reg_no} - unchanged since last scrape")
             continue
 
         try:
@@ -411,7 +415,9 @@ def fetch_and_save_details(
             
             # CONDITIONAL SCRAPING: Mark listing as scraped in cache
             if cache is not None:
-                mark_listing_scraped(record.reg_no, cache, persist_immediately=False)
+                mark_listing_scraped(
+                    record.reg_no, cache, persist_immediately=False, fingerprint=fingerprint, html=html
+                )
                 LOGGER.info("[SCRAPE] %s scraped successfully", record.reg_no)
                 print(f"[{idx}/{total}] SCRAPED {record.reg_no} successfully")
 
@@ -7,14 +7,19 @@ enriched project records.
 Components:
 - DataMerger: Merge PDF extractions with scraped data
 - ConflictResolver: Resolve conflicts between data sources
+- merge_and_save_batch: Columnar merge of a whole run of projects
 """
 
 from .data_merger import DataMerger, MergeResult
 from .conflict_resolver import ConflictResolver, ConflictResolution
+from .batch_merge import batch_merge_available, merge_and_save_batch, merge_projects_batch
 
 __all__ = [
     "DataMerger",
     "MergeResult",
     "ConflictResolver",
     "ConflictResolution",
+    "batch_merge_available",
+    "merge_and_save_batch",
+    "merge_projects_batch",
 ]
@@ -0,0 +1,424 @@
+"""
+Batch Data Merge
+
+:meth:`DataMerger.merge_project` merges one project at a time: it walks the
+nested scraped dict for every mapped field of every extraction and resolves
+each conflict separately. For a run's worth of projects the batch merge
+flattens every (project, field path) pair into one pandas table, with the
+PDF value and the scraped value as columns, resolves conflicts column-wise
+per strategy group (dates are parsed once per distinct value), then writes
+the merged values back project by project. :func:`merge_and_save_batch`
+merges whole files in chunks (optionally across worker processes), writes
+the enriched JSON with pydantic-core's encoder and returns one merge report.
+
+Results are identical to :meth:`DataMerger.merge_project` apart from the
+``enriched_at`` timestamp, which is shared by the batch. Resolvers that
+override the resolution methods are called row by row to keep their
+behaviour.
+
+pandas is optional (``pip install .[enrichment]``); without it
+:func:`merge_projects_batch` falls back to per-project merging.
+
+Usage:
+    report = merge_and_save_batch(
+        [(json_path, extractions), ...], report_path="merge_report.json", workers=4
+    )
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic_core import to_json
+
+try:  # Optional dependency
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - exercised when pandas is missing
+    np = None
+    pd = None
+
+from .conflict_resolver import ConflictResolution, ConflictResolver, ResolutionStrategy
+from .data_merger import DataMerger, MergeResult
+
+logger = logging.getLogger(__name__)
+
+# (project_id, scraped V1 data, PDF extractions)
+ProjectInput = Tuple[str, Dict[str, Any], List[Dict[str, Any]]]
+# (scraped V1 JSON path, PDF extractions)
+MergeJob = Tuple[Union[str, Path], List[Dict[str, Any]]]
+
+_ROW_WISE_METHODS = ("resolve", "_is_empty", "_values_match", "_apply_strategy", "_parse_date")
+
+
+def batch_merge_available() -> bool:
+    return pd is not None
+
+
+@lru_cache(maxsize=None)
+def _path_parts(path: str) -> Tuple[Union[str, int], ...]:
+    return tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+
+def _lookup(data: Any, parts: Tuple[Union[str, int], ...]) -> Any:
+    """Same result as ``DataMerger._get_nested_value`` for a pre-split path."""
+
+    current = data
+    for part in parts:
+        if current is None:
+            return None
+        if isinstance(part, int):
+            if not isinstance(current, list) or part >= len(current):
+                return None
+            current = current[part]
+        elif isinstance(current, dict):
+            current = current.get(part)
+        else:
+            return None
+    return current
+
+
+def _flatten(projects: Sequence[ProjectInput], field_mapping: Dict[str, str]) -> "pd.DataFrame":
+    """One row per (project, field path) value an extraction contributes."""
+
+    rows = []
+    for index, (_, scraped, extractions) in enumerate(projects):
+        scraped_values: Dict[str, Any] = {}
+        for extraction in extractions:
+            for pdf_field, json_path in field_mapping.items():
+                pdf_value = extraction.get(pdf_field)
+                if pdf_value is None:
+                    continue
+                if json_path not in scraped_values:
+                    scraped_values[json_path] = _lookup(scraped, _path_parts(json_path))
+                rows.append((index, pdf_field, json_path, pdf_value, scraped_values[json_path]))
+    projects_col, fields, paths, pdf_values, scraped_col = zip(*rows) if rows else ((), (), (), (), ())
+    # Object columns keep JSON values (None, ints, lists) exactly as loaded
+    return pd.DataFrame(
+        {
+            "project": list(projects_col),
+            "field": list(fields),
+            "path": list(paths),
+            "pdf": pd.Series(pdf_values, dtype=object),
+            "scraped": pd.Series(scraped_col, dtype=object),
+        }
+    )
+
+
+def _of_type(values: "pd.Series", kinds: tuple) -> "pd.Series":
+    return values[values.map(type).isin(kinds)]
+
+
+def _empty_mask(values: "pd.Series") -> "pd.Series":
+    blank = _of_type(values, (str,)).astype(str).str.strip().eq("")
+    hollow = _of_type(values, (list, dict)).map(len).eq(0)
+    return (
+        values.isna()
+        | blank.reindex(values.index, fill_value=False)
+        | hollow.reindex(values.index, fill_value=False)
+    )
+
+
+def _normalized(values: "pd.Series") -> "pd.Series":
+    """Lower-cased, whitespace-collapsed strings; NaN for non-string values."""
+    strings = _of_type(values, (str,)).astype(str)
+    return strings.str.lower().str.split().str.join(" ").reindex(values.index)
+
+
+def _resolve_columns(frame: "pd.DataFrame", resolver: ConflictResolver) -> List[Optional[ConflictResolution]]:
+    """``resolver.resolve`` for every conflicting row, computed per column."""
+
+    resolutions: List[Optional[ConflictResolution]] = [None] * len(frame)
+    conflict = frame["scraped"].notna() & ~frame["pdf"].eq(frame["scraped"])
+    rows = frame[conflict]
+    if rows.empty:
+        return resolutions
+
+    positions = np.flatnonzero(conflict.to_numpy())
+    fields = rows["field"].tolist()
+    scraped = rows["scraped"].reset_index(drop=True)
+    pdf = rows["pdf"].reset_index(drop=True)
+
+    if any(getattr(type(resolver), name) is not getattr(ConflictResolver, name) for name in _ROW_WISE_METHODS):
+        for position, name, s_value, p_value in zip(positions, fields, scraped, pdf):
+            resolutions[position] = resolver.resolve(name, s_value, p_value)
+        return resolutions
+
+    n = len(rows)
+    resolved = pdf.to_numpy(dtype=object, copy=True)
+    strategy = np.full(n, ResolutionStrategy.PREFER_PDF, dtype=object)
+    confidence = np.ones(n)
+    notes = np.full(n, "", dtype=object)
+    pending = np.ones(n, dtype=bool)
+
+    def settle(mask, value, used, conf, note) -> None:
+        nonlocal pending
+        mask = np.asarray(mask, dtype=bool) & pending
+        if isinstance(value, pd.Series):
+            resolved[mask] = value.to_numpy(dtype=object)[mask]
+        elif value is None:
+            resolved[mask] = None
+        strategy[mask] = used
+        confidence[mask] = conf
+        if isinstance(note, pd.Series):
+            notes[mask] = note.to_numpy(dtype=object)[mask]
+        else:
+            notes[mask] = note
+        pending &= ~mask
+
+    # Empty values and matches
+    s_empty = _empty_mask(scraped).to_numpy()
+    p_empty = _empty_mask(pdf).to_numpy()
+    settle(s_empty & p_empty, None, ResolutionStrategy.PREFER_PDF, 1.0, "Both values empty")
+    settle(s_empty, pdf, ResolutionStrategy.PREFER_PDF, 1.0, "Scraped value empty, using PDF")
+    settle(p_empty, scraped, ResolutionStrategy.PREFER_SCRAPED, 1.0, "PDF value empty, using scraped")
+    s_norm, p_norm = _normalized(scraped), _normalized(pdf)
+    both_str = (s_norm.notna() & p_norm.notna()).to_numpy()
+    match = pdf.eq(scraped).to_numpy(copy=True)
+    match[both_str] |= [
+        a == b or a in b or b in a for a, b in zip(s_norm[both_str], p_norm[both_str])
+    ]
+    settle(match, pdf, ResolutionStrategy.PREFER_PDF, 1.0, "Values match")
+
+    # Field strategies, one vectorised rule per strategy group
+    strategy_map = {name: resolver.FIELD_STRATEGIES.get(name, resolver.default_strategy) for name in set(fields)}
+    field_strategy = np.array([strategy_map[name] for name in fields], dtype=object)
+    settle(field_strategy == ResolutionStrategy.PREFER_PDF, pdf, ResolutionStrategy.PREFER_PDF, 0.9, "Preferred PDF value")
+    settle(
+        field_strategy == ResolutionStrategy.PREFER_SCRAPED,
+        scraped,
+        ResolutionStrategy.PREFER_SCRAPED,
+        0.9,
+        "Preferred scraped value",
+    )
+
+    longer = (field_strategy == ResolutionStrategy.PREFER_LONGER) & pending
+    if longer.any():
+        s_len = scraped.map(lambda v: len(str(v)) if v else 0)
+        p_len = pdf.map(lambda v: len(str(v)) if v else 0)
+        lengths = lambda a, b: " (" + a.astype(str) + " vs " + b.astype(str) + " chars)"  # noqa: E731
+        used = ResolutionStrategy.PREFER_LONGER
+        settle(longer & (p_len > s_len).to_numpy(), pdf, used, 0.8, "PDF value longer" + lengths(p_len, s_len))
+        settle(
+            longer & (s_len > p_len).to_numpy(), scraped, used, 0.8, "Scraped value longer" + lengths(s_len, p_len)
+        )
+        settle(longer, pdf, used, 0.7, "Same length, defaulting to PDF")
+
+    newer = (field_strategy == ResolutionStrategy.PREFER_NEWER) & pending
+    if newer.any():
+        # Each distinct date string is parsed once for the whole batch
+        distinct = {v for v in pd.concat([scraped[newer], pdf[newer]]) if isinstance(v, (str, datetime))}
+        parsed = {v: resolver._parse_date(v) for v in distinct}
+        to_date = lambda v: parsed.get(v) if isinstance(v, (str, datetime)) else None  # noqa: E731
+        s_date, p_date = scraped.map(to_date), pdf.map(to_date)
+        comparable = (s_date.notna() & p_date.notna()).to_numpy()
+        pdf_newer = np.zeros(n, dtype=bool)
+        pdf_newer[comparable] = [p > s for s, p in zip(s_date[comparable], p_date[comparable])]
+        used = ResolutionStrategy.PREFER_NEWER
+        settle(newer & comparable & pdf_newer, pdf, used, 0.8, "PDF date is newer")
+        settle(newer & comparable, scraped, used, 0.8, "Scraped date is newer")
+        settle(newer, pdf, used, 0.6, "Could not compare dates")
+
+    # MERGE, MANUAL and custom strategies
+    scraped_values, pdf_values = scraped.tolist(), pdf.tolist()
+    for i in np.flatnonzero(pending).tolist():
+        value, conf, note = resolver._apply_strategy(field_strategy[i], scraped_values[i], pdf_values[i], fields[i])
+        resolved[i], strategy[i], confidence[i], notes[i] = value, field_strategy[i], conf, note
+
+    columns = zip(positions.tolist(), fields, scraped_values, pdf_values, resolved, strategy, confidence.tolist(), notes)
+    for position, name, s_value, p_value, value, used, conf, note in columns:
+        resolutions[position] = ConflictResolution(
+            field_name=name,
+            scraped_value=s_value,
+            pdf_value=p_value,
+            resolved_value=value,
+            strategy_used=used,
+            confidence=conf,
+            needs_review=conf < 0.7,
+            notes=note,
+        )
+    return resolutions
+
+
+def _enriched_base(
+    scraped: Dict[str, Any], extractions: List[Dict[str, Any]], enriched_at: str, in_place: bool
+) -> Dict[str, Any]:
+    enriched = scraped if in_place else json.loads(json.dumps(scraped))
+    metadata = enriched.setdefault("metadata", {})
+    metadata["schema_version"] = "2.0"
+    metadata["enriched_at"] = enriched_at
+    metadata["data_sources"] = ["scraped"]
+    documents = enriched.setdefault("extracted_documents", {})
+    for extraction in extractions:
+        documents[extraction.get("document_type", "unknown")] = extraction
+    if extractions:
+        metadata["data_sources"].append("pdf_extracted")
+    return enriched
+
+
+def merge_projects_batch(
+    projects: Sequence[ProjectInput], merger: Optional[DataMerger] = None, in_place: bool = False
+) -> List[MergeResult]:
+    """
+    Merge many projects at once; same results as ``merge_project`` per project.
+
+    With ``in_place`` the scraped dicts themselves become the enriched data
+    (every scraped value is read before the first write), saving a deep
+    copy per project when the caller owns them.
+    """
+
+    merger = merger or DataMerger()
+    if not batch_merge_available():
+        return [merger.merge_project(scraped, extractions, project_id) for project_id, scraped, extractions in projects]
+
+    enriched_at = datetime.now().isoformat()
+    frame = _flatten(projects, merger.FIELD_MAPPING)
+    resolutions = _resolve_columns(frame, merger.resolver)
+
+    outputs = [
+        {
+            "enriched": _enriched_base(scraped, extractions, enriched_at, in_place),
+            "resolutions": {},
+            "added": [],
+            "updated": [],
+            "errors": [],
+        }
+        for _, scraped, extractions in projects
+    ]
+    columns = zip(*(frame[name].tolist() for name in ("project", "field", "path", "pdf", "scraped")), resolutions)
+    for index, pdf_field, json_path, pdf_value, scraped_value, resolution in columns:
+        out = outputs[index]
+        if resolution is not None:
+            out["resolutions"][pdf_field] = resolution
+            final_value = resolution.resolved_value
+            if final_value != scraped_value:
+                out["updated"].append(pdf_field)
+        else:
+            final_value = pdf_value
+            if scraped_value is None:
+                out["added"].append(pdf_field)
+        try:
+            merger._set_nested_value(out["enriched"], json_path, final_value)
+        except Exception as e:
+            out["errors"].append(f"Failed to set {json_path}: {e}")
+
+    results = []
+    for (project_id, scraped, extractions), out in zip(projects, outputs):
+        field_sources = out["enriched"]["metadata"].setdefault("field_sources", {})
+        field_sources.update(dict.fromkeys(out["added"], "pdf_extracted"))
+        field_sources.update(dict.fromkeys(out["updated"], "pdf_extracted (updated)"))
+        conflicts = sum(1 for r in out["resolutions"].values() if r.needs_review)
+        results.append(
+            MergeResult(
+                success=not out["errors"],
+                project_id=project_id or scraped.get("project_details", {}).get("registration_number", "unknown"),
+                original_data=scraped,
+                enriched_data=out["enriched"],
+                pdf_extractions=extractions,
+                resolutions=out["resolutions"],
+                fields_added=out["added"],
+                fields_updated=out["updated"],
+                conflicts_detected=conflicts,
+                needs_review=conflicts > 0,
+                errors=out["errors"],
+            )
+        )
+    return results
+
+
+def _output_path(scraped_path: Path, output_dir: Optional[Path]) -> Path:
+    name = f"{scraped_path.stem.replace('.v1', '')}.enriched.v2.json"
+    return (output_dir or scraped_path.parent) / name
+
+
+def _merge_chunk(jobs: List[MergeJob], merger: DataMerger, output_dir: Optional[Path]) -> List[Dict[str, Any]]:
+    """Load, merge and write one chunk of jobs; returns per-project report rows."""
+
+    projects = []
+    for scraped_json_path, extractions in jobs:
+        path = Path(scraped_json_path)
+        scraped = json.loads(path.read_text(encoding="utf-8"))
+        projects.append((path.stem.replace("project_", "").replace(".v1", ""), scraped, extractions))
+
+    rows = []
+    for (scraped_json_path, _), result in zip(jobs, merge_projects_batch(projects, merger, in_place=True)):
+        output = _output_path(Path(scraped_json_path), output_dir)
+        output.write_bytes(to_json(result.enriched_data, indent=2))
+        rows.append(
+            {
+                "project_id": result.project_id,
+                "output": str(output),
+                "success": result.success,
+                "fields_added": result.fields_added,
+                "fields_updated": result.fields_updated,
+                "conflicts_detected": result.conflicts_detected,
+                "needs_review": result.needs_review,
+                "errors": result.errors,
+            }
+        )
+    return rows
+
+
+def merge_and_save_batch(
+    jobs: Sequence[MergeJob],
+    merger: Optional[DataMerger] = None,
+    output_dir: Optional[Union[str, Path]] = None,
+    report_path: Optional[Union[str, Path]] = None,
+    workers: int = 1,
+    chunk_size: int = 500,
+) -> Dict[str, Any]:
+    """
+    Merge and save many scraped JSON files, then write one merge report.
+
+    Args:
+        jobs: (scraped V1 JSON path, PDF extractions) pairs
+        merger: DataMerger providing the field mapping and resolver
+        output_dir: Where enriched files go (default: next to each input)
+        report_path: Optional path for the merge report JSON
+        workers: Worker processes; chunks of ``chunk_size`` jobs are merged per task
+
+    Returns:
+        Merge report (``DataMerger.generate_merge_report`` keys plus per-project rows)
+    """
+    merger = merger or DataMerger()
+    jobs = list(jobs)
+    out_dir = Path(output_dir) if output_dir else None
+    if out_dir:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    chunks = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        chunk_rows = [_merge_chunk(chunk, merger, out_dir) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_rows = list(
+                pool.map(_merge_chunk, chunks, [merger] * len(chunks), [out_dir] * len(chunks))
+            )
+    rows = [row for chunk in chunk_rows for row in chunk]
+
+    report = {
+        "total_processed": len(rows),
+        "successful": sum(1 for r in rows if r["success"]),
+        "failed": sum(1 for r in rows if not r["success"]),
+        "needs_review": sum(1 for r in rows if r["needs_review"]),
+        "total_fields_added": sum(len(r["fields_added"]) for r in rows),
+        "total_fields_updated": sum(len(r["fields_updated"]) for r in rows),
+        "total_conflicts": sum(r["conflicts_detected"] for r in rows),
+        "failed_projects": [r["project_id"] for r in rows if not r["success"]],
+        "review_projects": [r["project_id"] for r in rows if r["needs_review"]],
+        "timestamp": datetime.now().isoformat(),
+        "projects": rows,
+    }
+    if report_path:
+        Path(report_path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info(f"Merged {len(rows)} projects in {len(chunks)} chunk(s) with {max(workers, 1)} worker(s)")
+    return report
+
+
+__all__ = ["batch_merge_available", "merge_and_save_batch", "merge_projects_batch"]
@@ -9,6 +9,8 @@ from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 
+from cg_rera_extractor.parsing.html_backend import SelectolaxNode, make_selector_document
+
 from .models import ListingRecord
 
 LOGGER = logging.getLogger(__name__)
@@ -114,7 +116,7 @@ def _extract_website_url(cells, index: int | None) -> str | None:
     return None
 
 
-def _pick_listing_table(soup: BeautifulSoup, listing_selector: str | None):
+def _pick_listing_table(soup: BeautifulSoup | SelectolaxNode, listing_selector: str | None):
     if listing_selector:
         table = soup.select_one(listing_selector)
         if table:
@@ -142,10 +144,13 @@ def parse_listing_html(
     row_selector: str | None = None,
     view_details_selector: str | None = None,
 ) -> list[ListingRecord]:
-    """Parse a CG RERA listing search HTML page into ListingRecord entries."""
+    """Parse a CG RERA listing search HTML page into ListingRecord entries.
+
+    Uses the selectolax fast path when that HTML parser backend is active.
+    """
 
     LOGGER.debug("Parsing listing HTML (selector: %s)", listing_selector)
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_selector_document(html)
     target_table = _pick_listing_table(soup, listing_selector)
     if target_table is None:
         LOGGER.warning("No listing table found in HTML")
@@ -1,7 +1,7 @@
 """Parsing utilities and schema definitions for the CG RERA extractor."""
 
-from .mapper import map_raw_to_v1
-from .mhtml_utils import extract_html_from_mhtml
+from .mapper import UnmappedLabelStats, map_raw_to_v1
+from .mhtml_utils import extract_html_from_mhtml, iter_html_parts
 from .schema import (
     FieldRecord,
     RawExtractedProject,
@@ -23,7 +23,9 @@ __all__ = [
     "FieldRecord",
     "RawExtractedProject",
     "SectionRecord",
+    "UnmappedLabelStats",
     "extract_html_from_mhtml",
+    "iter_html_parts",
     "V1BankDetails",
     "V1BuildingDetails",
     "V1Document",
@@ -8,6 +8,7 @@ from typing import Optional
 
 from bs4 import BeautifulSoup, Tag
 
+from .html_backend import make_soup
 from .schema import V1ReraLocation
 
 LOGGER = logging.getLogger(__name__)
@@ -43,7 +44,7 @@ def extract_map_iframe_location(html: str) -> Optional[V1ReraLocation]:
     Returns:
         V1ReraLocation with source_type='map_iframe' if found, None otherwise.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
 
     # Find all iframes
     iframes = soup.find_all("iframe")
@@ -102,7 +103,7 @@ def extract_amenity_locations(html: str, base_url: str = "") -> list[V1ReraLocat
     Returns:
         List of V1ReraLocation entries for each amenity with lat/lon.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     locations: list[V1ReraLocation] = []
 
     # Find the amenities table by ID
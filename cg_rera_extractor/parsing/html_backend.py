@@ -0,0 +1,186 @@
+"""Pluggable HTML parser backends for the extractors.
+
+The detail-page extractors navigate a BeautifulSoup tree, so their backend
+choice is the tree builder: the stdlib ``html.parser`` (default, slowest) or
+``lxml``. The listing table parser only needs CSS selection and text, and can
+use ``selectolax`` through :class:`SelectolaxNode`, a minimal adapter exposing
+the subset of the Tag API it calls.
+
+The backend comes from ``HTML_PARSER_BACKEND`` (or ``run.html_parser_backend``
+in the run config, applied with :func:`set_html_backend`):
+
+* ``html.parser`` - stdlib parser everywhere
+* ``lxml`` - lxml tree builder everywhere
+* ``selectolax`` - selectolax for listing tables, lxml (if installed) for
+  the rest
+* ``auto`` - the fastest installed of the above
+
+Backends can produce different trees for malformed markup; run
+``python tools/parser_regression.py conform --backend lxml`` before switching.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+try:  # Optional fast path for listing tables
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:  # pragma: no cover - optional dependency
+    _SelectolaxParser = None
+
+BACKENDS = ("html.parser", "lxml", "selectolax")
+
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "html.parser").strip().lower()
+
+_configured_backend = HTML_PARSER_BACKEND
+_NON_TEXT_PARENTS = {"script", "style", "template"}
+_backend_override: ContextVar[str | None] = ContextVar("html_backend_override", default=None)
+
+
+def _lxml_available() -> bool:
+    return importlib.util.find_spec("lxml") is not None
+
+
+def available_backends() -> list[str]:
+    """Backends whose libraries are installed."""
+
+    return [
+        name
+        for name in BACKENDS
+        if name == "html.parser"
+        or (name == "lxml" and _lxml_available())
+        or (name == "selectolax" and _SelectolaxParser is not None)
+    ]
+
+
+def resolve_backend(name: str | None = None) -> str:
+    """Validate a backend name (``None`` = the active one), resolving ``auto``."""
+
+    name = (name or _backend_override.get() or _configured_backend).strip().lower()
+    if name == "auto":
+        installed = available_backends()
+        return "selectolax" if "selectolax" in installed else installed[-1]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend {name!r}; expected one of {', '.join(BACKENDS)} or auto")
+    if name == "lxml" and not _lxml_available():
+        raise RuntimeError("lxml is required for the lxml HTML parser backend")
+    if name == "selectolax" and _SelectolaxParser is None:
+        raise RuntimeError("selectolax is required for the selectolax HTML parser backend")
+    return name
+
+
+def set_html_backend(name: str) -> str:
+    """Set the process-wide backend; returns the resolved name."""
+
+    global _configured_backend
+
+    resolved = resolve_backend(name)
+    _configured_backend = name.strip().lower()
+    return resolved
+
+
+@contextmanager
+def use_html_backend(name: str) -> Iterator[str]:
+    """Temporarily use ``name`` in the current context (conformance runs, benchmarks)."""
+
+    resolved = resolve_backend(name)
+    token = _backend_override.set(resolved)
+    try:
+        yield resolved
+    finally:
+        _backend_override.reset(token)
+
+
+def _soup_builder(backend: str) -> str:
+    if backend == "selectolax":
+        return "lxml" if _lxml_available() else "html.parser"
+    return backend
+
+
+def make_soup(html: str, backend: str | None = None) -> BeautifulSoup:
+    """Parse ``html`` into a BeautifulSoup tree with the active tree builder."""
+
+    return BeautifulSoup(html, _soup_builder(resolve_backend(backend)))
+
+
+def make_selector_document(html: str, backend: str | None = None) -> BeautifulSoup | "SelectolaxNode":
+    """Parse ``html`` for CSS selection and text only (listing tables).
+
+    Returns a :class:`SelectolaxNode` with the selectolax backend, otherwise a
+    BeautifulSoup tree.
+    """
+
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return SelectolaxNode(_SelectolaxParser(html).root)
+    return BeautifulSoup(html, backend)
+
+
+class SelectolaxNode:
+    """The slice of the bs4 ``Tag`` API used by the listing parser, over selectolax."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any):
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._node.attributes.get(key)
+        return default if value is None else value
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        # bs4 semantics: strip each text node, skip empty ones and script/style text
+        parts = []
+        for node in self._node.traverse(include_text=True):
+            if node.tag != "-text" or node.parent.tag in _NON_TEXT_PARENTS:
+                continue
+            text = node.text_content or ""
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            parts.append(text)
+        return separator.join(parts)
+
+    def select(self, selector: str) -> list["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> "SelectolaxNode | None":
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find_all(self, name: str | list[str]) -> list["SelectolaxNode"]:
+        selector = name if isinstance(name, str) else ", ".join(name)
+        return self.select(selector)
+
+    def find(self, name: str, class_: Callable[[str], bool] | None = None) -> "SelectolaxNode | None":
+        for node in self._node.css(name):
+            if class_ is None:
+                return SelectolaxNode(node)
+            classes = (node.attributes.get("class") or "").split()
+            if any(class_(cls) for cls in classes):
+                return SelectolaxNode(node)
+        return None
+
+
+__all__ = [
+    "BACKENDS",
+    "HTML_PARSER_BACKEND",
+    "SelectolaxNode",
+    "available_backends",
+    "make_selector_document",
+    "make_soup",
+    "resolve_backend",
+    "set_html_backend",
+    "use_html_backend",
+]
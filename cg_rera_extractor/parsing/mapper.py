@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from importlib import resources
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 from .schema import (
     GridRecord,
@@ -25,17 +29,26 @@ from .schema import (
     V1UnitType,
 )
 
+# Section titles, field labels and table headers repeat across every project
+# of a run, so their normalized forms and header matches are memoized.
+MAPPER_LABEL_CACHE_SIZE = int(os.getenv("MAPPER_LABEL_CACHE_SIZE", "16384"))
+
 _LOGICAL_SECTIONS_RESOURCE = "logical_sections_and_keys.json"
 _BRACKETED_TEXT_RE = re.compile(r"[\[\(].*?[\]\)]")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+_NUMBER_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+_DATE_RE = re.compile(r'(\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{2,4})|(\d{4}-\d{2}-\d{2})')
 
 
+@lru_cache(maxsize=MAPPER_LABEL_CACHE_SIZE)
 def _normalize(value: str | None) -> str:
     if not value:
         return ""
     # Strip bracketed/parenthetical metadata so headings like
     # "Project Details [ Registration No : ... ]" normalize correctly.
     cleaned = _BRACKETED_TEXT_RE.sub(" ", value)
-    return re.sub(r"[^a-z0-9]", "", cleaned.lower())
+    return _NON_ALNUM_RE.sub("", cleaned.lower())
 
 
 def _load_logical_section_mapping() -> Tuple[Dict[str, str], Dict[str, Dict[str, str]], Dict[str, Dict[str, List[str]]]]:
@@ -56,7 +69,8 @@ def _load_logical_section_mapping() -> Tuple[Dict[str, str], Dict[str, Dict[str,
         canonical_map: Dict[str, str] = {}
         table_map: Dict[str, List[str]] = {}
         for canonical_key, variants in section.get("keys", {}).items():
-            table_map[canonical_key] = variants
+            # Header matching is a lower-case substring test
+            table_map[canonical_key] = [variant.lower() for variant in variants]
             for variant in variants:
                 canonical_map[_normalize(variant)] = canonical_key
         
@@ -81,7 +95,7 @@ _MODEL_MAP = {
 def _to_int(value: str | None) -> int | None:
     if not value:
         return None
-    digits = re.sub(r"[^0-9]", "", value)
+    digits = _NON_DIGIT_RE.sub("", value)
     if not digits:
         return None
     try:
@@ -97,7 +111,7 @@ def _to_float(value: str | None) -> float | None:
     try:
         return float(cleaned)
     except ValueError:
-        match = re.search(r"[0-9]+(?:\.[0-9]+)?", cleaned)
+        match = _NUMBER_RE.search(cleaned)
         if match:
             try:
                 return float(match.group(0))
@@ -119,7 +133,7 @@ def _normalize_date(value: str | None) -> str | None:
     
     # Try to extract something that looks like a date first
     # Matches DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD, etc.
-    date_match = re.search(r'(\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{2,4})|(\d{4}-\d{2}-\d{2})', value)
+    date_match = _DATE_RE.search(value)
     if date_match:
         value = date_match.group(0)
 
@@ -152,44 +166,48 @@ def _normalize_date(value: str | None) -> str | None:
     return None
 
 
-def _map_table_to_model(table: TableRecord, model_class: type, mapping: Dict[str, str]) -> List[any]:
-    """Map a TableRecord to a list of Pydantic models based on header mapping."""
-    results = []
-    headers = [h.lower() for h in table.headers]
-    
-    # Create index map: canonical_key -> column_index
-    col_map = {}
-    for canonical_key, variants in mapping.items():
+def _as_is(value: str | None) -> str | None:
+    return value
+
+
+@lru_cache(maxsize=None)
+def _value_converter(key: str) -> Callable[[str | None], Any]:
+    """Type conversion for a canonical key, based on field name heuristics."""
+    if any(k in key for k in ["area", "price", "percent", "amount"]):
+        return _to_float
+    if any(k in key for k in ["number", "units", "floors", "year"]):
+        return _to_int
+    if "date" in key:
+        return _normalize_date
+    return _as_is
+
+
+@lru_cache(maxsize=MAPPER_LABEL_CACHE_SIZE)
+def _column_map(logical_section: str, headers: Tuple[str, ...]) -> Tuple[Tuple[str, int, Callable[[str | None], Any]], ...]:
+    """Match table headers to canonical keys: ``(key, column index, converter)``."""
+    lowered = [h.lower() for h in headers]
+    columns = []
+    for canonical_key, variants in _TABLE_LOOKUP.get(logical_section, {}).items():
         for variant in variants:
-            variant_norm = variant.lower()
-            for idx, h in enumerate(headers):
-                if variant_norm in h:
-                    col_map[canonical_key] = idx
-                    break
-            if canonical_key in col_map:
+            idx = next((i for i, h in enumerate(lowered) if variant in h), None)
+            if idx is not None:
+                columns.append((canonical_key, idx, _value_converter(canonical_key)))
                 break
-                
-    if not col_map:
+    return tuple(columns)
+
+
+def _map_table_to_model(table: TableRecord, model_class: type, logical_section: str) -> List[any]:
+    """Map a TableRecord to a list of Pydantic models based on header mapping."""
+    results = []
+    columns = _column_map(logical_section, tuple(table.headers))
+    if not columns:
         return []
         
     for row in table.rows:
         if not row:
             continue
             
-        data = {}
-        for key, idx in col_map.items():
-            if idx < len(row):
-                val = row[idx]
-                # Basic type conversion based on field name heuristics
-                if any(k in key for k in ["area", "price", "percent", "amount"]):
-                    data[key] = _to_float(val)
-                elif any(k in key for k in ["number", "units", "floors", "year"]):
-                    data[key] = _to_int(val)
-                elif "date" in key:
-                    data[key] = _normalize_date(val)
-                else:
-                    data[key] = val
-        
+        data = {key: convert(row[idx]) for key, idx, convert in columns if idx < len(row)}
         try:
             results.append(model_class(**data))
         except Exception:
@@ -236,6 +254,46 @@ def _infer_doc_type(field_key: str) -> str:
     return 'unknown'
 
 
+@lru_cache(maxsize=MAPPER_LABEL_CACHE_SIZE)
+def _display_title(title: str) -> str:
+    # Group headings that differ only in bracketed metadata (registration no.)
+    return " ".join(_BRACKETED_TEXT_RE.sub(" ", title).split()) or title
+
+
+@dataclass
+class UnmappedLabelStats:
+    """Section titles and field labels the mapper did not recognise, across a run.
+
+    Built from each mapped project's ``raw_data.unmapped_sections``, so
+    recording a project costs one counter update per unmapped label.
+    """
+
+    projects: int = 0
+    sections: Counter = field(default_factory=Counter)
+    labels: Counter = field(default_factory=Counter)
+
+    def record(self, project: V1Project) -> None:
+        self.projects += 1
+        for title, fields in project.raw_data.unmapped_sections.items():
+            display = _display_title(title)
+            if _normalize(title) not in _SECTION_LOOKUP:
+                self.sections[display] += 1
+            for label in fields:
+                self.labels[(display, label)] += 1
+
+    def to_dict(self, top: int = 100) -> Dict[str, Any]:
+        return {
+            "projects": self.projects,
+            "unmapped_sections": [
+                {"section": title, "projects": count} for title, count in self.sections.most_common(top)
+            ],
+            "unmapped_labels": [
+                {"section": title, "label": label, "count": count}
+                for (title, label), count in self.labels.most_common(top)
+            ],
+        }
+
+
 def map_raw_to_v1(raw: RawExtractedProject, state_code: str = "CG") -> V1Project:
     """Map a :class:`RawExtractedProject` into the V1 scraper schema."""
 
@@ -266,9 +324,8 @@ def map_raw_to_v1(raw: RawExtractedProject, state_code: str = "CG") -> V1Project
         # Process tables for known logical sections
         if logical_section in _MODEL_MAP:
             model_class = _MODEL_MAP[logical_section]
-            table_mapping = _TABLE_LOOKUP.get(logical_section, {})
             for table in section.tables:
-                records = _map_table_to_model(table, model_class, table_mapping)
+                records = _map_table_to_model(table, model_class, logical_section)
                 if logical_section == "promoter_details": promoter_details.extend(records)
                 elif logical_section == "land_details": land_details.extend(records)
                 elif logical_section == "building_details": building_details.extend(records)
@@ -404,20 +461,11 @@ def map_raw_to_v1(raw: RawExtractedProject, state_code: str = "CG") -> V1Project
         if fields:
             try:
                 # Convert types for fields
-                typed_fields = {}
-                for k, v in fields.items():
-                    if any(x in k for x in ["area", "price", "percent", "amount"]):
-                        typed_fields[k] = _to_float(v)
-                    elif any(x in k for x in ["number", "units", "floors", "year"]):
-                        typed_fields[k] = _to_int(v)
-                    elif "date" in k:
-                        typed_fields[k] = _normalize_date(v)
-                    else:
-                        typed_fields[k] = v
+                typed_fields = {k: _value_converter(k)(v) for k, v in fields.items()}
                 
                 obj = model_class(**typed_fields)
                 # Only add if it has some meaningful data and not already present
-                if any(getattr(obj, f) for f in obj.model_fields if getattr(obj, f)):
+                if any(getattr(obj, f) for f in model_class.model_fields if getattr(obj, f)):
                     current_list.insert(0, obj)
             except Exception:
                 pass
@@ -465,4 +513,4 @@ def map_raw_to_v1(raw: RawExtractedProject, state_code: str = "CG") -> V1Project
     )
 
 
-__all__ = ["map_raw_to_v1"]
+__all__ = ["UnmappedLabelStats", "map_raw_to_v1"]
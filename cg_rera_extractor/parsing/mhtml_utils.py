@@ -1,34 +1,167 @@
-"""Utilities for working with saved MHTML pages."""
+"""Utilities for working with saved MHTML pages.
+
+MHTML snapshots are read as a stream: MIME boundaries are found line by line
+from a file handle (or ``mmap``), and only ``text/html`` parts are decoded,
+incrementally, from quoted-printable or base64. Images, stylesheets and fonts
+are skipped without being buffered, so peak memory is bounded by the size of
+the HTML part rather than the archive.
+"""
 from __future__ import annotations
 
-from email import policy
-from email.parser import BytesParser
+import binascii
+import codecs
+import mmap
+from collections.abc import Callable
+from email.message import Message
+from email.parser import BytesHeaderParser
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterator
 
+# Longest line read at once; longer (binary) lines are consumed in pieces
+_MAX_LINE = 64 * 1024
 
-def _iter_html_parts(mhtml_bytes: bytes) -> Iterable[str]:
-    """Yield decoded HTML payloads from an MHTML document."""
+_header_parser = BytesHeaderParser()
 
-    message = BytesParser(policy=policy.default).parsebytes(mhtml_bytes)
-    for part in message.walk():
-        if part.get_content_type() != "text/html":
-            continue
-        payload = part.get_payload(decode=True)
-        if payload is None:
+
+def _line_reader(stream: BinaryIO | mmap.mmap) -> Callable[[], bytes]:
+    if isinstance(stream, mmap.mmap):
+        return stream.readline  # no size limit; lines are slices of the mapping
+    return lambda: stream.readline(_MAX_LINE)
+
+
+def _read_headers(readline: Callable[[], bytes]) -> Message | None:
+    lines: list[bytes] = []
+    while True:
+        line = readline()
+        if not line:
+            return None if not lines else _header_parser.parsebytes(b"".join(lines))
+        if line in (b"\r\n", b"\n"):
+            return _header_parser.parsebytes(b"".join(lines))
+        lines.append(line)
+
+
+class _BodyDecoder:
+    """Decodes one part's transfer encoding and charset chunk by chunk."""
+
+    def __init__(self, transfer_encoding: str, charset: str):
+        self._encoding = transfer_encoding
+        try:
+            self._text = codecs.getincrementaldecoder(charset)(errors="replace")
+        except LookupError:
+            self._text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._b64_tail = b""
+        self.chunks: list[str] = []
+
+    def feed(self, line: bytes) -> None:
+        if self._encoding == "quoted-printable":
+            data = binascii.a2b_qp(line)
+        elif self._encoding == "base64":
+            data = self._b64_tail + b"".join(line.split())
+            usable = len(data) - len(data) % 4
+            data, self._b64_tail = data[:usable], data[usable:]
+            data = binascii.a2b_base64(data) if data else b""
+        else:
+            data = line
+        if data:
+            self.chunks.append(self._text.decode(data))
+
+    def finish(self) -> str:
+        if self._b64_tail:
+            padded = self._b64_tail + b"=" * (-len(self._b64_tail) % 4)
+            try:
+                self.chunks.append(self._text.decode(binascii.a2b_base64(padded)))
+            except binascii.Error:
+                pass
+        self.chunks.append(self._text.decode(b"", final=True))
+        return "".join(self.chunks)
+
+
+def _decoder_for(headers: Message) -> _BodyDecoder | None:
+    if headers.get_content_type() != "text/html":
+        return None
+    transfer_encoding = str(headers.get("Content-Transfer-Encoding", "7bit")).strip().lower()
+    return _BodyDecoder(transfer_encoding, headers.get_content_charset() or "utf-8")
+
+
+def iter_html_parts(stream: BinaryIO | mmap.mmap) -> Iterator[str]:
+    """Yield decoded HTML payloads from an MHTML stream, one part at a time.
+
+    ``stream`` is any binary object with ``readline`` (an open file, ``mmap``,
+    ``BytesIO``) positioned at the start of the archive.
+    """
+
+    readline = _line_reader(stream)
+    top = _read_headers(readline)
+    if top is None:
+        return
+
+    if top.get_content_maintype() != "multipart":
+        decoder = _decoder_for(top)
+        if decoder is not None:
+            for line in iter(readline, b""):
+                decoder.feed(line)
+            yield decoder.finish()
+        return
+
+    boundaries = {top.get_boundary()} - {None}
+    decoder: _BodyDecoder | None = None
+    pending = b""  # the CRLF before a boundary belongs to the delimiter
+    at_part_start = False
+
+    for line in iter(readline, b""):
+        if at_part_start:
+            # Headers of the part whose boundary was just seen
+            at_part_start = False
+            header_lines = [line]
+            while line not in (b"\r\n", b"\n"):
+                line = readline()
+                if not line:
+                    break
+                header_lines.append(line)
+            headers = _header_parser.parsebytes(b"".join(header_lines))
+            if headers.get_content_maintype() == "multipart" and headers.get_boundary():
+                boundaries.add(headers.get_boundary())
+            decoder = _decoder_for(headers)
+            pending = b""
             continue
-        charset = part.get_content_charset() or "utf-8"
-        yield payload.decode(charset, errors="replace")
 
+        if line.startswith(b"--"):
+            marker = line.rstrip(b"\r\n")[2:]
+            closing = marker.endswith(b"--") and marker[:-2].decode("latin-1") in boundaries
+            if closing or marker.decode("latin-1") in boundaries:
+                if decoder is not None:
+                    decoder.feed(pending.rstrip(b"\r\n"))
+                    yield decoder.finish()
+                decoder = None
+                pending = b""
+                at_part_start = not closing
+                continue
+
+        if decoder is not None:
+            if pending:
+                decoder.feed(pending)
+            pending = line
+
+    if decoder is not None:
+        decoder.feed(pending)
+        yield decoder.finish()
+
+
+def extract_html_from_mhtml(source: str | Path | BinaryIO | mmap.mmap) -> str:
+    """Extract the first HTML document contained in an MHTML archive.
+
+    ``source`` is a path or an open binary stream; only the HTML part is
+    decoded and held in memory.
+    """
 
-def extract_html_from_mhtml(path: str | Path) -> str:
-    """Extract the first HTML document contained in an MHTML archive."""
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as stream:
+            return extract_html_from_mhtml(stream)
 
-    data = Path(path).read_bytes()
-    for html in _iter_html_parts(data):
+    for html in iter_html_parts(source):
         if html.strip():
             return html
-    raise ValueError(f"No HTML parts found in {path}")
+    raise ValueError(f"No HTML parts found in {getattr(source, 'name', source)}")
 
 
-__all__ = ["extract_html_from_mhtml"]
+__all__ = ["extract_html_from_mhtml", "iter_html_parts"]
@@ -7,8 +7,9 @@ from collections import OrderedDict
 from datetime import datetime
 from typing import Iterable, List, Optional
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import NavigableString, Tag
 
+from .html_backend import make_soup
 from .schema import FieldRecord, FieldValueType, RawExtractedProject, SectionRecord
 
 HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "strong")
@@ -28,7 +29,7 @@ def extract_raw_from_html(
     (useful when saving previews alongside the project key).
     """
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     label_tags = soup.find_all("label")
 
     # Structure: {Title: {'fields': [], 'tables': [], 'grids': []}}
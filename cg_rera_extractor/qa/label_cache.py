@@ -0,0 +1,82 @@
+"""
+Persistent cache of HTML label/value maps for field-by-field QA.
+
+:func:`extract_label_value_map` is a full parse of a detail page. Saved
+pages never change, so their maps are stored in a SQLite file keyed by the
+SHA-256 of the page bytes; re-running QA after a mapper change only redoes
+the JSON-vs-HTML diff. Bump :data:`LABEL_MAP_VERSION` when the extractor's
+output changes to invalidate old entries.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Mapping
+
+DEFAULT_LABEL_CACHE_FILE = "data/qa_label_cache.sqlite3"
+LABEL_MAP_VERSION = "1"
+
+_BATCH = 500
+
+
+def html_content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class LabelMapCache:
+    """Label/value maps keyed by HTML content hash, stored in SQLite."""
+
+    def __init__(self, path: str | Path = DEFAULT_LABEL_CACHE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS label_maps ("
+            " content_hash TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " label_map TEXT NOT NULL,"
+            " PRIMARY KEY (content_hash, version))"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Cached maps for the given hashes (missing hashes are absent)."""
+        wanted = list(dict.fromkeys(hashes))
+        found: Dict[str, Dict[str, str]] = {}
+        for start in range(0, len(wanted), _BATCH):
+            chunk = wanted[start:start + _BATCH]
+            rows = self._conn.execute(
+                f"SELECT content_hash, label_map FROM label_maps WHERE version = ? "
+                f"AND content_hash IN ({','.join('?' * len(chunk))})",
+                [LABEL_MAP_VERSION, *chunk],
+            )
+            found.update((content_hash, json.loads(payload)) for content_hash, payload in rows)
+        return found
+
+    def put_many(self, maps: Mapping[str, Mapping[str, str]]) -> None:
+        if not maps:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO label_maps (content_hash, version, label_map) VALUES (?, ?, ?)",
+            [(content_hash, LABEL_MAP_VERSION, json.dumps(label_map)) for content_hash, label_map in maps.items()],
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM label_maps WHERE version = ?", (LABEL_MAP_VERSION,)
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "LabelMapCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+__all__ = ["DEFAULT_LABEL_CACHE_FILE", "LABEL_MAP_VERSION", "LabelMapCache", "html_content_hash"]
@@ -0,0 +1,219 @@
+"""
+Parallel field-by-field QA over one or more run directories.
+
+For every ``scraped_json/*.v1.json`` with a saved detail page, the page's
+label/value map (:func:`extract_label_value_map`) is diffed against the V1
+JSON (:func:`compare_v1_to_html_fields`). Pages are hashed up front and
+their maps looked up in a :class:`LabelMapCache`; only uncached pages are
+parsed. Parsing and diffing run in a process pool, results are folded into
+per-run summaries as they arrive, and new maps are written back to the
+cache.
+
+Each run gets the usual ``qa_fields/qa_fields_report.{json,md}`` plus
+``qa_fields/qa_index.json``: a compact summary (totals and status counts
+per field) that :func:`load_qa_trend` collects across runs for trend
+reporting.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
+from cg_rera_extractor.parsing.schema import V1Project
+from cg_rera_extractor.qa.field_by_field_compare import compare_v1_to_html_fields
+from cg_rera_extractor.qa.field_extractor import extract_label_value_map
+from cg_rera_extractor.qa.label_cache import DEFAULT_LABEL_CACHE_FILE, LabelMapCache, html_content_hash
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("match", "mismatch", "missing_in_html", "missing_in_json", "preview_unchecked")
+QA_DIR = "qa_fields"
+QA_INDEX_FILE = "qa_index.json"
+
+
+@dataclass
+class FieldQATask:
+    run_id: str
+    project_key: str
+    json_path: str
+    html_path: str
+    content_hash: str
+    label_map: Optional[Dict[str, str]] = None  # cached map, if any
+
+
+@dataclass
+class RunQAAggregate:
+    """Running totals for one run, updated as project results arrive."""
+
+    run_id: str
+    projects: List[dict] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+    fields: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def add(self, project_key: str, diffs: List[dict], cached: bool) -> None:
+        self.projects.append({"project_key": project_key, "diffs": diffs})
+        self.counts["total_projects"] += 1
+        self.counts["total_fields"] += len(diffs)
+        for diff in diffs:
+            status = diff.get("status")
+            if status in STATUSES:
+                self.counts[status] += 1
+                self.fields[diff["field_key"]][status] += 1
+        if cached:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def summary(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "total_projects": self.counts["total_projects"],
+            "total_fields": self.counts["total_fields"],
+            **{status: self.counts[status] for status in STATUSES},
+        }
+
+    def index(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "summary": self.summary(),
+            "fields": {key: dict(counts) for key, counts in sorted(self.fields.items())},
+            "label_cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+        }
+
+
+def _project_pages(run_dir: Path, limit: Optional[int], project_key: Optional[str]) -> Iterator[Tuple[str, Path, Path]]:
+    html_dir = run_dir / "raw_html"
+    json_dir = run_dir / "scraped_json"
+    missing = [str(p) for p in (html_dir, json_dir) if not p.exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing expected folders: {', '.join(missing)}")
+
+    json_files = sorted(json_dir.glob("*.v1.json"))
+    if project_key:
+        json_files = [p for p in json_files if project_key in p.stem]
+    if limit is not None:
+        json_files = json_files[:limit]
+
+    for json_path in json_files:
+        key = json_path.stem.replace("project_", "", 1).replace(".v1", "")
+        for suffix in (".html", ".mhtml"):
+            html_path = html_dir / f"project_{key}{suffix}"
+            if html_path.exists():
+                yield key, json_path, html_path
+                break
+
+
+def _read_html(path: Path) -> str:
+    if path.suffix == ".mhtml":
+        return extract_html_from_mhtml(path)
+    return path.read_text(encoding="utf-8")
+
+
+def _run_task(task: FieldQATask) -> Tuple[FieldQATask, Optional[Dict[str, str]], List[dict]]:
+    fresh = None
+    label_map = task.label_map
+    if label_map is None:
+        label_map = fresh = extract_label_value_map(_read_html(Path(task.html_path)))
+    v1_project = V1Project.model_validate_json(Path(task.json_path).read_text(encoding="utf-8"))
+    return task, fresh, compare_v1_to_html_fields(v1_project, label_map)
+
+
+def _write_reports(run_dir: Path, aggregate: RunQAAggregate) -> dict:
+    qa_dir = run_dir / QA_DIR
+    qa_dir.mkdir(parents=True, exist_ok=True)
+    aggregate.projects.sort(key=lambda project: project["project_key"])
+    report = {"summary": aggregate.summary(), "projects": aggregate.projects}
+    (qa_dir / "qa_fields_report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    md_lines = ["# Field-by-field QA Report", "", f"Run: {aggregate.run_id}", ""]
+    md_lines.append("| Project | Mismatches | Missing in HTML | Missing in JSON | Preview |")
+    md_lines.append("| --- | --- | --- | --- | --- |")
+    for project in aggregate.projects:
+        counts = Counter(diff.get("status") for diff in project["diffs"])
+        md_lines.append(
+            f"| {project['project_key']} | {counts['mismatch']} | {counts['missing_in_html']} "
+            f"| {counts['missing_in_json']} | {counts['preview_unchecked']} |"
+        )
+    (qa_dir / "qa_fields_report.md").write_text("\n".join(md_lines), encoding="utf-8")
+    (qa_dir / QA_INDEX_FILE).write_text(json.dumps(aggregate.index(), indent=2), encoding="utf-8")
+    return report
+
+
+def run_field_qa(
+    runs: Sequence[Tuple[str, Path]],
+    *,
+    workers: Optional[int] = None,
+    cache_path: str | Path | None = DEFAULT_LABEL_CACHE_FILE,
+    limit: Optional[int] = None,
+    project_key: Optional[str] = None,
+) -> Dict[str, dict]:
+    """
+    Field-by-field QA for ``(run_id, run_dir)`` pairs; returns reports by run id.
+
+    ``workers`` defaults to the CPU count; 1 runs inline. ``cache_path``
+    None disables the label-map cache.
+    """
+    cache = LabelMapCache(cache_path) if cache_path else None
+    try:
+        tasks: List[FieldQATask] = []
+        for run_id, run_dir in runs:
+            for key, json_path, html_path in _project_pages(Path(run_dir), limit, project_key):
+                tasks.append(
+                    FieldQATask(run_id, key, str(json_path), str(html_path), html_content_hash(html_path.read_bytes()))
+                )
+        if cache is not None:
+            cached = cache.get_many(task.content_hash for task in tasks)
+            for task in tasks:
+                task.label_map = cached.get(task.content_hash)
+
+        aggregates = {run_id: RunQAAggregate(run_id) for run_id, _ in runs}
+        fresh_maps: Dict[str, Dict[str, str]] = {}
+        workers = workers or os.cpu_count() or 1
+        misses = sum(task.label_map is None for task in tasks)
+        logger.info(f"Field QA: {len(tasks)} projects in {len(runs)} runs, {misses} pages to parse")
+
+        def _collect(results) -> None:
+            for task, fresh, diffs in results:
+                aggregates[task.run_id].add(task.project_key, diffs, cached=fresh is None)
+                if fresh is not None:
+                    fresh_maps[task.content_hash] = fresh
+
+        if workers <= 1 or len(tasks) <= 1:
+            _collect(map(_run_task, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, min(32, len(tasks) // (workers * 4)))
+                _collect(pool.map(_run_task, tasks, chunksize=chunksize))
+
+        if cache is not None:
+            cache.put_many(fresh_maps)
+        return {run_id: _write_reports(Path(run_dir), aggregates[run_id]) for run_id, run_dir in runs}
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def load_qa_trend(runs_root: Path) -> List[dict]:
+    """Per-run QA indexes under ``runs_root``, oldest run first."""
+
+    indexes = []
+    for path in sorted(Path(runs_root).glob(f"*/{QA_DIR}/{QA_INDEX_FILE}")):
+        try:
+            indexes.append(json.loads(path.read_text(encoding="utf-8")))
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unreadable QA index {path}")
+    return indexes
+
+
+__all__ = ["FieldQATask", "RunQAAggregate", "STATUSES", "load_qa_trend", "run_field_qa"]
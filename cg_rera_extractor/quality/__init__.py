@@ -6,6 +6,7 @@ from .normalization import (
     normalize_project_type,
     normalize_status,
     normalize_v1_project,
+    normalized_details_update,
 )
 from .validation import validate_v1_project
 
@@ -15,5 +16,6 @@ __all__ = [
     "normalize_status",
     "normalize_project_type",
     "normalize_v1_project",
+    "normalized_details_update",
     "validate_v1_project",
 ]
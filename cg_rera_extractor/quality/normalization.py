@@ -4,7 +4,7 @@ from __future__ import annotations
 import re
 from typing import Dict
 
-from cg_rera_extractor.parsing.schema import V1Project
+from cg_rera_extractor.parsing.schema import V1Project, V1ProjectDetails
 
 
 _DISTRICT_MAP: Dict[str, str] = {
@@ -82,25 +82,24 @@ def clean_reg_no(reg: str | None) -> str:
     return compact.upper().strip("-./")
 
 
+def normalized_details_update(details: V1ProjectDetails) -> Dict[str, str]:
+    """Return the normalized project-detail fields as a ``model_copy`` update."""
+
+    return {
+        "district": normalize_district(details.district),
+        "project_status": normalize_status(details.project_status),
+        "project_type": normalize_project_type(details.project_type),
+        "registration_number": clean_reg_no(details.registration_number),
+        "project_name": _clean_whitespace(details.project_name),
+        "project_address": _clean_whitespace(details.project_address),
+    }
+
+
 def normalize_v1_project(project: V1Project) -> V1Project:
     """Return a normalized copy of the provided V1 project."""
 
-    normalized_details = project.project_details.model_copy()
-    normalized_details.district = normalize_district(normalized_details.district)
-    normalized_details.project_status = normalize_status(
-        normalized_details.project_status
-    )
-    normalized_details.project_type = normalize_project_type(
-        normalized_details.project_type
-    )
-    normalized_details.registration_number = clean_reg_no(
-        normalized_details.registration_number
-    )
-    normalized_details.project_name = _clean_whitespace(normalized_details.project_name)
-    normalized_details.project_address = _clean_whitespace(
-        normalized_details.project_address
-    )
-
+    details = project.project_details
+    normalized_details = details.model_copy(update=normalized_details_update(details))
     return project.model_copy(update={"project_details": normalized_details})
 
 
@@ -110,4 +109,5 @@ __all__ = [
     "normalize_status",
     "normalize_project_type",
     "normalize_v1_project",
+    "normalized_details_update",
 ]
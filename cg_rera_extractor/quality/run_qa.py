@@ -0,0 +1,211 @@
+"""
+Run-level QA gate.
+
+The loader used to evaluate the QA gate one project at a time, so checks
+that need peers (price against the locality average) had nothing to compare
+with. :func:`evaluate_run_qa` builds one pandas table of every project in a
+run, computes locality and district price-per-sqft statistics once, and
+evaluates each rule as a column operation. Rules only screen: projects no
+rule can flag pass directly, the rest go through :func:`run_qa_validation`
+with their locality average, so every :class:`QAResult` (flags, messages,
+status) is exactly what the per-project gate returns for the same inputs.
+
+Locality averages are leave-one-out means over the other projects of the
+same district + locality, falling back to the district when the locality
+has fewer than ``QA_MIN_PEERS`` other priced projects.
+
+pandas is optional (``pip install .[qa]``); without it the loader keeps the
+per-project gate.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+try:  # Optional dependency
+    import pandas as pd
+except ImportError:  # pragma: no cover - exercised when pandas is missing
+    pd = None
+
+from cg_rera_extractor.parsing.schema import V1Project
+from cg_rera_extractor.quality.validation import (
+    CRITICAL_FIELDS,
+    DEFAULT_PRICE_CONFIG,
+    IMPORTANT_FIELDS,
+    PriceSanityConfig,
+    QAResult,
+    QAStatus,
+    run_qa_validation,
+)
+
+# Other priced projects needed before a locality (or district) average is used
+QA_MIN_PEERS = int(os.getenv("QA_MIN_PEERS", "3"))
+
+SQM_TO_SQFT = 10.7639
+# Screens are widened slightly so float rounding never hides a Decimal hit
+_EPS = 1e-9
+
+
+def qa_project_data(project: V1Project) -> dict[str, Any]:
+    """Fields the QA gate checks, taken from a V1 project and its unit types."""
+
+    details = project.project_details
+    data: dict[str, Any] = {
+        "rera_registration_number": details.registration_number,
+        "project_name": details.project_name,
+        "district": details.district,
+        "locality": details.village_or_locality,
+        "project_status": details.project_status,
+        "promoter_name": project.promoter_details[0].name if project.promoter_details else None,
+        "approved_date": details.launch_date,
+        "proposed_end_date": details.expected_completion_date,
+    }
+
+    prices = [ut.price_in_inr for ut in project.unit_types if ut.price_in_inr]
+    if prices:
+        data["min_price_total"] = min(prices)
+        data["max_price_total"] = max(prices)
+
+    per_sqft = [
+        ut.price_in_inr / (ut.carpet_area_sq_m * SQM_TO_SQFT)
+        for ut in project.unit_types
+        if ut.price_in_inr and ut.carpet_area_sq_m and ut.carpet_area_sq_m > 0
+    ]
+    if per_sqft:
+        data["min_price_per_sqft"] = min(per_sqft)
+        data["max_price_per_sqft"] = max(per_sqft)
+        data["price_per_sqft"] = statistics.median(per_sqft)
+
+    carpet = [ut.carpet_area_sq_m * SQM_TO_SQFT for ut in project.unit_types if ut.carpet_area_sq_m]
+    if carpet:
+        data["carpet_area_sqft"] = statistics.median(carpet)
+    return data
+
+
+@dataclass
+class RunQAReport:
+    """Per-project QA results (in input order) and the run's peer statistics."""
+
+    results: list[QAResult]
+    locality_stats: list[dict[str, Any]] = field(default_factory=list)
+    district_stats: list[dict[str, Any]] = field(default_factory=list)
+    screened: int = 0  # projects evaluated by run_qa_validation
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "qa_passed": sum(r.status == QAStatus.PASSED for r in self.results),
+            "qa_warnings": sum(r.status == QAStatus.WARNING for r in self.results),
+            "qa_failed": sum(r.status == QAStatus.FAILED for r in self.results),
+            "localities_with_peers": len(self.locality_stats),
+            "district_stats": self.district_stats,
+        }
+
+
+def run_qa_available() -> bool:
+    return pd is not None
+
+
+def _require_pandas() -> None:
+    if pd is None:
+        raise RuntimeError("Run-level QA requires pandas; install with `pip install .[qa]`")
+
+
+def _missing(column: "pd.Series") -> "pd.Series":
+    return column.isna() | column.astype("string").str.strip().eq("").fillna(True)
+
+
+def _column(frame: "pd.DataFrame", name: str) -> "pd.Series":
+    if name in frame:
+        return pd.to_numeric(frame[name], errors="coerce")
+    return pd.Series(float("nan"), index=frame.index)
+
+
+def _leave_one_out_mean(frame: "pd.DataFrame", keys: list[str], values: "pd.Series") -> "pd.Series":
+    grouped = values.groupby([frame[key] for key in keys], dropna=False)
+    total = grouped.transform("sum")
+    count = grouped.transform("count")
+    peers = count - values.notna()
+    mean = (total - values.fillna(0)) / peers.where(peers > 0)
+    return mean.where(peers >= QA_MIN_PEERS)
+
+
+def _bounds_screen(values: "pd.Series", low: float, high: float) -> "pd.Series":
+    return values.notna() & ((values < low * (1 + _EPS)) | (values > high * (1 - _EPS)))
+
+
+def _group_stats(frame: "pd.DataFrame", keys: list[str]) -> list[dict[str, Any]]:
+    priced = frame[frame["price_per_sqft"].notna()]
+    if priced.empty:
+        return []
+    stats = priced.groupby(keys).agg(
+        projects=("price_per_sqft", "size"),
+        median_price_per_sqft=("price_per_sqft", "median"),
+        median_carpet_area_sqft=("carpet_area_sqft", "median"),
+    )
+    stats = stats[stats["projects"] > QA_MIN_PEERS].round(2).reset_index()
+    stats = stats.rename(columns={"_district": "district", "_locality": "locality"})
+    return [
+        {key: (None if pd.isna(value) else value) for key, value in row.items()}
+        for row in stats.to_dict("records")
+    ]
+
+
+def evaluate_run_qa(
+    projects: Sequence[V1Project],
+    config: PriceSanityConfig = DEFAULT_PRICE_CONFIG,
+) -> RunQAReport:
+    """Evaluate the QA gate for all projects of a run in one pass."""
+
+    _require_pandas()
+    records = [qa_project_data(project) for project in projects]
+    if not records:
+        return RunQAReport(results=[])
+    frame = pd.DataFrame.from_records(records)
+    frame["price_per_sqft"] = _column(frame, "price_per_sqft")
+    frame["carpet_area_sqft"] = _column(frame, "carpet_area_sqft")
+    frame["_district"] = frame["district"].astype("string").str.strip().str.lower().fillna("")
+    frame["_locality"] = frame["locality"].astype("string").str.strip().str.lower().fillna("")
+
+    # Peer averages, computed once for the run
+    price = frame["price_per_sqft"]
+    locality_avg = _leave_one_out_mean(frame, ["_district", "_locality"], price)
+    district_avg = _leave_one_out_mean(frame, ["_district"], price)
+    peer_avg = locality_avg.fillna(district_avg)
+
+    # Rule screens
+    screen = pd.Series(False, index=frame.index)
+    for name in CRITICAL_FIELDS + IMPORTANT_FIELDS:
+        screen |= _missing(frame[name]) if name in frame else True
+    for name in ("min_price_total", "max_price_total"):
+        screen |= _bounds_screen(_column(frame, name), float(config.min_price_total), float(config.max_price_total))
+    for name in ("min_price_per_sqft", "max_price_per_sqft"):
+        screen |= _bounds_screen(
+            _column(frame, name), float(config.min_price_per_sqft), float(config.max_price_per_sqft)
+        )
+    screen |= _bounds_screen(frame["carpet_area_sqft"], float(config.min_area_sqft), float(config.max_area_sqft))
+    compared = _column(frame, "price_per_sqft").fillna(_column(frame, "min_price_per_sqft"))
+    deviation = (compared - peer_avg).abs() / peer_avg.where(peer_avg > 0)
+    screen |= deviation.gt(config.locality_deviation_threshold * (1 - _EPS)).fillna(False)
+    approved = frame["approved_date"].astype("string")
+    proposed = frame["proposed_end_date"].astype("string")
+    screen |= (proposed < approved).fillna(False)
+
+    results: list[QAResult] = []
+    for index, flagged in enumerate(screen.tolist()):
+        if flagged:
+            avg = peer_avg.iat[index]
+            results.append(run_qa_validation(records[index], None if pd.isna(avg) else float(avg), config))
+        else:
+            results.append(QAResult(status=QAStatus.PASSED))
+
+    return RunQAReport(
+        results=results,
+        locality_stats=_group_stats(frame, ["_district", "_locality"]),
+        district_stats=_group_stats(frame, ["_district"]),
+        screened=int(screen.sum()),
+    )
+
+
+__all__ = ["QA_MIN_PEERS", "RunQAReport", "evaluate_run_qa", "qa_project_data", "run_qa_available"]
@@ -0,0 +1,113 @@
+"""Single-pass enrichment and serialization of mapped V1 projects.
+
+After :func:`map_raw_to_v1`, a project is enriched with listing metadata,
+page locations and captured previews, then normalized and validated.
+:class:`V1ProjectBuilder` collects those updates and applies them with one
+``model_copy`` of the project (and one of its details) instead of a copy
+per step. ``model_copy`` does not re-validate, so nothing is re-checked
+either.
+
+:func:`write_model_json` serializes a model straight to UTF-8 bytes with
+pydantic-core's encoder; the output is equivalent JSON to
+``json.dumps(model.model_dump(mode="json"), ensure_ascii=False, indent=2)``
+(same layout, though floats may be spelled differently, e.g. ``1e-05`` as
+``0.00001``).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from cg_rera_extractor.parsing.schema import PreviewArtifact, V1Project, V1ReraLocation
+from cg_rera_extractor.quality import normalized_details_update, validate_v1_project
+
+
+class V1ProjectBuilder:
+    """Accumulates enrichment of a mapped :class:`V1Project` and builds it once."""
+
+    def __init__(self, project: V1Project) -> None:
+        self.project = project
+        self.validation_messages: list[str] = []
+        self._details: dict[str, Any] = {}
+        self._locations: list[V1ReraLocation] = []
+        self._previews: dict[str, PreviewArtifact] | None = None
+        self._normalize = False
+        self._validate = False
+
+    def website_url(self, url: str | None) -> "V1ProjectBuilder":
+        if url:
+            self._details["project_website_url"] = url
+        return self
+
+    def add_locations(self, locations: Iterable[V1ReraLocation]) -> "V1ProjectBuilder":
+        """Collect locations; when any are added they become ``rera_locations``."""
+
+        self._locations.extend(locations)
+        return self
+
+    def merge_previews(self, previews: Mapping[str, PreviewArtifact]) -> "V1ProjectBuilder":
+        """Merge captured preview metadata into the mapped preview placeholders."""
+
+        if not previews:
+            return self
+        merged = self._previews if self._previews is not None else dict(self.project.previews)
+        for key, artifact in previews.items():
+            if key in merged:
+                base = merged[key]
+                merged[key] = base.model_copy(
+                    update={
+                        "artifact_type": artifact.artifact_type or base.artifact_type,
+                        "files": artifact.files or base.files,
+                        "notes": base.notes or artifact.notes,
+                    }
+                )
+            else:
+                merged[key] = artifact
+        self._previews = merged
+        return self
+
+    def normalize(self) -> "V1ProjectBuilder":
+        self._normalize = True
+        return self
+
+    def validate(self) -> "V1ProjectBuilder":
+        """Run :func:`validate_v1_project` on the built project."""
+
+        self._validate = True
+        return self
+
+    def build(self) -> V1Project:
+        base = self.project
+        details_update = dict(self._details)
+        if self._normalize:
+            details_update.update(normalized_details_update(base.project_details))
+
+        update: dict[str, Any] = {}
+        if details_update:
+            update["project_details"] = base.project_details.model_copy(update=details_update)
+        if self._locations:
+            update["rera_locations"] = list(self._locations)
+        if self._previews is not None:
+            update["previews"] = self._previews
+        project = base.model_copy(update=update) if update else base
+
+        if self._validate:
+            self.validation_messages = validate_v1_project(project)
+            if self.validation_messages:
+                if project is base:
+                    project = base.model_copy()
+                project.validation_messages = self.validation_messages
+        return project
+
+
+def write_model_json(path: Path, model: BaseModel, *, exclude_none: bool = False) -> None:
+    """Write ``model`` as indented JSON using pydantic-core's encoder."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(to_json(model, indent=2, exclude_none=exclude_none))
+
+
+__all__ = ["V1ProjectBuilder", "write_model_json"]
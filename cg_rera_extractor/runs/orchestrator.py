@@ -33,10 +33,11 @@ from cg_rera_extractor.parsing.amenity_extractor import (
     extract_map_iframe_location,
     compute_centroid,
 )
-from cg_rera_extractor.parsing.mapper import map_raw_to_v1
+from cg_rera_extractor.parsing.mapper import UnmappedLabelStats, map_raw_to_v1
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
 from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
-from cg_rera_extractor.parsing.schema import PreviewArtifact, V1ReraLocation
-from cg_rera_extractor.quality import normalize_v1_project, validate_v1_project
+from cg_rera_extractor.parsing.schema import V1ReraLocation
+from cg_rera_extractor.runs.enrichment import V1ProjectBuilder, write_model_json
 from cg_rera_extractor.runs.status import RunStatus
 
 LOGGER = logging.getLogger(__name__)
@@ -92,15 +93,26 @@ def run_crawl(app_config: AppConfig) -> RunStatus:
         "Starting run %s in %s mode. Output folder: %s", run_id, status.mode, dirs["run_dir"]
     )
     
-    # CONDITIONAL SCRAPING: Initialize cache for delta mode
-    scraping_cache = None
+    if run_config.html_parser_backend:
+        from cg_rera_extractor.parsing.html_backend import set_html_backend
+        backend = set_html_backend(run_config.html_parser_backend)
+        LOGGER.info("Using the %s HTML parser backend", backend)
+
+    # CONDITIONAL SCRAPING: Open the scrape index. Full mode fetches everything
+    # but still records fingerprints and page hashes for later delta runs.
     scraping_mode = run_config.scraping_mode.value if hasattr(run_config.scraping_mode, "value") else str(run_config.scraping_mode)
+    from cg_rera_extractor.utils.scraping_cache import load_scrape_index
+    scraping_cache = load_scrape_index(
+        Path(run_config.scrape_index_file).expanduser(),
+        refetch_ttl_days=run_config.scrape_refetch_ttl_days,
+        legacy_cache_file=Path(run_config.scraping_cache_file).expanduser(),
+    )
     if scraping_mode == "delta":
-        from cg_rera_extractor.utils.scraping_cache import load_cache
-        cache_file = Path(run_config.scraping_cache_file).expanduser()
-        scraping_cache = load_cache(cache_file)
-        LOGGER.info("Loaded scraping cache with %d entries for delta mode", len(scraping_cache))
-        print(f"Delta mode enabled: {len(scraping_cache)} listings already scraped")
+        LOGGER.info("Loaded scrape index with %d entries for delta mode", len(scraping_cache))
+        print(
+            f"Delta mode enabled: {len(scraping_cache)} listings indexed; "
+            f"re-fetching new, changed and listings older than {run_config.scrape_refetch_ttl_days} days"
+        )
     else:
         LOGGER.info("Full scraping mode: all listings will be scraped")
         print(f"Full scraping mode: all listings will be scraped")
@@ -293,6 +305,7 @@ def run_crawl(app_config: AppConfig) -> RunStatus:
     finally:
         if session is not None:
             session.close()
+        scraping_cache.close()
 
     if run_config.mode == RunMode.FULL:
         _process_saved_html(dirs, run_config.state_code, counts, status)
@@ -610,9 +623,15 @@ def _process_saved_html(
     status: RunStatus,
 ) -> None:
     raw_html_dir = dirs["raw_html"]
-    for html_file in sorted(raw_html_dir.glob("*.html")):
+    unmapped = UnmappedLabelStats()
+    # Archived portal snapshots (.mhtml) are streamed; only their HTML part is decoded
+    saved_pages = sorted([*raw_html_dir.glob("*.html"), *raw_html_dir.glob("*.mhtml")])
+    for html_file in saved_pages:
         try:
-            html = html_file.read_text(encoding="utf-8")
+            if html_file.suffix == ".mhtml":
+                html = extract_html_from_mhtml(html_file)
+            else:
+                html = html_file.read_text(encoding="utf-8")
             
             # Extract registration number from filename if possible
             # Filename format: project_{state_code}_{reg_no}.html
@@ -622,23 +641,18 @@ def _process_saved_html(
                 reg_no = project_key[len(state_code) + 1:]
             
             raw = extract_raw_from_html(html, source_file=str(html_file), registration_number=reg_no)
-            raw_path = dirs["raw_extracted"] / f"{html_file.stem}.json"
-            _write_json(raw_path, raw.model_dump(mode="json"))
+            write_model_json(dirs["raw_extracted"] / f"{html_file.stem}.json", raw)
 
-            v1_project = map_raw_to_v1(raw, state_code=state_code)
+            # Enrichment is collected on the builder and applied in one copy
+            builder = V1ProjectBuilder(map_raw_to_v1(raw, state_code=state_code))
+            unmapped.record(builder.project)
             
             # Load listing metadata (website_url, map coords, etc.) if available
-            listing_meta = load_listing_metadata(str(dirs["run_dir"]), project_key)
-            if listing_meta:
-                website_url = listing_meta.get("website_url")
-                if website_url:
-                    updated_details = v1_project.project_details.model_copy(
-                        update={"project_website_url": website_url}
-                    )
-                    v1_project = v1_project.model_copy(
-                        update={"project_details": updated_details}
-                    )
-                    LOGGER.debug("Populated website_url=%s for %s", website_url, project_key)
+            listing_meta = load_listing_metadata(str(dirs["run_dir"]), project_key) or {}
+            website_url = listing_meta.get("website_url")
+            if website_url:
+                builder.website_url(website_url)
+                LOGGER.debug("Populated website_url=%s for %s", website_url, project_key)
             
             # Extract amenity locations with lat/lon from detail page
             amenity_locations = extract_amenity_locations(html)
@@ -646,18 +660,18 @@ def _process_saved_html(
                 LOGGER.info(
                     "Extracted %d amenity locations from %s", len(amenity_locations), html_file.name
                 )
+                builder.add_locations(amenity_locations)
                 # Add amenity centroid as a "project_centroid" location
                 centroid = compute_centroid(amenity_locations)
                 if centroid:
-                    centroid_loc = V1ReraLocation(
-                        source_type="amenity_centroid",
-                        latitude=centroid[0],
-                        longitude=centroid[1],
-                        particulars="Computed centroid of amenity locations",
-                    )
-                    amenity_locations.append(centroid_loc)
-            else:
-                amenity_locations = []
+                    builder.add_locations([
+                        V1ReraLocation(
+                            source_type="amenity_centroid",
+                            latitude=centroid[0],
+                            longitude=centroid[1],
+                            particulars="Computed centroid of amenity locations",
+                        )
+                    ])
             
             # Extract Google Maps iframe location from detail page (if present)
             map_iframe_loc = extract_map_iframe_location(html)
@@ -668,59 +682,34 @@ def _process_saved_html(
                     map_iframe_loc.latitude,
                     map_iframe_loc.longitude,
                 )
-                amenity_locations.append(map_iframe_loc)
+                builder.add_locations([map_iframe_loc])
             
             # Add map coordinates from listing page (if available in listing metadata)
-            if listing_meta:
-                map_lat = listing_meta.get("map_latitude")
-                map_lon = listing_meta.get("map_longitude")
-                if map_lat is not None and map_lon is not None:
-                    LOGGER.info(
-                        "Adding listing page map location for %s: lat=%s, lon=%s",
-                        project_key,
-                        map_lat,
-                        map_lon,
-                    )
-                    listing_map_loc = V1ReraLocation(
+            map_lat = listing_meta.get("map_latitude")
+            map_lon = listing_meta.get("map_longitude")
+            if map_lat is not None and map_lon is not None:
+                LOGGER.info(
+                    "Adding listing page map location for %s: lat=%s, lon=%s",
+                    project_key,
+                    map_lat,
+                    map_lon,
+                )
+                builder.add_locations([
+                    V1ReraLocation(
                         source_type="listing_map",
                         latitude=map_lat,
                         longitude=map_lon,
                         particulars="Google Maps marker from listing page",
                     )
-                    amenity_locations.append(listing_map_loc)
-            
-            # Merge all locations into v1_project.rera_locations
-            if amenity_locations:
-                v1_project = v1_project.model_copy(
-                    update={"rera_locations": amenity_locations}
-                )
-            
-            v1_project = normalize_v1_project(v1_project)
-            validation_messages = validate_v1_project(v1_project)
-            if validation_messages:
-                counts["dq_warnings"] += len(validation_messages)
-                v1_project = v1_project.model_copy(
-                    update={"validation_messages": validation_messages}
-                )
+                ])
             
             preview_dir = dirs.get("previews", dirs["run_dir"]) / project_key
-            preview_metadata = load_preview_metadata(preview_dir)
-            if preview_metadata:
-                merged_previews: dict[str, PreviewArtifact] = dict(v1_project.previews)
-                for key, artifact in preview_metadata.items():
-                    if key in merged_previews:
-                        base = PreviewArtifact(**merged_previews[key].model_dump())
-                        base.artifact_type = artifact.artifact_type or base.artifact_type
-                        base.files = artifact.files or base.files
-                        base.notes = base.notes or artifact.notes
-                        merged_previews[key] = base
-                    else:
-                        merged_previews[key] = artifact
-                v1_project = v1_project.model_copy(update={"previews": merged_previews})
-            v1_path = dirs["scraped_json"] / f"{html_file.stem}.v1.json"
-            _write_json(
-                v1_path,
-                v1_project.model_dump(mode="json", exclude_none=True),
+            builder.merge_previews(load_preview_metadata(preview_dir))
+
+            v1_project = builder.normalize().validate().build()
+            counts["dq_warnings"] += len(builder.validation_messages)
+            write_model_json(
+                dirs["scraped_json"] / f"{html_file.stem}.v1.json", v1_project, exclude_none=True
             )
             counts["projects_parsed"] += 1
             counts["projects_mapped"] += 1
@@ -728,6 +717,12 @@ def _process_saved_html(
             LOGGER.exception("Failed to process %s", html_file)
             status.errors.append(str(exc))
 
+    if unmapped.projects:
+        counts["unmapped_labels"] = sum(unmapped.labels.values())
+        _write_json(dirs["run_dir"] / "unmapped_labels.json", unmapped.to_dict())
+        for (section, label), count in unmapped.labels.most_common(5):
+            LOGGER.info("Unmapped label %r in %r: %d projects", label, section, count)
+
 
 def _write_json(path: Path, payload: object) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,526 @@
+"""Incremental, sharded ETL stages over saved run directories.
+
+The crawl writes detail pages to ``raw_html/``; this module turns them into
+loadable V1 JSON in separate stages so an orchestrator (the Airflow DAG) can
+fan each stage out over runs and shards:
+
+``extract``
+    ``raw_html/<stem>.html`` (or an archived ``<stem>.mhtml`` snapshot) ->
+    ``raw_extracted/<stem>.json`` (+ the amenity / map-iframe locations found
+    in the page as ``<stem>.locations.json``)
+``map``
+    raw JSON + locations + listing metadata + previews ->
+    ``mapped_json/<stem>.v1.json``
+``qa``
+    normalize and validate -> ``scraped_json/<stem>.v1.json`` (what the DB
+    loader reads)
+``load``
+    one task per run, returns the ids of the projects it upserted
+
+Each stage reads only the previous stage's artifacts. A shard records the
+content hash of its inputs under ``pipeline_state/`` and is skipped when the
+hash is unchanged, so re-running the DAG over old runs is cheap. Every stage
+appends a :class:`StageMetrics` line to ``pipeline_state/metrics.jsonl``.
+
+Command line (used by the DAG)::
+
+    python -m cg_rera_extractor.runs.pipeline plan --runs-dir outputs/runs
+    python -m cg_rera_extractor.runs.pipeline stage extract --run-dir ... --shard 0 --shards 4
+    python -m cg_rera_extractor.runs.pipeline load --run-dir ...
+
+Each command prints its JSON result as the last line of stdout.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+
+from cg_rera_extractor.detail.storage import (
+    load_listing_metadata,
+    make_project_listing_meta_path,
+)
+from cg_rera_extractor.parsing.amenity_extractor import (
+    compute_centroid,
+    extract_amenity_locations,
+    extract_map_iframe_location,
+)
+from cg_rera_extractor.parsing.mapper import map_raw_to_v1
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
+from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
+from cg_rera_extractor.parsing.schema import (
+    PreviewArtifact,
+    RawExtractedProject,
+    V1Project,
+    V1ReraLocation,
+)
+from cg_rera_extractor.runs.enrichment import V1ProjectBuilder, write_model_json
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when stage logic changes so existing manifests are invalidated
+PIPELINE_VERSION = "1"
+
+DEFAULT_SHARD_COUNT = int(os.getenv("REALMAP_ETL_SHARDS", "4"))
+DEFAULT_STATE_CODE = os.getenv("REALMAP_STATE_CODE", "CG")
+
+STATE_DIR = "pipeline_state"
+METRICS_FILE = "metrics.jsonl"
+
+STAGES = ("extract", "map", "qa")
+
+# stage -> (input directory, input suffixes); outputs are the next stage's inputs
+_STAGE_INPUTS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "extract": ("raw_html", (".html", ".mhtml")),
+    "map": ("raw_extracted", (".json",)),
+    "qa": ("mapped_json", (".v1.json",)),
+}
+
+_LOCATIONS_SUFFIX = ".locations.json"
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """One shard of one run; files are assigned by a stable hash of their stem."""
+
+    run_dir: str
+    shard_index: int = 0
+    shard_count: int = 1
+
+    @property
+    def label(self) -> str:
+        return f"{self.shard_index + 1}/{self.shard_count}"
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+@dataclass
+class StageMetrics:
+    """Duration and throughput of one stage invocation."""
+
+    stage: str
+    run_id: str
+    shard: str | None = None
+    items: int = 0
+    processed: int = 0
+    failed: int = 0
+    skipped: bool = False
+    duration_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        if self.skipped or self.duration_seconds <= 0:
+            return 0.0
+        return self.processed / self.duration_seconds
+
+    def to_dict(self) -> dict[str, object]:
+        data = asdict(self)
+        data["items_per_second"] = round(self.items_per_second, 3)
+        return data
+
+
+# =============================================================================
+# Planning and hashing
+# =============================================================================
+
+
+def shard_of(stem: str, shard_count: int) -> int:
+    return zlib.crc32(stem.encode("utf-8")) % shard_count
+
+
+def _stem(path: Path, suffix: str) -> str:
+    return path.name[: -len(suffix)]
+
+
+def _stage_inputs(stage: str, run_dir: Path) -> list[tuple[Path, str]]:
+    """``(path, stem)`` of every input ``stage`` reads from ``run_dir``."""
+
+    input_dir, suffixes = _STAGE_INPUTS[stage]
+    directory = run_dir / input_dir
+    if not directory.exists():
+        return []
+    return [
+        (path, _stem(path, suffix))
+        for suffix in suffixes
+        for path in directory.glob(f"*{suffix}")
+        if not path.name.endswith(_LOCATIONS_SUFFIX) and not path.name.endswith(".listing.json")
+    ]
+
+
+def _shard_inputs(stage: str, shard: ShardSpec) -> list[Path]:
+    return sorted(
+        path
+        for path, stem in _stage_inputs(stage, Path(shard.run_dir))
+        if shard_of(stem, shard.shard_count) == shard.shard_index
+    )
+
+
+def plan_shards(
+    runs_dir: str | Path,
+    shard_count: int = DEFAULT_SHARD_COUNT,
+    run_ids: Iterable[str] | None = None,
+) -> list[ShardSpec]:
+    """Non-empty shards of every ``run_*`` directory (or only ``run_ids``)."""
+
+    base = Path(runs_dir)
+    if not base.exists():
+        return []
+    wanted = set(run_ids) if run_ids else None
+    specs: list[ShardSpec] = []
+    for run_dir in sorted(p for p in base.glob("run_*") if p.is_dir()):
+        if wanted is not None and run_dir.name not in wanted:
+            continue
+        occupied = {shard_of(stem, shard_count) for _, stem in _stage_inputs("extract", run_dir)}
+        specs.extend(
+            ShardSpec(str(run_dir), index, shard_count) for index in sorted(occupied)
+        )
+    return specs
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def inputs_digest(stage: str, paths: Iterable[Path]) -> str:
+    """Hash of the stage version and the name + content of every input."""
+
+    digest = hashlib.sha256(f"{stage}:{PIPELINE_VERSION}".encode("utf-8"))
+    for path in sorted(paths):
+        if path.exists():
+            digest.update(f"{path.name}:{_file_digest(path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _manifest_path(run_dir: Path, stage: str, shard: ShardSpec | None) -> Path:
+    name = "run.json" if shard is None else f"shard-{shard.shard_index}-of-{shard.shard_count}.json"
+    return run_dir / STATE_DIR / stage / name
+
+
+def _read_manifest(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def _write_json(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def record_metrics(run_dir: str | Path, metrics: StageMetrics) -> None:
+    path = Path(run_dir) / STATE_DIR / METRICS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {"recorded_at": datetime.now(timezone.utc).isoformat(), **metrics.to_dict()}
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    LOGGER.info(
+        "stage=%s run=%s shard=%s items=%s processed=%s failed=%s skipped=%s "
+        "duration=%.2fs throughput=%.2f/s",
+        metrics.stage,
+        metrics.run_id,
+        metrics.shard,
+        metrics.items,
+        metrics.processed,
+        metrics.failed,
+        metrics.skipped,
+        metrics.duration_seconds,
+        metrics.items_per_second,
+    )
+
+
+# =============================================================================
+# Stage bodies (one input file -> artifacts)
+# =============================================================================
+
+
+def _project_key(stem: str) -> str:
+    return stem.replace("project_", "", 1)
+
+
+def _extract_one(run_dir: Path, html_file: Path, state_code: str) -> None:
+    if html_file.suffix == ".mhtml":
+        html = extract_html_from_mhtml(html_file)
+    else:
+        html = html_file.read_text(encoding="utf-8")
+    project_key = _project_key(html_file.stem)
+    reg_no = None
+    if project_key.startswith(f"{state_code}_"):
+        reg_no = project_key[len(state_code) + 1:]
+
+    raw = extract_raw_from_html(html, source_file=str(html_file), registration_number=reg_no)
+    write_model_json(run_dir / "raw_extracted" / f"{html_file.stem}.json", raw)
+
+    # Locations need the HTML, so they are captured here rather than in ``map``
+    locations = extract_amenity_locations(html)
+    centroid = compute_centroid(locations) if locations else None
+    if centroid:
+        locations.append(
+            V1ReraLocation(
+                source_type="amenity_centroid",
+                latitude=centroid[0],
+                longitude=centroid[1],
+                particulars="Computed centroid of amenity locations",
+            )
+        )
+    iframe_location = extract_map_iframe_location(html)
+    if iframe_location:
+        locations.append(iframe_location)
+    _write_json(
+        run_dir / "raw_extracted" / f"{html_file.stem}{_LOCATIONS_SUFFIX}",
+        [location.model_dump(mode="json") for location in locations],
+    )
+
+
+def _load_previews(preview_dir: Path) -> dict[str, PreviewArtifact]:
+    metadata_file = preview_dir / "metadata.json"
+    if not metadata_file.exists():
+        return {}
+    raw = json.loads(metadata_file.read_text(encoding="utf-8"))
+    return {key: PreviewArtifact(**value) for key, value in raw.items()}
+
+
+def _map_one(run_dir: Path, raw_file: Path, state_code: str) -> None:
+    stem = _stem(raw_file, ".json")
+    project_key = _project_key(stem)
+    raw = RawExtractedProject.model_validate_json(raw_file.read_text(encoding="utf-8"))
+    builder = V1ProjectBuilder(map_raw_to_v1(raw, state_code=state_code))
+
+    listing_meta = load_listing_metadata(str(run_dir), project_key) or {}
+    builder.website_url(listing_meta.get("website_url"))
+
+    locations_file = raw_file.with_name(f"{stem}{_LOCATIONS_SUFFIX}")
+    if locations_file.exists():
+        builder.add_locations(
+            V1ReraLocation(**item) for item in json.loads(locations_file.read_text(encoding="utf-8"))
+        )
+    if listing_meta.get("map_latitude") is not None and listing_meta.get("map_longitude") is not None:
+        builder.add_locations([
+            V1ReraLocation(
+                source_type="listing_map",
+                latitude=listing_meta["map_latitude"],
+                longitude=listing_meta["map_longitude"],
+                particulars="Google Maps marker from listing page",
+            )
+        ])
+
+    builder.merge_previews(_load_previews(run_dir / "previews" / project_key))
+    write_model_json(run_dir / "mapped_json" / f"{stem}.v1.json", builder.build(), exclude_none=True)
+
+
+def _qa_one(run_dir: Path, mapped_file: Path, state_code: str) -> None:
+    v1_project = V1Project.model_validate_json(mapped_file.read_text(encoding="utf-8"))
+    write_model_json(
+        run_dir / "scraped_json" / mapped_file.name,
+        V1ProjectBuilder(v1_project).normalize().validate().build(),
+        exclude_none=True,
+    )
+
+
+_STAGE_BODIES: dict[str, Callable[[Path, Path, str], None]] = {
+    "extract": _extract_one,
+    "map": _map_one,
+    "qa": _qa_one,
+}
+
+
+def _dependent_inputs(stage: str, run_dir: Path, path: Path) -> list[Path]:
+    """Side inputs that also decide a file's output (hashed with it)."""
+
+    if stage != "map":
+        return []
+    stem = _stem(path, ".json")
+    project_key = _project_key(stem)
+    return [
+        path.with_name(f"{stem}{_LOCATIONS_SUFFIX}"),
+        Path(make_project_listing_meta_path(str(run_dir), project_key)),
+        run_dir / "previews" / project_key / "metadata.json",
+    ]
+
+
+# =============================================================================
+# Stage runners
+# =============================================================================
+
+
+def run_stage(
+    stage: str,
+    shard: ShardSpec,
+    state_code: str = DEFAULT_STATE_CODE,
+    force: bool = False,
+) -> StageMetrics:
+    """Run ``stage`` over one shard unless its inputs are unchanged."""
+
+    if stage not in _STAGE_BODIES:
+        raise ValueError(f"Unknown stage: {stage}. Expected one of {', '.join(STAGES)}")
+
+    run_dir = Path(shard.run_dir)
+    started = time.perf_counter()
+    inputs = _shard_inputs(stage, shard)
+    metrics = StageMetrics(stage=stage, run_id=run_dir.name, shard=shard.label, items=len(inputs))
+
+    hashed = list(inputs)
+    for path in inputs:
+        hashed.extend(_dependent_inputs(stage, run_dir, path))
+    digest = inputs_digest(stage, hashed)
+    manifest_path = _manifest_path(run_dir, stage, shard)
+    manifest = _read_manifest(manifest_path)
+
+    if not force and manifest and manifest.get("inputs_digest") == digest and not manifest.get("failed"):
+        metrics.skipped = True
+    else:
+        body = _STAGE_BODIES[stage]
+        failed: list[str] = []
+        for path in inputs:
+            try:
+                body(run_dir, path, state_code)
+                metrics.processed += 1
+            except Exception:
+                LOGGER.exception("Stage %s failed for %s", stage, path)
+                failed.append(path.name)
+        metrics.failed = len(failed)
+        _write_json(
+            manifest_path,
+            {
+                "stage": stage,
+                "version": PIPELINE_VERSION,
+                "inputs_digest": digest,
+                "inputs": [path.name for path in inputs],
+                "failed": failed,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+    metrics.duration_seconds = round(time.perf_counter() - started, 3)
+    record_metrics(run_dir, metrics)
+    return metrics
+
+
+def load_run(run_dir: str | Path, force: bool = False) -> tuple[StageMetrics, list[int]]:
+    """Load a run's ``scraped_json`` into the DB unless it is unchanged.
+
+    Returns the metrics and the ids of the projects the load upserted (empty
+    when skipped), which is what the post-processing tasks work on.
+    """
+
+    # Imported lazily: the file stages must not need SQLAlchemy or a database
+    from cg_rera_extractor.db.loader import load_run_into_db
+
+    run_path = Path(run_dir)
+    started = time.perf_counter()
+    inputs = sorted((run_path / "scraped_json").glob("*.v1.json"))
+    metrics = StageMetrics(stage="load", run_id=run_path.name, items=len(inputs))
+    digest = inputs_digest("load", inputs)
+    manifest_path = _manifest_path(run_path, "load", None)
+    manifest = _read_manifest(manifest_path)
+
+    project_ids: list[int] = []
+    if not force and manifest and manifest.get("inputs_digest") == digest:
+        metrics.skipped = True
+    elif inputs:
+        stats = load_run_into_db(str(run_path))
+        project_ids = list(stats.get("project_ids", []))
+        metrics.processed = int(stats.get("projects_upserted", 0))
+        metrics.failed = int(stats.get("qa_failed", 0))
+        _write_json(
+            manifest_path,
+            {
+                "stage": "load",
+                "version": PIPELINE_VERSION,
+                "inputs_digest": digest,
+                "project_ids": project_ids,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+    metrics.duration_seconds = round(time.perf_counter() - started, 3)
+    record_metrics(run_path, metrics)
+    return metrics, project_ids
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _emit(payload: object) -> None:
+    # The DAG reads the last stdout line as the task's XCom value
+    sys.stdout.write(json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Incremental ETL stages over run directories")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan = sub.add_parser("plan", help="List non-empty run shards as JSON")
+    plan.add_argument("--runs-dir", required=True)
+    plan.add_argument("--shards", type=int, default=DEFAULT_SHARD_COUNT)
+    plan.add_argument("--run-id", action="append", help="Restrict to these run ids")
+
+    stage = sub.add_parser("stage", help="Run one file stage over one shard")
+    stage.add_argument("stage", choices=STAGES)
+    stage.add_argument("--run-dir", required=True)
+    stage.add_argument("--shard", type=int, default=0)
+    stage.add_argument("--shards", type=int, default=1)
+    stage.add_argument("--state-code", default=DEFAULT_STATE_CODE)
+    stage.add_argument("--force", action="store_true", help="Ignore the input hash manifest")
+
+    load = sub.add_parser("load", help="Load one run into the database")
+    load.add_argument("--run-dir", required=True)
+    load.add_argument("--force", action="store_true", help="Ignore the input hash manifest")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "plan":
+        specs = plan_shards(args.runs_dir, args.shards, args.run_id)
+        _emit([spec.to_dict() for spec in specs])
+        return 0
+    if args.command == "stage":
+        metrics = run_stage(
+            args.stage,
+            ShardSpec(args.run_dir, args.shard, args.shards),
+            state_code=args.state_code,
+            force=args.force,
+        )
+        _emit(metrics.to_dict())
+        return 1 if metrics.failed and metrics.failed == metrics.items else 0
+
+    metrics, project_ids = load_run(args.run_dir, force=args.force)
+    _emit({**metrics.to_dict(), "project_ids": project_ids})
+    return 0
+
+
+__all__ = [
+    "PIPELINE_VERSION",
+    "STAGES",
+    "ShardSpec",
+    "StageMetrics",
+    "inputs_digest",
+    "load_run",
+    "plan_shards",
+    "record_metrics",
+    "run_stage",
+    "shard_of",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
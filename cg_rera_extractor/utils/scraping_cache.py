@@ -1,19 +1,45 @@
 """
 Fast cache layer for conditional scraping.
 
-This module provides O(1) lookup for checking if a listing has already been scraped,
-enabling delta scraping mode where only new listings are processed.
+:class:`ScrapeIndex` is the change-aware index used by the scraper. Per
+listing it stores a fingerprint of the listing row (status, promoter, name,
+location), a hash of the last fetched detail page and timestamps, in a
+SQLite file that is updated row by row. In delta mode a listing's detail
+page is re-fetched only when it is new, its row fingerprint changed, or its
+last fetch is older than the refetch TTL.
+
+:class:`ScrapedCache` is the original "ever scraped?" ID set persisted as
+JSON; a new index imports its IDs on first load.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from cg_rera_extractor.listing.models import ListingRecord
 
 logger = logging.getLogger(__name__)
 
 ScrapingMode = Literal["delta", "full"]
+FetchReason = Literal["new", "changed", "stale", "fresh"]
+
+DEFAULT_INDEX_FILE = "data/scrape_index.sqlite3"
+DEFAULT_REFETCH_TTL_DAYS = 30.0
+
+# ASP.NET postback state differs on every render of an unchanged page
+_VOLATILE_INPUT_RE = re.compile(
+    r"""<input[^>]*name=["']__(?:VIEWSTATE\w*|EVENTVALIDATION|EVENTTARGET|EVENTARGUMENT)["'][^>]*>""",
+    re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 class ScrapedCache:
@@ -21,6 +47,7 @@ class ScrapedCache:
     Fast in-memory cache of scraped listing IDs with persistent storage.
     
     Uses a set for O(1) lookup performance and persists to a JSON file.
+    Superseded by :class:`ScrapeIndex`, which imports these files.
     """
     
     def __init__(self, cache_file: str | Path = "data/scraped_cache.json"):
@@ -143,6 +170,252 @@ class ScrapedCache:
         return self.size()
 
 
+def listing_fingerprint(record: "ListingRecord") -> str:
+    """Hash of the listing-row fields whose change warrants a detail re-fetch."""
+
+    parts = (
+        record.status,
+        record.promoter_name,
+        record.project_name,
+        record.district,
+        record.tehsil,
+    )
+    payload = "\x1f".join(_WHITESPACE_RE.sub(" ", p or "").strip().lower() for p in parts)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def content_hash(html: str) -> str:
+    """Hash of a detail page, ignoring postback state and whitespace."""
+
+    text = _WHITESPACE_RE.sub(" ", _VOLATILE_INPUT_RE.sub("", html)).strip()
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ListingState:
+    """What the index knows about one listing (timestamps are epoch seconds)."""
+
+    listing_id: str
+    row_fingerprint: str | None
+    content_hash: str | None
+    first_seen_at: float
+    fetched_at: float | None
+    content_changed_at: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class FetchDecision:
+    """Whether to fetch a listing's detail page, and why."""
+
+    fetch: bool
+    reason: FetchReason
+
+
+class ScrapeIndex:
+    """
+    Change-aware index of scraped listings backed by SQLite.
+
+    Writes go to an open transaction and are committed by :meth:`persist`,
+    so saving costs only the rows touched since the last save.
+    """
+
+    def __init__(
+        self,
+        index_file: str | Path = DEFAULT_INDEX_FILE,
+        *,
+        refetch_ttl_days: float | None = DEFAULT_REFETCH_TTL_DAYS,
+        legacy_cache_file: str | Path | None = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            index_file: Path to the SQLite index file
+            refetch_ttl_days: Re-fetch listings last fetched longer ago than
+                this even if unchanged (None disables age-based re-fetching)
+            legacy_cache_file: ScrapedCache JSON file imported into an empty index
+        """
+        self.index_file = Path(index_file)
+        self.refetch_ttl_days = refetch_ttl_days
+        self.legacy_cache_file = Path(legacy_cache_file) if legacy_cache_file else None
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.load()
+        assert self._conn is not None
+        return self._conn
+
+    def load(self) -> None:
+        """Open (creating if needed) the index file."""
+        if self._conn is not None:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.index_file)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrape_index (
+                listing_id TEXT PRIMARY KEY,
+                row_fingerprint TEXT,
+                content_hash TEXT,
+                first_seen_at REAL NOT NULL,
+                fetched_at REAL,
+                content_changed_at REAL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+        if len(self) == 0 and self.legacy_cache_file and self.legacy_cache_file.exists():
+            self._import_legacy(self.legacy_cache_file)
+        logger.info(f"Loaded scrape index with {len(self)} listings: {self.index_file}")
+
+    def _import_legacy(self, cache_file: Path) -> None:
+        legacy = ScrapedCache(cache_file)
+        legacy.load()
+        # The old cache has no fetch times; the file's mtime is the best bound
+        fetched_at = cache_file.stat().st_mtime
+        self._db.executemany(
+            "INSERT OR IGNORE INTO scrape_index (listing_id, first_seen_at, fetched_at) VALUES (?, ?, ?)",
+            ((listing_id, fetched_at, fetched_at) for listing_id in legacy._cache),
+        )
+        self._db.commit()
+        logger.info(f"Imported {len(legacy)} listing IDs from legacy cache: {cache_file}")
+
+    def close(self) -> None:
+        """Commit pending writes and close the index file."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def persist(self) -> None:
+        """Commit the rows written since the last persist."""
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.commit()
+            logger.info(f"Persisted scrape index ({len(self)} listings): {self.index_file}")
+
+    def get(self, listing_id: str) -> ListingState | None:
+        """Stored state of a listing, or None if it was never seen."""
+        row = self._db.execute(
+            """
+            SELECT listing_id, row_fingerprint, content_hash, first_seen_at, fetched_at, content_changed_at
+            FROM scrape_index WHERE listing_id = ?
+            """,
+            (listing_id,),
+        ).fetchone()
+        return ListingState(*row) if row else None
+
+    def decide(self, listing_id: str, fingerprint: str | None = None, now: float | None = None) -> FetchDecision:
+        """
+        Decide whether a listing's detail page needs fetching.
+
+        Entries imported from the legacy cache have no fingerprint yet; they
+        adopt the first one seen here instead of being re-fetched.
+
+        Args:
+            listing_id: The listing identifier (e.g., registration number)
+            fingerprint: :func:`listing_fingerprint` of the current listing row
+            now: Current epoch time (defaults to time.time())
+        """
+        state = self.get(listing_id)
+        if state is None or state.fetched_at is None:
+            return FetchDecision(True, "new")
+
+        if fingerprint is not None:
+            if state.row_fingerprint is None:
+                self._db.execute(
+                    "UPDATE scrape_index SET row_fingerprint = ? WHERE listing_id = ?",
+                    (fingerprint, listing_id),
+                )
+            elif state.row_fingerprint != fingerprint:
+                return FetchDecision(True, "changed")
+
+        now = time.time() if now is None else now
+        if self.refetch_ttl_days is not None and now - state.fetched_at > self.refetch_ttl_days * 86400:
+            return FetchDecision(True, "stale")
+        return FetchDecision(False, "fresh")
+
+    def record_fetch(
+        self,
+        listing_id: str,
+        fingerprint: str | None = None,
+        html: str | None = None,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Record a detail-page fetch.
+
+        Returns:
+            True if the page content differs from the previous fetch
+            (always True for a first fetch or when no HTML is given)
+        """
+        now = time.time() if now is None else now
+        digest = content_hash(html) if html is not None else None
+        previous = self.get(listing_id)
+        changed = previous is None or digest is None or previous.content_hash != digest
+        self._db.execute(
+            """
+            INSERT INTO scrape_index (
+                listing_id, row_fingerprint, content_hash, first_seen_at, fetched_at, content_changed_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(listing_id) DO UPDATE SET
+                row_fingerprint = COALESCE(excluded.row_fingerprint, row_fingerprint),
+                content_hash = COALESCE(excluded.content_hash, content_hash),
+                fetched_at = excluded.fetched_at,
+                content_changed_at = CASE WHEN ? THEN excluded.fetched_at ELSE content_changed_at END
+            """,
+            (listing_id, fingerprint, digest, now, now, now, changed),
+        )
+        return changed
+
+    def contains(self, listing_id: str) -> bool:
+        """Check if a listing has been fetched before."""
+        state = self.get(listing_id)
+        return state is not None and state.fetched_at is not None
+
+    def remove(self, listing_id: str) -> None:
+        """Forget a listing so it is fetched again."""
+        self._db.execute("DELETE FROM scrape_index WHERE listing_id = ?", (listing_id,))
+
+    def size(self) -> int:
+        """Get the number of listings in the index."""
+        return self._db.execute("SELECT COUNT(*) FROM scrape_index").fetchone()[0]
+
+    def __contains__(self, listing_id: str) -> bool:
+        """Support 'in' operator."""
+        return self.contains(listing_id)
+
+    def __len__(self) -> int:
+        """Support len() function."""
+        return self.size()
+
+
+def load_scrape_index(
+    index_file: str | Path = DEFAULT_INDEX_FILE,
+    *,
+    refetch_ttl_days: float | None = DEFAULT_REFETCH_TTL_DAYS,
+    legacy_cache_file: str | Path | None = None,
+) -> ScrapeIndex:
+    """
+    Open the change-aware scrape index.
+
+    Args:
+        index_file: Path to the SQLite index file
+        refetch_ttl_days: Age after which unchanged listings are re-fetched
+        legacy_cache_file: ScrapedCache JSON file to import into a new index
+
+    Returns:
+        ScrapeIndex instance, opened
+    """
+    index = ScrapeIndex(index_file, refetch_ttl_days=refetch_ttl_days, legacy_cache_file=legacy_cache_file)
+    index.load()
+    return index
+
+
 def load_cache(cache_file: str | Path = "data/scraped_cache.json") -> ScrapedCache:
     """
     Load the scraped listings cache from disk.
@@ -158,12 +431,12 @@ def load_cache(cache_file: str | Path = "data/scraped_cache.json") -> ScrapedCac
     return cache
 
 
-def persist_cache(cache: ScrapedCache) -> None:
+def persist_cache(cache: ScrapedCache | ScrapeIndex) -> None:
     """
     Persist the cache to disk.
     
     Args:
-        cache: ScrapedCache instance to persist
+        cache: ScrapedCache or ScrapeIndex instance to persist
     """
     cache.persist()
 
@@ -171,7 +444,8 @@ def persist_cache(cache: ScrapedCache) -> None:
 def should_skip_listing(
     listing_id: str,
     mode: ScrapingMode,
-    cache: ScrapedCache,
+    cache: ScrapedCache | ScrapeIndex,
+    fingerprint: str | None = None,
 ) -> bool:
     """
     Determine if a listing should be skipped based on mode and cache.
@@ -179,7 +453,8 @@ def should_skip_listing(
     Args:
         listing_id: The listing identifier
         mode: Scraping mode ("delta" or "full")
-        cache: ScrapedCache instance
+        cache: ScrapedCache or ScrapeIndex instance
+        fingerprint: Listing-row fingerprint (ScrapeIndex only)
     
     Returns:
         True if the listing should be skipped, False if it should be scraped
@@ -188,6 +463,8 @@ def should_skip_listing(
         return False
     
     if mode == "delta":
+        if isinstance(cache, ScrapeIndex):
+            return not cache.decide(listing_id, fingerprint).fetch
         return cache.contains(listing_id)
     
     logger.warning(f"Unknown scraping mode: {mode}, defaulting to full scrape")
@@ -196,27 +473,41 @@ def should_skip_listing(
 
 def mark_listing_scraped(
     listing_id: str,
-    cache: ScrapedCache,
+    cache: ScrapedCache | ScrapeIndex,
     persist_immediately: bool = False,
+    *,
+    fingerprint: str | None = None,
+    html: str | None = None,
 ) -> None:
     """
     Mark a listing as scraped in the cache.
     
     Args:
         listing_id: The listing identifier
-        cache: ScrapedCache instance
+        cache: ScrapedCache or ScrapeIndex instance
         persist_immediately: If True, persist cache to disk immediately
+        fingerprint: Listing-row fingerprint (ScrapeIndex only)
+        html: Fetched detail page, hashed for change tracking (ScrapeIndex only)
     """
-    cache.add(listing_id)
+    if isinstance(cache, ScrapeIndex):
+        cache.record_fetch(listing_id, fingerprint, html)
+    else:
+        cache.add(listing_id)
     
     if persist_immediately:
         cache.persist()
 
 
 __all__ = [
+    "FetchDecision",
+    "ListingState",
+    "ScrapeIndex",
     "ScrapedCache",
     "ScrapingMode",
+    "content_hash",
+    "listing_fingerprint",
     "load_cache",
+    "load_scrape_index",
     "persist_cache",
     "should_skip_listing",
     "mark_listing_scraped",
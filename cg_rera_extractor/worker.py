@@ -1,19 +1,45 @@
+"""
+Celery application and tasks for queued AI work.
+
+Jobs are submitted through :mod:`ai.jobs` (the AI service endpoints or ETL
+batch submission), which records an ``ai_jobs`` row and dispatches one of the
+tasks below with the row id. Extraction is CPU-bound OCR and goes to the
+``ocr`` queue; scoring runs the LLM on the ``llm`` queue. Run one worker per
+queue so each gets its own concurrency:
+
+    celery -A cg_rera_extractor.worker worker -Q ocr -c 4 -n ocr@%h
+    celery -A cg_rera_extractor.worker worker -Q llm -c 1 -n llm@%h
+
+Failed attempts are retried with exponential backoff and jitter, up to
+``AI_JOB_MAX_RETRIES``; invalid input (unknown project, unreadable PDF) fails
+at once. ``CELERY_TASK_ALWAYS_EAGER=true`` runs tasks inline (tests, local
+development without Redis).
+"""
 import os
-import time
 from celery import Celery
+from celery.signals import worker_process_init
 from dotenv import load_dotenv
 
+from ai.jobs import PERMANENT_ERRORS, execute_job
+from cg_rera_extractor.db import get_engine, get_session_local
+
 # Load environment variables
 load_dotenv()
 
 # Configure Celery
 # Default to localhost if not found (for local dev without docker networking issues)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# memory:// and cache+memory:// run without Redis (tests)
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
+AI_JOB_MAX_RETRIES = int(os.getenv("AI_JOB_MAX_RETRIES", "3"))
+AI_JOB_RETRY_BACKOFF_MAX = int(os.getenv("AI_JOB_RETRY_BACKOFF_MAX", "600"))
 
 celery_app = Celery(
     "ai_worker",
-    broker=REDIS_URL,
-    backend=REDIS_URL
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND
 )
 
 celery_app.conf.update(
@@ -22,21 +48,71 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_routes={
+        "ai.extract_rera_document": {"queue": "ocr"},
+        "ai.score_project": {"queue": "llm"},
+    },
+    # Long tasks: take one message at a time, acknowledge after completion
+    # so a crashed worker's job is redelivered (execution is idempotent)
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    result_expires=24 * 3600,
+    task_always_eager=CELERY_TASK_ALWAYS_EAGER,
+)
+
+_SessionLocal = None
+
+
+def _open_session():
+    global _SessionLocal
+    if _SessionLocal is None:
+        _SessionLocal = get_session_local(get_engine())
+    return _SessionLocal()
+
+
+def _run_job(task, job_id: int) -> dict:
+    session = _open_session()
+    try:
+        return execute_job(session, job_id, final_attempt=task.request.retries >= task.max_retries)
+    finally:
+        session.close()
+
+
+_RETRY_OPTIONS = dict(
+    bind=True,
+    autoretry_for=(Exception,),
+    dont_autoretry_for=PERMANENT_ERRORS,
+    retry_backoff=True,
+    retry_backoff_max=AI_JOB_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=AI_JOB_MAX_RETRIES,
 )
 
-@celery_app.task(name="score_project_task")
-def score_project_task(project_id: str):
-    """
-    Background task to score a project using the AI model.
-    """
-    print(f"DTO-LOG: Starting scoring task for project_id: {project_id}")
-    
-    # Simulate processing time
-    time.sleep(2)
-    
-    # TODO: Load Model and Score
-    # from cg_rera_extractor.ai.model import load_local_model, score_project_logic
-    # result = score_project_logic(project_id)
-    
-    print(f"DTO-LOG: Finished scoring task for project_id: {project_id}")
-    return {"project_id": project_id, "status": "completed", "score": "placeholder"}
+
+@celery_app.task(name="ai.extract_rera_document", **_RETRY_OPTIONS)
+def extract_rera_document_task(self, job_id: int) -> dict:
+    """OCR + LLM extraction of one RERA PDF (``rera_extract`` job)."""
+    return _run_job(self, job_id)
+
+
+@celery_app.task(name="ai.score_project", **_RETRY_OPTIONS)
+def score_project_task(self, job_id: int) -> dict:
+    """LLM quality score for one project (``score`` job)."""
+    return _run_job(self, job_id)
+
+
+JOB_TASKS = {
+    "rera_extract": extract_rera_document_task,
+    "score": score_project_task,
+}
+
+
+@worker_process_init.connect
+def _warm_models(**_kwargs) -> None:
+    # Load models once per worker process, not on the first task
+    preload = os.getenv("AI_PRELOAD_MODELS", "")
+    if preload.strip():
+        from ai.registry import model_registry
+
+        model_registry.preload(preload)
@@ -1,5 +1,5 @@
 import axios from "axios";
-import type { AIScoreResponse, HealthCheckResponse } from "../types/ai";
+import type { AIJobResponse, AIScoreResponse, HealthCheckResponse } from "../types/ai";
 
 // Use the same base URL as the robust client for now, or a separate one if deployed differently.
 // Using relative path assuming proxy or same origin for simplicity in dev.
@@ -14,13 +14,33 @@ export const aiClient = axios.create({
     },
 });
 
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_POLL_TIMEOUT_MS = 120000;
+
+export async function waitForJob(jobId: number): Promise<AIJobResponse> {
+    const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+    for (;;) {
+        const { data } = await aiClient.get<AIJobResponse>(`/ai/jobs/${jobId}`);
+        if (data.status === "succeeded" || data.status === "failed") {
+            return data;
+        }
+        if (Date.now() > deadline) {
+            throw new Error(`AI job ${jobId} still ${data.status}`);
+        }
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+}
+
 export async function getProjectScore(projectId: number): Promise<AIScoreResponse> {
     try {
-        // Try fetching existing score first (stub logic in backend implies this endpoint handles generation too if posted)
-        // But per runbook: POST filters generation. GET retrieves.
-        // Let's implement the "Get or Generate" pattern here or in the component.
-        // For this MVP, we will call POST to ensure we get a result (it returns existing or new)
-        const { data } = await aiClient.post<AIScoreResponse>(`/ai/score/project/${projectId}`);
+        // POST queues a scoring job (or returns the existing one for unchanged
+        // project data); poll it, then fetch the stored score.
+        const { data: queued } = await aiClient.post<AIJobResponse>(`/ai/score/project/${projectId}`);
+        const job = await waitForJob(queued.job_id);
+        if (job.status !== "succeeded" || job.result?.score_id == null) {
+            throw new Error(job.error || `Scoring job ${job.job_id} failed`);
+        }
+        const { data } = await aiClient.get<AIScoreResponse>(`/ai/score/${job.result.score_id}`);
         return data;
     } catch (error) {
         console.error("AI Service Error", error);
@@ -1,7 +1,9 @@
 import type {
   BBox,
+  MapClustersParams,
   MapPinsParams,
   ProjectDetail,
+  ProjectMapClusterResponse,
   ProjectMapResponse,
   ProjectSearchResponse,
   ProjectInventoryResponse,
@@ -77,6 +79,35 @@ export async function getProjectsForMap(
   }
 }
 
+/**
+ * Zoom-aware map feed: clusters at low zoom, individual pins at high zoom.
+ * Vector tiles with the same content are served from
+ * `/projects/tiles/{z}/{x}/{y}.mvt` (see `mapTileUrl`).
+ */
+export async function getMapClusters(
+  params: MapClustersParams,
+): Promise<ProjectMapClusterResponse> {
+  try {
+    const { data } = await apiClient.get<ProjectMapClusterResponse>(
+      "/projects/map/clusters",
+      {
+        params: {
+          ...params,
+          zoom: Math.round(params.zoom),
+          bbox: formatBBox(params.bbox),
+        },
+      },
+    );
+    return data;
+  } catch (error) {
+    console.error("Failed to fetch map clusters", error);
+    throw new Error("Unable to load map pins.");
+  }
+}
+
+export const mapTileUrl = () =>
+  `${apiClient.defaults.baseURL ?? ""}/projects/tiles/{z}/{x}/{y}.mvt`;
+
 export async function getProjectInventory(
   projectId: number,
 ): Promise<ProjectInventoryResponse> {
@@ -10,6 +10,17 @@ export interface AIScoreResponse {
     strengths?: string[];
 }
 
+export interface AIJobResponse {
+    job_id: number;
+    kind: "rera_extract" | "score";
+    project_id: number;
+    status: "queued" | "running" | "retrying" | "succeeded" | "failed";
+    attempts: number;
+    result?: { score_id?: number; [key: string]: unknown } | null;
+    error?: string | null;
+    created?: boolean | null;
+}
+
 export interface HealthCheckResponse {
     status: string;
     model_loaded: boolean;
@@ -177,6 +177,28 @@ export interface ProjectMapResponse {
   items: ProjectMapPin[];
 }
 
+export interface MapClustersParams extends MapPinsParams {
+  zoom: number;
+}
+
+export interface ProjectMapCluster {
+  cluster_id: string;
+  count: number;
+  lat: number;
+  lon: number;
+  min_overall_score?: number;
+  avg_overall_score?: number;
+  max_overall_score?: number;
+  min_price_total?: number;
+  expansion_zoom: number;
+}
+
+export interface ProjectMapClusterResponse {
+  zoom: number;
+  clusters: ProjectMapCluster[];
+  pins: ProjectMapPin[];
+}
+
 export interface BBox {
   minLat: number;
   minLon: number;
@@ -15,7 +15,7 @@ sys.path.append(os.getcwd())
 from sqlalchemy import select
 from cg_rera_extractor.db.base import get_engine, get_session_local
 from cg_rera_extractor.db.models import Project, ProjectEmbedding
-from ai.chat.embedder import ProjectEmbedder
+from ai.chat.embedder import get_embedder
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("generate_embeddings")
@@ -33,7 +33,7 @@ def generate_embeddings(limit: int = None, force: bool = False):
     SessionLocal = get_session_local(engine)
     session = SessionLocal()
     
-    embedder = ProjectEmbedder()
+    embedder = get_embedder()
     
     if not embedder.is_loaded:
         logger.error("Embedder model not loaded. Install sentence-transformers.")
@@ -7,7 +7,6 @@ import argparse
 import os
 import sys
 import logging
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 # Ensure project root is in path
@@ -16,6 +15,7 @@ sys.path.append(os.getcwd())
 from ai.rera.parser import ReraPdfParser
 from cg_rera_extractor.db.models import Project
 from cg_rera_extractor.config.loader import load_config
+from cg_rera_extractor.db.base import get_engine
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -36,7 +36,7 @@ def main():
         
     app_config = load_config(config_path)
     db_url = app_config.db.url
-    engine = create_engine(db_url)
+    engine = get_engine(url=db_url)
     SessionLocal = sessionmaker(bind=engine)
     db = SessionLocal()
     
@@ -5,6 +5,12 @@ Flags outliers in Price/Area ratios.
 
 Usage:
     python scripts/run_anomaly_detection.py --dry-run
+    python scripts/run_anomaly_detection.py --mode retrain   # e.g. weekly
+    python scripts/run_anomaly_detection.py --mode score     # e.g. after each load
+
+`full` (default) retrains and scans every unit type in one go. `retrain` and
+`score` split that into a persisted-model refit and an incremental scoring
+pass over unit types changed since the last watermark.
 """
 import argparse
 import logging
@@ -16,6 +22,7 @@ sys.path.append(os.getcwd())
 
 from cg_rera_extractor.db.base import get_engine, get_session_local
 from ai.anomaly.detector import AnomalyDetector
+from ai.anomaly.service import ANOMALY_MODEL_DIR, AnomalyService
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("run_anomaly_detection")
@@ -52,9 +59,32 @@ def run_detection(dry_run: bool = False):
     finally:
         session.close()
 
+def run_service(mode: str, dry_run: bool = False, model_dir: str = ANOMALY_MODEL_DIR, force: bool = False):
+    engine = get_engine()
+    SessionLocal = get_session_local(engine)
+    session = SessionLocal()
+
+    try:
+        service = AnomalyService(session, model_dir=model_dir)
+        if mode == "retrain":
+            state = service.retrain(force=force)
+            logger.info(f"Current model: {state.get('model_version')} (window {state.get('window_hash')})")
+        else:
+            anomalies = service.score_incremental(dry_run=dry_run)
+            logger.info(f"Found {len(anomalies)} anomalies in changed unit types.")
+    finally:
+        session.close()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true", help="Do not save DB changes")
+    parser.add_argument("--mode", choices=["full", "retrain", "score"], default="full",
+                        help="full: retrain+scan all; retrain: refit persisted model; score: incremental scoring")
+    parser.add_argument("--model-dir", default=ANOMALY_MODEL_DIR, help="Persisted model/state directory")
+    parser.add_argument("--force", action="store_true", help="Retrain even if the training window is unchanged")
     args = parser.parse_args()
     
-    run_detection(dry_run=args.dry_run)
+    if args.mode == "full":
+        run_detection(dry_run=args.dry_run)
+    else:
+        run_service(args.mode, dry_run=args.dry_run, model_dir=args.model_dir, force=args.force)
@@ -4,6 +4,7 @@ CLI script to run AI imputation for missing project data.
 
 Usage:
     python scripts/run_imputation.py --limit 100 --dry-run
+    python scripts/run_imputation.py --all            # batch mode, cached model
 """
 import argparse
 import logging
@@ -12,7 +13,7 @@ from sqlalchemy import select, or_
 
 from cg_rera_extractor.db.base import get_engine, get_session_local
 from cg_rera_extractor.db.models import Project
-from ai.imputation.engine import ImputationEngine
+from ai.imputation.engine import IMPUTATION_MODEL_DIR, ImputationEngine
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("run_imputation")
@@ -79,10 +80,38 @@ def run_imputation(limit: int = 100, dry_run: bool = False):
     finally:
         session.close()
 
+def run_imputation_all(
+    dry_run: bool = False, model_dir: str | None = IMPUTATION_MODEL_DIR, refit: bool = False
+):
+    """Impute every project with one transform and one bulk write."""
+    engine = get_engine()
+    SessionLocal = get_session_local(engine)
+    session = SessionLocal()
+
+    try:
+        imputer = ImputationEngine(session)
+        predictions = imputer.impute_all(model_dir=model_dir, dry_run=dry_run, refit=refit)
+
+        if not imputer.is_trained:
+            logger.error("Model failed to train (insufficient data). Exiting.")
+            sys.exit(1)
+
+        scanned = len(imputer.training_data) if imputer.training_data is not None else 0
+        logger.info(f"Completed. Scanned: {scanned}, Imputed: {len(predictions)}")
+
+    finally:
+        session.close()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=100, help="projects to scan")
     parser.add_argument("--dry-run", action="store_true", help="Do not save DB changes")
+    parser.add_argument("--all", action="store_true", help="Batch-impute all projects in one pass")
+    parser.add_argument("--model-dir", default=IMPUTATION_MODEL_DIR, help="Fitted model cache directory")
+    parser.add_argument("--retrain", action="store_true", help="Train fresh and replace the cached model (batch mode)")
     args = parser.parse_args()
     
-    run_imputation(limit=args.limit, dry_run=args.dry_run)
+    if args.all:
+        run_imputation_all(dry_run=args.dry_run, model_dir=args.model_dir, refit=args.retrain)
+    else:
+        run_imputation(limit=args.limit, dry_run=args.dry_run)
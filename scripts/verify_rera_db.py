@@ -1,6 +1,7 @@
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from cg_rera_extractor.config.loader import load_config
+from cg_rera_extractor.db.base import get_engine
 import os
 import logging
 
@@ -9,7 +10,7 @@ logging.basicConfig(level=logging.INFO)
 config_path = "config.yaml" if os.path.exists("config.yaml") else "config.example.yaml"
 app_config = load_config(config_path)
 db_url = app_config.db.url
-engine = create_engine(db_url)
+engine = get_engine(url=db_url)
 
 with engine.connect() as conn:
     print(f"Connecting to {db_url.split('@')[-1]}") # redact password
@@ -122,5 +122,54 @@ class TestAnomalyIntegration(unittest.TestCase):
             traceback.print_exc()
             raise e
 
+    def test_incremental_scoring_upserts_flags(self):
+        import tempfile
+        from datetime import datetime, timedelta
+        from unittest.mock import patch
+        from ai.anomaly.service import AnomalyService
+
+        store = {}
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("ai.anomaly.service.joblib") as mock_joblib:
+            def fake_dump(obj, path):
+                store[str(path)] = obj
+                open(path, "wb").close()
+            mock_joblib.dump.side_effect = fake_dump
+            mock_joblib.load.side_effect = lambda path: store[str(path)]
+
+            service = AnomalyService(self.session, model_dir=tmp)
+
+            # Retrain persists a versioned model; unchanged window is a no-op
+            mock_iso_forest.fit.reset_mock()
+            state = service.retrain()
+            self.assertTrue(state["model_version"].startswith("isoforest_v1-"))
+            self.assertEqual(state["n_samples"], 3)
+            self.assertEqual(service.retrain()["model_file"], state["model_file"])
+            self.assertEqual(mock_iso_forest.fit.call_count, 1)
+
+            # First scoring pass sees everything
+            anomalies = AnomalyService(self.session, model_dir=tmp).score_incremental()
+            self.assertEqual(len(anomalies), 1)
+            self.assertEqual(self.session.query(DataQualityFlag).count(), 1)
+
+            # A later, worse unit in the same project refreshes the open flag
+            later = datetime.now() + timedelta(days=1)
+            self.session.add(UnitType(
+                project_id=self.p_id, type_name="Villa", saleable_area_sqmt=100.0,
+                sale_price=200000.0, updated_at=later,
+            ))
+            self.session.commit()
+
+            anomalies = AnomalyService(self.session, model_dir=tmp).score_incremental()
+            self.assertEqual(len(anomalies), 1)
+            flags = self.session.query(DataQualityFlag).all()
+            self.assertEqual(len(flags), 1)
+            self.assertEqual(float(flags[0].outlier_value), 2000.0)
+
+            # Nothing changed since the watermark apart from the boundary row
+            self.assertEqual(service.load_state()["watermark"], later.isoformat())
+            AnomalyService(self.session, model_dir=tmp).score_incremental()
+            self.assertEqual(self.session.query(DataQualityFlag).count(), 1)
+
 if __name__ == "__main__":
     unittest.main()
@@ -139,5 +139,67 @@ class TestImputationIntegration(unittest.TestCase):
         self.assertEqual(imp_record.imputed_data['total_units'], 123)
         self.assertEqual(imp_record.imputed_data['proposed_end_date'], "2025-12-31")
 
+    def test_impute_all_batch(self):
+        """
+        Verify batch mode predicts all gaps in one transform and bulk-saves them.
+        """
+        engine = ImputationEngine(self.session)
+        mock_imputer.transform.reset_mock()
+
+        predictions = engine.impute_all(model_dir=None)
+
+        # One transform call covers every project
+        self.assertEqual(mock_imputer.transform.call_count, 1)
+        # Only the incomplete project has gaps
+        self.assertEqual(list(predictions), [self.p_inc.id])
+        self.assertEqual(predictions[self.p_inc.id]["total_units"], 123)
+        self.assertEqual(predictions[self.p_inc.id]["proposed_end_date"], "2025-12-31")
+
+        records = self.session.query(ProjectImputation).all()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].project_id, self.p_inc.id)
+
+    def test_train_reuses_cached_model(self):
+        """
+        Verify a model cached for identical training data skips refitting.
+        """
+        import tempfile
+        from unittest.mock import patch
+
+        store = {}
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("ai.imputation.engine.joblib") as mock_joblib:
+            def fake_dump(obj, path):
+                store[str(path)] = obj
+                open(path, "wb").close()
+            mock_joblib.dump.side_effect = fake_dump
+            mock_joblib.load.side_effect = lambda path: store[str(path)]
+
+            first = ImputationEngine(self.session)
+            mock_imputer.fit.reset_mock()
+            first.train(model_dir=tmp)
+            self.assertEqual(mock_imputer.fit.call_count, 1)
+
+            second = ImputationEngine(self.session)
+            second.train(model_dir=tmp)
+            self.assertTrue(second.is_trained)
+            self.assertEqual(mock_imputer.fit.call_count, 1)
+            self.assertEqual(second.trained_features, first.trained_features)
+
+            # Changed data -> new hash -> refit
+            self.p_inc.latitude = 19.0
+            self.session.commit()
+            third = ImputationEngine(self.session)
+            third.train(model_dir=tmp)
+            self.assertEqual(mock_imputer.fit.call_count, 2)
+
+            # Forced refit ignores the cache but replaces the stored model
+            saved = len(store)
+            fourth = ImputationEngine(self.session)
+            fourth.train(model_dir=tmp, refit=True)
+            self.assertEqual(mock_imputer.fit.call_count, 3)
+            self.assertEqual(len(store), saved)
+            self.assertEqual(mock_joblib.dump.call_count, 3)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+"""Tests for queued AI jobs, with Celery in eager mode."""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+pytest.importorskip("celery")
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+from ai import jobs  # noqa: E402
+from ai.dependencies import get_db  # noqa: E402
+from ai.main import app  # noqa: E402
+from cg_rera_extractor import worker  # noqa: E402
+from cg_rera_extractor.db import AIJob, Base, Project  # noqa: E402
+
+
+@pytest.fixture()
+def session_local(monkeypatch) -> sessionmaker:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    monkeypatch.setattr(worker, "_open_session", factory)
+    monkeypatch.setitem(worker.celery_app.conf, "task_always_eager", True)
+    with factory() as session:
+        session.add_all([
+            Project(id=1, state_code="CG", rera_registration_number="CG-JOB-1", project_name="One"),
+            Project(id=2, state_code="CG", rera_registration_number="CG-JOB-2", project_name="Two"),
+        ])
+        session.commit()
+    return factory
+
+
+@pytest.fixture()
+def scoring():
+    score = {"score": 81, "confidence": 0.7, "explanation": "Solid", "metadata": {}}
+    with patch("ai.features.builder.build_feature_pack") as build, \
+            patch("ai.scoring.logic.score_project_quality", return_value=score) as quality, \
+            patch.object(jobs, "store_score", side_effect=[501, 502, 503]):
+        build.return_value = MagicMock(features={"name": "Test"})
+        yield quality
+
+
+def test_score_jobs_are_idempotent_per_data_version(session_local, scoring):
+    with session_local() as session:
+        job, created = jobs.submit_job(session, "score", 1)
+        assert created
+        assert (job.status, job.queue, job.attempts) == ("succeeded", "llm", 1)
+        assert job.result["score_id"] == 501
+
+        again, created = jobs.submit_job(session, "score", 1)
+        assert not created and again.id == job.id
+        assert scoring.call_count == 1
+
+        session.get(Project, 1).last_parsed_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        session.commit()
+        rescored, created = jobs.submit_job(session, "score", 1)
+        assert created and rescored.id != job.id
+        assert scoring.call_count == 2
+
+
+def test_extraction_retries_transient_errors_only(session_local, tmp_path):
+    pdf = tmp_path / "filing.pdf"
+    pdf.write_bytes(b"%PDF-1.4 filing")
+    outcomes = [RuntimeError("OCR engine busy"), {"filing_id": 7, "data": {}}]
+
+    def process_file(self, file_path, project_id, db):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with session_local() as session, patch("ai.rera.parser.ReraPdfParser.process_file", process_file):
+        job, _ = jobs.submit_job(session, "rera_extract", 1, file_path=str(pdf))
+        assert (job.status, job.attempts, job.result) == ("succeeded", 2, {"filing_id": 7, "data": {}})
+        assert job.input_hash == jobs.file_sha256(str(pdf))
+
+    corrupt = tmp_path / "corrupt.pdf"
+    corrupt.write_bytes(b"not a pdf")
+    with session_local() as session, patch("ai.rera.parser.ReraPdfParser.process_file", return_value=None):
+        job, _ = jobs.submit_job(session, "rera_extract", 2, file_path=str(corrupt))
+        assert (job.status, job.attempts) == ("failed", 1)
+        assert "invalid or corrupt" in job.error
+
+
+def test_batch_submission_and_polling(session_local, scoring):
+    def _get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        with patch("httpx.post") as callback:
+            client = TestClient(app)
+            response = client.post("/ai/jobs/batch", json={"jobs": [
+                {"kind": "score", "project_id": 1, "callback_url": "http://etl.local/done"},
+                {"kind": "score", "project_id": 2},
+                {"kind": "score", "project_id": 1},
+            ]})
+            assert response.status_code == 202
+            body = response.json()
+            assert (body["submitted"], body["created"], body["existing"]) == (3, 2, 1)
+            assert body["jobs"][0]["job_id"] == body["jobs"][2]["job_id"]
+
+            job_id = body["jobs"][0]["job_id"]
+            polled = client.get(f"/ai/jobs/{job_id}").json()
+            assert polled["status"] == "succeeded"
+            assert polled["result"]["score_id"] == 501
+            assert callback.call_args.args[0] == "http://etl.local/done"
+            assert callback.call_args.kwargs["json"]["job_id"] == job_id
+
+            assert client.post("/ai/score/project/999").status_code == 404
+            assert client.get("/ai/jobs/999").status_code == 404
+            assert [j["project_id"] for j in client.get("/ai/jobs", params={"project_id": 2}).json()] == [2]
+    finally:
+        app.dependency_overrides = {}
+
+    with session_local() as session:
+        assert session.query(AIJob).count() == 2
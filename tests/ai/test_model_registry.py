@@ -0,0 +1,85 @@
+"""Tests for the process-wide AI model registry."""
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+import ai.registry  # noqa: E402  (import after env setup)
+from ai.main import app  # noqa: E402
+from ai.registry import ModelRegistry  # noqa: E402
+
+
+def test_concurrent_gets_share_one_load():
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry({"embedder": slow_loader})
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("embedder"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(model) for model in results}) == 1
+    status = registry.status("embedder")
+    assert status.state == "warm"
+    assert status.load_seconds >= 0.05
+
+
+def test_unavailable_and_failed_models():
+    attempts = []
+
+    def flaky_loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("model file truncated")
+        return "llm"
+
+    registry = ModelRegistry({"ocr": lambda: None, "llm": flaky_loader})
+
+    assert registry.preload("all") == {"ocr": "unavailable", "llm": "failed"}
+    assert registry.status("llm").error == "model file truncated"
+    # Unavailable and recently failed models are not reloaded per request
+    assert registry.get("ocr") is None and registry.get("llm") is None
+    assert len(attempts) == 1
+
+    with patch.object(ai.registry, "AI_MODEL_RETRY_SEC", 0):
+        assert registry.get("llm") == "llm"
+    assert registry.is_warm("llm")
+
+
+def test_chat_assistants_reuse_registry_embedder():
+    from ai.chat.assistant import ChatAssistant
+
+    embedder = MagicMock(is_loaded=True)
+    loader = MagicMock(return_value=embedder)
+    registry = ModelRegistry({"embedder": loader, "llm": lambda: None})
+
+    with patch.object(ai.registry, "model_registry", registry):
+        first, second = ChatAssistant(MagicMock()), ChatAssistant(MagicMock())
+
+    assert first.embedder is second.embedder is embedder
+    assert first.searcher.embedder is embedder
+    assert loader.call_count == 1
+
+
+def test_health_reports_model_status():
+    registry = ModelRegistry({"embedder": lambda: object(), "llm": lambda: None})
+    registry.get("embedder")
+
+    with patch("ai.main.model_registry", registry):
+        data = TestClient(app).get("/ai/health").json()
+
+    assert data["model_loaded"] is False
+    assert data["models"]["embedder"]["state"] == "warm"
+    assert data["models"]["llm"]["state"] == "cold"
@@ -72,6 +72,32 @@ class TestFloorPlanParser(unittest.TestCase):
                 self.assertIn("potential_room_name", labels)
                 self.assertIn("potential_dim", labels)
 
+    @patch("ai.ocr.parser.SURYA_AVAILABLE", True)
+    @patch("ai.ocr.parser.run_ocr")
+    def test_parse_images_single_batch(self, mock_run_ocr):
+        """Several images go through one OCR call and map back in order."""
+        predictions = []
+        for text in ["Kitchen", "Bedroom 2", "Balcony"]:
+            line = MagicMock()
+            line.text = text
+            line.bbox = [0, 0, 10, 10]
+            line.confidence = 0.9
+            prediction = MagicMock()
+            prediction.text_lines = [line]
+            predictions.append(prediction)
+        mock_run_ocr.return_value = predictions
+
+        with patch("ai.ocr.parser.Image.open", return_value=MagicMock()):
+            parser = FloorPlanParser()
+            parser.models_loaded = True
+            paths = ["/fake/a.jpg", "/fake/b.jpg", "/fake/c.jpg"]
+            results = parser.parse_images(paths)
+
+        mock_run_ocr.assert_called_once()
+        self.assertEqual(len(mock_run_ocr.call_args[0][0]), 3)
+        self.assertEqual([r["image_path"] for r in results], paths)
+        self.assertEqual([r["raw_text"][0]["text"] for r in results], ["Kitchen", "Bedroom 2", "Balcony"])
+
     @patch("ai.ocr.parser.SURYA_AVAILABLE", False)
     def test_parse_no_deps(self):
         """Test behavior when deps are missing."""
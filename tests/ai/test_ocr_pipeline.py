@@ -0,0 +1,85 @@
+"""Tests for the batched floor-plan OCR pipeline."""
+from __future__ import annotations
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from ai.ocr.pipeline import auto_batch_size, process_floor_plans
+from cg_rera_extractor.db import Base, Project, ProjectArtifact
+
+
+class FakeParser:
+    """Records batches instead of running Surya."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def parse_images(self, paths):
+        self.batches.append(list(paths))
+        results = []
+        for path in paths:
+            text = open(path, "rb").read().decode()
+            parsed = text != "unreadable"
+            results.append({"image_path": path, "parsed": parsed, "rooms": [], "raw_text": [text], "meta": {},
+                            **({} if parsed else {"error": "bad image"})})
+        return results
+
+
+def _session(tmp_path, files: dict[str, str]):
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, future=True)()
+    session.add(Project(id=1, state_code="CG", rera_registration_number="CG-FP-1", project_name="Plans"))
+    for name, content in files.items():
+        path = tmp_path / name
+        path.write_text(content)
+        session.add(ProjectArtifact(project_id=1, artifact_type="floor_plan", file_path=str(path), file_format="png"))
+    session.add(ProjectArtifact(project_id=1, artifact_type="brochure", file_path=str(tmp_path / "x.pdf")))
+    session.commit()
+    return session
+
+
+def _stored(session) -> dict[int, tuple]:
+    rows = session.execute(select(ProjectArtifact.id, ProjectArtifact.floor_plan_data, ProjectArtifact.content_sha256))
+    return {row.id: (row.floor_plan_data, row.content_sha256) for row in rows}
+
+
+def test_batches_dedupes_by_content_hash_and_bulk_writes(tmp_path):
+    session = _session(tmp_path, {"a.png": "2BHK", "b.png": "3BHK", "c.png": "2BHK", "d.png": "unreadable", "e.png": "4BHK"})
+    parser = FakeParser()
+
+    stats = process_floor_plans(session, parser, batch_size=2, download_workers=2)
+
+    # Identical a/c are OCR'd once; d fails; brochure is not a floor plan
+    assert [len(batch) for batch in parser.batches] == [2, 2]
+    assert (stats.artifacts, stats.parsed, stats.reused, stats.failed) == (5, 3, 1, 1)
+    stored = _stored(session)
+    assert stored[1][0]["raw_text"] == stored[3][0]["raw_text"] == ["2BHK"]
+    assert stored[1][1] == stored[3][1] is not None
+    assert stored[3][0]["image_path"].endswith("c.png")
+    assert stored[4] == (None, None) and stored[6] == (None, None)
+
+    # Already-parsed artifacts are not selected again
+    assert process_floor_plans(session, FakeParser(), batch_size=2).artifacts == 1
+
+
+def test_reparse_skips_unchanged_files(tmp_path):
+    session = _session(tmp_path, {"a.png": "2BHK", "b.png": "3BHK"})
+    process_floor_plans(session, FakeParser(), batch_size=8)
+
+    (tmp_path / "b.png").write_text("3BHK revised")
+    parser = FakeParser()
+    stats = process_floor_plans(session, parser, batch_size=8, reparse=True)
+
+    assert (stats.unchanged, stats.parsed) == (1, 1)
+    assert parser.batches == [[str(tmp_path / "b.png")]]
+    assert _stored(session)[2][0]["raw_text"] == ["3BHK revised"]
+
+
+def test_dry_run_and_batch_sizing(tmp_path):
+    session = _session(tmp_path, {"a.png": "2BHK"})
+    stats = process_floor_plans(session, FakeParser(), batch_size=4, dry_run=True)
+
+    assert stats.parsed == 1
+    assert _stored(session)[1] == (None, None)
+    assert 1 <= auto_batch_size(mb_per_image=1e9) <= auto_batch_size(mb_per_image=1, max_batch=4) <= 4
@@ -0,0 +1,116 @@
+"""Tests for the streaming project export."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.analysis.export import (
+    ExportFilters,
+    iter_export_rows,
+    resolve_columns,
+    stream_export,
+)
+from cg_rera_extractor.analysis.projects import export_projects_csv, top_projects_by_score
+from cg_rera_extractor.db.base import Base
+from cg_rera_extractor.db.models import Project, ProjectScores
+
+
+@pytest.fixture()
+def session_local() -> sessionmaker:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+def seed(session_local: sessionmaker, count: int = 25) -> None:
+    with session_local() as session:
+        for i in range(count):
+            project = Project(
+                state_code="CG",
+                rera_registration_number=f"CG-{i:03d}",
+                project_name=f"Project {i}",
+                district="Raipur" if i % 2 else "Durg",
+            )
+            # Every third project is unscored; scores repeat to exercise the id tiebreak
+            if i % 3:
+                project.score = ProjectScores(overall_score=Decimal(str(round(0.1 * (i % 5), 2))))
+            session.add(project)
+        session.commit()
+
+
+def test_keyset_pages_match_single_query(session_local):
+    seed(session_local)
+    with session_local() as session:
+        paged = list(iter_export_rows(session, ["project_id", "overall_score"], batch_size=4))
+        single = list(iter_export_rows(session, ["project_id", "overall_score"], batch_size=1000))
+
+    assert paged == single
+    assert len({row[0] for row in paged}) == 25
+    scores = [row[1] if row[1] is not None else -1 for row in paged]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_filters_and_limit(session_local):
+    seed(session_local)
+    with session_local() as session:
+        rows = list(
+            iter_export_rows(
+                session,
+                ["project_id", "district"],
+                ExportFilters(district="raipur", scored_only=True, limit=3),
+                batch_size=2,
+            )
+        )
+
+    assert len(rows) == 3
+    assert {row[1] for row in rows} == {"Raipur"}
+
+
+def test_csv_and_jsonl_encoding(session_local):
+    seed(session_local, count=5)
+    with session_local() as session:
+        csv_bytes = b"".join(stream_export(session, "csv", ["project_id", "project_name"], batch_size=2))
+        jsonl_bytes = b"".join(stream_export(session, "jsonl", ["project_id", "overall_score"], batch_size=2))
+
+    rows = list(csv.reader(io.StringIO(csv_bytes.decode())))
+    assert rows[0] == ["project_id", "project_name"]
+    assert len(rows) == 6
+
+    records = [json.loads(line) for line in jsonl_bytes.decode().splitlines()]
+    assert len(records) == 5
+    assert set(records[0]) == {"project_id", "overall_score"}
+
+
+def test_unknown_columns_rejected():
+    with pytest.raises(ValueError):
+        resolve_columns(["project_id", "password"])
+
+
+def test_top_projects_and_csv_export_keep_their_contract(session_local, tmp_path):
+    seed(session_local)
+    with session_local() as session:
+        top = top_projects_by_score(limit=5, session=session)
+        path = export_projects_csv({"limit": 100}, tmp_path / "top.csv", session=session)
+        empty = export_projects_csv({"district": "Bilaspur"}, tmp_path / "empty.csv", session=session)
+
+    # Score ties are broken by project name
+    assert [p["project_name"] for p in top] == ["Project 14", "Project 19", "Project 4", "Project 13", "Project 23"]
+    rows = list(csv.DictReader(path.open()))
+    assert len(rows) == 16  # scored projects only
+    assert rows[0]["id"] == str(top[0]["id"])
+    assert empty.read_text() == ""
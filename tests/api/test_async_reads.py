@@ -0,0 +1,86 @@
+"""Tests for async read sessions and the bounded worker pool."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import anyio
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.api import concurrency  # noqa: E402  (import after env setup)
+from cg_rera_extractor.api.concurrency import ReadSession, run_blocking  # noqa: E402
+
+
+def test_sync_fallback_runs_off_the_event_loop():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    loop_thread = threading.get_ident()
+
+    def _query(session: Session, value: int) -> tuple[int, int]:
+        return session.execute(text("SELECT :v"), {"v": value}).scalar_one(), threading.get_ident()
+
+    async def _main():
+        with Session(engine) as session:
+            read = ReadSession(session=session)
+            assert not read.is_async
+            return await read.run(_query, 7)
+
+    value, worker_thread = anyio.run(_main)
+    assert value == 7
+    assert worker_thread != loop_thread
+
+
+def test_run_blocking_is_bounded(monkeypatch):
+    monkeypatch.setattr(concurrency, "_blocking_limiter", anyio.CapacityLimiter(2))
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def _main():
+        async with anyio.create_task_group() as tg:
+            for _ in range(6):
+                tg.start_soon(run_blocking, _work)
+
+    anyio.run(_main)
+    assert peak == 2
+
+
+def test_async_session_runs_sync_service_functions(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from cg_rera_extractor.db.base import dispose_engines, get_async_engine, get_async_session_local
+
+    engine = get_async_engine(url=f"sqlite:///{tmp_path / 'reads.db'}")
+
+    def _query(session: Session) -> int:
+        return session.execute(text("SELECT 42")).scalar_one()
+
+    async def _main():
+        async with get_async_session_local(engine)() as async_session:
+            read = ReadSession(async_session=async_session)
+            assert read.is_async
+            result = await read.run(_query)
+        await engine.dispose()
+        return result
+
+    try:
+        assert anyio.run(_main) == 42
+    finally:
+        dispose_engines()
@@ -0,0 +1,229 @@
+"""Tests for map clustering and vector tile endpoints."""
+from __future__ import annotations
+
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.api.app import app  # noqa: E402  (import after env setup)
+from cg_rera_extractor.api.deps import get_db  # noqa: E402
+from cg_rera_extractor.api.services.map import reset_map_index  # noqa: E402
+from cg_rera_extractor.api.services.vector_tiles import PointFeature, encode_tile  # noqa: E402
+from cg_rera_extractor.db import (  # noqa: E402
+    Project,
+    ProjectPricingSnapshot,
+    ProjectScores,
+    bump_data_version,
+)
+from cg_rera_extractor.db.base import Base  # noqa: E402
+
+RAIPUR_BBOX = "21.0,81.4,21.5,81.9"
+
+
+@pytest.fixture()
+def session_local() -> sessionmaker:
+    reset_map_index()
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    reset_map_index()
+
+
+@pytest.fixture()
+def client(session_local: sessionmaker) -> TestClient:
+    def _get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def seed(session_local: sessionmaker) -> None:
+    with session_local() as session:
+        # Three projects within a few hundred metres of each other, one far away
+        coords = [(21.2500, 81.6300), (21.2510, 81.6310), (21.2520, 81.6290), (21.2000, 81.4500)]
+        for i, (lat, lon) in enumerate(coords):
+            project = Project(
+                state_code="CG",
+                rera_registration_number=f"CG-{i}",
+                project_name=f"Project {i}",
+                status="Ongoing",
+                latitude=Decimal(str(lat)),
+                longitude=Decimal(str(lon)),
+            )
+            project.score = ProjectScores(overall_score=Decimal(str(0.5 + i / 10)))
+            project.pricing_snapshots.append(
+                ProjectPricingSnapshot(
+                    snapshot_date=date(2024, 1, 1),
+                    min_price_total=Decimal(3_000_000 + i * 100_000),
+                    is_active=True,
+                )
+            )
+            session.add(project)
+        session.commit()
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: bytes) -> list[tuple[int, int | bytes]]:
+    """Decode one protobuf message level into (field_number, value) pairs."""
+    pos, out = 0, []
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire = key >> 3, key & 0x7
+        if wire == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire == 2:
+            length, pos = _read_varint(buf, pos)
+            value, pos = buf[pos:pos + length], pos + length
+        elif wire == 1:
+            value, pos = buf[pos:pos + 8], pos + 8
+        else:
+            raise AssertionError(f"unexpected wire type {wire}")
+        out.append((number, value))
+    return out
+
+
+def _tile_features(tile: bytes) -> tuple[bytes, list[bytes], list[bytes]]:
+    (number, layer), = _fields(tile)
+    assert number == 3
+    layer_fields = _fields(layer)
+    name = next(v for n, v in layer_fields if n == 1)
+    features = [v for n, v in layer_fields if n == 2]
+    keys = [v for n, v in layer_fields if n == 3]
+    return name, features, keys
+
+
+def test_encode_tile_point_geometry():
+    tile = encode_tile({"projects": [PointFeature(x=10, y=20, properties={"a": 1}, id=7)]})
+    name, features, keys = _tile_features(tile)
+    feature = dict(_fields(features[0]))
+
+    assert name == b"projects"
+    assert keys == [b"a"]
+    assert feature[1] == 7
+    assert feature[3] == 1  # POINT
+    assert list(feature[4]) == [9, 20, 40]  # MoveTo(1), zigzag(10), zigzag(20)
+
+
+def test_low_zoom_returns_clusters(client, session_local):
+    seed(session_local)
+
+    response = client.get("/projects/map/clusters", params={"bbox": RAIPUR_BBOX, "zoom": 8})
+    assert response.status_code == 200
+    body = response.json()
+
+    total = sum(c["count"] for c in body["clusters"]) + len(body["pins"])
+    assert total == 4
+    assert body["clusters"], "nearby projects should merge at low zoom"
+    biggest = max(body["clusters"], key=lambda c: c["count"])
+    assert biggest["min_price_total"] is not None
+    assert biggest["max_overall_score"] >= biggest["min_overall_score"]
+
+
+def test_high_zoom_returns_individual_pins(client, session_local):
+    seed(session_local)
+
+    response = client.get("/projects/map/clusters", params={"bbox": RAIPUR_BBOX, "zoom": 16})
+    body = response.json()
+
+    assert body["clusters"] == []
+    assert sorted(p["name"] for p in body["pins"]) == [f"Project {i}" for i in range(4)]
+
+    filtered = client.get(
+        "/projects/map/clusters",
+        params={"bbox": RAIPUR_BBOX, "zoom": 16, "min_overall_score": 0.65},
+    ).json()
+    assert {p["name"] for p in filtered["pins"]} == {"Project 2", "Project 3"}
+
+
+def test_map_endpoint_still_returns_pins(client, session_local):
+    seed(session_local)
+
+    response = client.get("/projects/map", params={"bbox": RAIPUR_BBOX})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 4
+    assert min(p["min_price_total"] for p in items) == 3_000_000
+
+
+def test_tile_endpoint_serves_cached_mvt(client, session_local):
+    seed(session_local)
+    # Tile containing Raipur at zoom 6
+    first = client.get("/projects/tiles/6/46/28.mvt")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    _, features, _ = _tile_features(first.content)
+    assert features
+
+    again = client.get("/projects/tiles/6/46/28.mvt", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+    empty = client.get("/projects/tiles/6/0/0.mvt")
+    assert empty.status_code == 200
+    assert _tile_features(empty.content)[1] == []
+
+    assert client.get("/projects/tiles/2/9/0.mvt").status_code == 400
+
+
+def test_index_rebuilds_after_data_version_bump(client, session_local):
+    seed(session_local)
+    assert len(client.get("/projects/map", params={"bbox": RAIPUR_BBOX}).json()["items"]) == 4
+
+    with session_local() as session:
+        session.add(
+            Project(
+                state_code="CG", rera_registration_number="CG-new", project_name="New",
+                latitude=Decimal("21.3"), longitude=Decimal("81.7"),
+            )
+        )
+        bump_data_version(session)
+        session.commit()
+
+    assert len(client.get("/projects/map", params={"bbox": RAIPUR_BBOX}).json()["items"]) == 5
+
+
+def test_high_zoom_tiles_draw_points_in_the_edge_buffer(client, session_local):
+    z, x, y = 16, 47_618, 28_807  # Raipur
+    east_lon = (x + 1) / 2 ** z * 360.0 - 180.0
+    with session_local() as session:
+        # Just across the tile's east edge (~22 of 64 buffer pixels): drawn in both tiles
+        session.add(
+            Project(
+                state_code="CG", rera_registration_number="CG-edge", project_name="Edge",
+                latitude=Decimal("21.25"), longitude=Decimal(str(round(east_lon + 3e-5, 7))),
+            )
+        )
+        session.commit()
+
+    for tile_x in (x, x + 1):
+        _, features, _ = _tile_features(client.get(f"/projects/tiles/{z}/{tile_x}/{y}.mvt").content)
+        assert len(features) == 1
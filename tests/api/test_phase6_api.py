@@ -13,13 +13,20 @@ os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
 
 from cg_rera_extractor.api.app import app  # noqa: E402
 from cg_rera_extractor.api.deps import get_db  # noqa: E402
+from cg_rera_extractor.api.services.detail import refresh_detail_documents  # noqa: E402
 from cg_rera_extractor.db import (  # noqa: E402
     Base,
     Project,
     ProjectAmenityStats,
+    ProjectDetailDocument,
+    ProjectDocument,
     ProjectLocation,
     ProjectScores,
+    Unit,
+    bump_data_version,
+    invalidate_detail_documents,
 )
+from cg_rera_extractor.db.inventory import sync_project_units  # noqa: E402
 
 
 @pytest.fixture()
@@ -138,6 +145,78 @@ def test_project_detail_endpoint(client: TestClient, session_local: sessionmaker
     assert "negatives" in payload["score_explanation"]
 
 
+def test_project_detail_sections_on_demand(client: TestClient, session_local: sessionmaker) -> None:
+    project_id, _ = seed_phase6(session_local)
+    with session_local() as session:
+        session.add(ProjectDocument(project_id=project_id, doc_type="approval", url="https://example.com/a.pdf"))
+        session.commit()
+
+    payload = client.get(f"/projects/{project_id}").json()
+    assert "provenance" in payload
+    assert not {"documents", "quarterly_updates", "units", "schema_org"} & payload.keys()
+
+    payload = client.get(
+        f"/projects/{project_id}", params={"fields": "project,scores", "include": "documents,schema_org"}
+    ).json()
+    assert set(payload) == {"project", "scores", "documents", "schema_org"}
+    assert payload["documents"][0]["doc_type"] == "approval"
+    assert payload["schema_org"]["name"] == "Phase6 Heights"
+
+    assert client.get(f"/projects/{project_id}", params={"include": "everything"}).status_code == 400
+
+
+def test_project_detail_document_invalidated_per_project(client: TestClient, session_local: sessionmaker) -> None:
+    project_id, second_id = seed_phase6(session_local)
+    with session_local() as session:
+        bump_data_version(session)
+        assert refresh_detail_documents(session) == 2
+        session.commit()
+
+        # Served from the stored documents
+        for document in session.query(ProjectDetailDocument):
+            document.document = {**document.document, "project": {**document.document["project"], "name": "Cached"}}
+        session.commit()
+    assert client.get(f"/projects/{project_id}").json()["project"]["name"] == "Cached"
+
+    # Changing one project drops only its document; a version bump alone does not
+    with session_local() as session:
+        assert invalidate_detail_documents(session, [project_id]) == 1
+        bump_data_version(session)
+        session.commit()
+    assert client.get(f"/projects/{project_id}").json()["project"]["name"] == "Phase6 Heights"
+    assert client.get(f"/projects/{second_id}").json()["project"]["name"] == "Cached"
+
+    # Incremental refresh rebuilds the dropped document at the current version
+    with session_local() as session:
+        assert refresh_detail_documents(session, [project_id]) == 1
+        session.commit()
+        versions = {d.project_id: d.data_version for d in session.query(ProjectDetailDocument)}
+    assert versions == {project_id: 2, second_id: 1}
+
+
+def test_project_inventory_endpoints(client: TestClient, session_local: sessionmaker) -> None:
+    project_id, _ = seed_phase6(session_local)
+    with session_local() as session:
+        units = [
+            Unit(block_name="A", unit_no="101", unit_type="2BHK", status="Available"),
+            Unit(block_name="A", unit_no="102", unit_type="2BHK", status="Booked"),
+        ]
+        sync_project_units(session, project_id, units, run_id="run-1")
+        session.commit()
+
+    payload = client.get(f"/projects/{project_id}/inventory").json()
+    assert payload["stats"]["total_units"] == 2
+    assert payload["stats"]["sold_percent"] == 50.0
+    assert payload["blocks"][0]["name"] == "A"
+    assert len(payload["units"]) == 2
+
+    payload = client.get(f"/projects/{project_id}/inventory", params={"include_units": "false"}).json()
+    assert payload["units"] == []
+
+    history = client.get(f"/projects/{project_id}/inventory/history").json()
+    assert {(h["unit_key"], h["new_status"]) for h in history} == {("A_101", "Available"), ("A_102", "Booked")}
+
+
 def test_map_endpoint_bbox(client: TestClient, session_local: sessionmaker) -> None:
     first_id, _ = seed_phase6(session_local)
 
@@ -0,0 +1,189 @@
+"""Tests for the price trend rollups and the analytics endpoints."""
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.api.app import app  # noqa: E402  (import after env setup)
+from cg_rera_extractor.api.deps import get_db  # noqa: E402
+from cg_rera_extractor.db import (  # noqa: E402
+    PriceTrendRollup,
+    Project,
+    ProjectPricingSnapshot,
+    refresh_price_rollups,
+)
+from cg_rera_extractor.db.base import Base  # noqa: E402
+from cg_rera_extractor.db.models_discovery import Locality  # noqa: E402
+from cg_rera_extractor.db.price_rollups import period_end, period_start  # noqa: E402
+
+
+@pytest.fixture()
+def session_local() -> sessionmaker:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+@pytest.fixture()
+def client(session_local: sessionmaker) -> TestClient:
+    def _get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def _snapshot(project_id: int, when: date, low: str, high: str, unit: str = "2BHK"):
+    return ProjectPricingSnapshot(
+        project_id=project_id,
+        snapshot_date=when,
+        unit_type_label=unit,
+        min_price_per_sqft=Decimal(low),
+        max_price_per_sqft=Decimal(high),
+        min_price_total=Decimal(low) * 1000,
+        max_price_total=Decimal(high) * 1000,
+        is_active=True,
+    )
+
+
+def seed(session_local: sessionmaker) -> dict[str, int]:
+    this_month = date.today().replace(day=1)
+    last_month = (this_month - timedelta(days=1)).replace(day=1)
+    with session_local() as session:
+        locality = Locality(name="Shankar Nagar", slug="shankar-nagar", district="Raipur")
+        session.add(locality)
+        session.flush()
+        first = Project(
+            state_code="CG", rera_registration_number="CG-1", project_name="Alpha",
+            district="Raipur", locality_id=locality.id,
+        )
+        second = Project(
+            state_code="CG", rera_registration_number="CG-2", project_name="Beta",
+            district=" raipur ", locality_id=locality.id,
+        )
+        session.add_all([first, second])
+        session.flush()
+        session.add_all([
+            _snapshot(first.id, last_month, "4000", "4400"),
+            _snapshot(first.id, this_month, "4200", "4600"),
+            _snapshot(second.id, this_month, "5000", "5000", unit="3BHK"),
+        ])
+        session.flush()
+        refresh_price_rollups(session, [first.id, second.id])
+        session.commit()
+        return {"first": first.id, "second": second.id, "locality": locality.id}
+
+
+def test_period_helpers():
+    assert period_start(date(2024, 5, 17), "quarterly") == date(2024, 4, 1)
+    assert period_end(date(2024, 4, 1), "quarterly") == date(2024, 6, 30)
+    assert period_start(date(2024, 5, 17), "weekly") == date(2024, 5, 13)
+    assert period_end(date(2024, 12, 1), "monthly") == date(2024, 12, 31)
+
+
+def test_refresh_builds_project_locality_and_district_rollups(session_local):
+    ids = seed(session_local)
+    with session_local() as session:
+        rows = session.execute(
+            select(PriceTrendRollup).where(
+                PriceTrendRollup.granularity == "monthly",
+                PriceTrendRollup.unit_type_label == "",
+                PriceTrendRollup.period_start == date.today().replace(day=1),
+            )
+        ).scalars().all()
+
+    by_type = {(r.entity_type, r.entity_key): r for r in rows}
+    district = by_type[("district", "raipur")]
+    assert district.sample_size == 2
+    assert float(district.avg_price_per_sqft) == pytest.approx(4700.0)
+    assert float(district.median_price_per_sqft) == pytest.approx(4800.0)
+    assert by_type[("locality", str(ids["locality"]))].sample_size == 2
+    assert sum(1 for (entity_type, _) in by_type if entity_type == "project") == 2
+
+
+def test_incremental_refresh_only_touches_affected_entities(session_local):
+    ids = seed(session_local)
+    with session_local() as session:
+        other = Project(state_code="CG", rera_registration_number="CG-3", project_name="Gamma", district="Durg")
+        session.add(other)
+        session.flush()
+        session.add(_snapshot(other.id, date.today(), "3000", "3000"))
+        session.flush()
+        refresh_price_rollups(session, [other.id])
+        session.commit()
+
+        keys = set(session.execute(
+            select(PriceTrendRollup.entity_type, PriceTrendRollup.entity_key).distinct()
+        ).all())
+
+    assert ("district", "durg") in keys
+    assert ("district", "raipur") in keys
+    assert ("project", str(ids["first"])) in keys
+
+
+def test_price_trends_endpoint_serves_all_entity_types(client, session_local):
+    ids = seed(session_local)
+
+    project = client.get(
+        "/analytics/price-trends",
+        params={"entity_id": ids["first"], "granularity": "monthly", "timeframe": "6M"},
+    )
+    assert project.status_code == 200
+    body = project.json()
+    assert body["entity_name"] == "Alpha"
+    assert [p["avg_price_per_sqft"] for p in body["trend_data"]] == [4200.0, 4400.0]
+    assert body["trend_data"][1]["change_pct"] == pytest.approx(4.76, abs=0.01)
+
+    locality = client.get(
+        "/analytics/price-trends",
+        params={"entity_id": ids["locality"], "entity_type": "locality", "granularity": "monthly"},
+    )
+    assert locality.status_code == 200
+    assert locality.json()["entity_name"] == "Shankar Nagar"
+    assert locality.json()["data_points_count"] == 2
+
+    district = client.get(
+        "/analytics/price-trends",
+        params={
+            "entity_id": ids["locality"],
+            "entity_type": "district",
+            "granularity": "monthly",
+            "unit_type": "3BHK",
+        },
+    )
+    assert district.status_code == 200
+    assert [p["avg_price_per_sqft"] for p in district.json()["trend_data"]] == [5000.0]
+
+    compare = client.get(
+        "/analytics/price-trends/compare",
+        params={"entity_ids": f"{ids['first']},{ids['second']}", "granularity": "monthly"},
+    )
+    assert compare.status_code == 200
+    assert compare.json()["entity_count"] == 2
+
+
+def test_price_trends_rejects_developer_entities(client, session_local):
+    response = client.get(
+        "/analytics/price-trends", params={"entity_id": 1, "entity_type": "developer"}
+    )
+    assert response.status_code == 400
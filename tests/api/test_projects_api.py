@@ -1,6 +1,7 @@
 """Integration-style tests for the FastAPI project endpoints."""
 from __future__ import annotations
 
+import json
 import os
 from datetime import date
 from decimal import Decimal
@@ -149,3 +150,20 @@ def test_project_detail_endpoint(session_local: sessionmaker, client: TestClient
     assert len(payload["unit_types"]) == 1
     assert len(payload["documents"]) == 1
     assert len(payload["quarterly_updates"]) == 1
+
+
+def test_export_endpoint_streams_jsonl(client: TestClient, session_local: sessionmaker) -> None:
+    seed_projects(session_local)
+
+    response = client.get(
+        "/projects/export", params={"format": "jsonl", "columns": "project_id,project_name"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [line for line in response.text.splitlines() if line]
+    assert lines
+    assert set(json.loads(lines[0])) == {"project_id", "project_name"}
+
+    bad = client.get("/projects/export", params={"columns": "nope"})
+    assert bad.status_code == 400
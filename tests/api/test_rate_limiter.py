@@ -0,0 +1,186 @@
+"""Tests for the rate limiters and usage tracker."""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.api import middleware  # noqa: E402  (import after env setup)
+from cg_rera_extractor.api.middleware import (  # noqa: E402
+    ClientTier,
+    RateLimitConfig,
+    RateLimiter,
+    RateLimitMiddleware,
+    RedisRateLimiter,
+    UsageTracker,
+)
+
+
+class StubRedisError(Exception):
+    pass
+
+
+class StubRedis:
+    """Records Lua script calls; replies with ``reply`` or raises ``error``."""
+
+    def __init__(self, reply=(1, 5, 4, 1_020, b"minute"), error: Exception | None = None):
+        self.reply = list(reply)
+        self.error = error
+        self.calls = []
+        self.threads = []
+
+    def register_script(self, source):
+        assert "HMGET" in source
+
+        def script(keys, args):
+            self.calls.append((keys, args))
+            self.threads.append(threading.current_thread())
+            if self.error is not None:
+                raise self.error
+            return self.reply
+
+        return script
+
+
+def _config(rpm: int = 5, rph: int = 100, burst: int = 100) -> RateLimitConfig:
+    return RateLimitConfig(
+        requests_per_minute=rpm,
+        requests_per_hour=rph,
+        requests_per_day=1000,
+        burst_limit=burst,
+    )
+
+
+def test_minute_window_limit_and_reset(monkeypatch):
+    now = [1_000_020.0]
+    monkeypatch.setattr(middleware.time, "time", lambda: now[0])
+    limiter = RateLimiter()
+    config = _config(rpm=3)
+
+    results = [limiter.check_rate_limit("c1", config)[0] for _ in range(4)]
+    assert results == [True, True, True, False]
+
+    allowed, headers = limiter.check_rate_limit("c1", config)
+    assert not allowed
+    assert headers["X-RateLimit-Window"] == "minute"
+    assert headers["X-RateLimit-Reset"] == str((int(now[0] // 60) + 1) * 60)
+
+    # Other clients are independent
+    assert limiter.check_rate_limit("c2", config)[0]
+
+    now[0] += 60
+    allowed, headers = limiter.check_rate_limit("c1", config)
+    assert allowed
+    assert headers["X-RateLimit-Remaining"] == "2"
+
+
+def test_hour_window_limit(monkeypatch):
+    now = [3_600_000.0]
+    monkeypatch.setattr(middleware.time, "time", lambda: now[0])
+    limiter = RateLimiter()
+    config = _config(rpm=2, rph=3)
+
+    assert limiter.check_rate_limit("c", config)[0]
+    assert limiter.check_rate_limit("c", config)[0]
+    now[0] += 60
+    assert limiter.check_rate_limit("c", config)[0]
+    allowed, headers = limiter.check_rate_limit("c", config)
+    assert not allowed
+    assert headers["X-RateLimit-Window"] == "hour"
+
+
+def test_burst_limit(monkeypatch):
+    monkeypatch.setattr(middleware.time, "time", lambda: 5_000_000.0)
+    limiter = RateLimiter()
+    config = _config(rpm=100, burst=2)
+
+    assert limiter.check_rate_limit("c", config)[0]
+    assert limiter.check_rate_limit("c", config)[0]
+    allowed, headers = limiter.check_rate_limit("c", config)
+    assert not allowed
+    assert headers["X-RateLimit-Window"] == "burst"
+
+
+def test_idle_clients_are_evicted():
+    limiter = RateLimiter(max_clients=2)
+    config = _config()
+    for client in ("a", "b", "c"):
+        limiter.check_rate_limit(client, config)
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def test_usage_tracker_ring_buffer_and_aggregates():
+    tracker = UsageTracker(max_records=3)
+    for i in range(5):
+        tracker.record(
+            client_id=f"c{i % 2}",
+            tier=ClientTier.ANONYMOUS,
+            endpoint="/projects/{project_id}" if i % 2 else "/projects/search",
+            method="GET",
+            status_code=500 if i == 4 else 200,
+            response_time_ms=float(i * 30),
+        )
+
+    # Only the last 3 records are retained, oldest first
+    assert [r.response_time_ms for r in tracker.recent_records()] == [60.0, 90.0, 120.0]
+
+    # Unfiltered summary comes from counters covering every request
+    summary = tracker.get_summary()
+    assert summary["total_requests"] == 5
+    assert summary["by_endpoint"] == {"/projects/search": 3, "/projects/{project_id}": 2}
+    assert summary["error_count"] == 1
+    assert summary["avg_response_time_ms"] == 60.0
+    assert sum(summary["latency_histogram_ms"].values()) == 5
+    assert summary["latency_histogram_ms"]["<=5"] == 1
+
+    # Filters scan the retained window
+    assert tracker.get_summary(client_id="c0")["total_requests"] == 2
+    future = datetime.now(timezone.utc) + timedelta(minutes=1)
+    assert tracker.get_summary(since=future) == {"total_requests": 0}
+
+    endpoint_stats = tracker.get_endpoint_stats()["/projects/search"]
+    assert endpoint_stats["count"] == 3
+    assert endpoint_stats["error_count"] == 1
+
+
+def test_redis_limiter_runs_lua_script_and_decodes_reply(monkeypatch):
+    monkeypatch.setattr(middleware.time, "time", lambda: 1_000.0)
+    client = StubRedis(reply=[0, 3, 0, 1_020, b"minute"])
+    limiter = RedisRateLimiter(client=client)
+
+    allowed, headers = limiter.check_rate_limit("c1", _config(rpm=3, rph=50, burst=7))
+
+    assert not allowed
+    assert headers["X-RateLimit-Window"] == "minute"
+    assert headers["X-RateLimit-Limit"] == "3"
+    assert headers["X-RateLimit-Reset"] == "1020"
+    assert client.calls == [(["realmap:ratelimit:c1"], [1_000.0, 3, 50, 7])]
+
+
+def test_redis_limiter_falls_back_to_memory_when_redis_fails(monkeypatch):
+    monkeypatch.setattr(middleware, "redis", SimpleNamespace(RedisError=StubRedisError))
+    limiter = RedisRateLimiter(client=StubRedis(error=StubRedisError("connection refused")))
+    config = _config(rpm=2)
+
+    assert [limiter.check_rate_limit("c", config)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_middleware_checks_redis_limits_off_the_event_loop(monkeypatch):
+    client = StubRedis()
+    monkeypatch.setattr(middleware, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(middleware, "_rate_limiter", RedisRateLimiter(client=client))
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.get("/ping")(lambda: {"ok": True})
+
+    response = TestClient(app).get("/ping")
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "4"
+    assert client.threads and client.threads[0] is not threading.main_thread()
@@ -0,0 +1,140 @@
+"""Tests for the API response cache middleware."""
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cg_rera_extractor.api.cache import (
+    DataVersionSource,
+    InMemoryLRUCache,
+    ResponseCacheMiddleware,
+)
+from cg_rera_extractor.api.cache import CachedResponse
+from cg_rera_extractor.db import Base, bump_data_version, get_data_version
+
+
+class FakeVersionSource(DataVersionSource):
+    def __init__(self) -> None:
+        super().__init__()
+        self.version = 1
+
+    def current(self) -> int | None:
+        return self.version
+
+
+@pytest.fixture()
+def cached_app():
+    calls = {"search": 0, "other": 0}
+    app = FastAPI()
+
+    @app.get("/projects/search")
+    def search(district: str | None = None, tags: list[str] | None = None):
+        calls["search"] += 1
+        return {"district": district, "calls": calls["search"]}
+
+    @app.get("/projects/other")
+    def other():
+        calls["other"] += 1
+        return {"calls": calls["other"]}
+
+    versions = FakeVersionSource()
+    backend = InMemoryLRUCache(max_entries=10)
+    app.add_middleware(
+        ResponseCacheMiddleware, backend=backend, version_source=versions, enabled=True
+    )
+    with TestClient(app) as client:
+        yield client, calls, versions, backend
+
+
+def test_second_request_is_served_from_cache(cached_app):
+    client, calls, _, _ = cached_app
+
+    first = client.get("/projects/search?district=Raipur")
+    second = client.get("/projects/search?district=Raipur")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert calls["search"] == 1
+
+
+def test_query_params_are_normalized(cached_app):
+    client, calls, _, _ = cached_app
+
+    client.get("/projects/search?tags=b&district=Raipur&tags=a")
+    response = client.get("/projects/search?district=Raipur&tags=a&tags=b&name_contains=")
+
+    assert response.headers["X-Cache"] == "HIT"
+    assert calls["search"] == 1
+
+
+def test_version_bump_invalidates(cached_app):
+    client, calls, versions, _ = cached_app
+
+    client.get("/projects/search")
+    versions.version += 1
+    response = client.get("/projects/search")
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert calls["search"] == 2
+
+
+def test_etag_revalidation_returns_304(cached_app):
+    client, _, versions, _ = cached_app
+
+    etag = client.get("/projects/search").headers["ETag"]
+    not_modified = client.get("/projects/search", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    versions.version += 1
+    changed = client.get("/projects/search", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_non_cacheable_paths_pass_through(cached_app):
+    client, calls, _, _ = cached_app
+
+    client.get("/projects/other")
+    response = client.get("/projects/other")
+
+    assert "X-Cache" not in response.headers
+    assert calls["other"] == 2
+
+
+def test_lru_evicts_oldest_entry():
+    cache = InMemoryLRUCache(max_entries=2)
+    entry = CachedResponse(body=b"{}", etag='"x"')
+    cache.set("a", entry, ttl=60)
+    cache.set("b", entry, ttl=60)
+    cache.get("a")
+    cache.set("c", entry, ttl=60)
+
+    assert cache.get("a") is entry
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_lru_expires_entries():
+    cache = InMemoryLRUCache()
+    cache.set("a", CachedResponse(body=b"{}", etag='"x"'), ttl=-1)
+    assert cache.get("a") is None
+
+
+def test_bump_data_version_roundtrip():
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine, future=True)
+
+    with SessionLocal() as session:
+        assert get_data_version(session) == 0
+        assert bump_data_version(session) == 1
+        assert bump_data_version(session) == 2
+        session.commit()
+
+    source = DataVersionSource(session_factory=SessionLocal, poll_seconds=0)
+    assert source.current() == 2
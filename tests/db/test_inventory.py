@@ -0,0 +1,129 @@
+"""Tests for the incremental unit inventory sync."""
+from __future__ import annotations
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from cg_rera_extractor.db import Project, Unit, UnitInventoryCounter, UnitStatusHistory
+from cg_rera_extractor.db.base import Base
+from cg_rera_extractor.db.inventory import (
+    get_inventory_summary,
+    rebuild_inventory_counters,
+    sync_project_units,
+)
+
+
+def _make_session():
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)()
+
+
+def _project(session) -> Project:
+    project = Project(
+        state_code="CG",
+        rera_registration_number="CG-INV-1",
+        project_name="Inventory Towers",
+    )
+    session.add(project)
+    session.flush()
+    return project
+
+
+def _units(statuses: dict[str, str]) -> list[Unit]:
+    units = []
+    for label, status in statuses.items():
+        block, unit_no = label.split("-")
+        units.append(
+            Unit(
+                block_name=block,
+                unit_no=unit_no,
+                unit_type="2BHK" if unit_no.endswith("1") else "3BHK",
+                status=status,
+                raw_data={"source": "table"},
+            )
+        )
+    return units
+
+
+def _history(session) -> list[tuple[str, str | None, str | None]]:
+    rows = session.scalars(select(UnitStatusHistory).order_by(UnitStatusHistory.id))
+    return [(r.unit_key, r.old_status, r.new_status) for r in rows]
+
+
+def test_sync_writes_only_transitions() -> None:
+    session = _make_session()
+    project = _project(session)
+    grid = {"A-101": "Available", "A-102": "Booked", "B-101": "Available"}
+
+    first = sync_project_units(session, project.id, _units(grid), run_id="run-1")
+    session.commit()
+    assert (first.inserted, first.status_changes) == (3, 3)
+    ids = dict(session.execute(select(Unit.unit_no + Unit.block_name, Unit.id)).all())
+
+    again = sync_project_units(session, project.id, _units(grid), run_id="run-2")
+    session.commit()
+    assert again.unchanged == 3
+    assert again.status_changes == 0
+    assert again.counters_written == 0
+
+    grid["A-101"] = "Sold"
+    del grid["B-101"]
+    grid["B-102"] = "Available"
+    third = sync_project_units(session, project.id, _units(grid), run_id="run-3")
+    session.commit()
+
+    assert (third.inserted, third.updated, third.removed, third.unchanged) == (1, 1, 1, 1)
+    assert _history(session)[3:] == [
+        ("A_101", "Available", "Sold"),
+        ("B_102", None, "Available"),
+        ("B_101", "Available", None),
+    ]
+    # Unchanged units keep their ids
+    assert session.scalar(select(Unit.id).where(Unit.block_name == "A", Unit.unit_no == "102")) == ids["102A"]
+
+
+def test_counters_feed_inventory_summary() -> None:
+    session = _make_session()
+    project = _project(session)
+    grid = {"A-101": "Available", "A-102": "Booked", "B-101": "Sold", "B-102": "Unknown"}
+    sync_project_units(session, project.id, _units(grid))
+    session.commit()
+
+    summary = get_inventory_summary(session, project.id)
+    assert summary["stats"] == {
+        "name": "",
+        "total_units": 4,
+        "available_units": 1,
+        "booked_units": 2,
+        "unknown_units": 1,
+        "sold_percent": 50.0,
+    }
+    assert [(b["name"], b["booked_units"]) for b in summary["blocks"]] == [("A", 1), ("B", 1)]
+    assert [(t["name"], t["total_units"]) for t in summary["unit_types"]] == [("2BHK", 2), ("3BHK", 2)]
+
+    # Without counters (pre-migration data) the summary is aggregated from units
+    session.query(UnitInventoryCounter).delete()
+    session.commit()
+    assert get_inventory_summary(session, project.id) == summary
+
+    assert rebuild_inventory_counters(session) == 5
+    session.commit()
+    assert session.scalar(select(func.count()).select_from(UnitInventoryCounter)) == 5
+    assert get_inventory_summary(session, project.id) == summary
+
+
+def test_empty_parse_keeps_stored_inventory() -> None:
+    session = _make_session()
+    project = _project(session)
+    sync_project_units(session, project.id, _units({"A-101": "Available", "A-102": "Booked"}))
+    session.commit()
+    summary = get_inventory_summary(session, project.id)
+
+    result = sync_project_units(session, project.id, [], run_id="run-2")
+    session.commit()
+
+    assert result.removed == 0 and result.status_changes == 0
+    assert session.scalar(select(func.count()).select_from(Unit)) == 2
+    assert len(_history(session)) == 2
+    assert get_inventory_summary(session, project.id) == summary
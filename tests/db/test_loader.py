@@ -2,14 +2,30 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session, sessionmaker
 
-from cg_rera_extractor.db.base import Base
-from cg_rera_extractor.db.loader import load_run_into_db
-from cg_rera_extractor.db.models import Building, Project, ProjectDocument, Promoter, QuarterlyUpdate, UnitType
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.api.services.detail import (  # noqa: E402  (import after env setup)
+    fetch_project_detail,
+    refresh_detail_documents,
+)
+from cg_rera_extractor.db.base import Base  # noqa: E402
+from cg_rera_extractor.db.loader import load_run_into_db  # noqa: E402
+from cg_rera_extractor.db.models import (  # noqa: E402
+    Building,
+    PriceTrendRollup,
+    ProjectDetailDocument,
+    Project,
+    ProjectDocument,
+    Promoter,
+    QuarterlyUpdate,
+    UnitType,
+)
 
 
 def _make_session(tmp_path: Path) -> Session:
@@ -19,14 +35,22 @@ def _make_session(tmp_path: Path) -> Session:
     return SessionLocal()
 
 
-def _write_v1_fixture(path: Path, *, registration: str, project_name: str, promoter_name: str) -> None:
+def _write_v1_fixture(
+    path: Path,
+    *,
+    registration: str,
+    project_name: str,
+    promoter_name: str,
+    district: str = "Raipur",
+    price: float | None = 5500000.0,
+) -> None:
     data = {
         "metadata": {"schema_version": "1.0", "state_code": "CG", "scraped_at": "2024-01-01T00:00:00Z"},
         "project_details": {
             "registration_number": registration,
             "project_name": project_name,
             "project_status": "Registered",
-            "district": "Raipur",
+            "district": district,
             "tehsil": "Raipur",
             "project_address": "123 Test Street",
             "launch_date": "2024-01-15",
@@ -45,7 +69,7 @@ def _write_v1_fixture(path: Path, *, registration: str, project_name: str, promo
             {"name": "Tower A", "number_of_floors": 10, "number_of_units": 80, "carpet_area_sq_m": 75.5}
         ],
         "unit_types": [
-            {"name": "2BHK", "carpet_area_sq_m": 70.0, "built_up_area_sq_m": 85.0, "price_in_inr": 5500000.0}
+            {"name": "2BHK", "carpet_area_sq_m": 70.0, "built_up_area_sq_m": 85.0, "price_in_inr": price}
         ],
         "documents": [{"name": "Approval", "document_type": "Approval", "url": "http://example.com/doc.pdf"}],
         "quarterly_updates": [
@@ -96,3 +120,65 @@ def test_load_run_into_db_idempotent(tmp_path: Path) -> None:
     assert project.project_name == "Updated Name"
     assert session.query(Promoter).count() == 1
     assert session.query(Promoter).one().promoter_name == "Beta Builders"
+
+
+def test_reload_without_prices_clears_stale_rollups(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+
+    def load(run_id: str, **kwargs) -> None:
+        run_dir = tmp_path / run_id / "scraped_json"
+        run_dir.mkdir(parents=True)
+        _write_v1_fixture(
+            run_dir / "project.v1.json",
+            registration="CG-123",
+            project_name="Priced",
+            promoter_name="Alpha Builders",
+            **kwargs,
+        )
+        load_run_into_db(str(run_dir.parent), session=session)
+
+    def rollup_keys() -> set[tuple[str, str]]:
+        return set(session.execute(select(PriceTrendRollup.entity_type, PriceTrendRollup.entity_key)).all())
+
+    load("run_001")
+    keys = rollup_keys()
+    assert ("district", "raipur") in keys
+    assert any(entity_type == "project" for entity_type, _ in keys)
+
+    # Moving district with a priced reload drops the old district's rollup
+    load("run_002", district="Durg")
+    keys = rollup_keys()
+    assert ("district", "durg") in keys
+    assert ("district", "raipur") not in keys
+
+    # A reload without prices replaces the snapshots, so no rollup survives
+    load("run_003", district="Durg", price=None)
+    assert rollup_keys() == set()
+
+
+def test_reload_keeps_other_detail_documents(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+
+    def load(run_id: str, *registrations: str) -> None:
+        run_dir = tmp_path / run_id / "scraped_json"
+        run_dir.mkdir(parents=True)
+        for registration in registrations:
+            _write_v1_fixture(
+                run_dir / f"{registration}.v1.json",
+                registration=registration,
+                project_name=f"Project {registration}",
+                promoter_name="Alpha Builders",
+            )
+        load_run_into_db(str(run_dir.parent), session=session)
+
+    load("run_001", "CG-A", "CG-B")
+    ids = dict(session.execute(select(Project.rera_registration_number, Project.id)).all())
+    refresh_detail_documents(session)
+    for document in session.execute(select(ProjectDetailDocument)).scalars():
+        document.document = {**document.document, "project": {**document.document["project"], "name": "Stored"}}
+    session.commit()
+
+    load("run_002", "CG-A")
+    # The reloaded project is assembled live; the untouched one is still served from the table
+    assert fetch_project_detail(session, ids["CG-A"])["project"]["name"] == "Project CG-A"
+    assert fetch_project_detail(session, ids["CG-B"])["project"]["name"] == "Stored"
@@ -0,0 +1,57 @@
+import json
+import shutil
+from pathlib import Path
+
+from cg_rera_extractor.parsing.schema import V1Project
+from cg_rera_extractor.qa.field_by_field_compare import compare_v1_to_html_fields
+from cg_rera_extractor.qa.field_extractor import extract_label_value_map
+from cg_rera_extractor.qa.label_cache import LabelMapCache
+from cg_rera_extractor.qa.runner import load_qa_trend, run_field_qa
+
+FIXTURES = Path("tests/qa/fixtures")
+
+
+def _make_run(root: Path, name: str, keys: list[str]) -> Path:
+    run_dir = root / name
+    (run_dir / "raw_html").mkdir(parents=True)
+    (run_dir / "scraped_json").mkdir(parents=True)
+    for key in keys:
+        shutil.copy(FIXTURES / "detail_page.html", run_dir / "raw_html" / f"project_{key}.html")
+        shutil.copy(FIXTURES / "project_v1.json", run_dir / "scraped_json" / f"project_{key}.v1.json")
+    return run_dir
+
+
+def test_run_field_qa_matches_sequential_diff_and_reuses_label_maps(tmp_path):
+    run_dir = _make_run(tmp_path / "runs", "run_1", ["CG-B", "CG-A"])
+    cache_path = tmp_path / "labels.sqlite3"
+
+    report = run_field_qa([("1", run_dir)], workers=2, cache_path=cache_path)
+
+    html_fields = extract_label_value_map((FIXTURES / "detail_page.html").read_text(encoding="utf-8"))
+    v1_project = V1Project.model_validate_json((FIXTURES / "project_v1.json").read_text(encoding="utf-8"))
+    expected = compare_v1_to_html_fields(v1_project, html_fields)
+    assert [p["project_key"] for p in report["1"]["projects"]] == ["CG-A", "CG-B"]
+    assert all(p["diffs"] == expected for p in report["1"]["projects"])
+    assert report["1"]["summary"]["total_fields"] == 2 * len(expected)
+    assert json.loads((run_dir / "qa_fields" / "qa_fields_report.json").read_text()) == report["1"]
+
+    # Identical pages share one cache entry; the rerun parses nothing
+    with LabelMapCache(cache_path) as cache:
+        assert len(cache) == 1
+    rerun = run_field_qa([("1", run_dir)], workers=1, cache_path=cache_path)
+    assert rerun["1"] == report["1"]
+    index = json.loads((run_dir / "qa_fields" / "qa_index.json").read_text())
+    assert index["label_cache"] == {"hits": 2, "misses": 0}
+    assert index["fields"]["project_details.tehsil"] == {"mismatch": 2}
+
+
+def test_run_field_qa_writes_per_run_index_for_trend(tmp_path):
+    runs_root = tmp_path / "runs"
+    runs = [("1", _make_run(runs_root, "run_1", ["CG-A"])), ("2", _make_run(runs_root, "run_2", ["CG-A", "CG-B"]))]
+
+    run_field_qa(runs, workers=1, cache_path=None)
+
+    trend = load_qa_trend(runs_root)
+    assert [entry["run_id"] for entry in trend] == ["1", "2"]
+    assert [entry["summary"]["total_projects"] for entry in trend] == [1, 2]
+    assert trend[0]["label_cache"] == {"hits": 0, "misses": 1}
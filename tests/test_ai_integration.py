@@ -6,29 +6,24 @@ from ai.dependencies import get_db
 client = TestClient(app)
 
 
-@patch("ai.features.builder.build_feature_pack")
-@patch("ai.scoring.logic.score_project_quality")
-def test_score_project_endpoint_success(mock_score, mock_build):
-    """Test successful scoring of a project."""
-    
-    # Mock Dependencies
-    mock_build.return_value = MagicMock(features={"name": "Test"})
-    mock_score.return_value = {
-        "score": 88, 
-        "confidence": 0.8, 
-        "explanation": "Test explanation",
-        "metadata": {}
-    }
-    
-    # Override DB dependency with mock session
-    mock_session = MagicMock()
-    # Mock row return for INSERT - needs to be a tuple-like object with attribute access
-    mock_row = MagicMock()
-    mock_row.__getitem__ = lambda self, key: 101  # For row[0] access
-    mock_session.execute.return_value.fetchone.return_value = mock_row
+def _queued_job(**overrides):
+    job = MagicMock(
+        id=101, job_key="score:1:abc", kind="score", project_id=1, input_hash="abc",
+        queue="llm", status="queued", task_id="t-1", attempts=0, result=None, error=None,
+        created_at=None, started_at=None, finished_at=None,
+    )
+    for key, value in overrides.items():
+        setattr(job, key, value)
+    return job
+
+
+@patch("ai.main.submit_jobs")
+def test_score_project_endpoint_success(mock_submit):
+    """Scoring is queued as a job and returned for polling."""
     
+    mock_submit.return_value = [(_queued_job(), True)]
     def override_get_db():
-        yield mock_session
+        yield MagicMock()
     
     app.dependency_overrides[get_db] = override_get_db
     
@@ -36,18 +31,15 @@ def test_score_project_endpoint_success(mock_score, mock_build):
     response = client.post("/ai/score/project/1")
     
     # Assert
-    assert response.status_code == 200
+    assert response.status_code == 202
     data = response.json()
-    assert data["score_value"] == 88.0
-    assert data["score_id"] == 101
+    assert data["job_id"] == 101
     assert data["project_id"] == 1
-    assert data["confidence"] == 0.8
-    assert data["explanation"] == "Test explanation"
-    assert "created_at" in data
-    
-    # Verify DB calls
-    assert mock_session.execute.called
-    assert mock_session.commit.called
+    assert data["status"] == "queued"
+    assert data["queue"] == "llm"
+    assert data["created"] is True
+    request = mock_submit.call_args.args[1][0]
+    assert (request.kind, request.project_id) == ("score", 1)
     
     # Cleanup
     app.dependency_overrides = {}
@@ -78,26 +70,13 @@ def test_score_project_not_found(mock_build):
     app.dependency_overrides = {}
 
 
-@patch("ai.features.builder.build_feature_pack")
-@patch("ai.scoring.logic.score_project_quality")
-def test_score_project_database_error(mock_score, mock_build):
-    """Test 500 when database error occurs."""
-    
-    # Mock Dependencies
-    mock_build.return_value = MagicMock(features={"name": "Test"})
-    mock_score.return_value = {
-        "score": 88, 
-        "confidence": 0.8, 
-        "explanation": "Test",
-        "metadata": {}
-    }
-    
-    # Mock session to raise exception on execute
-    mock_session = MagicMock()
-    mock_session.execute.side_effect = Exception("Database connection failed")
+@patch("ai.main.submit_jobs")
+def test_score_project_queue_unavailable(mock_submit):
+    """Test 503 when the job cannot be queued."""
     
+    mock_submit.side_effect = Exception("Database connection failed")
     def override_get_db():
-        yield mock_session
+        yield MagicMock()
     
     app.dependency_overrides[get_db] = override_get_db
     
@@ -105,9 +84,8 @@ def test_score_project_database_error(mock_score, mock_build):
     response = client.post("/ai/score/project/1")
     
     # Assert
-    assert response.status_code == 500
-    assert "Database error" in response.json()["detail"]
-    assert mock_session.rollback.called
+    assert response.status_code == 503
+    assert "Database connection failed" in response.json()["detail"]
     
     # Cleanup
     app.dependency_overrides = {}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from cg_rera_extractor.enrichment import DataMerger, merge_and_save_batch, merge_projects_batch
+from cg_rera_extractor.enrichment.conflict_resolver import ConflictResolver, ResolutionStrategy
+
+
+def _scraped(reg_no: str, **details) -> dict:
+    return {
+        "metadata": {"schema_version": "1.0"},
+        "project_details": {"registration_number": reg_no, **details},
+        "promoter_details": [{"name": "Acme"}],
+    }
+
+
+PROJECTS = [
+    (
+        "CG-001",
+        _scraped("CG-001", project_name="Garden Villas", total_units=120, registration_date="2023-01-05"),
+        [
+            {
+                "document_type": "registration_certificate",
+                "project_name": "garden  villas phase 2",  # contains the scraped name
+                "total_units": 118,
+                "registration_date": "10/02/2023",
+                "project_address": "Near City Center",
+            },
+            {"document_type": "bank_passbook", "bank_name": "SBI", "ifsc_code": " "},
+        ],
+    ),
+    (
+        "CG-002",
+        _scraped("CG-002", project_name="Sky", district="Raipur", registration_date="2024/03/01"),
+        [
+            {
+                "document_type": "registration_certificate",
+                "project_name": "Sunrise Towers",
+                "project_district": "",
+                "registration_date": "2023-12-31",
+                "promoter_name": "Acme Builders Pvt Ltd",
+                "survey_numbers": ["12", "13"],
+            }
+        ],
+    ),
+    ("CG-003", {"project_details": None}, [{"document_type": "layout_plan", "project_name": "Broken"}]),
+    ("CG-004", _scraped("CG-004"), []),
+]
+
+
+def _comparable(result) -> tuple:
+    enriched = json.loads(json.dumps(result.enriched_data))
+    enriched["metadata"].pop("enriched_at")
+    return (
+        result.success,
+        result.project_id,
+        enriched,
+        result.fields_added,
+        result.fields_updated,
+        result.conflicts_detected,
+        result.errors,
+        {name: vars(resolution) for name, resolution in result.resolutions.items()},
+    )
+
+
+@pytest.mark.parametrize(
+    "strategies",
+    [{}, {"registration_date": ResolutionStrategy.PREFER_NEWER, "project_name": ResolutionStrategy.MERGE}],
+)
+def test_batch_merge_matches_per_project_merge(strategies):
+    resolver = ConflictResolver()
+    resolver.FIELD_STRATEGIES = {**ConflictResolver.FIELD_STRATEGIES, **strategies}
+    merger = DataMerger(resolver)
+
+    expected = [merger.merge_project(scraped, extractions, pid) for pid, scraped, extractions in PROJECTS]
+    results = merge_projects_batch(PROJECTS, merger)
+
+    assert [_comparable(r) for r in results] == [_comparable(r) for r in expected]
+    assert PROJECTS[0][1]["metadata"] == {"schema_version": "1.0"}  # inputs untouched
+    assert results[2].success is False
+
+
+def test_merge_and_save_batch_writes_outputs_and_report(tmp_path):
+    jobs = []
+    for pid, scraped, extractions in PROJECTS[:2]:
+        path = tmp_path / f"project_{pid}.v1.json"
+        path.write_text(json.dumps(scraped), encoding="utf-8")
+        jobs.append((path, extractions))
+    report_path = tmp_path / "merge_report.json"
+
+    report = merge_and_save_batch(jobs, output_dir=tmp_path / "enriched", report_path=report_path, chunk_size=1)
+
+    expected = DataMerger().merge_and_save(str(jobs[0][0]), jobs[0][1], str(tmp_path / "expected.json"))
+    written = json.loads((tmp_path / "enriched" / "project_CG-001.enriched.v2.json").read_text(encoding="utf-8"))
+    written["metadata"].pop("enriched_at")
+    expected.enriched_data["metadata"].pop("enriched_at")
+    assert written == expected.enriched_data
+    assert report["total_processed"] == 2
+    assert report["total_fields_updated"] == sum(len(p["fields_updated"]) for p in report["projects"])
+    assert [p["project_id"] for p in report["projects"]] == ["CG-001", "CG-002"]
+    assert json.loads(report_path.read_text(encoding="utf-8"))["projects"] == report["projects"]
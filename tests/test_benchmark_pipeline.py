@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from cg_rera_extractor.listing import parse_listing_html  # noqa: E402  (import after env setup)
+from cg_rera_extractor.parsing.mapper import map_raw_to_v1  # noqa: E402
+from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html  # noqa: E402
+from tools import benchmark_corpus as corpus  # noqa: E402
+from tools import benchmark_pipeline  # noqa: E402
+
+
+def test_synthetic_pages_parse_like_portal_pages():
+    v1 = map_raw_to_v1(extract_raw_from_html(corpus.render_detail_page(3), source_file="p.html"), state_code="CG")
+    assert v1.project_details.registration_number == corpus.registration_number(3)
+
+    records = parse_listing_html(corpus.render_listing_page(10, 5), base_url="https://rera.cg.gov/")
+    assert len(records) == 5
+    assert corpus.render_certificate_pdf(1).startswith(b"%PDF-")
+
+
+def test_suite_records_history_and_flags_regressions(tmp_path, capsys):
+    history = tmp_path / "history.jsonl"
+    args = ["--scale", "6", "--stages", "extract,map,load,search,map_api", "--queries", "3", "--history", str(history)]
+
+    assert benchmark_pipeline.main([*args, "--record"]) == 0
+
+    entries = benchmark_pipeline.load_history(history)
+    assert len(entries) == 1
+    assert entries[0]["scale"] == 6 and entries[0]["database"] == "sqlite"
+    results = {r["stage"]: r for r in entries[0]["results"]}
+    assert list(results) == ["extract", "map", "load", "search", "map_api"]
+    assert results["load"]["notes"]["projects_upserted"] == 6
+
+    # A baseline far faster than anything achievable must be reported as a regression
+    for result in entries[0]["results"]:
+        result["items_per_sec"] = 1e12
+    history.write_text(json.dumps(entries[0]) + "\n", encoding="utf-8")
+    capsys.readouterr()
+    assert benchmark_pipeline.main([*args, "--max-regression", "0.5"]) == 1
+    assert "regression" in capsys.readouterr().out
@@ -0,0 +1,114 @@
+"""Tests for the incremental, sharded ETL stages used by the Airflow DAG."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from cg_rera_extractor.db import loader
+from cg_rera_extractor.runs import pipeline
+
+FIXTURE_HTML = Path(__file__).parent / "fixtures" / "project_detail_sample.html"
+
+
+def _make_run(tmp_path: Path, stems: list[str]) -> Path:
+    raw_html = tmp_path / "runs" / "run_001" / "raw_html"
+    raw_html.mkdir(parents=True)
+    for stem in stems:
+        (raw_html / f"{stem}.html").write_text(FIXTURE_HTML.read_text(encoding="utf-8"), encoding="utf-8")
+    return raw_html.parent
+
+
+def _run_all_stages(run_dir: Path, shard_count: int) -> list[pipeline.StageMetrics]:
+    results = []
+    for stage in pipeline.STAGES:
+        for shard in pipeline.plan_shards(run_dir.parent, shard_count):
+            results.append(pipeline.run_stage(stage, shard))
+    return results
+
+
+def test_stages_chain_through_persisted_artifacts(tmp_path: Path) -> None:
+    stems = [f"project_CG_P{i}" for i in range(6)]
+    run_dir = _make_run(tmp_path, stems)
+
+    shards = pipeline.plan_shards(run_dir.parent, shard_count=3)
+    assert {s.shard_index for s in shards} == {pipeline.shard_of(stem, 3) for stem in stems}
+
+    results = _run_all_stages(run_dir, 3)
+    assert all(not r.skipped and r.failed == 0 for r in results)
+    assert sum(r.processed for r in results if r.stage == "extract") == len(stems)
+
+    for stem in stems:
+        assert (run_dir / "raw_extracted" / f"{stem}.json").exists()
+        assert (run_dir / "raw_extracted" / f"{stem}.locations.json").exists()
+        assert (run_dir / "mapped_json" / f"{stem}.v1.json").exists()
+        v1 = json.loads((run_dir / "scraped_json" / f"{stem}.v1.json").read_text(encoding="utf-8"))
+        assert v1["metadata"]["state_code"] == "CG"
+
+    metrics = (run_dir / "pipeline_state" / "metrics.jsonl").read_text().splitlines()
+    assert len(metrics) == len(results)
+    assert {"stage", "duration_seconds", "items_per_second"} <= set(json.loads(metrics[0]))
+
+
+def test_mhtml_snapshots_are_extracted(tmp_path: Path) -> None:
+    run_dir = _make_run(tmp_path, ["project_CG_HTML"])
+    page = FIXTURE_HTML.read_bytes()
+    (run_dir / "raw_html" / "project_CG_SNAP.mhtml").write_bytes(
+        b'MIME-Version: 1.0\r\nContent-Type: multipart/related; boundary="b1"\r\n\r\n'
+        b"--b1\r\nContent-Type: text/html; charset=utf-8\r\nContent-Transfer-Encoding: binary\r\n\r\n"
+        + page
+        + b"\r\n--b1--\r\n"
+    )
+
+    shards = pipeline.plan_shards(run_dir.parent, shard_count=8)
+    assert {s.shard_index for s in shards} == {pipeline.shard_of(f"project_CG_{k}", 8) for k in ("HTML", "SNAP")}
+    results = _run_all_stages(run_dir, 8)
+    assert all(r.failed == 0 for r in results)
+
+    from_html, from_snapshot = (
+        json.loads((run_dir / "raw_extracted" / f"project_CG_{key}.json").read_text(encoding="utf-8"))
+        for key in ("HTML", "SNAP")
+    )
+    assert from_snapshot["sections"] == from_html["sections"]
+    assert (run_dir / "scraped_json" / "project_CG_SNAP.v1.json").exists()
+
+
+def test_unchanged_shards_are_skipped(tmp_path: Path) -> None:
+    stems = [f"project_CG_P{i}" for i in range(6)]
+    run_dir = _make_run(tmp_path, stems)
+    _run_all_stages(run_dir, 3)
+
+    # Nothing changed: every shard of every stage is skipped
+    assert all(r.skipped for r in _run_all_stages(run_dir, 3))
+
+    # Touch one page: only its shard re-extracts. The comment does not change
+    # the extracted data, so map/qa see identical inputs and stay skipped.
+    changed = stems[0]
+    html_path = run_dir / "raw_html" / f"{changed}.html"
+    html_path.write_text(html_path.read_text(encoding="utf-8") + "<!-- refreshed -->", encoding="utf-8")
+
+    rerun = [r for r in _run_all_stages(run_dir, 3) if not r.skipped]
+    changed_shard = f"{pipeline.shard_of(changed, 3) + 1}/3"
+    assert [(r.stage, r.shard) for r in rerun] == [("extract", changed_shard)]
+
+    assert pipeline.run_stage("extract", pipeline.ShardSpec(str(run_dir), 0, 3), force=True).skipped is False
+
+
+def test_load_run_returns_touched_projects_once(tmp_path: Path, monkeypatch) -> None:
+    run_dir = _make_run(tmp_path, ["project_CG_P1"])
+    _run_all_stages(run_dir, 1)
+
+    calls: list[str] = []
+
+    def fake_load(run_path: str) -> dict:
+        calls.append(run_path)
+        return {"projects_upserted": 1, "qa_failed": 0, "project_ids": [42]}
+
+    monkeypatch.setattr(loader, "load_run_into_db", fake_load)
+
+    metrics, project_ids = pipeline.load_run(run_dir)
+    assert project_ids == [42]
+    assert metrics.processed == 1
+
+    metrics, project_ids = pipeline.load_run(run_dir)
+    assert metrics.skipped and project_ids == []
+    assert calls == [str(run_dir)]
@@ -0,0 +1,56 @@
+"""Tests for the pluggable HTML parser backends."""
+from pathlib import Path
+
+import pytest
+
+from cg_rera_extractor.listing import parse_listing_html
+from cg_rera_extractor.parsing.html_backend import (
+    available_backends,
+    make_soup,
+    resolve_backend,
+    use_html_backend,
+)
+from tools import parser_regression
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_resolve_backend_validates_names():
+    assert resolve_backend("html.parser") == "html.parser"
+    assert resolve_backend("auto") in available_backends()
+    with pytest.raises(ValueError):
+        resolve_backend("html5")
+
+
+def test_use_html_backend_is_scoped():
+    default = resolve_backend()
+    with use_html_backend("html.parser"):
+        assert resolve_backend() == "html.parser"
+        assert make_soup("<p>x</p>").p.get_text() == "x"
+    assert resolve_backend() == default
+
+
+@pytest.mark.parametrize("backend", ["lxml", "selectolax"])
+def test_fast_backends_match_reference(backend):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} is not installed")
+
+    html = (FIXTURES / "listing_sample.html").read_text(encoding="utf-8")
+    with use_html_backend("html.parser"):
+        expected = parse_listing_html(html, base_url="https://rera.cg.gov/")
+    with use_html_backend(backend):
+        assert parse_listing_html(html, base_url="https://rera.cg.gov/") == expected
+
+    fixtures = parser_regression.conformance_fixtures(parser_regression.DEFAULT_FIXTURE_DIR)
+    discrepancies = parser_regression.check_conformance(
+        fixtures, parser_regression.DEFAULT_GOLDEN_DIR, parser_regression.DEFAULT_BASE_URL, [backend]
+    )
+    # Golden drift is reported by the check mode; only backend differences matter here
+    assert [d for d in discrepancies if not d.startswith(f"[{backend}]")] == []
+
+
+def test_benchmark_reports_pages_per_second():
+    results = parser_regression.benchmark_backends(
+        [FIXTURES / "listing_sample.html"], "https://rera.cg.gov/", ["html.parser"], iterations=1
+    )
+    assert results["html.parser"] > 0
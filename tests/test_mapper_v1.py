@@ -4,7 +4,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from cg_rera_extractor.parsing import RawExtractedProject, map_raw_to_v1
+from cg_rera_extractor.parsing import RawExtractedProject, UnmappedLabelStats, map_raw_to_v1
+from cg_rera_extractor.parsing.schema import SectionRecord, TableRecord
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "raw_extracted_sample.json"
 
@@ -40,3 +41,25 @@ def test_map_raw_to_v1_preserves_unmapped_sections():
     assert special["Airport Clearance"] == "Pending"
     assert "project_details" in v1.raw_data.sections
     assert v1.raw_data.sections["project_details"]["district"] == "Raipur"
+
+
+def test_unmapped_label_stats_count_across_projects():
+    stats = UnmappedLabelStats()
+    for _ in range(3):
+        stats.record(map_raw_to_v1(load_raw_fixture()))
+
+    assert stats.projects == 3
+    assert stats.sections["Special Approvals"] == 3
+    assert stats.labels[("Special Approvals", "Airport Clearance")] == 3
+    summary = stats.to_dict(top=1)
+    assert summary["projects"] == 3
+    assert len(summary["unmapped_labels"]) == 1
+
+
+def test_table_header_matching_is_shared_across_projects():
+    table = TableRecord(headers=["Sr No", "Bank Name", "Branch Name"], rows=[["1", "SBI", "Raipur"]])
+    for title in ("Bank Details", "BANK / ESCROW DETAILS"):
+        raw = RawExtractedProject(sections=[SectionRecord(section_title_raw=title, tables=[table])])
+        bank = map_raw_to_v1(raw).bank_details
+
+        assert [(b.bank_name, b.branch_name) for b in bank] == [("SBI", "Raipur")]
@@ -1,8 +1,15 @@
+import base64
+import io
+import mmap
+import quopri
+import tracemalloc
 from pathlib import Path
 
+import pytest
 from bs4 import BeautifulSoup
 
-from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml, iter_html_parts
+from tools import benchmark_mhtml
 
 
 def test_extract_html_from_mhtml_exposes_listing_table():
@@ -14,3 +21,45 @@ def test_extract_html_from_mhtml_exposes_listing_table():
 
     assert table is not None
     assert district_select is not None
+
+
+def _archive(*parts: tuple[str, str, bytes]) -> bytes:
+    out = b'MIME-Version: 1.0\r\nContent-Type: multipart/related; boundary="b1"\r\n\r\n'
+    for content_type, encoding, body in parts:
+        out += f"--b1\r\nContent-Type: {content_type}\r\nContent-Transfer-Encoding: {encoding}\r\n\r\n".encode()
+        out += body + b"\r\n"
+    return out + b"--b1--\r\n"
+
+
+def test_iter_html_parts_decodes_each_transfer_encoding():
+    page = "<html><body><p>Approved – Raipur ₹ 45,00,000</p></body></html>"
+    archive = _archive(
+        ("image/png", "base64", base64.encodebytes(b"\x89PNG" * 5000)),
+        ("text/html; charset=utf-8", "base64", base64.encodebytes(page.encode("utf-8"))),
+        ("text/html; charset=windows-1252", "quoted-printable", quopri.encodestring("café".encode("cp1252"))),
+    )
+
+    assert list(iter_html_parts(io.BytesIO(archive))) == [page, "café"]
+    assert extract_html_from_mhtml(io.BytesIO(archive)) == page
+
+
+def test_extract_html_from_mhtml_requires_html_part():
+    archive = _archive(("image/png", "base64", base64.encodebytes(b"\x89PNG")))
+
+    with pytest.raises(ValueError, match="No HTML parts"):
+        extract_html_from_mhtml(io.BytesIO(archive))
+
+
+def test_extract_html_from_mhtml_memory_is_bounded_by_html_part(tmp_path):
+    path = tmp_path / "snapshot.mhtml"
+    expected = benchmark_mhtml.build_synthetic_mhtml(path, size_mb=8, html_kb=64, html_last=True)
+
+    tracemalloc.start()
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        html = extract_html_from_mhtml(mapped)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert html == expected
+    assert html == benchmark_mhtml._email_parser_extract(path)
+    assert peak < 2 * 1024 * 1024
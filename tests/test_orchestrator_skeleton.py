@@ -29,6 +29,8 @@ def test_run_crawl_creates_outputs_and_counts(monkeypatch, tmp_path: Path) -> No
         search_filters=filters,
         output_base_dir=str(tmp_path),
         state_code="CG",
+        scrape_index_file=str(tmp_path / "scrape_index.sqlite3"),
+        scraping_cache_file=str(tmp_path / "scraped_cache.json"),
     )
     browser_config = BrowserConfig(driver="playwright", headless=True)
     app_config = AppConfig(
@@ -37,3 +37,54 @@ def test_record_and_check_round_trip(tmp_path):
     assert payload["listing"][0]["detail_url"] == "https://example.com/details/CG-001"
     assert payload["raw"]["sections"]
     assert payload["v1"]["project_details"]["project_name"] == "Tiny Project"
+
+
+def _write_fixture(path, project_name):
+    path.write_text(
+        f"""
+        <html><body>
+            <h4>Project Details</h4>
+            <label>Project Name:</label> {project_name}
+        </body></html>
+        """,
+        encoding="utf-8",
+    )
+
+
+def test_parallel_check_uses_digests_and_reports_parse_time(tmp_path):
+    fixtures = [tmp_path / f"page_{i}.html" for i in range(3)]
+    for i, fixture in enumerate(fixtures):
+        _write_fixture(fixture, f"Project {i}")
+    golden_dir = tmp_path / "golden"
+
+    recorded = parser_regression.record_golden(fixtures, golden_dir, "https://example.com/", workers=2)
+    golden = json.loads(recorded[0].read_text(encoding="utf-8"))
+    assert list(golden)[:2] == ["digest", "parse_ms"]
+    assert golden["digest"] == parser_regression.payload_digest(
+        {k: v for k, v in golden.items() if k not in parser_regression.GOLDEN_META_KEYS}
+    )
+
+    _write_fixture(fixtures[1], "Renamed Project")
+    checks = parser_regression.check_goldens(fixtures, golden_dir, "https://example.com/", workers=2)
+
+    assert [c.fixture for c in checks] == ["page_0.html", "page_1.html", "page_2.html"]
+    assert [c.status for c in checks] == ["match", "changed", "match"]
+    assert checks[0].differences == [] and checks[0].parse_ms > 0
+    assert checks[0].slowdown is not None
+    assert any("project_name" in item for item in checks[1].differences)
+
+
+def test_check_falls_back_to_diff_for_goldens_without_digest(tmp_path):
+    fixture = tmp_path / "page.html"
+    _write_fixture(fixture, "Legacy Project")
+    golden_dir = tmp_path / "golden"
+    (golden_path,) = parser_regression.record_golden([fixture], golden_dir, "https://example.com/", workers=1)
+    legacy = json.loads(golden_path.read_text(encoding="utf-8"))
+    for key in parser_regression.GOLDEN_META_KEYS:
+        legacy.pop(key)
+    golden_path.write_text(json.dumps(legacy), encoding="utf-8")
+
+    (check,) = parser_regression.check_goldens([fixture], golden_dir, "https://example.com/", workers=1)
+
+    assert check.status == "match"
+    assert check.golden_parse_ms is None and check.slowdown is None
@@ -21,7 +21,7 @@ from cg_rera_extractor.parsing.schema import (
 from cg_rera_extractor.runs import orchestrator
 
 
-def test_run_crawl_dry_run_reports_pairs(monkeypatch, capsys):
+def test_run_crawl_dry_run_reports_pairs(monkeypatch, capsys, tmp_path: Path):
     filters = SearchFilterConfig(districts=["Raipur", "Bilaspur"], statuses=["Registered"])
     run_config = RunConfig(
         mode=RunMode.DRY_RUN,
@@ -30,6 +30,8 @@ def test_run_crawl_dry_run_reports_pairs(monkeypatch, capsys):
         state_code="CG",
         max_search_combinations=1,
         max_total_listings=5,
+        scrape_index_file=str(tmp_path / "scrape_index.sqlite3"),
+        scraping_cache_file=str(tmp_path / "scraped_cache.json"),
     )
     app_config = AppConfig(
         run=run_config,
@@ -65,6 +67,8 @@ def test_run_crawl_stops_after_combination_cap(monkeypatch, tmp_path: Path):
         state_code="CG",
         max_search_combinations=2,
         max_total_listings=None,
+        scrape_index_file=str(tmp_path / "scrape_index.sqlite3"),
+        scraping_cache_file=str(tmp_path / "scraped_cache.json"),
     )
     app_config = AppConfig(
         run=run_config,
@@ -135,6 +139,8 @@ def test_run_crawl_honors_total_listing_limit(monkeypatch, tmp_path: Path):
         state_code="CG",
         max_search_combinations=None,
         max_total_listings=3,
+        scrape_index_file=str(tmp_path / "scrape_index.sqlite3"),
+        scraping_cache_file=str(tmp_path / "scraped_cache.json"),
     )
     app_config = AppConfig(
         run=run_config,
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from cg_rera_extractor.parsing.schema import (
+    V1Metadata,
+    V1Project,
+    V1ProjectDetails,
+    V1PromoterDetails,
+    V1RawData,
+    V1UnitType,
+)
+from cg_rera_extractor.quality.run_qa import evaluate_run_qa, qa_project_data
+from cg_rera_extractor.quality.validation import QAStatus, run_qa_validation
+
+
+def _project(i: int, price_per_sqm: float | None, locality: str = "Tatibandh", **details) -> V1Project:
+    units = []
+    if price_per_sqm is not None:
+        units = [V1UnitType(name="2BHK", carpet_area_sq_m=80.0, price_in_inr=price_per_sqm * 80.0)]
+    fields = dict(
+        registration_number=f"PCGRERA{i:04d}",
+        project_name=f"Project {i}",
+        district="Raipur",
+        village_or_locality=locality,
+        project_status="Ongoing",
+        launch_date="2023-01-01",
+        expected_completion_date="2026-01-01",
+    )
+    fields.update(details)
+    return V1Project(
+        metadata=V1Metadata(state_code="CG"),
+        project_details=V1ProjectDetails(**fields),
+        promoter_details=[V1PromoterDetails(name="Builder")],
+        unit_types=units,
+        raw_data=V1RawData(),
+    )
+
+
+def _comparable(result) -> dict:
+    payload = result.to_dict()
+    payload.pop("checked_at")
+    return payload
+
+
+def test_run_qa_flags_locality_outlier_against_peers():
+    projects = [_project(i, 40000) for i in range(5)] + [_project(5, 90000)]
+
+    report = evaluate_run_qa(projects)
+
+    outlier = report.results[5]
+    assert outlier.status == QAStatus.FAILED
+    assert [f.flag_type.value for f in outlier.flags] == ["price_locality_mismatch"]
+    assert all(r.status == QAStatus.PASSED for r in report.results[:5])
+    assert report.screened == 1
+    assert report.locality_stats[0]["locality"] == "tatibandh"
+
+
+def test_run_qa_matches_per_project_gate():
+    projects = [
+        _project(0, 40000),
+        _project(1, None, project_name=" "),
+        _project(2, 30, district="Durg"),  # below per-sqft minimum
+        _project(3, 40000, district="Korba", expected_completion_date="2022-01-01"),
+        _project(4, 2_000_000, district="Bilaspur"),  # above per-sqft maximum
+        _project(5, None, district=None),
+    ]
+
+    report = evaluate_run_qa(projects)
+
+    # Too few peers for any locality/district average: same as the per-project gate
+    for project, result in zip(projects, report.results):
+        expected = run_qa_validation(qa_project_data(project))
+        assert _comparable(result) == _comparable(expected)
+    assert report.summary()["qa_passed"] == 1
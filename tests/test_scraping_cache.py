@@ -1,12 +1,17 @@
 """Test the conditional scraping cache functionality."""
 import json
+import time
 from pathlib import Path
 
 import pytest
 
+from cg_rera_extractor.listing.models import ListingRecord
 from cg_rera_extractor.utils.scraping_cache import (
     ScrapedCache,
+    content_hash,
+    listing_fingerprint,
     load_cache,
+    load_scrape_index,
     persist_cache,
     should_skip_listing,
     mark_listing_scraped,
@@ -242,3 +247,58 @@ def test_mark_listing_scraped_with_immediate_persist(tmp_path):
     assert cache_file.exists()
     data = json.loads(cache_file.read_text())
     assert "LISTING_001" in data["scraped_ids"]
+
+
+def test_scrape_index_refetches_changed_and_stale_listings(tmp_path):
+    """Test delta decisions: new, changed row, stale by TTL, fresh."""
+    index = load_scrape_index(tmp_path / "index.sqlite3", refetch_ttl_days=7)
+    record = ListingRecord(reg_no="PCGRERA001", project_name="Green Acres", status="Approved")
+    fingerprint = listing_fingerprint(record)
+
+    assert index.decide("PCGRERA001", fingerprint).reason == "new"
+    index.record_fetch("PCGRERA001", fingerprint, "<html>v1</html>")
+
+    assert index.decide("PCGRERA001", fingerprint).reason == "fresh"
+    assert should_skip_listing("PCGRERA001", "delta", index, fingerprint)
+    assert not should_skip_listing("PCGRERA001", "full", index, fingerprint)
+
+    record.status = "Lapsed"
+    changed = listing_fingerprint(record)
+    assert index.decide("PCGRERA001", changed).reason == "changed"
+    assert index.decide("PCGRERA001", fingerprint, now=time.time() + 8 * 86400).reason == "stale"
+
+
+def test_scrape_index_tracks_content_changes_and_persists(tmp_path):
+    """Test page hashes ignore postback state and survive reopening."""
+    index_file = tmp_path / "index.sqlite3"
+    index = load_scrape_index(index_file)
+    page = '<html><input type="hidden" name="__VIEWSTATE" value="{}"/>Quarter {}</html>'
+
+    assert index.record_fetch("PCGRERA001", "fp", page.format("aaa", 1), now=100)
+    assert not index.record_fetch("PCGRERA001", "fp", page.format("bbb", 1), now=200)
+    assert index.record_fetch("PCGRERA001", "fp", page.format("ccc", 2), now=300)
+    assert content_hash(page.format("x", 1)) == content_hash(page.format("y", 1))
+    index.close()
+
+    reopened = load_scrape_index(index_file)
+    state = reopened.get("PCGRERA001")
+    assert (state.fetched_at, state.content_changed_at, state.first_seen_at) == (300, 300, 100)
+    assert "PCGRERA001" in reopened
+    assert len(reopened) == 1
+    reopened.close()
+
+
+def test_scrape_index_imports_legacy_cache(tmp_path):
+    """Test a new index adopts the legacy ID list without re-fetching it."""
+    legacy_file = tmp_path / "scraped_cache.json"
+    legacy_file.write_text(json.dumps({"scraped_ids": ["PCGRERA001"], "total_count": 1}))
+
+    index = load_scrape_index(tmp_path / "index.sqlite3", refetch_ttl_days=None, legacy_cache_file=legacy_file)
+    assert len(index) == 1
+    assert index.decide("PCGRERA001", "fp").reason == "fresh"
+    # The first fingerprint seen is adopted; later changes trigger a re-fetch
+    assert index.decide("PCGRERA001", "fp2").reason == "changed"
+
+    mark_listing_scraped("PCGRERA002", index, fingerprint="fp", html="<html/>")
+    persist_cache(index)
+    assert index.contains("PCGRERA002")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from cg_rera_extractor.parsing.mapper import map_raw_to_v1
+from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
+from cg_rera_extractor.parsing.schema import (
+    PreviewArtifact,
+    V1Metadata,
+    V1Project,
+    V1ProjectDetails,
+    V1RawData,
+    V1ReraLocation,
+)
+from cg_rera_extractor.quality import normalize_v1_project, validate_v1_project
+from cg_rera_extractor.runs.enrichment import V1ProjectBuilder, write_model_json
+
+FIXTURE = Path(__file__).parent / "fixtures" / "project_detail_sample.html"
+
+
+def _location(source_type: str) -> V1ReraLocation:
+    return V1ReraLocation(source_type=source_type, latitude=21.25, longitude=81.63)
+
+
+def test_builder_matches_copy_per_step_enrichment():
+    raw = extract_raw_from_html(FIXTURE.read_text(encoding="utf-8"), source_file=str(FIXTURE))
+    mapped = map_raw_to_v1(raw, state_code="CG")
+    locations = [_location("amenity"), _location("listing_map")]
+
+    expected = mapped.model_copy(
+        update={
+            "project_details": mapped.project_details.model_copy(
+                update={"project_website_url": "https://example.invalid"}
+            )
+        }
+    )
+    expected = normalize_v1_project(expected.model_copy(update={"rera_locations": locations}))
+    messages = validate_v1_project(expected)
+    if messages:
+        expected = expected.model_copy(update={"validation_messages": messages})
+
+    builder = V1ProjectBuilder(mapped).website_url("https://example.invalid").add_locations(locations)
+    built = builder.normalize().validate().build()
+
+    assert built == expected
+    assert builder.validation_messages == messages
+    assert mapped.project_details.project_website_url != "https://example.invalid"
+
+
+def test_builder_merges_previews_and_leaves_input_unchanged():
+    project = V1Project(
+        metadata=V1Metadata(state_code="CG"),
+        project_details=V1ProjectDetails(district="Raipur", project_status="Registered"),
+        raw_data=V1RawData(),
+        previews={"layout_plan": PreviewArtifact(field_key="layout_plan", notes="#btnLayout")},
+    )
+
+    built = (
+        V1ProjectBuilder(project)
+        .merge_previews({
+            "layout_plan": PreviewArtifact(field_key="layout_plan", artifact_type="pdf", files=["a.pdf"]),
+            "brochure": PreviewArtifact(field_key="brochure", artifact_type="image"),
+        })
+        .validate()
+        .build()
+    )
+
+    assert built.previews["layout_plan"].artifact_type == "pdf"
+    assert built.previews["layout_plan"].files == ["a.pdf"]
+    assert built.previews["layout_plan"].notes == "#btnLayout"
+    assert set(built.previews) == {"layout_plan", "brochure"}
+    assert project.previews["layout_plan"].artifact_type == "unknown"
+    assert built.validation_messages == []
+
+
+def test_write_model_json_is_equivalent_to_json_dumps(tmp_path):
+    raw = extract_raw_from_html(FIXTURE.read_text(encoding="utf-8"), source_file=str(FIXTURE))
+    project = map_raw_to_v1(raw, state_code="CG").model_copy(
+        update={"rera_locations": [_location("amenity")]}
+    )
+    path = tmp_path / "out" / "project.v1.json"
+
+    write_model_json(path, project, exclude_none=True)
+
+    expected = json.dumps(project.model_dump(mode="json", exclude_none=True), ensure_ascii=False, indent=2)
+    assert path.read_text(encoding="utf-8") == expected
+
+    # Floats may be spelled differently (1e-05 -> 0.00001) but parse the same
+    tiny = project.model_copy(update={"rera_locations": [V1ReraLocation(source_type="amenity", latitude=1e-05, longitude=81.63)]})
+    write_model_json(path, tiny, exclude_none=True)
+    assert json.loads(path.read_text(encoding="utf-8")) == tiny.model_dump(mode="json", exclude_none=True)
@@ -0,0 +1,300 @@
+"""Synthetic CG RERA corpora for the pipeline benchmarks.
+
+Builds inputs at any scale from the repository's own fixtures and section
+vocabulary, deterministically for a given seed:
+
+* detail pages - one ``<h3>`` section per logical section in
+  ``logical_sections_and_keys.json`` with labelled fields and tables, in
+  the field/label markup of ``tests/fixtures/project_detail_sample.html``
+* listing pages - the results table of ``tests/fixtures/listing_sample.html``
+  with ``rows_per_page`` projects per page
+* PDFs - single-page text registration certificates (no PDF library needed)
+* V1 catalogues - the mapped projects cloned to the requested count with
+  unique registration numbers, districts, coordinates and unit prices,
+  written as a run directory that ``load_run_into_db`` accepts
+
+    python tools/benchmark_corpus.py --projects 1000 --out /tmp/cg_corpus
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import random
+import sys
+from importlib import resources
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cg_rera_extractor.amenities.provider import Amenity
+from cg_rera_extractor.parsing.schema import V1Project, V1ReraLocation, V1UnitType
+from cg_rera_extractor.runs.enrichment import write_model_json
+
+DISTRICTS = ["Raipur", "Durg", "Bilaspur", "Korba", "Rajnandgaon", "Raigarh", "Jagdalpur", "Ambikapur"]
+TEHSILS = ["Abhanpur", "Tilda", "Patan", "Dhamdha", "Takhatpur", "Kartala", "Dongargarh", "Kharsia"]
+STATUSES = ["Ongoing", "Completed", "Registered", "Lapsed"]
+TYPES = ["Residential", "Commercial", "Plotted", "Mixed"]
+NAMES = ["Garden", "Lake View", "Sunrise", "Green", "Royal", "Shanti", "Sky", "Vrindavan", "Palm", "Silver"]
+SUFFIXES = ["Villas", "Heights", "Residency", "Enclave", "Towers", "Greens", "Homes", "City"]
+TABLE_SECTIONS = {"promoter_details", "building_details", "unit_types", "bank_details", "quarterly_updates"}
+# Chhattisgarh bounding box
+LAT_RANGE = (17.8, 24.1)
+LON_RANGE = (80.2, 84.4)
+
+
+def registration_number(index: int) -> str:
+    return f"PCGRERA{index:07d}"
+
+
+def _project_name(index: int) -> str:
+    return f"{NAMES[index % len(NAMES)]} {SUFFIXES[(index // len(NAMES)) % len(SUFFIXES)]} {index}"
+
+
+def _value(key: str, index: int, row: int = 0) -> str:
+    """Plausible text for a logical key, varied by project and row."""
+
+    if key == "registration_number":
+        return registration_number(index)
+    if key == "project_name":
+        return _project_name(index)
+    if "district" in key:
+        return DISTRICTS[index % len(DISTRICTS)]
+    if "tehsil" in key:
+        return TEHSILS[index % len(TEHSILS)]
+    if "status" in key:
+        return STATUSES[index % len(STATUSES)]
+    if key.endswith("_type") or key == "type":
+        return TYPES[index % len(TYPES)]
+    if "date" in key:
+        return f"{1 + (index + row) % 28:02d}/{1 + index % 12:02d}/{2018 + index % 7}"
+    if "area" in key:
+        return f"{800 + (index * 37 + row * 11) % 4000:,}.50"
+    if "price" in key or "cost" in key or "amount" in key:
+        return f"{2_500_000 + (index * 7919 + row * 104_729) % 9_000_000:,}"
+    if "units" in key or "number" in key or "count" in key or key.startswith("no_"):
+        return str(1 + (index + row) % 240)
+    if "percent" in key:
+        return str((index + row * 7) % 101)
+    if key == "year":
+        return str(2018 + (index + row) % 7)
+    if "email" in key:
+        return f"info{index}@example.com"
+    if "phone" in key or "mobile" in key:
+        return f"98{index:08d}"[-10:]
+    return f"{key.replace('_', ' ').title()} {index}-{row}"
+
+
+def logical_sections() -> list[dict]:
+    resource = resources.files("cg_rera_extractor.parsing.data").joinpath("logical_sections_and_keys.json")
+    return json.loads(resource.read_text("utf-8"))["sections"]
+
+
+def render_detail_page(index: int, table_rows: int = 6, sections: list[dict] | None = None) -> str:
+    """One synthetic project detail page."""
+
+    esc = html.escape
+    parts = ["<!DOCTYPE html>", "<html>", "  <body>"]
+    for section in sections or logical_sections():
+        titles = section["section_title_variants"]
+        keys = section.get("keys", {})
+        title = titles[index % len(titles)].title()
+        if section["logical_section"] == "project_details":
+            title += f" [ Registration No : {registration_number(index)} ]"
+        parts.append(f"    <h3>{esc(title)}</h3>")
+        for key, variants in keys.items():
+            label = variants[index % len(variants)].title()
+            parts.append(
+                f'    <div class="field"><label>{esc(label)}</label><span>{esc(_value(key, index))}</span></div>'
+            )
+        if section["logical_section"] in TABLE_SECTIONS:
+            parts.append("    <table>")
+            parts.append("      <tr>" + "".join(f"<th>{esc(v[0].title())}</th>" for v in keys.values()) + "</tr>")
+            for row in range(table_rows):
+                cells = "".join(f"<td>{esc(_value(key, index, row + 1))}</td>" for key in keys)
+                parts.append(f"      <tr>{cells}</tr>")
+            parts.append("    </table>")
+    parts.append(
+        '    <div><label>Project Brochure</label> <a href="https://example.com/brochure-%d.pdf">Download</a></div>' % index
+    )
+    parts += ["  </body>", "</html>"]
+    return "\n".join(parts)
+
+
+def render_listing_page(start: int, rows: int) -> str:
+    """A listing results table for projects ``start`` .. ``start + rows - 1``."""
+
+    esc = html.escape
+    body = []
+    for index in range(start, start + rows):
+        reg = registration_number(index)
+        body.append(
+            "            <tr>"
+            f"<td>{reg}</td><td><a href=\"/details/{reg}\">{esc(_project_name(index))}</a></td>"
+            f"<td>{esc(_value('promoter_name', index))}</td><td>{DISTRICTS[index % len(DISTRICTS)]}</td>"
+            f"<td>{TEHSILS[index % len(TEHSILS)]}</td><td>{STATUSES[index % len(STATUSES)]}</td>"
+            f"<td><a href=\"/details/{reg}\">View</a></td></tr>"
+        )
+    header = "".join(
+        f"<th>{name}</th>"
+        for name in ("Reg No", "Project Name", "Promoter Name", "District", "Tehsil", "Status", "View Details")
+    )
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head><title>CG RERA Projects</title></head>",
+            "<body>",
+            '    <table id="results-table">',
+            f"        <thead><tr>{header}</tr></thead>",
+            "        <tbody>",
+            *body,
+            "        </tbody>",
+            "    </table>",
+            "</body>",
+            "</html>",
+        ]
+    )
+
+
+def _pdf_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_certificate_pdf(index: int) -> bytes:
+    """A one-page text PDF shaped like a RERA registration certificate."""
+
+    lines = [
+        "CHHATTISGARH REAL ESTATE REGULATORY AUTHORITY",
+        "REGISTRATION CERTIFICATE OF PROJECT",
+        f"Registration No: {registration_number(index)}",
+        f"Project Name: {_project_name(index)}",
+        f"Promoter Name: {_value('promoter_name', index)}",
+        f"District: {DISTRICTS[index % len(DISTRICTS)]}   Tehsil: {TEHSILS[index % len(TEHSILS)]}",
+        f"Date of Registration: {_value('registration_date', index)}",
+        f"Valid Till: {_value('expected_completion_date', index, 3)}",
+        f"Total Land Area: {_value('total_area', index)} sq.m.",
+        f"Total Units: {_value('total_units', index)}",
+        *(f"Condition {n}: The promoter shall comply with section {n + 3} of the Act." for n in range(1, 25)),
+    ]
+    content = "BT /F1 10 Tf 60 760 Td 14 TL " + " ".join(f"({_pdf_text(line)}) Tj T*" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def clone_catalogue(templates: list[V1Project], projects: int, seed: int = 7) -> list[V1Project]:
+    """``projects`` V1 projects cloned from ``templates`` with unique identities."""
+
+    rng = random.Random(seed)
+    catalogue = []
+    for index in range(projects):
+        template = templates[index % len(templates)]
+        lat, lon = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        details = template.project_details.model_copy(
+            update={
+                "registration_number": registration_number(index),
+                "project_name": _project_name(index),
+                "district": DISTRICTS[index % len(DISTRICTS)],
+                "tehsil": TEHSILS[index % len(TEHSILS)],
+                "project_status": STATUSES[index % len(STATUSES)],
+            }
+        )
+        # ₹2,900-3,700 per sq.ft keeps every unit inside the loader's price QA bounds
+        base_price = rng.uniform(2_900, 3_700) * 10.764  # per sq.m.
+        units = [
+            V1UnitType(
+                name=f"{bhk}BHK",
+                carpet_area_sq_m=area,
+                price_in_inr=round(area * base_price * rng.uniform(0.95, 1.05), 2),
+            )
+            for bhk, area in ((1, 45.0), (2, 70.0), (3, 105.0))
+        ]
+        location = V1ReraLocation(source_type="map_iframe", latitude=round(lat, 6), longitude=round(lon, 6))
+        catalogue.append(
+            template.model_copy(
+                update={"project_details": details, "unit_types": units, "rera_locations": [location]}
+            )
+        )
+    return catalogue
+
+
+def write_run_dir(run_dir: Path, catalogue: list[V1Project]) -> Path:
+    """Write ``catalogue`` as ``scraped_json/*.v1.json`` for ``load_run_into_db``."""
+
+    json_dir = run_dir / "scraped_json"
+    json_dir.mkdir(parents=True, exist_ok=True)
+    for project in catalogue:
+        write_model_json(json_dir / f"project_{project.project_details.registration_number}.v1.json", project)
+    return run_dir
+
+
+class SyntheticAmenityProvider:
+    """Deterministic amenities scattered around each query point."""
+
+    name = "synthetic"
+
+    def __init__(self, per_query: int = 12):
+        self.per_query = per_query
+
+    def search(self, lat: float, lon: float, amenity_type: str, radius_km: float) -> list[Amenity]:
+        rng = random.Random(f"{amenity_type}:{lat:.4f}:{lon:.4f}")
+        degrees = radius_km / 111.0
+        return [
+            Amenity(
+                amenity_type=amenity_type,
+                name=f"{amenity_type.title()} {n}",
+                lat=round(lat + rng.uniform(-degrees, degrees), 6),
+                lon=round(lon + rng.uniform(-degrees, degrees), 6),
+                formatted_address=None,
+                provider=self.name,
+                provider_place_id=f"{amenity_type}:{lat:.4f}:{lon:.4f}:{n}",
+            )
+            for n in range(self.per_query)
+        ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic CG RERA corpus to disk")
+    parser.add_argument("--projects", type=int, default=1000, help="Detail pages, PDFs and listing rows to write")
+    parser.add_argument("--rows-per-page", type=int, default=50, help="Projects per listing page")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    args = parser.parse_args(argv)
+
+    sections = logical_sections()
+    for name in ("raw_html", "listings", "pdfs"):
+        (args.out / name).mkdir(parents=True, exist_ok=True)
+    for index in range(args.projects):
+        reg = registration_number(index)
+        (args.out / "raw_html" / f"project_{reg}.html").write_text(
+            render_detail_page(index, sections=sections), encoding="utf-8"
+        )
+        (args.out / "pdfs" / f"{reg}_registration_certificate.pdf").write_bytes(render_certificate_pdf(index))
+    for page, start in enumerate(range(0, args.projects, args.rows_per_page), start=1):
+        rows = min(args.rows_per_page, args.projects - start)
+        (args.out / "listings" / f"listing_{page:05d}.html").write_text(
+            render_listing_page(start, rows), encoding="utf-8"
+        )
+    print(f"Wrote {args.projects} detail pages, PDFs and listing rows to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
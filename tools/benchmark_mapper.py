@@ -0,0 +1,182 @@
+"""Throughput benchmark for :func:`map_raw_to_v1` over a run's worth of projects.
+
+Maps every raw project with the memoized label normalization and header
+matching, and again with the caches bypassed (the per-call work the mapper
+did before they were added), then reports the unmapped-label statistics:
+
+    python tools/benchmark_mapper.py --run-dir outputs/runs/run_20250101_000000
+    python tools/benchmark_mapper.py --projects 2000 --rows 25 [--json results.json]
+
+``--run-dir`` reads ``raw_extracted/*.json``; without it a synthetic run is
+built from the logical-section variants in ``logical_sections_and_keys.json``
+(every project uses the same label vocabulary, as portal pages do).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from importlib import resources
+from pathlib import Path
+from typing import Iterator
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cg_rera_extractor.parsing import mapper
+from cg_rera_extractor.parsing.schema import (
+    FieldRecord,
+    RawExtractedProject,
+    SectionRecord,
+    TableRecord,
+)
+
+_CACHED = ("_normalize", "_column_map", "_value_converter", "_display_title")
+_VALUES = {"area": "1,250.5", "date": "12/03/2024", "number": "14", "units": "120", "year": "2024"}
+
+
+@dataclass
+class MapperBenchResult:
+    variant: str
+    projects: int
+    seconds: float
+    projects_per_sec: float
+
+
+@contextmanager
+def _uncached() -> Iterator[None]:
+    """Route the mapper through the undecorated functions."""
+
+    originals = {name: getattr(mapper, name) for name in _CACHED}
+    try:
+        for name, func in originals.items():
+            setattr(mapper, name, func.__wrapped__)
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(mapper, name, func)
+
+
+def _clear_caches() -> None:
+    for name in _CACHED:
+        getattr(mapper, name).cache_clear()
+
+
+def _value_for(key: str, index: int) -> str:
+    return next((value for hint, value in _VALUES.items() if hint in key), f"{key} {index}")
+
+
+def build_synthetic_run(projects: int, rows: int) -> list[RawExtractedProject]:
+    """Raw projects with fields, tables and a few unknown labels per section."""
+
+    resource = resources.files("cg_rera_extractor.parsing.data").joinpath("logical_sections_and_keys.json")
+    sections = json.loads(resource.read_text("utf-8"))["sections"]
+    corpus = []
+    for i in range(projects):
+        records = []
+        for section in sections:
+            titles = section["section_title_variants"]
+            keys = section.get("keys", {})
+            title = titles[i % len(titles)].title()
+            if section["logical_section"] == "project_details":
+                title += f" [ Registration No : PCGRERA{i:06d} ]"
+            fields = [
+                FieldRecord(label=variants[i % len(variants)].title(), value=_value_for(key, i))
+                for key, variants in keys.items()
+            ]
+            fields += [FieldRecord(label=f"Remarks {i % 3}", value="-"), FieldRecord(label="Approval Authority", value="TCP")]
+            tables = []
+            if section["logical_section"] in mapper._MODEL_MAP:
+                headers = [variants[0].title() for variants in keys.values()] + ["Sr No"]
+                tables.append(
+                    TableRecord(
+                        headers=headers,
+                        rows=[[_value_for(key, r) for key in keys] + [str(r)] for r in range(rows)],
+                    )
+                )
+            records.append(SectionRecord(section_title_raw=title, fields=fields, tables=tables))
+        records.append(
+            SectionRecord(
+                section_title_raw="Other Information",
+                fields=[FieldRecord(label="Litigation Details", value="None")],
+            )
+        )
+        corpus.append(RawExtractedProject(registration_number=f"PCGRERA{i:06d}", sections=records))
+    return corpus
+
+
+def measure(variant: str, corpus: list[RawExtractedProject], repeat: int = 1) -> MapperBenchResult:
+    """Best of ``repeat`` passes; each pass starts with cold caches."""
+
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        _clear_caches()
+        started = time.perf_counter()
+        if variant == "uncached":
+            with _uncached():
+                for raw in corpus:
+                    mapper.map_raw_to_v1(raw)
+        else:
+            for raw in corpus:
+                mapper.map_raw_to_v1(raw)
+        best = min(best, time.perf_counter() - started)
+    return MapperBenchResult(
+        variant=variant,
+        projects=len(corpus),
+        seconds=round(best, 4),
+        projects_per_sec=round(len(corpus) / best, 1) if best else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark raw -> V1 mapping throughput")
+    parser.add_argument("--run-dir", type=Path, help="Run directory whose raw_extracted/*.json are mapped")
+    parser.add_argument("--projects", type=int, default=1000, help="Synthetic projects when no --run-dir is given")
+    parser.add_argument("--rows", type=int, default=20, help="Rows per synthetic table")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per variant (best is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Unmapped labels to print")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.run_dir:
+        corpus = [
+            RawExtractedProject.model_validate_json(path.read_text(encoding="utf-8"))
+            for path in sorted((args.run_dir / "raw_extracted").glob("*.json"))
+            if not path.name.endswith(".locations.json")
+        ]
+        if not corpus:
+            print(f"No raw JSON under {args.run_dir / 'raw_extracted'}")
+            return 1
+    else:
+        corpus = build_synthetic_run(args.projects, args.rows)
+
+    with _uncached():
+        expected = [mapper.map_raw_to_v1(raw) for raw in corpus[:20]]
+    if [mapper.map_raw_to_v1(raw) for raw in corpus[:20]] != expected:
+        print("Cached and uncached mapping differ")
+        return 1
+
+    results = [measure(variant, corpus, args.repeat) for variant in ("uncached", "cached")]
+    for result in results:
+        print(f"{result.variant:>9}: {result.seconds:>8} s, {result.projects_per_sec} projects/s")
+
+    stats = mapper.UnmappedLabelStats()
+    started = time.perf_counter()
+    for raw in corpus:
+        stats.record(mapper.map_raw_to_v1(raw))
+    print(f"map + unmapped-label stats: {time.perf_counter() - started:.4f} s")
+    for (section, label), count in stats.labels.most_common(args.top):
+        print(f"  {count:>7}  {section} / {label}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"results": [asdict(r) for r in results], "unmapped": stats.to_dict(args.top)}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
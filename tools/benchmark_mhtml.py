@@ -0,0 +1,165 @@
+"""Peak-memory and speed benchmark for MHTML ingestion.
+
+Builds synthetic portal snapshots (one quoted-printable HTML page plus base64
+image parts, like Blink's "Save as MHTML") and extracts the HTML with the
+streaming reader and with the previous whole-file ``email`` parser:
+
+    python tools/benchmark_mhtml.py --size-mb 10 --size-mb 50 --html-kb 1024 [--html-last]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import mmap
+import os
+import quopri
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from email import policy
+from email.parser import BytesParser
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
+
+BOUNDARY = "----MultipartBoundary--benchmark----"
+IMAGE_PART_BYTES = 512 * 1024
+
+
+def build_synthetic_mhtml(path: Path, size_mb: float, html_kb: int = 512, html_last: bool = False) -> str:
+    """Write a snapshot of about ``size_mb`` MB; returns its HTML page as decoded.
+
+    Blink writes the page first; ``html_last`` puts it after the images so the
+    reader has to skip all of them.
+    """
+
+    row = "<tr><td>PCGRERA{0:06d}</td><td>Project {0} – Raipur</td><td>Approved</td></tr>\n"
+    rows, length, n = [], 0, 0
+    while length < html_kb * 1024:
+        rows.append(row.format(n))
+        length += len(rows[-1])
+        n += 1
+    html = "<html><body><table id=\"ContentPlaceHolder1_gv_ProjectList\">\n" + "".join(rows) + "</table></body></html>"
+
+    image = base64.encodebytes(os.urandom(IMAGE_PART_BYTES)).replace(b"\n", b"\r\n")
+    with open(path, "wb") as fh:
+        fh.write(
+            b"From: <Saved by Blink>\r\nMIME-Version: 1.0\r\n"
+            b'Content-Type: multipart/related;\r\n\ttype="text/html";\r\n\tboundary="'
+            + BOUNDARY.encode()
+            + b'"\r\n\r\n\r\n'
+        )
+        html_part = (
+            f"--{BOUNDARY}\r\nContent-Type: text/html\r\n"
+            "Content-Transfer-Encoding: quoted-printable\r\n\r\n".encode()
+            + quopri.encodestring(html.encode("utf-8")).replace(b"\n", b"\r\n")
+            + b"\r\n"
+        )
+        if not html_last:
+            fh.write(html_part)
+        index = 0
+        while fh.tell() + (len(html_part) if html_last else 0) < size_mb * 1024 * 1024:
+            fh.write(
+                f"--{BOUNDARY}\r\nContent-Type: image/png\r\nContent-Transfer-Encoding: base64\r\n"
+                f"Content-Location: https://example.invalid/img{index}.png\r\n\r\n".encode()
+            )
+            fh.write(image)
+            index += 1
+        if html_last:
+            fh.write(html_part)
+        fh.write(f"--{BOUNDARY}--\r\n".encode())
+    # Line breaks are CRLF on the wire, and quoted-printable keeps them
+    return html.replace("\n", "\r\n")
+
+
+def _email_parser_extract(path: Path) -> str:
+    # The implementation the streaming reader replaced
+    message = BytesParser(policy=policy.default).parsebytes(path.read_bytes())
+    for part in message.walk():
+        if part.get_content_type() == "text/html":
+            return part.get_payload(decode=True).decode(part.get_content_charset() or "utf-8", errors="replace")
+    raise ValueError(f"No HTML parts found in {path}")
+
+
+def _mmap_extract(path: Path) -> str:
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return extract_html_from_mhtml(mapped)
+
+
+READERS = {
+    "streaming": extract_html_from_mhtml,
+    "streaming_mmap": _mmap_extract,
+    "email_parser": _email_parser_extract,
+}
+
+
+@dataclass
+class MhtmlBenchResult:
+    reader: str
+    file_mb: float
+    html_kb: float
+    seconds: float
+    peak_mb: float
+    mb_per_sec: float
+
+
+def measure(reader: str, path: Path) -> MhtmlBenchResult:
+    """Run one extraction under tracemalloc and time it."""
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    html = READERS[reader](path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    file_mb = path.stat().st_size / (1024 * 1024)
+    return MhtmlBenchResult(
+        reader=reader,
+        file_mb=round(file_mb, 1),
+        html_kb=round(len(html) / 1024, 1),
+        seconds=round(elapsed, 3),
+        peak_mb=round(peak / (1024 * 1024), 2),
+        mb_per_sec=round(file_mb / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MHTML HTML extraction")
+    parser.add_argument("--size-mb", type=float, action="append", help="Snapshot size (repeatable; default 10 and 50)")
+    parser.add_argument("--html-kb", type=int, default=512, help="Size of the HTML page inside each snapshot")
+    parser.add_argument("--html-last", action="store_true", help="Place the HTML part after the images")
+    parser.add_argument("--reader", action="append", choices=sorted(READERS), help="Readers to run (default all)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results: list[MhtmlBenchResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.size_mb or [10.0, 50.0]:
+            path = Path(tmp) / f"snapshot_{size_mb:g}mb.mhtml"
+            expected = build_synthetic_mhtml(path, size_mb, args.html_kb, args.html_last)
+            for reader in args.reader or list(READERS):
+                result = measure(reader, path)
+                if READERS[reader](path) != expected:
+                    print(f"{reader} returned different HTML for {path.name}")
+                    return 1
+                results.append(result)
+                print(
+                    f"{result.reader:>15} {result.file_mb:>7} MB: {result.seconds:>7} s, "
+                    f"peak {result.peak_mb:>8} MB, {result.mb_per_sec} MB/s"
+                )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(r) for r in results], fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""Benchmark V1 enrichment and JSON serialization over a run's saved HTML.
+
+Times the post-mapping part of ``_process_saved_html`` (website URL,
+locations, normalization, validation, previews, writing raw and V1 JSON)
+with the single-pass :class:`V1ProjectBuilder` + pydantic-core encoder and
+with the copy-per-step + ``json.dumps`` code it replaced. Extraction and
+mapping are shared and reported separately:
+
+    python tools/benchmark_v1_enrichment.py --run-dir outputs/runs/run_20250101_000000
+    python tools/benchmark_v1_enrichment.py --copies 500 [--repeat 3] [--json results.json]
+
+Without ``--run-dir`` the detail-page fixture is repeated ``--copies`` times.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cg_rera_extractor.parsing.amenity_extractor import (
+    compute_centroid,
+    extract_amenity_locations,
+    extract_map_iframe_location,
+)
+from cg_rera_extractor.parsing.mapper import map_raw_to_v1
+from cg_rera_extractor.parsing.mhtml_utils import extract_html_from_mhtml
+from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
+from cg_rera_extractor.parsing.schema import (
+    PreviewArtifact,
+    RawExtractedProject,
+    V1Project,
+    V1ReraLocation,
+)
+from cg_rera_extractor.quality import normalize_v1_project, validate_v1_project
+from cg_rera_extractor.runs.enrichment import V1ProjectBuilder, write_model_json
+
+DEFAULT_FIXTURE = REPO_ROOT / "tests" / "fixtures" / "project_detail_sample.html"
+_LISTING_META = {"website_url": "https://example.invalid/project", "map_latitude": 21.25, "map_longitude": 81.63}
+_PREVIEWS = {"layout_plan": PreviewArtifact(field_key="layout_plan", artifact_type="pdf", files=["layout.pdf"])}
+
+
+@dataclass
+class Page:
+    stem: str
+    raw: RawExtractedProject
+    v1: V1Project
+    locations: list[V1ReraLocation]
+
+
+@dataclass
+class EnrichmentBenchResult:
+    variant: str
+    projects: int
+    seconds: float
+    projects_per_sec: float
+
+
+def _load_pages(paths: list[Path]) -> tuple[list[Page], float]:
+    started = time.perf_counter()
+    pages = []
+    for path in paths:
+        html = extract_html_from_mhtml(path) if path.suffix == ".mhtml" else path.read_text(encoding="utf-8")
+        raw = extract_raw_from_html(html, source_file=str(path))
+        locations = extract_amenity_locations(html)
+        centroid = compute_centroid(locations) if locations else None
+        if centroid:
+            locations.append(V1ReraLocation(source_type="amenity_centroid", latitude=centroid[0], longitude=centroid[1]))
+        iframe = extract_map_iframe_location(html)
+        if iframe:
+            locations.append(iframe)
+        pages.append(Page(path.stem, raw, map_raw_to_v1(raw, state_code="CG"), locations))
+    return pages, time.perf_counter() - started
+
+
+def _write_json(path: Path, payload: object) -> None:
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _copy_per_step(page: Page, out_dir: Path) -> None:
+    # The enrichment ``_process_saved_html`` used before V1ProjectBuilder
+    _write_json(out_dir / f"{page.stem}.json", page.raw.model_dump(mode="json"))
+    v1_project = page.v1
+    details = v1_project.project_details.model_copy(update={"project_website_url": _LISTING_META["website_url"]})
+    v1_project = v1_project.model_copy(update={"project_details": details})
+    locations = [
+        *page.locations,
+        V1ReraLocation(
+            source_type="listing_map",
+            latitude=_LISTING_META["map_latitude"],
+            longitude=_LISTING_META["map_longitude"],
+        ),
+    ]
+    v1_project = v1_project.model_copy(update={"rera_locations": locations})
+    v1_project = normalize_v1_project(v1_project)
+    messages = validate_v1_project(v1_project)
+    if messages:
+        v1_project = v1_project.model_copy(update={"validation_messages": messages})
+    merged = dict(v1_project.previews)
+    for key, artifact in _PREVIEWS.items():
+        if key in merged:
+            base = PreviewArtifact(**merged[key].model_dump())
+            base.artifact_type = artifact.artifact_type or base.artifact_type
+            base.files = artifact.files or base.files
+            base.notes = base.notes or artifact.notes
+            merged[key] = base
+        else:
+            merged[key] = artifact
+    v1_project = v1_project.model_copy(update={"previews": merged})
+    _write_json(out_dir / f"{page.stem}.v1.json", v1_project.model_dump(mode="json", exclude_none=True))
+
+
+def _builder(page: Page, out_dir: Path) -> None:
+    write_model_json(out_dir / f"{page.stem}.json", page.raw)
+    builder = V1ProjectBuilder(page.v1).website_url(_LISTING_META["website_url"]).add_locations(page.locations)
+    builder.add_locations([
+        V1ReraLocation(
+            source_type="listing_map",
+            latitude=_LISTING_META["map_latitude"],
+            longitude=_LISTING_META["map_longitude"],
+        )
+    ])
+    builder.merge_previews(_PREVIEWS)
+    write_model_json(out_dir / f"{page.stem}.v1.json", builder.normalize().validate().build(), exclude_none=True)
+
+
+VARIANTS: dict[str, Callable[[Page, Path], None]] = {
+    "copy_per_step": _copy_per_step,
+    "builder": _builder,
+}
+
+
+def measure(variant: str, pages: list[Page], out_dir: Path, repeat: int = 1) -> EnrichmentBenchResult:
+    """Best of ``repeat`` passes of one variant over all pages."""
+
+    target = out_dir / variant
+    target.mkdir(parents=True, exist_ok=True)
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for page in pages:
+            VARIANTS[variant](page, target)
+        best = min(best, time.perf_counter() - started)
+    return EnrichmentBenchResult(
+        variant=variant,
+        projects=len(pages),
+        seconds=round(best, 4),
+        projects_per_sec=round(len(pages) / best, 1) if best else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark V1 enrichment and serialization")
+    parser.add_argument("--run-dir", type=Path, help="Run directory whose raw_html/ pages are used")
+    parser.add_argument("--copies", type=int, default=200, help="Fixture copies when no --run-dir is given")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per variant (best is reported)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.run_dir:
+        raw_html_dir = args.run_dir / "raw_html"
+        paths = sorted([*raw_html_dir.glob("*.html"), *raw_html_dir.glob("*.mhtml")])
+        if not paths:
+            print(f"No saved HTML under {raw_html_dir}")
+            return 1
+    else:
+        paths = [DEFAULT_FIXTURE] * args.copies
+
+    pages, load_seconds = _load_pages(paths)
+    for index, page in enumerate(pages):
+        page.stem = f"{page.stem}_{index}"
+    print(f"extract + map: {len(pages)} projects in {load_seconds:.3f} s")
+
+    results: list[EnrichmentBenchResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for variant in VARIANTS:
+            results.append(measure(variant, pages, Path(tmp), args.repeat))
+            print(f"{variant:>14}: {results[-1].seconds:>8} s, {results[-1].projects_per_sec} projects/s")
+        sample = pages[0].stem
+        outputs = {variant: (Path(tmp) / variant / f"{sample}.v1.json").read_bytes() for variant in VARIANTS}
+        if len(set(outputs.values())) != 1:
+            print(f"Variants wrote different V1 JSON for {sample}")
+            return 1
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(r) for r in results], fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
 """QA script to check scoring coverage and status distribution."""
 import sys
 import os
-from sqlalchemy import create_engine, select, func
+from sqlalchemy import select, func
 from sqlalchemy.orm import sessionmaker
 from collections import Counter
 
@@ -10,10 +10,11 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from cg_rera_extractor.db import ProjectScores, Project
 from cg_rera_extractor.config.env import ensure_database_url
+from cg_rera_extractor.db.base import get_engine
 
 def check_scoring_coverage():
     db_url = ensure_database_url()
-    engine = create_engine(db_url)
+    engine = get_engine(url=db_url)
     Session = sessionmaker(bind=engine)
     session = Session()
 
@@ -53,7 +53,7 @@ def _resolve_project_ids(
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Compute per-project amenity statistics")
+    parser = argparse.ArgumentParser(description="Compute per-project amenity statistics", fromfile_prefix_chars="@")
     parser.add_argument("--config", help="Path to YAML config containing db/amenity settings (defaults to env vars)")
     parser.add_argument("--limit", type=int, help="Process only the first N matching projects")
     parser.add_argument("--project-id", action="append", type=int, help="Specific project ID(s) to process")
@@ -17,8 +17,10 @@ from cg_rera_extractor.db import (
     Project,
     ProjectAmenityStats,
     ProjectScores,
+    bump_data_version,
     get_engine,
     get_session_local,
+    invalidate_detail_documents,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,7 +31,7 @@ logger = logging.getLogger(__name__)
 def _project_ids_with_stats(
     session: Session,
     *,
-    project_id: int | None,
+    project_ids: list[int] | None,
     project_reg: str | None,
     limit: int | None,
 ) -> list[tuple[int, str | None, str | None]]:
@@ -40,8 +42,8 @@ def _project_ids_with_stats(
         .order_by(Project.id)
     )
 
-    if project_id:
-        stmt = stmt.where(Project.id == project_id)
+    if project_ids:
+        stmt = stmt.where(Project.id.in_(project_ids))
     if project_reg:
         stmt = stmt.where(Project.rera_registration_number == project_reg)
     if limit:
@@ -81,9 +83,11 @@ def _upsert_score(session: Session, project_id: int, scores: ProjectScores) -> P
 # ---- CLI -----------------------------------------------------------------
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Compute amenity scores for projects")
+    parser = argparse.ArgumentParser(description="Compute amenity scores for projects", fromfile_prefix_chars="@")
     parser.add_argument("--limit", type=int, help="Limit number of projects to score")
-    parser.add_argument("--project-id", type=int, help="Score a single project by ID")
+    parser.add_argument(
+        "--project-id", action="append", type=int, help="Specific project ID(s) to score"
+    )
     parser.add_argument(
         "--project-reg",
         help="Score a single project by registration number (without state prefix)",
@@ -118,7 +122,7 @@ def main() -> int:
 
         project_rows = _project_ids_with_stats(
             session,
-            project_id=args.project_id,
+            project_ids=args.project_id,
             project_reg=project_reg,
             limit=args.limit,
         )
@@ -164,6 +168,7 @@ def main() -> int:
 
             # Scores are already clamped to [0, 100] by compute_amenity_scores.
             _upsert_score(session, project_id, scores)
+            invalidate_detail_documents(session, [project_id])
             session.commit()
 
             if scores.overall_score is not None:
@@ -183,6 +188,9 @@ def main() -> int:
                 )
 
         if scored_overall:
+            # Scores feed search/detail responses; invalidate cached copies.
+            bump_data_version(session)
+            session.commit()
             logger.info(
                 "Scored %s projects | overall min=%.1f mean=%.1f max=%.1f",
                 len(scored_overall),
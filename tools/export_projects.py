@@ -0,0 +1,66 @@
+"""Stream the full project catalogue to CSV, JSON Lines or Parquet."""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from cg_rera_extractor.analysis.export import EXPORT_COLUMNS, ExportFilters, write_export
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
+from cg_rera_extractor.db import get_engine, get_session_local
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_DIR = Path("exports")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv")
+    parser.add_argument(
+        "--columns",
+        help=f"Comma-separated columns (available: {', '.join(EXPORT_COLUMNS)})",
+    )
+    parser.add_argument("--district", help="Filter by district name")
+    parser.add_argument("--status", help="Filter by project status")
+    parser.add_argument("--min-score", type=float, help="Minimum overall_score")
+    parser.add_argument("--scored-only", action="store_true", help="Skip unscored projects")
+    parser.add_argument("--limit", type=int, help="Maximum number of rows (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per keyset page")
+    parser.add_argument(
+        "--output",
+        help="Output path, or '-' for stdout. Defaults to exports/projects_<timestamp>.<format>",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    db_url = ensure_database_url()
+    SessionLocal = get_session_local(get_engine())
+    output = args.output or str(
+        DEFAULT_EXPORT_DIR / f"projects_{datetime.utcnow():%Y%m%dT%H%M%SZ}.{args.format}"
+    )
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    filters = ExportFilters(
+        district=args.district,
+        status=args.status,
+        min_score=args.min_score,
+        scored_only=args.scored_only,
+        limit=args.limit,
+    )
+
+    logger.info("Exporting projects from %s", describe_database_target(db_url))
+    with SessionLocal() as session:
+        target = sys.stdout.buffer if output == "-" else Path(output)
+        written = write_export(
+            session, target, args.format, columns, filters, batch_size=args.batch_size
+        )
+
+    logger.info("Wrote %s bytes to %s", written, output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
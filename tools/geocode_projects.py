@@ -34,12 +34,13 @@ def load_configs(config_path: str | None) -> tuple[DatabaseConfig, GeocoderConfi
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Geocode projects missing coordinates")
+    parser = argparse.ArgumentParser(description="Geocode projects missing coordinates", fromfile_prefix_chars="@")
     parser.add_argument(
         "--config",
         help="Path to YAML config containing db/geocoder settings (falls back to environment if omitted)",
     )
     parser.add_argument("--limit", type=int, default=100, help="Maximum projects to geocode")
+    parser.add_argument("--project-id", action="append", type=int, help="Specific project ID(s) to geocode")
     parser.add_argument(
         "--provider",
         choices=[provider.value for provider in GeocoderProvider],
@@ -69,6 +70,8 @@ def main() -> int:
             .where(ProjectLocation.id.is_(None))
             .limit(args.limit)
         )
+        if args.project_id:
+            stmt = stmt.where(Project.id.in_(args.project_id))
         projects = session.scalars(stmt).all()
         logging.info("Found %s project(s) needing geocoding", len(projects))
 
@@ -12,8 +12,11 @@ from cg_rera_extractor.db import (
     Project,
     ProjectPricingSnapshot,
     ProjectUnitType,
+    bump_data_version,
     get_engine,
     get_session_local,
+    invalidate_detail_documents,
+    refresh_price_rollups,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,6 +43,7 @@ def import_prices(csv_path: str, snapshot_date: date, source_type: str) -> None:
         logger.info(f"Read {len(rows)} rows from {csv_path}")
         
         projects_cache = {}
+        touched_project_ids: set[int] = set()
         
         for row in rows:
             reg_no = row.get("project_reg_no")
@@ -130,7 +134,12 @@ def import_prices(csv_path: str, snapshot_date: date, source_type: str) -> None:
                     is_active=True
                 )
                 session.add(snapshot)
-        
+            touched_project_ids.add(project.id)
+
+        session.flush()
+        refresh_price_rollups(session, touched_project_ids)
+        invalidate_detail_documents(session, touched_project_ids)
+        bump_data_version(session)
         session.commit()
         logger.info("Import completed successfully.")
 
@@ -0,0 +1,147 @@
+"""Concurrent load test for the read endpoints of a running API.
+
+Fires ``--requests`` GETs at the given paths with ``--concurrency`` requests
+in flight and reports throughput and latency percentiles. To compare the
+sync and async read paths, run the API twice against the same database:
+
+    DB_ASYNC_READS=false uvicorn cg_rera_extractor.api.app:app --port 8000
+    DB_ASYNC_READS=true  uvicorn cg_rera_extractor.api.app:app --port 8000
+
+and run this tool against each with identical arguments, e.g.
+
+    python tools/load_test_api.py --base-url http://localhost:8000 \\
+        --path "/projects/search?page_size=20" --path /projects/1 \\
+        --concurrency 64 --requests 5000 --json results.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+
+DEFAULT_PATHS = (
+    "/projects/search?page_size=20",
+    "/projects/map?bbox=20.0,80.0,23.0,83.0",
+    "/discovery/tags",
+    "/discovery/landmarks",
+)
+
+
+@dataclass
+class LoadResult:
+    base_url: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_seconds: float
+    rps: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(
+    base_url: str,
+    paths: list[str],
+    concurrency: int,
+    total_requests: int,
+    timeout: float = 30.0,
+) -> LoadResult:
+    """Issue ``total_requests`` GETs round-robin over ``paths``."""
+
+    latencies: list[float] = []
+    errors = 0
+    targets = itertools.cycle(paths)
+    remaining = total_requests
+    lock = asyncio.Lock()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while True:
+                async with lock:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                    path = next(targets)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return LoadResult(
+        base_url=base_url,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_seconds=round(duration, 3),
+        rps=round(len(latencies) / duration, 1) if duration else 0.0,
+        latency_p50_ms=round(statistics.median(ordered) * 1000, 2) if ordered else 0.0,
+        latency_p95_ms=round(_percentile(ordered, 95) * 1000, 2),
+        latency_p99_ms=round(_percentile(ordered, 99) * 1000, 2),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the API read endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--path",
+        action="append",
+        dest="paths",
+        help="Request path (repeatable); defaults to search, map, tags and landmarks",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50, help="Requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the result to this file")
+    args = parser.parse_args()
+
+    paths = args.paths or list(DEFAULT_PATHS)
+    if args.warmup:
+        asyncio.run(run_load(args.base_url, paths, min(args.concurrency, args.warmup), args.warmup, args.timeout))
+    result = asyncio.run(
+        run_load(args.base_url, paths, args.concurrency, args.requests, args.timeout)
+    )
+
+    print(
+        f"{result.requests} requests, concurrency {result.concurrency}: "
+        f"{result.rps} req/s, p50 {result.latency_p50_ms} ms, "
+        f"p95 {result.latency_p95_ms} ms, p99 {result.latency_p99_ms} ms, "
+        f"{result.errors} errors"
+    )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(asdict(result), fh, indent=2)
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
-"""Regression harness for CG RERA HTML parsing and mapping."""
+"""Regression harness for CG RERA HTML parsing and mapping.
+
+Modes: ``record``/``check`` goldens; ``conform`` runs the reference
+(html.parser) and candidate HTML parser backends over the fixtures and
+goldens and diffs their outputs; ``bench`` reports pages/sec per backend.
+
+``record`` and ``check`` fan fixtures out over a process pool
+(``--workers``). Each golden stores a SHA-256 ``digest`` of its canonical
+JSON and the ``parse_ms`` it took to produce; ``check`` confirms unchanged
+fixtures by digest and only runs the recursive diff on a mismatch. It also
+reports each fixture's parse time against the recorded one, failing on
+fixtures slower than ``--max-slowdown`` times their golden.
+"""
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import sys
-from dataclasses import asdict
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Iterable, List, TypeVar
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
@@ -15,11 +32,19 @@ if str(REPO_ROOT) not in sys.path:
 
 from cg_rera_extractor.listing import ListingRecord, parse_listing_html
 from cg_rera_extractor.parsing import RawExtractedProject, map_raw_to_v1
+from cg_rera_extractor.parsing.html_backend import available_backends, resolve_backend, use_html_backend
 from cg_rera_extractor.parsing.raw_extractor import extract_raw_from_html
 
 DEFAULT_FIXTURE_DIR = REPO_ROOT / "tests" / "parser_regression" / "fixtures"
 DEFAULT_GOLDEN_DIR = REPO_ROOT / "tests" / "parser_regression" / "golden"
 DEFAULT_BASE_URL = "https://rera.cg.gov/"
+# Extra HTML fixtures covered by conformance and benchmark runs
+SHARED_FIXTURE_DIR = REPO_ROOT / "tests" / "fixtures"
+REFERENCE_BACKEND = "html.parser"
+# Golden keys that describe the recording rather than the parser output
+GOLDEN_META_KEYS = ("digest", "parse_ms")
+
+T = TypeVar("T")
 
 
 class RegressionResult:
@@ -75,16 +100,69 @@ def run_parsers(html: str, fixture_path: Path, base_url: str) -> RegressionResul
     return RegressionResult(fixture=fixture_path, listing=listing_records, raw=raw)
 
 
-def record_golden(fixtures: Iterable[Path], golden_dir: Path, base_url: str) -> list[Path]:
-    golden_dir.mkdir(parents=True, exist_ok=True)
-    outputs: list[Path] = []
-    for fixture in fixtures:
-        html = fixture.read_text(encoding="utf-8")
+@dataclass
+class FixtureCheck:
+    """Outcome of checking one fixture against its golden."""
+
+    fixture: str
+    status: str  # "match", "changed" or "missing_golden"
+    parse_ms: float
+    golden_parse_ms: float | None = None
+    differences: list[str] = field(default_factory=list)
+
+    @property
+    def slowdown(self) -> float | None:
+        if not self.golden_parse_ms:
+            return None
+        return self.parse_ms / self.golden_parse_ms
+
+
+def payload_digest(payload: dict) -> str:
+    """SHA-256 of the canonical (sorted, compact) JSON form of a golden payload."""
+
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _timed_parse(fixture: Path, base_url: str, repeat: int = 1) -> tuple[dict, float]:
+    """Parser output for ``fixture`` and its best parse time (ms) over ``repeat`` runs."""
+
+    html = fixture.read_text(encoding="utf-8")
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
         result = run_parsers(html, fixture, base_url)
-        golden_path = golden_dir / f"{fixture.stem}.json"
-        golden_path.write_text(json.dumps(result.to_jsonable(), indent=2, ensure_ascii=False), encoding="utf-8")
-        outputs.append(golden_path)
-    return outputs
+        best = min(best, time.perf_counter() - started)
+    return result.to_jsonable(), round(best * 1000, 2)
+
+
+def _fan_out(worker: Callable[[Path], T], fixtures: list[Path], workers: int | None) -> list[T]:
+    """``worker`` over ``fixtures`` in a process pool, results in fixture order."""
+
+    workers = min(workers or os.cpu_count() or 1, len(fixtures))
+    if workers <= 1:
+        return [worker(fixture) for fixture in fixtures]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, fixtures))
+
+
+def _record_fixture(fixture: Path, golden_dir: Path, base_url: str, backend: str, repeat: int) -> Path:
+    with use_html_backend(backend):
+        payload, parse_ms = _timed_parse(fixture, base_url, repeat)
+    golden_path = golden_dir / f"{fixture.stem}.json"
+    golden = {"digest": payload_digest(payload), "parse_ms": parse_ms, **payload}
+    golden_path.write_text(json.dumps(golden, indent=2, ensure_ascii=False), encoding="utf-8")
+    return golden_path
+
+
+def record_golden(
+    fixtures: Iterable[Path], golden_dir: Path, base_url: str, workers: int | None = None, repeat: int = 1
+) -> list[Path]:
+    golden_dir.mkdir(parents=True, exist_ok=True)
+    worker = partial(
+        _record_fixture, golden_dir=golden_dir, base_url=base_url, backend=resolve_backend(), repeat=repeat
+    )
+    return _fan_out(worker, list(fixtures), workers)
 
 
 def diff(expected, actual, path: str = "root") -> list[str]:  # type: ignore[override]
@@ -112,31 +190,131 @@ def diff(expected, actual, path: str = "root") -> list[str]:  # type: ignore[ove
     return differences
 
 
-def check_golden(fixtures: Iterable[Path], golden_dir: Path, base_url: str) -> list[str]:
+def conformance_fixtures(fixtures_dir: Path) -> list[Path]:
+    return sorted(fixtures_dir.glob("*.html")) + sorted(SHARED_FIXTURE_DIR.glob("*.html"))
+
+
+def check_conformance(
+    fixtures: Iterable[Path], golden_dir: Path, base_url: str, backends: Iterable[str]
+) -> list[str]:
+    """Diff each backend's output against the reference backend and the goldens."""
+
+    fixtures = list(fixtures)
     discrepancies: list[str] = []
-    for fixture in fixtures:
-        html = fixture.read_text(encoding="utf-8")
-        result = run_parsers(html, fixture, base_url)
-        golden_path = golden_dir / f"{fixture.stem}.json"
-        if not golden_path.exists():
-            discrepancies.append(f"Missing golden file for {fixture.name} -> {golden_path}")
+    with use_html_backend(REFERENCE_BACKEND):
+        reference = {
+            fixture: run_parsers(fixture.read_text(encoding="utf-8"), fixture, base_url).to_jsonable()
+            for fixture in fixtures
+        }
+    for backend in backends:
+        if backend == REFERENCE_BACKEND:
             continue
-        golden_data = json.loads(golden_path.read_text(encoding="utf-8"))
-        current = result.to_jsonable()
-        differences = diff(golden_data, current)
-        if differences:
-            header = f"Differences for {fixture.name}:"
-            discrepancies.append("\n".join([header, *(f"- {item}" for item in differences)]))
+        with use_html_backend(backend):
+            for fixture in fixtures:
+                current = run_parsers(fixture.read_text(encoding="utf-8"), fixture, base_url).to_jsonable()
+                differences = diff(reference[fixture], current)
+                if differences:
+                    header = f"{backend} differs from {REFERENCE_BACKEND} for {fixture.name}:"
+                    discrepancies.append("\n".join([header, *(f"- {item}" for item in differences)]))
+            goldens = [f for f in fixtures if (golden_dir / f"{f.stem}.json").exists()]
+            discrepancies.extend(
+                f"[{backend}] {block}" for block in check_golden(goldens, golden_dir, base_url)
+            )
+    return discrepancies
+
+
+def benchmark_backends(
+    fixtures: Iterable[Path], base_url: str, backends: Iterable[str], iterations: int = 20
+) -> dict[str, float]:
+    """Pages/sec of the full parse (listing + raw extraction + mapping) per backend."""
+
+    pages = [(fixture, fixture.read_text(encoding="utf-8")) for fixture in fixtures]
+    results: dict[str, float] = {}
+    for backend in backends:
+        with use_html_backend(backend):
+            for fixture, html in pages:  # warm-up
+                run_parsers(html, fixture, base_url)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for fixture, html in pages:
+                    run_parsers(html, fixture, base_url)
+            elapsed = time.perf_counter() - started
+        results[backend] = round(len(pages) * iterations / elapsed, 1) if elapsed else 0.0
+    return results
+
+
+def _check_fixture(fixture: Path, golden_dir: Path, base_url: str, backend: str, repeat: int) -> FixtureCheck:
+    with use_html_backend(backend):
+        current, parse_ms = _timed_parse(fixture, base_url, repeat)
+    golden_path = golden_dir / f"{fixture.stem}.json"
+    if not golden_path.exists():
+        return FixtureCheck(
+            fixture.name, "missing_golden", parse_ms, differences=[f"Missing golden file for {fixture.name} -> {golden_path}"]
+        )
+    golden_data = json.loads(golden_path.read_text(encoding="utf-8"))
+    digest = golden_data.pop("digest", None)
+    golden_ms = golden_data.pop("parse_ms", None)
+    if digest is not None and digest == payload_digest(current):
+        return FixtureCheck(fixture.name, "match", parse_ms, golden_ms)
+    # Digest mismatch (or a golden recorded before digests): locate the changes
+    differences = diff(golden_data, current)
+    return FixtureCheck(fixture.name, "changed" if differences else "match", parse_ms, golden_ms, differences)
+
+
+def check_goldens(
+    fixtures: Iterable[Path],
+    golden_dir: Path,
+    base_url: str,
+    workers: int | None = None,
+    repeat: int = 1,
+) -> list[FixtureCheck]:
+    """Check every fixture against its golden, in parallel, with parse timings."""
+
+    worker = partial(
+        _check_fixture, golden_dir=golden_dir, base_url=base_url, backend=resolve_backend(), repeat=repeat
+    )
+    return _fan_out(worker, list(fixtures), workers)
+
+
+def check_golden(fixtures: Iterable[Path], golden_dir: Path, base_url: str, workers: int | None = None) -> list[str]:
+    discrepancies: list[str] = []
+    for check in check_goldens(fixtures, golden_dir, base_url, workers):
+        if check.status == "missing_golden":
+            discrepancies.extend(check.differences)
+        elif check.status == "changed":
+            header = f"Differences for {check.fixture}:"
+            discrepancies.append("\n".join([header, *(f"- {item}" for item in check.differences)]))
     return discrepancies
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("mode", choices=["record", "check"], help="record goldens or check against them")
+    parser.add_argument(
+        "mode",
+        choices=["record", "check", "conform", "bench"],
+        help="record goldens, check against them, compare parser backends or benchmark them",
+    )
     parser.add_argument("fixtures", nargs="*", help="HTML fixture files to process (defaults to fixtures directory)")
     parser.add_argument("--fixtures-dir", default=str(DEFAULT_FIXTURE_DIR), help="Directory containing HTML fixtures")
     parser.add_argument("--golden-dir", default=str(DEFAULT_GOLDEN_DIR), help="Directory to write/read goldens")
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Base URL for resolving listing detail links")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        dest="backends",
+        help="HTML parser backend (repeatable). record/check use the first; "
+        "conform/bench default to every installed backend",
+    )
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the fixtures in bench mode")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for record/check (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=1, help="Parses per fixture in record/check (best time is kept)")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=None,
+        help="Fail check when a fixture parses this many times slower than its golden's recorded time",
+    )
+    parser.add_argument("--json", dest="json_path", help="Write per-fixture check results to this file")
     return parser.parse_args(argv)
 
 
@@ -147,27 +325,86 @@ def main(argv: List[str] | None = None) -> int:
     base_url = args.base_url
 
     try:
-        fixtures = iter_fixture_paths(args.fixtures, fixtures_dir)
+        if args.mode in {"conform", "bench"} and not args.fixtures:
+            fixtures = conformance_fixtures(fixtures_dir)
+        else:
+            fixtures = iter_fixture_paths(args.fixtures, fixtures_dir)
     except FileNotFoundError as exc:  # pragma: no cover - argument validation
         print(str(exc))
         return 2
 
+    backends = args.backends or available_backends()
+    try:
+        for backend in backends:
+            resolve_backend(backend)
+    except (RuntimeError, ValueError) as exc:  # pragma: no cover - argument validation
+        print(str(exc))
+        return 2
+
+    if args.mode == "bench":
+        results = benchmark_backends(fixtures, base_url, backends, args.iterations)
+        print(f"Parsed {len(fixtures)} fixture(s) x {args.iterations} iterations:")
+        for backend, pages_per_sec in results.items():
+            print(f"- {backend}: {pages_per_sec} pages/sec")
+        return 0
+
+    if args.mode == "conform":
+        discrepancies = check_conformance(fixtures, golden_dir, base_url, backends)
+        if discrepancies:
+            print("Found differences between HTML parser backends:")
+            for block in discrepancies:
+                print(block)
+                print()
+            return 1
+        print(f"Backends {', '.join(backends)} agree on all {len(fixtures)} fixture(s).")
+        return 0
+
+    if args.backends:
+        with use_html_backend(args.backends[0]):
+            return _record_or_check(args, fixtures, golden_dir, base_url)
+    return _record_or_check(args, fixtures, golden_dir, base_url)
+
+
+def _record_or_check(args: argparse.Namespace, fixtures: list[Path], golden_dir: Path, base_url: str) -> int:
     if args.mode == "record":
-        outputs = record_golden(fixtures, golden_dir, base_url)
+        outputs = record_golden(fixtures, golden_dir, base_url, workers=args.workers, repeat=args.repeat)
         print(f"Recorded {len(outputs)} golden file(s):")
         for path in outputs:
-            print(f"- {path.relative_to(REPO_ROOT)}")
+            print(f"- {normalize_fixture_path(path)}")
         return 0
 
-    discrepancies = check_golden(fixtures, golden_dir, base_url)
-    if discrepancies:
+    checks = check_goldens(fixtures, golden_dir, base_url, workers=args.workers, repeat=args.repeat)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([{**asdict(check), "slowdown": check.slowdown} for check in checks], fh, indent=2)
+
+    print("Parse time per fixture:")
+    slow: list[FixtureCheck] = []
+    for check in sorted(checks, key=lambda c: c.parse_ms, reverse=True):
+        line = f"- {check.fixture}: {check.parse_ms} ms [{check.status}]"
+        if check.slowdown is not None:
+            line += f" (golden {check.golden_parse_ms} ms, x{check.slowdown:.2f})"
+            if args.max_slowdown and check.slowdown > args.max_slowdown:
+                slow.append(check)
+        print(line)
+
+    changed = [check for check in checks if check.status != "match"]
+    if changed:
         print("Found discrepancies between current parser output and golden files:")
-        for block in discrepancies:
-            print(block)
+        for check in changed:
+            if check.status == "missing_golden":
+                print(check.differences[0])
+            else:
+                print("\n".join([f"Differences for {check.fixture}:", *(f"- {item}" for item in check.differences)]))
             print()
+    if slow:
+        print(f"Parse time regressions (> x{args.max_slowdown} the golden's recorded time):")
+        for check in slow:
+            print(f"- {check.fixture}: {check.golden_parse_ms} ms -> {check.parse_ms} ms")
+    if changed or slow:
         return 1
 
-    print(f"All {len(list(fixtures))} fixture(s) match goldens.")
+    print(f"All {len(checks)} fixture(s) match goldens.")
     return 0
 
 
@@ -0,0 +1,44 @@
+"""Recompute unit inventory counters from the stored units (backfill)."""
+from __future__ import annotations
+
+import argparse
+import logging
+
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
+from cg_rera_extractor.db import get_engine, get_session_local
+from cg_rera_extractor.db.inventory import rebuild_inventory_counters
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild unit inventory counters")
+    parser.add_argument(
+        "--project-id",
+        type=int,
+        action="append",
+        help="Only rebuild this project (repeatable). Default rebuilds all",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    db_url = ensure_database_url()
+    SessionLocal = get_session_local(get_engine())
+
+    with SessionLocal() as session:
+        logger.info("Rebuilding inventory counters (database: %s)", describe_database_target(db_url))
+        written = rebuild_inventory_counters(session, args.project_id)
+        session.commit()
+        logger.info("Wrote %s counter rows", written)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""Rebuild the precomputed project detail documents."""
+from __future__ import annotations
+
+import argparse
+import logging
+
+from cg_rera_extractor.api.services.detail import refresh_detail_documents
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
+from cg_rera_extractor.db import get_engine, get_session_local
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh project detail documents", fromfile_prefix_chars="@")
+    parser.add_argument(
+        "--project-id",
+        type=int,
+        action="append",
+        help="Only rebuild this project (repeatable); other documents are left as they "
+        "are. Default rebuilds all",
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Projects loaded per batch")
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    db_url = ensure_database_url()
+    SessionLocal = get_session_local(get_engine())
+
+    with SessionLocal() as session:
+        logger.info("Refreshing detail documents (database: %s)", describe_database_target(db_url))
+        written = refresh_detail_documents(session, args.project_id, batch_size=args.batch_size)
+        session.commit()
+        logger.info("Wrote %s detail documents", written)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
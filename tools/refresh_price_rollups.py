@@ -0,0 +1,50 @@
+"""Rebuild the price trend rollups from pricing snapshots."""
+from __future__ import annotations
+
+import argparse
+import logging
+
+from cg_rera_extractor.config.env import describe_database_target, ensure_database_url
+from cg_rera_extractor.db import (
+    bump_data_version,
+    get_engine,
+    get_session_local,
+    refresh_price_rollups,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh price trend rollups")
+    parser.add_argument(
+        "--project-id",
+        type=int,
+        action="append",
+        help="Only refresh entities touched by this project (repeatable); default rebuilds all",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    db_url = ensure_database_url()
+    engine = get_engine()
+    SessionLocal = get_session_local(engine)
+
+    with SessionLocal() as session:
+        logger.info("Refreshing price rollups (database: %s)", describe_database_target(db_url))
+        written = refresh_price_rollups(session, args.project_id)
+        bump_data_version(session)
+        session.commit()
+        logger.info("Wrote %s rollup rows", written)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())